@@ -13,8 +13,11 @@ import logging
 from sap.config import config_get  # noqa: F401
 
 
-def get_logger():
-    """Returns the common logger object. Don't use for standard output"""
+_LOGGER_CONFIGURED = False
+
+
+def _configure_logger():
+    """Applies SAPCLI_LOG_LEVEL to the root logger"""
 
     logger = logging.getLogger()
 
@@ -26,6 +29,23 @@ def get_logger():
     return logger
 
 
+def get_logger():
+    """Returns the common logger object. Don't use for standard output
+
+       The environment is examined on the first call only because
+       the function is called from hot paths like SAX handlers.
+    """
+
+    # pylint: disable=global-statement
+    global _LOGGER_CONFIGURED
+
+    if not _LOGGER_CONFIGURED:
+        _configure_logger()
+        _LOGGER_CONFIGURED = True
+
+    return logging.getLogger()
+
+
 __all__ = [
     "get_logger",
 ]
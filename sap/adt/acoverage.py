@@ -1,9 +1,12 @@
 """ABAP Unit Test Coverage framework ADT wrappers"""
 import xml
+from copy import copy
 from typing import NamedTuple, List
 from xml.sax.handler import ContentHandler
 
 from sap import get_logger
+from sap.http import response_stream
+from sap.profiling import profiled_parser
 from sap.adt.annotations import XmlNodeProperty, XmlElementProperty, OrderedClassMembers
 from sap.adt.marshalling import Marshal
 from sap.adt.objects import XMLNamespace, ADTObjectType
@@ -32,6 +35,8 @@ class Query(metaclass=OrderedClassMembers):
     objects = XmlNodeProperty(XmlElementProperty.NAME_FROM_OBJECT)
 
     def __init__(self, identifier, objects):
+        # an own copy because the class one is shared by concurrent queries
+        self.objtype = copy(self.objtype)
         self.objtype.basepath = self.objtype.basepath.format(identifier=identifier)
         self.objects = objects
 
@@ -44,7 +49,7 @@ class ACoverage:
     def __init__(self, connection):
         self._connection = connection
 
-    def execute(self, identifier, adt_object_sets, additional_type_info=False):
+    def execute(self, identifier, adt_object_sets, additional_type_info=False, stream=False):
         """Executes ABAP Coverage on the given ADT object set"""
 
         query = Query(identifier, adt_object_sets)
@@ -59,7 +64,8 @@ class ACoverage:
             query.objtype.basepath,
             params=params,
             content_type=query.objtype.mimetype,
-            body=coverage_config
+            body=coverage_config,
+            stream=stream
         )
 
     def parse_response(self, acoverage_response):
@@ -76,6 +82,34 @@ class ACoverage:
 
         return parsed_acoverage_response
 
+    def stream_response(self, acoverage_response, on_node):
+        """Parse the response and pass every child node of the root node
+           together with its statement URIs to on_node(node, statement_uris)
+           as soon as the node is complete and its rel=next links are merged.
+           Returns the root node without children.
+
+           The response must be executed with stream=True.
+        """
+
+        def _complete_node(node):
+            for uri in handler.next_uris:
+                child_parsed = parse_acoverage_response(self._fetch_measurements(uri).text)
+                handler.next_uri_to_node[uri].nodes.extend(child_parsed.root_node.nodes)
+                handler.statement_uris.extend(child_parsed.statement_uris)
+
+            statement_uris = list(handler.statement_uris)
+
+            handler.next_uris.clear()
+            handler.next_uri_to_node.clear()
+            handler.statement_uris.clear()
+
+            on_node(node, statement_uris)
+
+        handler = CoverageResponseHandler(on_node=_complete_node)
+        xml.sax.parse(response_stream(acoverage_response), handler)
+
+        return handler.root_node
+
     def _fetch_measurements(self, uri):
         """Fetches measurements"""
 
@@ -110,13 +144,43 @@ class CoverageNode(NamedTuple):
     executed: int
 
 
+def merge_coverage_roots(root_nodes):
+    """Merges root nodes of coverage results of several runs into a single
+       root node - child nodes are concatenated and coverages of the same
+       type are summed up.
+    """
+
+    merged = Node(name=None, type=None, uri=None, nodes=[], coverages=[], parent_node=None)
+    totals = {}
+
+    for root_node in root_nodes:
+        if merged.name is None:
+            merged = merged._replace(name=root_node.name)
+
+        merged.nodes.extend(root_node.nodes)
+        for coverage in root_node.coverages:
+            total, executed = totals.get(coverage.type, (0, 0))
+            totals[coverage.type] = (total + coverage.total, executed + coverage.executed)
+
+    merged.coverages.extend(CoverageNode(type=typ, total=total, executed=executed)
+                            for typ, (total, executed) in totals.items())
+
+    return merged
+
+
 # pylint: disable=too-many-instance-attributes
 class CoverageResponseHandler(ContentHandler):
-    """ABAP Unit Test Framework Coverage ADT results XML parser"""
+    """ABAP Unit Test Framework Coverage ADT results XML parser
+
+       If on_node is given, every completed child node of the root node
+       (i.e. a package) is passed to the callable and removed from the tree
+       to keep memory bounded by the largest package.
+    """
 
-    def __init__(self):
+    def __init__(self, on_node=None):
         super().__init__()
 
+        self._on_node = on_node
         self.root_node = None
         self.statement_uris = []
         self.next_uris = []
@@ -178,7 +242,11 @@ class CoverageResponseHandler(ContentHandler):
             self._node = self._node.parent_node
             self._parent_node = self._node.parent_node
 
+            if self._on_node is not None and self._node is self.root_node:
+                self._on_node(self.root_node.nodes.pop())
+
 
+@profiled_parser('parse_acoverage_response')
 def parse_acoverage_response(coverage_results_xml):
     """Converts XML results into Python representation"""
 
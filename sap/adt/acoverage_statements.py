@@ -1,9 +1,11 @@
 """ABAP Unit Test Coverage framework code highlighting wrappers"""
 import xml
+from copy import copy
 from typing import NamedTuple, List
 from xml.sax.handler import ContentHandler
 
 from sap import get_logger
+from sap.profiling import profiled_parser
 from sap.adt.annotations import OrderedClassMembers, xml_attribute, xml_element
 from sap.adt.marshalling import Marshal
 from sap.adt.objects import XMLNamespace, ADTObjectType
@@ -51,6 +53,8 @@ class StatementsBulkRequest(metaclass=OrderedClassMembers):
                             'statementsBulkRequest')
 
     def __init__(self, identifier, statement_requests=None):
+        # an own copy because the class one is shared by concurrent requests
+        self.objtype = copy(self.objtype)
         self.objtype.basepath = self.objtype.basepath.format(identifier=identifier)
         self._statement_requests = statement_requests or []
 
@@ -152,6 +156,7 @@ class CoverageStatementsResponseHandler(ContentHandler):
             self._current_statement_response = None
 
 
+@profiled_parser('parse_statements_response')
 def parse_statements_response(coverage_statements_results_xml):
     """Converts XML results into Python representation"""
 
@@ -0,0 +1,209 @@
+"""asyncio counterpart of the ADT connection
+
+sap.adt.Connection is built on the blocking python requests library which
+has no asyncio support. The class sap.adt.aio.Connection runs the blocking
+requests on a bounded pool of threads where every thread owns its own clone
+of the wrapped connection (i.e. its own HTTP session with cookies and
+X-CSRF-Token). Hence the login, CSRF token handling, error handlers and
+marshalling are exactly the same as with the blocking connection and
+coroutines can keep hundreds of requests queued while at most
+max_concurrency of them are in flight.
+
+Usage:
+
+    async with sap.adt.aio.Connection(connection, max_concurrency=16) as aconn:
+        sources = await asyncio.gather(*(sap.adt.aio.text(aconn, obj) for obj in objects))
+"""
+
+import asyncio
+import copy
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import sap.adt.atc
+import sap.adt.repository
+from sap.errors import SAPCliError
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class Connection:
+    """Asynchronous ADT connection executing requests of the wrapped
+       sap.adt.Connection on at most max_concurrency threads.
+    """
+
+    def __init__(self, connection, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """Parameters:
+            - connection: sap.adt.Connection which is cloned for every thread
+            - max_concurrency: maximum number of requests in flight
+        """
+
+        if max_concurrency is None or max_concurrency < 1:
+            raise SAPCliError(f'The maximum concurrency must be a positive integer: {max_concurrency}')
+
+        self._connection = connection
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._local = threading.local()
+        self._clones = []
+        self._clones_lock = threading.Lock()
+        self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def connection(self):
+        """The wrapped blocking connection"""
+
+        return self._connection
+
+    @property
+    def max_concurrency(self):
+        """Maximum number of requests in flight"""
+
+        return self._max_concurrency
+
+    def close(self):
+        """Stops the threads and closes HTTP sessions of their connections;
+           requests which have not started are cancelled and the running
+           requests are waited for.
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+        # the threads are gone and so are their thread local connections
+        self._local = threading.local()
+
+        with self._clones_lock:
+            clones, self._clones = self._clones, []
+
+        for clone in clones:
+            clone.close()
+
+    def _worker_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._connection.clone()
+            self._local.connection = connection
+
+            with self._clones_lock:
+                self._clones.append(connection)
+
+        return connection
+
+    def _call(self, func, args, kwargs):
+        return func(self._worker_connection(), *args, **kwargs)
+
+    async def run(self, func, *args, **kwargs):
+        """Returns the result of func(connection, *args, **kwargs) called
+           in a worker thread with the thread's blocking connection.
+        """
+
+        async with self._semaphore:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency,
+                                                    thread_name_prefix='sapcli-adt')
+
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(self._call, func, args, kwargs))
+
+    # pylint: disable=too-many-arguments
+    async def execute(self, method, adt_uri, params=None, headers=None, body=None, accept=None, content_type=None,
+                      complete_url=False):
+        """Executes the given ADT URI as an HTTP request and returns
+           the requests response object
+        """
+
+        return await self.run(lambda connection: connection.execute(
+            method, adt_uri, params=params, headers=headers, body=body, accept=accept, content_type=content_type,
+            complete_url=complete_url))
+
+    async def get_text(self, relativeuri, accept='text/plain'):
+        """Executes a GET HTTP request with the given Accept header.
+        """
+
+        return await self.run(lambda connection: connection.get_text(relativeuri, accept=accept))
+
+
+def _bind(adt_object, connection):
+    """Returns a shallow copy of the ADT object using the connection"""
+
+    bound = copy.copy(adt_object)
+    # pylint: disable=protected-access
+    bound._connection = connection
+
+    return bound
+
+
+async def fetch(aconn, adt_object):
+    """Retrieve data of the ADT object from ADT"""
+
+    def _fetch(connection):
+        bound = _bind(adt_object, connection)
+        bound.fetch()
+        return bound
+
+    bound = await aconn.run(_fetch)
+
+    # the fetched data were deserialized into the copy
+    adt_object.__dict__.update((name, value) for name, value in bound.__dict__.items() if name != '_connection')
+
+
+async def text(aconn, adt_object):
+    """Downloads source code of the ADT object"""
+
+    return await aconn.run(lambda connection: _bind(adt_object, connection).text)
+
+
+async def create(aconn, adt_object, corrnr=None):
+    """Creates the ADT object.
+
+       The object is serialized in the worker thread with the thread's
+       connection which may download the discovery document to find out
+       the supported MIME version.
+    """
+
+    return await aconn.run(lambda connection: _bind(adt_object, connection).create(corrnr))
+
+
+class Repository:
+    """Asynchronous repository proxy"""
+
+    def __init__(self, aconn):
+        self._aconn = aconn
+
+    async def read_node(self, adt_object, withdescr=False, nodekeys=None):
+        """Returns node structure of the object"""
+
+        return await self._aconn.run(
+            lambda connection: sap.adt.repository.Repository(connection).read_node(
+                adt_object, withdescr=withdescr, nodekeys=nodekeys))
+
+
+class ChecksRunner:
+    """Asynchronous ATC checks runner"""
+
+    def __init__(self, aconn, variant):
+        """:param aconn: sap.adt.aio.Connection
+           :param variant: A string holding the executed variant name
+        """
+
+        self._aconn = aconn
+        self._variant = variant
+
+    async def run_for(self, obj_sets, max_verdicts=100):
+        """Executes checks for the given object sets in a new worklist
+           to allow concurrent runs.
+        """
+
+        return await self._aconn.run(
+            lambda connection: sap.adt.atc.ChecksRunner(connection, self._variant).run_for(
+                obj_sets, max_verdicts=max_verdicts))
@@ -264,12 +264,13 @@ class AUnit:
                 'AUnit run %s: status=%s percentage=%s',
                 run_id, handler.status, handler.percentage)
 
-    def fetch_results(self, run_id, accept=None):
+    def fetch_results(self, run_id, accept=None, stream=False):
         """Fetch the results of a completed AUnit run
 
         Args:
             run_id: the run identifier
             accept: result format MIME type (default: ACCEPT_AUNIT_RESULTS)
+            stream: do not read the response body in advance
         """
 
         if accept is None:
@@ -278,15 +279,17 @@ class AUnit:
         return self._connection.execute(
             'GET',
             f'{AUNIT_RESULTS_BASEPATH}/{run_id}',
-            accept=accept
+            accept=accept,
+            stream=stream
         )
 
-    def execute(self, test_run, accept=None):
+    def execute(self, test_run, accept=None, stream=False):
         """Execute AUnit tests using the API protocol.
 
         Args:
             test_run: TestRun object to serialize and execute
             accept: result format MIME type (default: ACCEPT_AUNIT_RESULTS)
+            stream: do not read the results body in advance
 
         Returns:
             Response with .text containing test results XML
@@ -295,4 +298,4 @@ class AUnit:
         xml_body = Marshal().serialize(test_run)
         run_id = self.start_run(xml_body)
         self.poll_run(run_id)
-        return self.fetch_results(run_id, accept=accept)
+        return self.fetch_results(run_id, accept=accept, stream=stream)
@@ -227,6 +227,35 @@ class ChecksRunner:
         return WorkListRunResult(run_response, worklist)
 
 
+def merge_worklists(worklists):
+    """Merges the given worklists into a single worklist with the ID and
+       the timestamp of the first one.
+
+       Objects reported by more than one worklist (e.g. a package and its
+       sub-package checked in different worklists) are taken only from the first
+       worklist.
+    """
+
+    merged = WorkList()
+    # pylint: disable=no-value-for-parameter
+    merged.objects = ATCObjectList()
+
+    known_uris = set()
+    for worklist in worklists:
+        if merged.worklist_id is None:
+            merged.worklist_id = worklist.worklist_id
+            merged.timestamp = worklist.timestamp
+
+        for obj in (worklist.objects or []):
+            if obj.uri in known_uris:
+                continue
+
+            known_uris.add(obj.uri)
+            merged.objects.append(obj)
+
+    return merged
+
+
 # pylint: disable=too-many-locals,too-many-nested-blocks,too-many-branches
 def dump_profiles(connection, profiles=None, priorities=False, checkman=False):
     """Dump ATC profiles for the connected system"""
@@ -0,0 +1,252 @@
+"""Local baseline of ATC findings.
+
+CI builds gating on ATC checks re-run the checks for all objects on every
+build and fail on findings which have been there for years. The baseline
+stores findings of checked objects in an SQLite database, keyed by system
+(host, port, client), check variant, object type and object name, together
+with the last-changed timestamp of the checked objects.
+
+Findings of a new run are compared with the baseline by the check, the
+message and the message title - the location is ignored because it moves
+with every edit of the object. A finding is new if the object reports more
+findings with the same identification than the baseline remembers.
+
+Objects whose last-changed timestamp has not changed since the baseline
+do not need to be checked again.
+"""
+
+from __future__ import annotations
+
+import time
+import sqlite3
+import xml.sax
+from collections import Counter
+from copy import copy
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from xml.sax.handler import ContentHandler
+
+from sap.adt.atc import ATCFindingList, ATCObjectList, WorkList
+from sap.adt.package_index import system_key
+from sap.errors import SAPCliError
+
+
+SCHEMA = ('''CREATE TABLE IF NOT EXISTS objects (
+    system TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    obj_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    changed_at TEXT,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (system, variant, obj_type, name)
+)''', '''CREATE TABLE IF NOT EXISTS findings (
+    system TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    obj_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    check_id TEXT NOT NULL,
+    message_id TEXT NOT NULL,
+    message_title TEXT NOT NULL,
+    priority TEXT,
+    location TEXT
+)''', '''CREATE INDEX IF NOT EXISTS findings_of_object ON findings (system, variant, obj_type, name)''')
+
+ObjectKey = Tuple[str, str]
+FindingKey = Tuple[str, str, str]
+
+
+class CheckedObject(NamedTuple):
+    """An object submitted to ATC checks"""
+
+    obj_type: str
+    name: str
+    changed_at: Optional[str]
+
+
+def object_key(obj_type: str, name: str) -> ObjectKey:
+    """Build the baseline key of the object from its ADT type and name"""
+
+    return ((obj_type or '').split('/')[0].upper(), (name or '').upper())
+
+
+def finding_key(finding) -> FindingKey:
+    """Build the identification of the finding which does not change with
+       the location of the finding.
+    """
+
+    return (finding.check_id or '', finding.message_id or '', finding.message_title or '')
+
+
+class _ChangedAtHandler(ContentHandler):
+
+    def __init__(self):
+        super().__init__()
+
+        self.changed_at = None
+        self._root = True
+
+    def startElement(self, name, attrs):
+        if self._root:
+            self.changed_at = attrs.get('adtcore:changedAt')
+            self._root = False
+
+
+def fetch_changed_at(connection, adt_object) -> Optional[str]:
+    """Returns the last-changed timestamp of the ADT object or None if
+       the object metadata do not have it.
+    """
+
+    resp = connection.execute('GET', adt_object.uri)
+
+    handler = _ChangedAtHandler()
+    xml.sax.parseString(resp.text.encode('utf-8'), handler)
+
+    return handler.changed_at
+
+
+class FindingsBaseline:
+    """Findings of objects checked by a single check variant in a single
+       system. The database is opened on the first access.
+    """
+
+    def __init__(self, path: Path, system: str, variant: str) -> None:
+        self._path = path
+        self._system = system
+        self._variant = variant
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            try:
+                self._db = sqlite3.connect(str(self._path))
+                with self._db:
+                    for statement in SCHEMA:
+                        self._db.execute(statement)
+            except (sqlite3.Error, OSError) as ex:
+                raise SAPCliError(f'Cannot open ATC baseline {self._path}: {ex}') from ex
+
+        return self._db
+
+    def _where(self, key: ObjectKey) -> Tuple[str, str, str, str]:
+        return (self._system, self._variant) + key
+
+    def close(self) -> None:
+        """Closes the database"""
+
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def changed_at(self, obj_type: str, name: str) -> Optional[str]:
+        """Returns the last-changed timestamp of the object when it was
+           checked or None if the object is not in the baseline.
+        """
+
+        try:
+            row = self._get_db().execute(
+                'SELECT changed_at FROM objects WHERE system = ? AND variant = ? AND obj_type = ? AND name = ?',
+                self._where(object_key(obj_type, name))).fetchone()
+        except sqlite3.Error as ex:
+            raise SAPCliError(f'Cannot read ATC baseline: {ex}') from ex
+
+        return None if row is None else row[0]
+
+    def is_unchanged(self, checked: CheckedObject) -> bool:
+        """Returns True if the object has the same last-changed timestamp
+           as when it was checked.
+        """
+
+        return checked.changed_at is not None and self.changed_at(checked.obj_type, checked.name) == checked.changed_at
+
+    def known_findings(self, obj_type: str, name: str) -> Counter:
+        """Returns numbers of findings of the object in the baseline"""
+
+        try:
+            rows = self._get_db().execute(
+                'SELECT check_id, message_id, message_title FROM findings'
+                ' WHERE system = ? AND variant = ? AND obj_type = ? AND name = ?',
+                self._where(object_key(obj_type, name))).fetchall()
+        except sqlite3.Error as ex:
+            raise SAPCliError(f'Cannot read ATC baseline: {ex}') from ex
+
+        return Counter(tuple(row) for row in rows)
+
+    def new_findings(self, worklists: Iterable[WorkList]) -> WorkList:
+        """Returns a single worklist with the objects of the given worklists
+           having only the findings which are not in the baseline.
+        """
+
+        result = WorkList()
+        # pylint: disable=no-value-for-parameter
+        result.objects = ATCObjectList()
+
+        for worklist in worklists:
+            if result.worklist_id is None:
+                result.worklist_id = worklist.worklist_id
+                result.timestamp = worklist.timestamp
+
+            for obj in (worklist.objects or []):
+                known = self.known_findings(obj.typ, obj.name)
+
+                findings = ATCFindingList()
+                for finding in (obj.findings or []):
+                    key = finding_key(finding)
+                    if known[key] > 0:
+                        known[key] -= 1
+                        continue
+
+                    findings.append(finding)
+
+                if not findings:
+                    continue
+
+                new_obj = copy(obj)
+                new_obj.findings = findings
+                result.objects.append(new_obj)
+
+        return result
+
+    def update(self, checked_objects: Iterable[CheckedObject], worklists: Iterable[WorkList]) -> None:
+        """Replaces findings of the checked objects and of the objects
+           reported by the worklists with the reported findings.
+        """
+
+        changed: Dict[ObjectKey, Optional[str]] = {}
+        for checked in checked_objects:
+            changed[object_key(checked.obj_type, checked.name)] = checked.changed_at
+
+        reported: Dict[ObjectKey, List] = {}
+        for worklist in worklists:
+            for obj in (worklist.objects or []):
+                reported.setdefault(object_key(obj.typ, obj.name), []).extend(obj.findings or [])
+
+        checked_at = time.time()
+
+        try:
+            db = self._get_db()
+            with db:
+                for key in list(changed) + [key for key in reported if key not in changed]:
+                    where = self._where(key)
+
+                    db.execute('INSERT OR IGNORE INTO objects VALUES (?, ?, ?, ?, NULL, ?)', where + (checked_at,))
+                    db.execute('UPDATE objects SET checked_at = ? WHERE system = ? AND variant = ?'
+                               ' AND obj_type = ? AND name = ?', (checked_at,) + where)
+                    if changed.get(key) is not None:
+                        db.execute('UPDATE objects SET changed_at = ? WHERE system = ? AND variant = ?'
+                                   ' AND obj_type = ? AND name = ?', (changed[key],) + where)
+
+                    db.execute('DELETE FROM findings WHERE system = ? AND variant = ? AND obj_type = ? AND name = ?',
+                               where)
+                    db.executemany('INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                   [where + finding_key(finding) + (finding.priority, finding.location)
+                                    for finding in reported.get(key, [])])
+        except sqlite3.Error as ex:
+            raise SAPCliError(f'Cannot update ATC baseline: {ex}') from ex
+
+
+def open_findings_baseline(connection, path: str, variant: str) -> FindingsBaseline:
+    """Return the baseline of the connected system and the check variant
+       stored in the file path.
+    """
+
+    return FindingsBaseline(Path(path), system_key(connection.host, connection.port, connection.client), variant)
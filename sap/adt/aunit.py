@@ -6,6 +6,7 @@ import xml.sax
 from xml.sax.handler import ContentHandler
 
 from sap import get_logger
+from sap.profiling import profiled_parser
 from sap.adt.objects import ADTObjectType, XMLNamespace
 from sap.adt.annotations import OrderedClassMembers, XmlElementProperty, XmlNodeProperty, XmlNodeAttributeProperty
 from sap.adt.marshalling import Marshal
@@ -218,7 +219,7 @@ class AUnit:
     def __init__(self, connection):
         self._connection = connection
 
-    def execute(self, adt_object_sets, activate_coverage=False):
+    def execute(self, adt_object_sets, activate_coverage=False, stream=False):
         """Executes ABAP Unit tests on the given ADT object set"""
 
         run_configuration = RunConfiguration(adt_object_sets)
@@ -229,7 +230,8 @@ class AUnit:
             'POST',
             run_configuration.objtype.basepath,
             content_type=run_configuration.objtype.mimetype,
-            body=test_config)
+            body=test_config,
+            stream=stream)
 
 
 # pylint: disable=too-few-public-methods
@@ -249,6 +251,19 @@ class Program(NamedTuple):
     alerts: List
 
 
+def merge_run_results(run_results_list):
+    """Merges results of several runs (e.g. shards of a single run) into one
+       RunResults keeping the order of the runs.
+    """
+
+    merged = RunResults([], [])
+    for run_results in run_results_list:
+        merged.alerts.extend(run_results.alerts)
+        merged.programs.extend(run_results.programs)
+
+    return merged
+
+
 # pylint: disable=too-few-public-methods
 class TestClass(NamedTuple):
     """ABAP Unit Tests Framework ADT results TestClass node"""
@@ -314,12 +329,18 @@ class Alert(NamedTuple):
 
 # pylint: disable=too-many-instance-attributes
 class AUnitResponseHandler(ContentHandler):
-    """ABAP Unit Test Framework ADT results XML parser"""
+    """ABAP Unit Test Framework ADT results XML parser
 
-    def __init__(self):
+       If on_program is given, every completed program is passed to the
+       callable instead of being stored in run_results.programs to keep
+       memory bounded by the largest program.
+    """
+
+    def __init__(self, on_program=None):
         super().__init__()
 
         self.run_results = RunResults([], [])
+        self._on_program = on_program
         self.coverage_identifier = None
         self._program = None
         self._test_class = None
@@ -375,6 +396,10 @@ class AUnitResponseHandler(ContentHandler):
     def endElement(self, name):
         mod_log().debug('XML: %s: CLOSING', name)
         if name == 'program':
+            if self._on_program is not None:
+                self.run_results.programs.pop()
+                self._on_program(self._program)
+
             self._program = None
         elif name == 'testClas':
             self._test_class = None
@@ -404,6 +429,7 @@ class AUnitResponseHandler(ContentHandler):
             self._alert_stack = None
 
 
+@profiled_parser('parse_aunit_response')
 def parse_aunit_response(aunit_results_xml):
     """Converts XML results into Python representation"""
 
@@ -411,3 +437,22 @@ def parse_aunit_response(aunit_results_xml):
     xml.sax.parseString(aunit_results_xml, xml_handler)
 
     return xml_handler
+
+
+@profiled_parser('stream_aunit_response')
+def stream_aunit_response(aunit_results, on_program):
+    """Parses XML results and passes every program to on_program as soon as
+       it is complete. Returns the handler with run alerts and the coverage
+       identifier.
+
+       The results are either the XML document or a file-like object
+       (e.g. sap.http.response_stream()) which is read incrementally.
+    """
+
+    xml_handler = AUnitResponseHandler(on_program=on_program)
+    if isinstance(aunit_results, (str, bytes)):
+        xml.sax.parseString(aunit_results, xml_handler)
+    else:
+        xml.sax.parse(aunit_results, xml_handler)
+
+    return xml_handler
@@ -2,7 +2,7 @@
 
 import base64
 from fnmatch import fnmatch
-from typing import Optional
+from typing import List, NamedTuple, Optional
 
 from sap.errors import SAPCliError
 from sap.adt.objects import ADTObjectType, XMLNamespace, xmlns_adtcore_ancestor
@@ -300,3 +300,107 @@ def run_object_check(adt_object, source, *, version='active', reporter='abapChec
 
     reports = run(adt_object.connection, Reporter(reporter), object_list)
     return CheckResult(reports)
+
+
+class ObjectListCheckResult(NamedTuple):
+    """Results of :func:`run_objects_check`.
+
+    ``results`` holds one :class:`CheckResult` per checked source and
+    ``unattributed`` the messages whose URI points to none of the objects.
+    """
+
+    results: List[CheckResult]
+    unattributed: CheckResult
+
+
+class ObjectListCheckFindings(SAPCliError):
+    """Raised when abapCheckRun reports error messages for candidate sources
+    of several objects checked by a single request.
+
+    Holds one :class:`ObjectCheckFindings` per object with errors and
+    the optional :class:`CheckResult` of messages which could not be
+    attributed to any of the objects.
+    """
+
+    def __init__(self, findings, unattributed=None):
+        super().__init__()
+        self.findings = list(findings)
+        self.unattributed = unattributed
+
+    def __str__(self):
+        lines = [str(findings) for findings in self.findings]
+
+        if self.unattributed is not None:
+            lines.extend(f'unattributed: {format_check_message(msg)}' for msg in self.unattributed.messages)
+
+        return '\n'.join(lines)
+
+
+def _find_message_owner(message_uri, object_uris):
+    """Returns the position of the longest object URI the message URI
+       starts with or None.
+    """
+
+    owner = None
+    owner_length = -1
+
+    for index, uri in enumerate(object_uris):
+        if not message_uri.startswith(uri) or len(uri) <= owner_length:
+            continue
+
+        if message_uri[len(uri):len(uri) + 1] not in ('', '/', '#', '?'):
+            continue
+
+        owner = index
+        owner_length = len(uri)
+
+    return owner
+
+
+def run_objects_check(connection, sources, *, version='active', reporter='abapCheckRun'):
+    """Runs ``abapCheckRun`` against candidate sources of several ADT objects
+    by a single request.
+
+    ``sources`` is a list of tuples (ADT object, source). Returns
+    :class:`ObjectListCheckResult` with the list of :class:`CheckResult`
+    in the order of ``sources`` where every result holds the messages whose
+    URI points into the checked source or into the object; messages
+    pointing to none of the objects are collected in ``unattributed``.
+    """
+
+    unattributed = CheckReport()
+    unattributed.reporter = reporter
+
+    if not sources:
+        return ObjectListCheckResult([], CheckResult([unattributed]))
+
+    object_list = CheckObjectList()
+    source_uris = []
+    for adt_object, source in sources:
+        object_list.add_object_with_source(adt_object, source, version=version)
+        source_uris.append(adt_object.full_adt_uri + adt_object.objtype.get_uri_for_type('text/plain'))
+
+    # includes of classes have the URI of the class
+    object_uris = [adt_object.full_adt_uri for adt_object, _ in sources]
+
+    object_reports = []
+    for _ in sources:
+        report = CheckReport()
+        report.reporter = reporter
+        object_reports.append(report)
+
+    for report in run(connection, Reporter(reporter), object_list):
+        if report.messages is None:
+            continue
+
+        for message in report.messages:
+            owner = _find_message_owner(message.uri or '', source_uris)
+            if owner is None:
+                owner = _find_message_owner(message.uri or '', object_uris)
+
+            if owner is None:
+                unattributed.messages.append(message)
+            else:
+                object_reports[owner].messages.append(message)
+
+    return ObjectListCheckResult([CheckResult([report]) for report in object_reports], CheckResult([unattributed]))
@@ -1,10 +1,12 @@
 """Base ADT functionality module"""
 
+import copy
 import xml.sax
 from xml.sax.handler import ContentHandler
 
 import sap.http
 from sap import get_logger
+from sap.profiling import profiled_parser
 from sap.adt.errors import new_adt_error_from_xml, ADTConnectionError
 from sap.http import (
     HTTPRequestError,
@@ -59,6 +61,7 @@ class _DiscoveryHandler(ContentHandler):
             self._accept = None
 
 
+@profiled_parser('_get_collection_accepts')
 def _get_collection_accepts(discovery_xml):
     """Transform the following XML excerpt:
         <app:service>
@@ -105,7 +108,7 @@ class Connection:
 
     # pylint: disable=too-many-arguments
     def __init__(self, host, client, user, password, port=None, ssl=True, verify=True, ssl_server_cert=None,
-                 session_initializer=None):
+                 session_initializer=None, discovery_cache=None, session_cache=None):
         """Parameters:
             - host: string host name
             - client: string SAP client
@@ -118,6 +121,11 @@ class Connection:
             - ssl_server_cert: optional path to a custom CA certificate file
             - session_initializer: optional HTTPSessionInitializer; when None,
                     BasicAuth with the given user/password is used
+            - discovery_cache: optional sap.adt.discovery_cache.DiscoveryCache;
+                    when None, the discovery document is downloaded for
+                    every new session
+            - session_cache: optional sap.http.session_cache.SessionCache;
+                    when None, every new session logs in
         """
 
         sap.http.setup_keepalive()
@@ -141,6 +149,7 @@ class Connection:
             login_path=f'{self._base_adt_path}/core/discovery',
             login_method='GET',
             session_initializer=session_initializer,
+            session_cache=session_cache,
         )
 
         self._http_client.add_error_handler(_adt_http_error_handler)
@@ -148,18 +157,61 @@ class Connection:
 
         self._session = None
         self._collection_types = None
+        self._discovery_cache = discovery_cache
+
+    def close(self):
+        """Closes the HTTP session; the next request starts a new one."""
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def new_session(self):
         """Start new HTTP session."""
 
         self._session = None
 
+    def clone(self):
+        """Returns a new connection to the same system which builds
+           its own HTTP session (cookies + CSRF token) on the first request.
+
+           Use a clone per thread when sending requests concurrently
+           because requests.Session is not thread safe.
+        """
+
+        cloned = copy.copy(self)
+        # pylint: disable=protected-access
+        cloned._http_client = copy.copy(self._http_client)
+        # Concurrent clones would overwrite the cached session of each other
+        cloned._http_client._session_cache = None
+        cloned._session = None
+
+        return cloned
+
     @property
     def user(self):
         """Connected user"""
 
         return self._http_client.user
 
+    @property
+    def host(self):
+        """Connected host"""
+
+        return self._http_client.host
+
+    @property
+    def port(self):
+        """Connected port"""
+
+        return self._http_client.port
+
+    @property
+    def client(self):
+        """Connected SAP client"""
+
+        return self._http_client.client
+
     @property
     def uri(self):
         """ADT path for building URLs (e.g. sap/bc/adt)"""
@@ -198,16 +250,41 @@ class Connection:
                 # try to build session with /sap/bc/adt/discovery endpoint
                 self._session, response = self._http_client.build_session()
 
-            if response is None:
-                response = self._http_client.execute_with_session(self._session, 'GET', self._build_adt_url('discovery'))
+            cached = self._get_cached_collection_types() if response is None else None
 
-            self._collection_types = _get_collection_accepts(response.text)
+            if cached is not None:
+                self._collection_types = cached
+            else:
+                if response is None:
+                    response = self._http_client.execute_with_session(self._session, 'GET',
+                                                                      self._build_adt_url('discovery'))
+
+                self._collection_types = _get_collection_accepts(response.text)
+                self._cache_collection_types()
 
         return self._session
 
-    def execute(self, method, adt_uri, params=None, headers=None, body=None, accept=None, content_type=None, complete_url=False):
+    def _get_cached_collection_types(self):
+        if self._discovery_cache is None:
+            return None
+
+        client = self._http_client
+        return self._discovery_cache.get(client.host, client.port, client.client)
+
+    def _cache_collection_types(self):
+        if self._discovery_cache is None:
+            return
+
+        client = self._http_client
+        self._discovery_cache.set(client.host, client.port, client.client, self._collection_types)
+
+    def execute(self, method, adt_uri, params=None, headers=None, body=None, accept=None, content_type=None,
+                complete_url=False, stream=False):
         """Executes the given ADT URI as an HTTP request and returns
            the requests response object
+
+           If stream is True, the response body is not read in advance
+           and can be parsed via sap.http.response_stream().
         """
 
         session = self._get_session()
@@ -232,7 +309,8 @@ class Connection:
         if not headers:
             headers = None
 
-        resp = self._http_client.execute_with_session(session, method, url, params=params, headers=headers, body=body)
+        resp = self._http_client.execute_with_session(session, method, url, params=params, headers=headers, body=body,
+                                                      stream=stream)
 
         if accept:
             resp_content_type = resp.headers['Content-Type']
@@ -2,6 +2,7 @@
 
 import re
 import xml.sax
+from urllib.parse import unquote
 from xml.sax.handler import ContentHandler
 from xml.sax.saxutils import escape
 
@@ -10,6 +11,7 @@ from typing import NamedTuple, Any, List, Optional, Tuple
 from sap import get_logger
 from sap.errors import SAPCliError
 from sap.adt.core import mod_log
+from sap.adt.search import ADTSearch
 
 
 class TransportTypes():
@@ -628,3 +630,88 @@ class Workbench:
                 return trns
 
         return None
+
+
+# LIMU sub-objects transported as parts of classes
+CLASS_PART_TYPES = {'CPUB', 'CPRO', 'CPRI', 'CLSD', 'CDEF', 'CINC', 'METH'}
+
+# LIMU sub-objects transported as parts of programs or function groups
+REPORT_PART_TYPES = {'REPS', 'REPT'}
+
+# Function group main programs are SAPL<group> and includes L<group><3 characters>
+FUNCTION_GROUP_PROGRAM_RE = re.compile(r'^(?P<namespace>/[^/]+/)?(?:SAPL(?P<main>.+)|L(?P<include>.+).{3})$')
+
+FUNCTION_GROUP_URI_RE = re.compile(r'/functions/groups/([^/?#]+)')
+
+
+def _function_group_of_module(connection, name: str) -> Optional[str]:
+    results = ADTSearch(connection).quick_search(name, max_results=10)
+
+    for ref in results.references:
+        if (ref.name or '').upper() != name.upper():
+            continue
+
+        match = FUNCTION_GROUP_URI_RE.search(ref.uri or '')
+        if match is not None:
+            return unquote(match.group(1)).upper()
+
+    return None
+
+
+def _owner(abap_object: WorkbenchABAPObject, typ: str, name: str, wbtype: str) -> WorkbenchABAPObject:
+    return WorkbenchABAPObject('R3TR', typ, name, wbtype, abap_object.description, abap_object.locked,
+                               abap_object.position)
+
+
+def _class_part_owner(_, abap_object: WorkbenchABAPObject) -> Optional[WorkbenchABAPObject]:
+    # METH: class name padded to 30 characters + method name
+    # CINC: class name padded by '=' to 30 characters + include suffix
+    return _owner(abap_object, 'CLAS', abap_object.name.upper()[:30].split()[0].rstrip('='), 'CLAS/OC')
+
+
+def _function_module_owner(connection, abap_object: WorkbenchABAPObject) -> Optional[WorkbenchABAPObject]:
+    group = _function_group_of_module(connection, abap_object.name.upper())
+    if group is None:
+        mod_log().info('Function group of the function module not found: %s', abap_object.name)
+        return None
+
+    return _owner(abap_object, 'FUGR', group, 'FUGR/F')
+
+
+def _report_source_owner(_, abap_object: WorkbenchABAPObject) -> Optional[WorkbenchABAPObject]:
+    name = abap_object.name.upper()
+
+    if not abap_object.wbtype.startswith('FUGR'):
+        return _owner(abap_object, 'PROG', name, abap_object.wbtype or 'PROG/P')
+
+    match = FUNCTION_GROUP_PROGRAM_RE.match(name)
+    if match is None:
+        return None
+
+    group = (match.group('namespace') or '') + (match.group('main') or match.group('include'))
+    return _owner(abap_object, 'FUGR', group, 'FUGR/F')
+
+
+def resolve_owner_object(connection, abap_object: WorkbenchABAPObject) -> Optional[WorkbenchABAPObject]:
+    """Returns the R3TR object the transported object belongs to - the object
+       itself for R3TR objects, the class for methods and class includes,
+       the function group for function modules and function group includes
+       and the program for report sources - or None if the owner is unknown.
+    """
+
+    if abap_object.pgmid == 'R3TR':
+        return abap_object
+
+    if abap_object.pgmid != 'LIMU':
+        return None
+
+    if abap_object.type in CLASS_PART_TYPES:
+        resolver = _class_part_owner
+    elif abap_object.type == 'FUNC':
+        resolver = _function_module_owner
+    elif abap_object.type in REPORT_PART_TYPES:
+        resolver = _report_source_owner
+    else:
+        return None
+
+    return resolver(connection, abap_object)
@@ -1,9 +1,11 @@
 """ADT SQL Console wrappers"""
 
+import logging
 import xml.sax
 from xml.sax.handler import ContentHandler
 
 from sap import get_logger
+from sap.profiling import profiled_parser
 
 
 def mod_log():
@@ -28,6 +30,8 @@ class FreeStyleTableXMLHandler(ContentHandler):
         self._cntr = 0
         self._total_rows = 0
         self._rows = rows
+        # called for every cell - do not even call the logger if not needed
+        self._debug = mod_log().isEnabledFor(logging.DEBUG)
 
     def _initrows(self, content):
         self.table = []
@@ -47,7 +51,8 @@ class FreeStyleTableXMLHandler(ContentHandler):
         return extra_row
 
     def startElement(self, name, attrs):
-        mod_log().debug('XML: %s', name)
+        if self._debug:
+            mod_log().debug('XML: %s', name)
         if name == 'dataPreview:totalRows':
             self._datahandler = self._initrows
         elif name == 'dataPreview:columns':
@@ -66,11 +71,13 @@ class FreeStyleTableXMLHandler(ContentHandler):
                 self._row = self._grow_table_by_one_row()
 
     def characters(self, content):
-        mod_log().debug('XML: data: %s', content)
+        if self._debug:
+            mod_log().debug('XML: data: %s', content)
         self._datahandler(content)
 
     def endElement(self, name):
-        mod_log().debug('XML: %s: CLOSING', name)
+        if self._debug:
+            mod_log().debug('XML: %s: CLOSING', name)
         if name == 'dataPreview:totalRows':
             self._datahandler = lambda x: x
         elif name == 'dataPreview:columns':
@@ -89,6 +96,7 @@ class FreeStyleTableXMLHandler(ContentHandler):
                         row[column] = ''
 
 
+@profiled_parser('parse_freestyle_table')
 def parse_freestyle_table(freestyle_table_xml, rows):
     """Converts XML results into Python representation"""
 
@@ -0,0 +1,140 @@
+"""File-backed cache of ADT discovery documents.
+
+Every ADT connection downloads and parses the whole /sap/bc/adt/discovery
+document (hundreds of KB) only to learn which MIME types the system accepts
+for object collections. The result changes only with system upgrades, so it
+is cached per system (host, port, client) in the per-user cache directory
+via the JSONFileStore primitive and refreshed when older than TTL seconds.
+
+The cache cannot tell that the system has been upgraded in the meantime,
+hence it is opt-in (SAPCLI_DISCOVERY_CACHE_TTL > 0) and the TTL should not
+exceed the interval between upgrades of the cached systems.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sap import get_logger
+from sap.config import config_get
+from sap.http.json_store import JSONFileStore, _default_cache_dir
+
+
+@dataclass(frozen=True)
+class CachedDiscovery:
+    """Collection types parsed from the discovery document and the time of download"""
+
+    collection_types: Dict[str, List[str]]
+    stored_at: float
+
+    def is_expired(self, ttl: float, now: Optional[float] = None) -> bool:
+        """True if the entry is older than ttl seconds"""
+
+        if now is None:
+            now = time.time()
+
+        return now - self.stored_at > ttl
+
+    def to_json(self) -> str:
+        """Serialize to a JSON string"""
+
+        return json.dumps({'collection_types': self.collection_types, 'stored_at': self.stored_at})
+
+    @classmethod
+    def from_json(cls, raw: str) -> CachedDiscovery:
+        """Deserialize from a JSON string"""
+
+        data = json.loads(raw)
+        collection_types = data['collection_types']
+        if not isinstance(collection_types, dict):
+            raise TypeError('collection_types is not a mapping')
+
+        return cls(collection_types=collection_types, stored_at=float(data['stored_at']))
+
+
+class DiscoveryFileStore(JSONFileStore[CachedDiscovery]):
+    """File-backed cache of discovery documents under ``<cache_dir>/adt_discovery/``."""
+
+    def __init__(self, base_dir: Optional[Path] = None) -> None:
+        super().__init__(base_dir or _default_cache_dir(), 'adt_discovery')
+
+    def _serialize(self, value: CachedDiscovery) -> str:
+        return value.to_json()
+
+    def _deserialize(self, raw: str) -> CachedDiscovery:
+        return CachedDiscovery.from_json(raw)
+
+
+def cache_key_for(host: str, port: str, client: str) -> str:
+    """Build the cache key for a (host, port, client) tuple"""
+
+    raw = json.dumps([host, str(port), client], separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class DiscoveryCache:
+    """Cached collection types with expiration.
+
+    The store is created on the first access to avoid touching the file
+    system for commands which never open an ADT session. Cache failures
+    are logged and ignored - the worst consequence is a download.
+    """
+
+    def __init__(self, ttl: float, store: Optional[JSONFileStore[CachedDiscovery]] = None) -> None:
+        self._ttl = ttl
+        self._store = store
+
+    @property
+    def ttl(self) -> float:
+        """Maximum age of cached entries in seconds"""
+
+        return self._ttl
+
+    def _get_store(self) -> JSONFileStore[CachedDiscovery]:
+        if self._store is None:
+            self._store = DiscoveryFileStore()
+
+        return self._store
+
+    def get(self, host: str, port: str, client: str) -> Optional[Dict[str, List[str]]]:
+        """Returns the cached collection types or None if missing or expired"""
+
+        try:
+            cached = self._get_store().get(cache_key_for(host, port, client))
+        except OSError as ex:
+            get_logger().info('Cannot read ADT discovery cache: %s', ex)
+            return None
+
+        if cached is None:
+            return None
+
+        if cached.is_expired(self._ttl):
+            get_logger().debug('ADT discovery cache expired: %s:%s/%s', host, port, client)
+            return None
+
+        get_logger().debug('Using cached ADT discovery: %s:%s/%s', host, port, client)
+        return cached.collection_types
+
+    def set(self, host: str, port: str, client: str, collection_types: Dict[str, List[str]]) -> None:
+        """Stores the collection types"""
+
+        try:
+            self._get_store().set(cache_key_for(host, port, client),
+                                  CachedDiscovery(collection_types=collection_types, stored_at=time.time()))
+        except OSError as ex:
+            get_logger().info('Cannot write ADT discovery cache: %s', ex)
+
+
+def get_discovery_cache() -> Optional[DiscoveryCache]:
+    """Return the configured discovery cache or None if disabled"""
+
+    ttl = config_get('discovery_cache_ttl')
+    if ttl <= 0:
+        return None
+
+    return DiscoveryCache(ttl)
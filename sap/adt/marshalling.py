@@ -1,6 +1,10 @@
 """Convert Python Objects to ADT XML entities"""
 
-from functools import partial
+import io
+import logging
+from functools import partial, lru_cache
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple
 
 import xml.sax
 from xml.sax.handler import ContentHandler
@@ -8,9 +12,13 @@ from xml.sax.saxutils import escape, quoteattr
 
 from sap import get_logger
 from sap.errors import FatalError
+from sap.profiling import profiled_parser
 from sap.adt.annotations import XmlAttributeProperty, XmlElementProperty, XmlElementKind, XmlTextProperty
 
 
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
 def _attr_supports_version(attr, version):
     if version is None and attr.version is not None:
         raise RuntimeError(f'The XML item {attr.name} specifies but its parent class does not')
@@ -39,77 +47,98 @@ class MarshallingError(FatalError):
     pass
 
 
-class Element:
-    """XML element representation"""
+def adt_object_to_element_name(adt_object):
+    """Returns XML element name for the given adt_object"""
 
-    def __init__(self, name):
-        self._name = name
-        self._text = None
-        self._children = []
-        self._attributes = {}
+    objtype = adt_object.objtype
+    return f'{objtype.xmlnamespace.name}:{objtype.xmlname}'
 
-    @property
-    def name(self):
-        """Element name"""
 
-        return self._name
+def factory_with_setter(factory, setter, obj):
+    """Creates a new product, calls the setter and returns the product"""
 
-    @property
-    def children(self):
-        """Child elements"""
+    product = factory()
+    setter(obj, product)
+    return product
 
-        return self._children
 
-    @property
-    def attributes(self):
-        """Element attributes"""
+class DeserializationPlan(NamedTuple):
+    """Deserializable XML members of a class"""
 
-        return self._attributes
+    attributes: Mapping[str, XmlAttributeProperty]
+    elements: Tuple[XmlElementProperty, ...]
+    textproperty: Optional[XmlTextProperty]
+    textproperty_name: Optional[str]
 
-    @property
-    def text(self):
-        """Element text"""
 
-        return self._text
+@lru_cache(maxsize=None)
+def deserialization_plan(cls):
+    """Examines annotations of the class once and returns its DeserializationPlan"""
 
-    @text.setter
-    def text(self, value):
-        """Sets Element text"""
+    attributes = {}
+    elements = []
+    textproperty = None
+    textproperty_name = None
 
-        if self._children:
-            raise MarshallingError(f'Cannot set text the text element "{self._name}" with children')
+    for attr_name in cls.__ordered__:
+        if attr_name.startswith('__'):
+            continue
 
-        self._text = value
+        attr = getattr(cls, attr_name)
 
-    def add_child(self, name):
-        """Adds a new child element and return it"""
+        if isinstance(attr, XmlElementProperty):
+            if not attr.deserialize:
+                get_logger().debug('Found readonly XML element property: %s', attr_name)
+                continue
 
-        if self._text is not None:
-            raise MarshallingError(f'Cannot add the child "{name}" the text element "{self._name}"')
+            get_logger().debug('Found XML element property: %s -> %s', attr_name, attr.name)
+            elements.append(attr)
+        elif isinstance(attr, XmlAttributeProperty):
+            if not attr.deserialize:
+                get_logger().debug('Found readonly XML attribute property: %s -> %s', attr_name, attr.name)
+                continue
 
-        child = Element(name)
-        self._children.append(child)
-        return child
+            get_logger().debug('Found XML attribute property: %s -> %s', attr_name, attr.name)
+            attributes[attr.name] = attr
+        elif isinstance(attr, XmlTextProperty):
+            if not attr.deserialize:
+                get_logger().debug('Found readonly XML text property: %s -> %s', attr_name, attr.name)
+                continue
 
-    def add_attribute(self, name, value):
-        """Adds a new attribute or change the value"""
+            get_logger().debug('Found XML text property: %s -> %s', attr_name, attr.name)
+            if textproperty is not None:
+                raise MarshallingError(f'Only one xml_text property is allowed per class, '
+                                       f'found duplicate: {attr_name}')
+            textproperty = attr
+            textproperty_name = attr_name
 
-        self._attributes[name] = value
+    return DeserializationPlan(MappingProxyType(attributes), tuple(elements), textproperty, textproperty_name)
 
 
-def adt_object_to_element_name(adt_object):
-    """Returns XML element name for the given adt_object"""
+@lru_cache(maxsize=None)
+def serialization_plan(cls, version):
+    """Examines annotations of the class once and returns the XML members
+       supported by the schema version as tuples (attribute name, property)
+       in the order of declaration.
+    """
 
-    objtype = adt_object.objtype
-    return f'{objtype.xmlnamespace.name}:{objtype.xmlname}'
+    members = []
+    for attr_name in cls.__ordered__:
+        if attr_name.startswith('_'):
+            continue
 
+        attr = getattr(cls, attr_name)
 
-def factory_with_setter(factory, setter, obj):
-    """Creates a new product, calls the setter and returns the product"""
+        if not isinstance(attr, (XmlElementProperty, XmlAttributeProperty, XmlTextProperty)):
+            continue
 
-    product = factory()
-    setter(obj, product)
-    return product
+        if not _attr_supports_version(attr, version):
+            get_logger().debug('Skipping class attribute %s for not supported version %s', attr.name, version)
+            continue
+
+        members.append((attr_name, attr))
+
+    return tuple(members)
 
 
 # pylint: disable=too-many-instance-attributes
@@ -125,6 +154,9 @@ class ElementHandler:
         self._init_textproperty = textproperty
         self.textproperty = textproperty
         self._textvalue = None
+        # SAX events are hot paths - do not even call the logger
+        # if debug messages are not enabled.
+        self._debug = get_logger().isEnabledFor(logging.DEBUG)
 
     def new(self):
         """Returns a new object"""
@@ -143,34 +175,29 @@ class ElementHandler:
     def set(self, attr_name, value):
         """Sets object's property value"""
 
-        get_logger().debug('Going to set XML attribute property: %s', attr_name)
+        if self._debug:
+            get_logger().debug('Going to set XML attribute property: %s', attr_name)
 
         try:
             # pylint: disable=unnecessary-dunder-call
             self.attributes[attr_name].__set__(self.obj, value)
-            get_logger().debug('Set XML attribute property: %s', attr_name)
         except AttributeError as ex:
             get_logger().error('XML property %s: %s', attr_name, str(ex))
         except KeyError:
-            get_logger().debug('Not an XML attribute property: %s', attr_name)
+            if self._debug:
+                get_logger().debug('Not an XML attribute property: %s', attr_name)
 
     def clear_text(self):
         """Clear text value"""
 
-        get_logger().debug('Going to clear text')
-
         if self.textproperty is None:
-            get_logger().debug('Not a text property')
             return
 
         self._textvalue = ''
-        get_logger().debug('Set the text property to None')
 
     def append_text(self, chunk):
         """Appends text chunk"""
 
-        get_logger().debug('Going to append text')
-
         if self.textproperty is None:
             if not chunk.isspace():
                 # TODO: potentially programming error
@@ -180,79 +207,56 @@ class ElementHandler:
 
         self._textvalue += chunk
 
-        get_logger().debug('Set text to: %s', self._textvalue)
-
     def set_text(self):
         """Sets the text value"""
 
-        get_logger().debug('Going to set text')
-
         if self.textproperty is None:
             if self._textvalue is not None and not self._textvalue.isspace():
                 # TODO: potentially programming error
                 raise MarshallingError()
 
-            get_logger().debug('The property is not a text node')
             return
 
+        if self._debug:
+            get_logger().debug('Set text to: %s', self._textvalue)
+
         # pylint: disable=unnecessary-dunder-call
         self.textproperty.__set__(self.obj, self._textvalue)
 
     def load_definitions(self, obj):
-        """Examines annotations of the current object"""
-
-        attributes = {}
-        for attr_name in obj.__class__.__ordered__:
-            if attr_name.startswith('__'):
-                continue
-
-            attr = getattr(obj.__class__, attr_name)
-
-            if isinstance(attr, XmlElementProperty):
-                xml_path = f'{self.my_xpath}/{attr.name}'
+        """Registers handlers of child elements of the current object
+           and returns its XML attribute properties.
+        """
 
-                if not attr.deserialize:
-                    get_logger().debug('Found readonly XML element property: %s -> %s', attr_name, xml_path)
-                    continue
+        plan = deserialization_plan(obj.__class__)
 
-                if attr.kind == XmlElementKind.TEXT:
-                    get_logger().debug('Found Text XML element property: %s -> %s', attr_name, xml_path)
-                    self.elements[xml_path] = ElementHandler(xml_path,
-                                                             self.elements,
-                                                             factory=lambda: obj,
-                                                             textproperty=attr)
-                    continue
+        for attr in plan.elements:
+            xml_path = f'{self.my_xpath}/{attr.name}'
 
-                get_logger().debug('Found XML element property: %s -> %s', attr_name, xml_path)
+            if attr.kind == XmlElementKind.TEXT:
+                self.elements[xml_path] = ElementHandler(xml_path,
+                                                         self.elements,
+                                                         factory=lambda: obj,
+                                                         textproperty=attr)
+                continue
 
-                factory = attr.factory
+            factory = attr.factory
 
-                if factory is None:
-                    factory = partial(attr.__get__, obj)
+            if factory is None:
+                factory = partial(attr.__get__, obj)
 
-                if attr.fset is not None:
-                    factory = partial(factory_with_setter, factory, attr.__set__, obj)
+            if attr.fset is not None:
+                factory = partial(factory_with_setter, factory, attr.__set__, obj)
 
-                self.elements[xml_path] = ElementHandler(xml_path, self.elements, factory)
-            elif isinstance(attr, XmlAttributeProperty):
-                if not attr.deserialize:
-                    get_logger().debug('Found readonly XML attribute property: %s -> %s', attr_name, attr.name)
-                    continue
+            self.elements[xml_path] = ElementHandler(xml_path, self.elements, factory)
 
-                get_logger().debug('Found XML attribute property: %s -> %s', attr_name, attr.name)
-                attributes[attr.name] = attr
-            elif isinstance(attr, XmlTextProperty):
-                if not attr.deserialize:
-                    get_logger().debug('Found readonly XML text property: %s -> %s', attr_name, attr.name)
-                    continue
+        if plan.textproperty is not None:
+            if self.elements[self.my_xpath].textproperty is not None:
+                raise MarshallingError(f'Only one xml_text property is allowed per class, '
+                                       f'found duplicate: {plan.textproperty_name}')
+            self.elements[self.my_xpath].textproperty = plan.textproperty
 
-                get_logger().debug('Found XML text property: %s -> %s', attr_name, attr.name)
-                if self.elements[self.my_xpath].textproperty is not None:
-                    raise MarshallingError(f'Only one xml_text property is allowed per class, '
-                                           f'found duplicate: {attr_name}')
-                self.elements[self.my_xpath].textproperty = attr
-
-        return attributes
+        return plan.attributes
 
 
 class ADTObjectSAXHandler(ContentHandler):
@@ -265,25 +269,27 @@ class ADTObjectSAXHandler(ContentHandler):
         self.current = ''
         self.elements = elements
         self.handler = None
+        self._debug = get_logger().isEnabledFor(logging.DEBUG)
 
     def startElement(self, name, attrs):
         self.stack.append(self.current)
         self.current = f'{self.current}/{name}'
-        get_logger().debug('Encountered XML element: %s', self.current)
 
         try:
             self.handler = self.elements[self.current]
         except KeyError:
+            if self._debug:
+                get_logger().debug('Skipping XML element: %s', self.current)
             return
 
-        get_logger().debug('Deserializing element: %s', self.current)
+        if self._debug:
+            get_logger().debug('Deserializing element: %s', self.current)
 
         # this loads handlers for children elements!! /o\
         self.handler.new()
         self.handler.clear_text()
 
         for attr_name, value in attrs.items():
-            get_logger().debug('Encountered XML attribute: %s', attr_name)
             try:
                 self.handler.set(attr_name, value)
             except KeyError:
@@ -293,7 +299,6 @@ class ADTObjectSAXHandler(ContentHandler):
         if self.handler is None:
             return
 
-        get_logger().debug('Trying to set text for the current handler: "%s"', content)
         self.handler.append_text(content)
 
     def endElement(self, name):
@@ -313,10 +318,32 @@ class Marshal:
     def serialize(self, adt_object):
         """Serialized ADT Object"""
 
-        tree = self._object_to_tree(adt_object)
-        return self._tree_to_xml(tree)
+        stream = io.StringIO()
+        self.serialize_to_stream(adt_object, stream)
+        return stream.getvalue()
+
+    def serialize_to_stream(self, adt_object, stream):
+        """Writes serialized ADT Object to the given text stream.
+
+           The XML is written while walking the object members, hence no
+           intermediate tree of elements is built and the size of the
+           payload does not affect the cost of string concatenation.
+        """
+
+        objtype = adt_object.objtype
+
+        attributes = {}
+        declared_ns = self._declare_xmlns_attributes(attributes, objtype.xmlnamespace)
+
+        if objtype.code is not None:
+            attributes['adtcore:type'] = objtype.code
+
+        stream.write(XML_DECLARATION)
+        self._write_object(stream.write, adt_object_to_element_name(adt_object), adt_object, attributes,
+                           declared_ns)
 
     @staticmethod
+    @profiled_parser('Marshal.deserialize')
     def deserialize(xml_text, adt_object):
         """Loads XML and stores values in the given adt_object and
            for the convenience of use returns the given adt_object.
@@ -334,24 +361,9 @@ class Marshal:
 
         return adt_object
 
-    def _object_to_tree(self, adt_object):
-        """Create a DOM like representation of the given ADT object"""
-
-        objtype = adt_object.objtype
-        name = adt_object_to_element_name(adt_object)
-
-        root = Element(name)
-        declared_ns = self._declare_xmlns(root, objtype.xmlnamespace)
-
-        if objtype.code is not None:
-            root.add_attribute('adtcore:type', objtype.code)
-
-        self._build_tree(root, adt_object, declared_ns)
-        return root
-
-    def _declare_xmlns(self, root, xmlns, declared_ns=None):
-        """Adds the xmlns attribute if such a Namespace hasn't already been
-           declared any parent nodes.
+    def _declare_xmlns_attributes(self, attributes, xmlns, declared_ns=None):
+        """Adds the xmlns attribute to the dictionary of attributes if such
+           a Namespace hasn't already been declared any parent nodes.
 
            Returns set of all declared Namespaces.
         """
@@ -362,127 +374,112 @@ class Marshal:
             declared = set(declared_ns)
 
         if xmlns.name not in declared:
-            root.add_attribute(f'xmlns:{xmlns.name}', xmlns.uri)
+            attributes[f'xmlns:{xmlns.name}'] = xmlns.uri
             declared.add(xmlns.name)
 
         for parent_ns in xmlns.parents:
             if parent_ns.name in declared:
                 continue
 
-            root.add_attribute(f'xmlns:{parent_ns.name}', parent_ns.uri)
+            attributes[f'xmlns:{parent_ns.name}'] = parent_ns.uri
             declared.add(parent_ns.name)
 
         return declared
 
-    def _serialize_object_to_node(self, root, node_name, child, declared_ns, kind):
-
-        if not isinstance(child, list):
-            # Put a solo object to a list to simplify
-            # the algorithm below - this might be a bad idea.
-            child = [child]
-
-        for item in child:
-
-            new_ns = None
-            if hasattr(item, 'objtype'):
-                if hasattr(item.objtype, 'xmlnamespace'):
-                    new_ns = item.objtype.xmlnamespace
-
-            if node_name is XmlElementProperty.NAME_FROM_OBJECT:
-                child_name = adt_object_to_element_name(item)
-                child_elem = root.add_child(child_name)
-            else:
-                child_elem = root.add_child(node_name)
-
-            if new_ns is None:
-                child_ns = declared_ns
-            else:
-                child_ns = self._declare_xmlns(child_elem, new_ns, declared_ns)
-
-            if kind == XmlElementKind.OBJECT:
-                self._build_tree(child_elem, item, child_ns)
-            elif kind == XmlElementKind.TEXT:
-                child_elem.text = item
-            else:
-                raise MarshallingError()
+    def _collect_members(self, obj, attributes):
+        """Stores XML attributes of the object in the given dictionary and
+           returns the XML text and the list of child elements as tuples
+           (node name, child, kind).
+        """
 
-    # pylint: disable=too-many-branches
-    def _build_tree(self, root, obj, declared_ns):
-        """Convert ADT Object members to XML elements"""
+        text = None
+        elements = []
 
         if obj is None:
-            return
-
-        get_logger().debug('Building tree for %s (%s)', str(obj), root.name)
-        for attr_name in obj.__class__.__ordered__:
-            if attr_name.startswith('_'):
-                continue
-
-            attr = getattr(obj.__class__, attr_name)
+            return text, elements
 
+        for attr_name, attr in serialization_plan(obj.__class__, self.version):
             if isinstance(attr, XmlElementProperty):
-                if not _attr_supports_version(attr, self.version):
-                    get_logger().debug('Skipping class attribute %s for not supported version %s',
-                                       attr.name, self.version)
-                    continue
-
                 child = getattr(obj, attr_name)
-                if not _attr_element_content_serializable(attr, child):
-                    get_logger().debug('NOT Serializing Child Element %s (%s) because of its value',
-                                       attr.name, attr_name)
-                    continue
-
-                get_logger().debug('Serializing Child Element %s (%s)', attr.name, attr_name)
-                self._serialize_object_to_node(root, attr.name, child, declared_ns, attr.kind)
+                if _attr_element_content_serializable(attr, child):
+                    elements.append((attr.name, child, attr.kind))
             elif isinstance(attr, XmlAttributeProperty):
-                if not _attr_supports_version(attr, self.version):
-                    get_logger().debug('Skipping class attribute %s for not supported version %s',
-                                       attr.name, self.version)
-                    continue
-
                 value = getattr(obj, attr_name)
                 if value is not None:
-                    root.add_attribute(attr.name, value)
-            elif isinstance(attr, XmlTextProperty):
-                if not _attr_supports_version(attr, self.version):
-                    get_logger().debug('Skipping class attribute %s for not supported version %s',
-                                       attr.name, self.version)
-                    continue
-
+                    attributes[attr.name] = value
+            else:
                 value = getattr(obj, attr_name)
                 if value is not None:
-                    if root.text is not None:
+                    if text is not None:
                         raise MarshallingError(f'Only one xml_text property is allowed per class, '
                                                f'found duplicate: {attr_name}')
-                    root.text = value
+                    text = value
 
-    def _tree_to_xml(self, tree):
-        """Turn the given abstract XML tree to XML string"""
+        return text, elements
 
-        body = '<?xml version="1.0" encoding="UTF-8"?>\n'
+    @staticmethod
+    def _write_start_tag(write, name, attributes):
+        """Writes the opened start tag without the closing >"""
+
+        write(f'<{name}')
+        for key, value in attributes.items():
+            write(f' {key}={quoteattr(str(value))}')
 
-        return body + self._element_to_xml(tree)
+    # pylint: disable=too-many-arguments
+    def _write_object(self, write, name, obj, attributes, declared_ns):
+        """Writes the object as the XML element of the given name"""
 
-    def _element_to_xml(self, tree):
-        """ """
+        text, elements = self._collect_members(obj, attributes)
+        self._write_start_tag(write, name, attributes)
 
-        xml_str = f'<{tree.name}'
+        if text is not None:
+            if any(child or not isinstance(child, list) for _, child, _ in elements):
+                raise MarshallingError(f'Cannot set text the text element "{name}" with children')
 
-        attributes = ' '.join(f'{key}={quoteattr(str(value))}' for key, value in tree.attributes.items())
-        if attributes:
-            xml_str += f' {attributes}'
+            write(f'>{escape(text)}</{name}>')
+            return
 
-        content = tree.text
+        has_children = False
+        for node_name, child, kind in elements:
+            if not isinstance(child, list):
+                # Put a solo object to a list to simplify the loop.
+                child = [child]
 
-        if content is None and tree.children:
-            subnode = str('\n'.join((self._element_to_xml(child) for child in tree.children)))
-            content = f'\n{subnode}\n'
-        elif content is not None:
-            content = escape(content)
+            for item in child:
+                write('\n' if has_children else '>\n')
+                has_children = True
+                self._write_child(write, node_name, item, declared_ns, kind)
 
-        if content is not None:
-            xml_str += f'>{content}</{tree.name}>'
+        if has_children:
+            write(f'\n</{name}>')
         else:
-            xml_str += '/>'
+            write('/>')
+
+    # pylint: disable=too-many-arguments
+    def _write_child(self, write, node_name, item, declared_ns, kind):
+        """Writes a single item of an XML element property"""
+
+        new_ns = None
+        if hasattr(item, 'objtype'):
+            if hasattr(item.objtype, 'xmlnamespace'):
+                new_ns = item.objtype.xmlnamespace
 
-        return xml_str
+        if node_name is XmlElementProperty.NAME_FROM_OBJECT:
+            node_name = adt_object_to_element_name(item)
+
+        attributes = {}
+        if new_ns is None:
+            child_ns = declared_ns
+        else:
+            child_ns = self._declare_xmlns_attributes(attributes, new_ns, declared_ns)
+
+        if kind == XmlElementKind.OBJECT:
+            self._write_object(write, node_name, item, attributes, child_ns)
+        elif kind == XmlElementKind.TEXT:
+            self._write_start_tag(write, node_name, attributes)
+            if item is None:
+                write('/>')
+            else:
+                write(f'>{escape(item)}</{node_name}>')
+        else:
+            raise MarshallingError()
@@ -947,6 +947,32 @@ class ADTObjectSourceEditor(ADTObjectEditor):
         mod_log().debug("Write text response status: %i", resp.status_code)
 
 
+def normalize_source_text(text):
+    """Returns the source code without differences which are not relevant
+       for comparison - line endings, trailing white spaces and trailing
+       empty lines (ADTObjectSourceEditor.write drops the last new line).
+    """
+
+    lines = (line.rstrip() for line in text.replace('\r\n', '\n').split('\n'))
+    return '\n'.join(lines).rstrip('\n')
+
+
+def is_source_unchanged(adt_object, content):
+    """Returns True if the current (inactive or active) source code
+       of the object equals the given content after normalization.
+
+       The object's text is downloaded, so this costs one GET which is
+       considerably cheaper than lock, PUT and activation.
+    """
+
+    try:
+        current = adt_object.text
+    except sap.adt.errors.ExceptionResourceNotFound:
+        return False
+
+    return normalize_source_text(current) == normalize_source_text(content)
+
+
 class ADTObjectSourceEditorWithResponse(ADTObjectSourceEditor):
     """Source Code Editor evaluating response"""
 
@@ -1,6 +1,8 @@
 """ABAP Package (DEV/C) ADT functionality module"""
 
+import threading
 from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # pylint: disable=unused-import
 from sap.adt.objects import OrderedClassMembers
@@ -8,6 +10,7 @@ from sap.adt.objects import ADTObjectType, ADTObject, ADTCoreData
 from sap.adt.objects import xmlns_adtcore_ancestor
 from sap.adt.annotations import xml_attribute, xml_element
 from sap.adt.repository import Repository
+from sap.errors import SAPCliError
 
 
 class Reference(metaclass=OrderedClassMembers):
@@ -222,7 +225,95 @@ class Package(ADTObject):
         self._appcomp.name = name
 
 
-def walk(package, withdescr=False):
+def _indexed_step(step, withdescr):
+    """Converts the walk step with descriptions stored in the index to
+       the format requested by the caller.
+    """
+
+    if withdescr:
+        return step
+
+    subpackages, objects = step
+    return [subpkg.name for subpkg in subpackages], objects
+
+
+def _walk_step(repository, explored, withdescr, index):
+    if index is None:
+        return repository.walk_step(explored, withdescr=withdescr)
+
+    step = index.get(explored.name)
+    if step is None:
+        step = repository.walk_step(explored, withdescr=True)
+        index.set(explored.name, *step)
+
+    return _indexed_step(step, withdescr)
+
+
+# pylint: disable=too-many-locals
+def _walk_concurrently(package, withdescr, jobs, index):
+    """Explores packages on a pool of threads where every thread owns its
+       own clone of the connection and yields the packages in the same order
+       as the sequential walk.
+
+       Sub-packages are submitted when their parent package is yielded and
+       thus a consumer which stops iterating does not trigger exploration
+       of the sub-packages. The index is accessed only from the thread
+       iterating the walk.
+    """
+
+    local = threading.local()
+    clones = []
+    clones_lock = threading.Lock()
+
+    def walk_step(explored):
+        connection = getattr(local, 'connection', None)
+        if connection is None:
+            connection = package.connection.clone()
+            local.connection = connection
+
+            with clones_lock:
+                clones.append(connection)
+
+        return Repository(connection).walk_step(explored, withdescr=withdescr or index is not None)
+
+    def submit(explored):
+        if index is not None:
+            step = index.get(explored.name)
+            if step is not None:
+                indexed = Future()
+                indexed.set_result(step)
+                return (indexed, explored.name, False)
+
+        return (executor.submit(walk_step, explored), explored.name, index is not None)
+
+    executor = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        toexplore = deque(((submit(package), []), ))
+
+        while toexplore:
+            (explored, explored_name, store), path = toexplore.popleft()
+            step = explored.result()
+
+            if index is not None:
+                if store:
+                    index.set(explored_name, *step)
+
+                step = _indexed_step(step, withdescr)
+
+            subpackages, objects = step
+            yield (path, subpackages, objects)
+
+            for subpkg in subpackages:
+                name = subpkg.name if withdescr else subpkg
+                toexplore.append((submit(Package(package.connection, name)), path + [name]))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+        for clone in clones:
+            clone.close()
+
+
+def walk(package, withdescr=False, jobs=1, index=None):
     """Returns the same structure as python os.walk.
 
     Args:
@@ -230,6 +321,11 @@ def walk(package, withdescr=False):
         withdescr: If True, include descriptions and return subpackages as
             SimpleNamespace(typ, name, uri, description). If False, return
             subpackages as plain name strings.
+        jobs: Number of packages explored concurrently; every job uses its
+            own clone of the package's connection.
+        index: Optional sap.adt.package_index.PackageIndex; packages found
+            in the index are not explored on the server and explored packages
+            are stored in the index.
 
     Yields:
         Tuples of (path, subpackages, objects) where:
@@ -239,6 +335,13 @@ def walk(package, withdescr=False):
         - objects: List of SimpleNamespace(typ, name, uri, description).
     """
 
+    if jobs is None or jobs < 1:
+        raise SAPCliError(f'The number of jobs must be a positive integer: {jobs}')
+
+    if jobs > 1:
+        yield from _walk_concurrently(package, withdescr, jobs, index)
+        return
+
     repository = Repository(package.connection)
 
     # This is a queue of tuples (Package, list) where the list holds path of
@@ -247,7 +350,7 @@ def walk(package, withdescr=False):
 
     while toexplore:
         explored, path = toexplore.pop()
-        subpackages, objects = repository.walk_step(explored, withdescr=withdescr)
+        subpackages, objects = _walk_step(repository, explored, withdescr, index)
 
         if withdescr:
             toexplore.extendleft(((Package(package.connection, subpkg.name), path + [subpkg.name]) for subpkg in subpackages))
@@ -0,0 +1,198 @@
+"""Local index of ABAP package contents.
+
+Commands working with package trees explore every package by two
+repository/nodestructure requests. The index stores sub-packages and objects
+of explored packages in an SQLite database in the per-user cache directory,
+keyed by system (host, port, client) and package name, and sap.adt.package.walk
+reads entries younger than TTL seconds (SAPCLI_PACKAGE_INDEX_TTL, 0 disables
+reading the index) instead of asking the server.
+
+The command `sapcli package index refresh` re-explores a package tree
+regardless of the TTL. Index failures are logged and ignored - the worst
+consequence is a walk over the server.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterable, List, Optional, Tuple
+
+from sap import get_logger
+from sap.config import config_get
+from sap.errors import SAPCliError
+from sap.http.json_store import _default_cache_dir, _harden_file
+
+
+INDEX_FILE_NAME = 'package_index.sqlite'
+
+SCHEMA = '''CREATE TABLE IF NOT EXISTS package_steps (
+    system TEXT NOT NULL,
+    package TEXT NOT NULL,
+    subpackages TEXT NOT NULL,
+    objects TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (system, package)
+)'''
+
+WalkStep = Tuple[List[SimpleNamespace], List[SimpleNamespace]]
+
+
+def system_key(host: str, port: str, client: str) -> str:
+    """Build the index key of the system"""
+
+    return f'{host}:{port}/{client}'
+
+
+def _dump_items(items: List[SimpleNamespace]) -> str:
+    return json.dumps([vars(item) for item in items], separators=(',', ':'))
+
+
+def _load_items(raw: str) -> List[SimpleNamespace]:
+    return [SimpleNamespace(**item) for item in json.loads(raw)]
+
+
+class PackageIndex:
+    """Sub-packages and objects of packages of a single system.
+
+    Entries are walk steps with descriptions, i.e. the lists of
+    SimpleNamespace(typ, name, uri, description). The database is opened
+    on the first access to avoid touching the file system for commands
+    which never walk a package.
+    """
+
+    def __init__(self, system: str, ttl: float, path: Optional[Path] = None) -> None:
+        self._system = system
+        self._ttl = ttl
+        self._path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def system(self) -> str:
+        """Key of the indexed system"""
+
+        return self._system
+
+    @property
+    def ttl(self) -> float:
+        """Maximum age of used entries in seconds"""
+
+        return self._ttl
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self._path is None:
+                self._path = _default_cache_dir() / INDEX_FILE_NAME
+
+            self._db = sqlite3.connect(str(self._path))
+            with self._db:
+                self._db.execute(SCHEMA)
+
+            if str(self._path) != ':memory:':
+                _harden_file(self._path)
+
+        return self._db
+
+    def close(self) -> None:
+        """Closes the database"""
+
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get(self, package: str, now: Optional[float] = None) -> Optional[WalkStep]:
+        """Returns (subpackages, objects) of the package or None if missing
+           or expired.
+        """
+
+        try:
+            row = self._get_db().execute(
+                'SELECT subpackages, objects, stored_at FROM package_steps WHERE system = ? AND package = ?',
+                (self._system, package.upper())).fetchone()
+        except (sqlite3.Error, OSError) as ex:
+            get_logger().info('Cannot read package index: %s', ex)
+            return None
+
+        if row is None:
+            return None
+
+        if now is None:
+            now = time.time()
+
+        if now - row[2] > self._ttl:
+            return None
+
+        return (_load_items(row[0]), _load_items(row[1]))
+
+    def set(self, package: str, subpackages: List[SimpleNamespace], objects: List[SimpleNamespace]) -> None:
+        """Stores sub-packages and objects of the package"""
+
+        try:
+            db = self._get_db()
+            with db:
+                db.execute('INSERT OR REPLACE INTO package_steps VALUES (?, ?, ?, ?, ?)',
+                           (self._system, package.upper(), _dump_items(subpackages), _dump_items(objects),
+                            time.time()))
+        except (sqlite3.Error, OSError) as ex:
+            get_logger().info('Cannot write package index: %s', ex)
+
+    def forget_tree(self, package: str) -> int:
+        """Removes the package and all its indexed sub-packages regardless
+           of their age and returns the number of removed entries.
+        """
+
+        removed = 0
+        toremove = [package.upper()]
+
+        try:
+            db = self._get_db()
+            with db:
+                while toremove:
+                    name = toremove.pop()
+                    row = db.execute('SELECT subpackages FROM package_steps WHERE system = ? AND package = ?',
+                                     (self._system, name)).fetchone()
+                    if row is None:
+                        continue
+
+                    toremove.extend(subpkg.name.upper() for subpkg in _load_items(row[0]))
+                    db.execute('DELETE FROM package_steps WHERE system = ? AND package = ?', (self._system, name))
+                    removed += 1
+        except (sqlite3.Error, OSError) as ex:
+            raise SAPCliError(f'Cannot update package index: {ex}') from ex
+
+        return removed
+
+
+def open_package_index(connection) -> PackageIndex:
+    """Return the index of the connected system with the configured TTL"""
+
+    return PackageIndex(system_key(connection.host, connection.port, connection.client),
+                        config_get('package_index_ttl'))
+
+
+def get_package_index(connection) -> Optional[PackageIndex]:
+    """Return the index of the connected system or None if disabled"""
+
+    if config_get('package_index_ttl') <= 0:
+        return None
+
+    return open_package_index(connection)
+
+
+def forget_indexed_trees(connection, packages: Iterable[str]) -> None:
+    """Removes the package trees from the index of the connected system
+       if the index is enabled - call it after changing the packages.
+    """
+
+    index = get_package_index(connection)
+    if index is None:
+        return
+
+    try:
+        for package in packages:
+            index.forget_tree(package)
+    finally:
+        index.close()
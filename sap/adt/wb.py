@@ -14,6 +14,8 @@ from sap.adt.objects import ADT_OBJECT_VERSION_ACTIVE
 
 XMLNS_CHKL = XMLNamespace('chkl', 'http://www.sap.com/abapxml/checklis')
 
+DEFAULT_MASS_ACTIVATION_CHUNK_SIZE = 100
+
 
 class IOCEntryData(metaclass=OrderedClassMembers):
     """Inactive Object or Transport"""
@@ -333,6 +335,62 @@ def try_mass_activate(connection, references):
     return None
 
 
+def _bisect_mass_activate(connection, items, references):
+    results, _ = mass_activate(connection, ADTObjectReferences(references))
+
+    if not results.has_errors or len(items) == 1:
+        yield items, results
+        return
+
+    get_logger().info('Bisecting %d objects because of activation errors', len(items))
+
+    middle = len(items) // 2
+    yield from _bisect_mass_activate(connection, items[:middle], references[:middle])
+    yield from _bisect_mass_activate(connection, items[middle:], references[middle:])
+
+
+def _bisect_mass_activate_chunks(connection, items, references, chunk_size):
+    if chunk_size is None or chunk_size < 1:
+        raise SAPCliError(f'The chunk size must be a positive integer: {chunk_size}')
+
+    for start in range(0, len(items), chunk_size):
+        yield from _bisect_mass_activate(connection, items[start:start + chunk_size],
+                                         references[start:start + chunk_size])
+
+
+def bisect_mass_activate(connection, adt_objects, chunk_size=DEFAULT_MASS_ACTIVATION_CHUNK_SIZE):
+    """Activates the given objects in chunks of chunk_size objects where every
+       chunk is activated by a single request. If activation of a chunk
+       reports errors, the chunk is split in halves which are activated
+       separately until the objects with errors are isolated and the other
+       objects are activated.
+
+       Yields tuples (objects, results) where objects is the list of objects
+       activated by a single request in the order of the given objects and
+       results is CheckResults; results with errors belong always to a single
+       object. The next request is sent when the consumer asks for the next
+       tuple.
+    """
+
+    adt_objects = list(adt_objects)
+    references = ADTObjectReferences()
+    object_references = [references.add_object(adt_object) for adt_object in adt_objects]
+
+    yield from _bisect_mass_activate_chunks(connection, adt_objects, object_references, chunk_size)
+
+
+def bisect_mass_activate_references(connection, references, chunk_size=DEFAULT_MASS_ACTIVATION_CHUNK_SIZE):
+    """The same as bisect_mass_activate but for ADTObjectReferences.
+
+       Yields tuples (references, results) where references is the list of
+       ADTObjectReference activated by a single request.
+    """
+
+    object_references = list(references.references)
+
+    yield from _bisect_mass_activate_chunks(connection, object_references, object_references, chunk_size)
+
+
 def try_activate(adt_object):
     """Tries to activate the given object. In case of an error, returns the results.
     """
@@ -364,3 +422,20 @@ def fetch_inactive_objects(connection):
 
     resp = connection.execute('GET', 'activation/inactiveobjects')
     return Marshal.deserialize(resp.text, IOCList())
+
+
+def filter_inactive_objects(connection, adt_objects):
+    """Returns the objects which have an inactive version - i.e. the objects
+       themselves or their parts are listed in the user's inactive objects.
+    """
+
+    inactive_uris = set()
+    for entry in fetch_inactive_objects(connection).entries:
+        if entry.object is not None and entry.object.uri:
+            inactive_uris.add(entry.object.uri)
+
+    def _is_inactive(adt_object):
+        uri = adt_object.full_adt_uri
+        return any(inactive == uri or inactive.startswith(uri + '/') for inactive in inactive_uris)
+
+    return [adt_object for adt_object in adt_objects if _is_inactive(adt_object)]
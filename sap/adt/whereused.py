@@ -27,7 +27,12 @@ If you need to refine the searched scope:
     print(result.referenced_objects)
 """
 
+from typing import Dict, List, Optional
+
+from sap import get_logger
 from sap.adt.core import Connection
+from sap.adt.errors import ADTError
+from sap.http.errors import HTTPRequestError
 from sap.adt.objects import OrderedClassMembers, ADTObjectType, XMLNamespace
 from sap.adt.annotations import XmlNodeAttributeProperty, XmlNodeProperty, XmlContainer, \
     xml_text_node_property, xml_element
@@ -252,3 +257,52 @@ def where_used(connection: Connection, uri: str):
 
     scope_result = get_scope(connection, uri)
     return get_where_used(connection, uri, scope_result)
+
+
+def where_used_transitive(connection: Connection, uris: List[str], max_depth: int,
+                          cache: Optional[Dict[str, List[ReferencedObject]]] = None) -> List[ReferencedObject]:
+    """Returns typed objects using the objects of the given URIs directly or
+       through other found objects up to max_depth where-used levels. Every
+       object is returned only once, in the order of discovery.
+
+       Objects whose where-used search fails are skipped with a warning.
+
+       Parameters:
+        uris: full ADT URIs of the used objects
+        cache: where-used results by URI shared by several calls to avoid
+               repeated searches
+    """
+
+    if cache is None:
+        cache = {}
+
+    known = set(uris)
+    found = []
+    level = list(uris)
+
+    for _ in range(max_depth):
+        next_level = []
+
+        for uri in level:
+            if uri not in cache:
+                try:
+                    cache[uri] = list(where_used(connection, uri).referenced_objects)
+                except (ADTError, HTTPRequestError) as ex:
+                    get_logger().warning('Skipping where-used of %s: %s', uri, ex)
+                    cache[uri] = []
+
+            for ref_obj in cache[uri]:
+                # untyped entries are parts (e.g. includes) of typed objects
+                if ref_obj.adt_object is None or not ref_obj.adt_object.typ or ref_obj.uri in known:
+                    continue
+
+                known.add(ref_obj.uri)
+                found.append(ref_obj)
+                next_level.append(ref_obj.uri)
+
+        if not next_level:
+            break
+
+        level = next_level
+
+    return found
@@ -7,6 +7,7 @@ Dependency modules are lazy loaded to enable partial modular installation.
 
 
 import os
+import importlib
 from collections import namedtuple
 from functools import partial
 from types import SimpleNamespace
@@ -17,120 +18,32 @@ from sap.http.auth_plugin_cache import cache_key_for, get_response_store
 
 
 class CommandsCache:
-    """Cached of available commands"""
+    """Cache of instantiated command groups"""
 
-    adt = None
-    rfc = None
-    rest = None
-    odata = None
-    local = None
+    groups = {}
 
     @staticmethod
-    def commands():
-        """Returns list of available commands"""
-
-        import sap.cli.program
-        import sap.cli.include
-        import sap.cli.interface
-        import sap.cli.abapclass
-        import sap.cli.datadefinition
-        import sap.cli.metadatextension
-        import sap.cli.accesscontrol
-        import sap.cli.behaviordefinition
-        import sap.cli.function
-        import sap.cli.aunit
-        import sap.cli.atc
-        import sap.cli.datapreview
-        import sap.cli.package
-        import sap.cli.cts
-        import sap.cli.gcts
-        import sap.cli.checkout
-        import sap.cli.checkin
-        import sap.cli.activation
-        import sap.cli.adt
-        import sap.cli.abapgit
-        import sap.cli.bsp
-        import sap.cli.featuretoggle
-        import sap.cli.flp
-        import sap.cli.rap
-        import sap.cli.srvd
-        import sap.cli.srvb
-        import sap.cli.table
-        import sap.cli.badi
-        import sap.cli.structure
-        import sap.cli.dataelement
-        import sap.cli.domain
-        import sap.cli.authorizationfield
-        import sap.cli.abap
-        import sap.cli.transaction
-        import sap.cli.messageclass
-        import sap.cli.config
-
-        if CommandsCache.adt is None:
-            CommandsCache.adt = [
-                (adt_connection_from_args, sap.cli.program.CommandGroup()),
-                (adt_connection_from_args, sap.cli.include.CommandGroup()),
-                (adt_connection_from_args, sap.cli.interface.CommandGroup()),
-                (adt_connection_from_args, sap.cli.abapclass.CommandGroup()),
-                (adt_connection_from_args, sap.cli.datadefinition.CommandGroup()),
-                (adt_connection_from_args, sap.cli.metadatextension.CommandGroup()),
-                (adt_connection_from_args, sap.cli.accesscontrol.CommandGroup()),
-                (adt_connection_from_args, sap.cli.behaviordefinition.CommandGroup()),
-                (adt_connection_from_args, sap.cli.function.CommandGroupFunctionGroup()),
-                (adt_connection_from_args, sap.cli.function.CommandGroupFunctionModule()),
-                (adt_connection_from_args, sap.cli.aunit.CommandGroup()),
-                (adt_connection_from_args, sap.cli.atc.CommandGroup()),
-                (adt_connection_from_args, sap.cli.datapreview.CommandGroup()),
-                (adt_connection_from_args, sap.cli.package.CommandGroup()),
-                (adt_connection_from_args, sap.cli.cts.CommandGroup()),
-                (adt_connection_from_args, sap.cli.checkout.CommandGroup()),
-                (adt_connection_from_args, sap.cli.activation.CommandGroup()),
-                (adt_connection_from_args, sap.cli.adt.CommandGroup()),
-                (adt_connection_from_args, sap.cli.abapgit.CommandGroup()),
-                (adt_connection_from_args, sap.cli.rap.CommandGroup()),
-                (adt_connection_from_args, sap.cli.srvd.CommandGroup()),
-                (adt_connection_from_args, sap.cli.srvb.CommandGroup()),
-                (adt_connection_from_args, sap.cli.table.CommandGroup()),
-                (adt_connection_from_args, sap.cli.structure.CommandGroup()),
-                (adt_connection_from_args, sap.cli.dataelement.CommandGroup()),
-                (adt_connection_from_args, sap.cli.domain.CommandGroup()),
-                (adt_connection_from_args, sap.cli.authorizationfield.CommandGroup()),
-                (adt_connection_from_args, sap.cli.checkin.CommandGroup()),
-                (adt_connection_from_args, sap.cli.badi.CommandGroup()),
-                (adt_connection_from_args, sap.cli.featuretoggle.CommandGroup()),
-                (adt_connection_from_args, sap.cli.abap.CommandGroup()),
-                (adt_connection_from_args, sap.cli.transaction.CommandGroup()),
-                (adt_connection_from_args, sap.cli.messageclass.CommandGroup()),
-            ]
-
-        if CommandsCache.rest is None:
-            CommandsCache.rest = [
-                (gcts_connection_from_args, sap.cli.gcts.CommandGroup())
-            ]
-
-        if CommandsCache.rfc is None:
-            import sap.cli.startrfc
-            import sap.cli.strust
-            import sap.cli.user
-
-            CommandsCache.rfc = [
-                (rfc_connection_from_args, sap.cli.startrfc.CommandGroup()),
-                (rfc_connection_from_args, sap.cli.strust.CommandGroup()),
-                (rfc_connection_from_args, sap.cli.user.CommandGroup())
-            ]
-
-        if CommandsCache.odata is None:
-            CommandsCache.odata = [
-                (partial(odata_connection_from_args, 'UI5/ABAP_REPOSITORY_SRV'), sap.cli.bsp.CommandGroup()),
-                (partial(odata_connection_from_args, 'UI2/PAGE_BUILDER_CUST'), sap.cli.flp.CommandGroup())
-            ]
-
-        if CommandsCache.local is None:
-            CommandsCache.local = [
-                (no_connection, sap.cli.config.CommandGroup()),
-            ]
-
-        return CommandsCache.adt + CommandsCache.rest + CommandsCache.rfc + CommandsCache.odata + CommandsCache.local
+    def command(registration):
+        """Imports the module of the registered command and returns
+           the tuple (connection factory, command group).
+        """
+
+        group = CommandsCache.groups.get(registration.name)
+        if group is None:
+            module = importlib.import_module(registration.module)
+            group = getattr(module, registration.group)()
+            CommandsCache.groups[registration.name] = group
+
+        return (registration.connection, group)
+
+    @staticmethod
+    def commands(names=None):
+        """Returns list of available commands or only of those with
+           the given names.
+        """
+
+        return [CommandsCache.command(registration) for registration in COMMANDS
+                if names is None or registration.name in names]
 
 
 def adt_connection_from_args(args):
@@ -138,6 +51,8 @@ def adt_connection_from_args(args):
     """
 
     import sap.adt
+    import sap.adt.discovery_cache
+    import sap.http.session_cache
 
     # ADT's built-in login is GET on /sap/bc/adt/core/discovery (see
     # sap.adt.core.Connection); plugins use the same endpoint so the
@@ -152,7 +67,9 @@ def adt_connection_from_args(args):
         args.ashost, args.client, args.user, args.password,
         port=args.port, ssl=args.ssl, verify=args.verify,
         ssl_server_cert=args.ssl_server_cert,
-        session_initializer=session_initializer)
+        session_initializer=session_initializer,
+        discovery_cache=sap.adt.discovery_cache.get_discovery_cache(),
+        session_cache=sap.http.session_cache.get_session_cache('adt'))
 
 
 def _build_session_initializer(args, conn_type=None, conn_path=None):
@@ -289,6 +206,7 @@ def gcts_connection_from_args(args):
     """
 
     import sap.rest
+    import sap.http.session_cache
 
     # gCTS REST login lives at /sap/bc/cts_abapvcs/system. ABAP session
     # cookies are server-wide, so a plugin that authenticates here also
@@ -303,7 +221,8 @@ def gcts_connection_from_args(args):
     return sap.rest.Connection('sap/bc/cts_abapvcs', 'system', args.ashost, args.client,
                                args.user, args.password, port=args.port, ssl=args.ssl,
                                verify=args.verify, ssl_server_cert=args.ssl_server_cert,
-                               session_initializer=session_initializer)
+                               session_initializer=session_initializer,
+                               session_cache=sap.http.session_cache.get_session_cache('rest'))
 
 
 def odata_connection_from_args(service_name, args):
@@ -311,6 +230,7 @@ def odata_connection_from_args(service_name, args):
     """
 
     import sap.odata
+    import sap.http.session_cache
 
     session_initializer = _build_session_initializer(
         args,
@@ -321,7 +241,8 @@ def odata_connection_from_args(service_name, args):
     return sap.odata.Connection(service_name, args.ashost, args.port,
                                 args.client, args.user, args.password, args.ssl,
                                 args.verify, ssl_server_cert=args.ssl_server_cert,
-                                session_initializer=session_initializer)
+                                session_initializer=session_initializer,
+                                session_cache=sap.http.session_cache.get_session_cache('odata'))
 
 
 def no_connection(_args):
@@ -330,12 +251,75 @@ def no_connection(_args):
     return None
 
 
-def get_commands():
+CommandRegistration = namedtuple('CommandRegistration', ['name', 'module', 'group', 'connection'])
+
+# Top-level commands in the order of sapcli --help. The registry holds only
+# module names to let sapcli import just the module of the selected command.
+COMMANDS = (
+    CommandRegistration('program', 'sap.cli.program', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('include', 'sap.cli.include', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('interface', 'sap.cli.interface', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('class', 'sap.cli.abapclass', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('ddl', 'sap.cli.datadefinition', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('ddlx', 'sap.cli.metadatextension', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('dcl', 'sap.cli.accesscontrol', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('bdef', 'sap.cli.behaviordefinition', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('functiongroup', 'sap.cli.function', 'CommandGroupFunctionGroup', adt_connection_from_args),
+    CommandRegistration('functionmodule', 'sap.cli.function', 'CommandGroupFunctionModule',
+                        adt_connection_from_args),
+    CommandRegistration('aunit', 'sap.cli.aunit', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('atc', 'sap.cli.atc', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('datapreview', 'sap.cli.datapreview', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('package', 'sap.cli.package', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('cts', 'sap.cli.cts', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('checkout', 'sap.cli.checkout', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('activation', 'sap.cli.activation', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('adt', 'sap.cli.adt', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('abapgit', 'sap.cli.abapgit', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('rap', 'sap.cli.rap', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('srvd', 'sap.cli.srvd', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('srvb', 'sap.cli.srvb', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('table', 'sap.cli.table', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('structure', 'sap.cli.structure', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('dataelement', 'sap.cli.dataelement', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('domain', 'sap.cli.domain', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('authorizationfield', 'sap.cli.authorizationfield', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('checkin', 'sap.cli.checkin', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('badi', 'sap.cli.badi', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('featuretoggle', 'sap.cli.featuretoggle', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('abap', 'sap.cli.abap', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('transaction', 'sap.cli.transaction', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('messageclass', 'sap.cli.messageclass', 'CommandGroup', adt_connection_from_args),
+    CommandRegistration('gcts', 'sap.cli.gcts', 'CommandGroup', gcts_connection_from_args),
+    CommandRegistration('startrfc', 'sap.cli.startrfc', 'CommandGroup', rfc_connection_from_args),
+    CommandRegistration('strust', 'sap.cli.strust', 'CommandGroup', rfc_connection_from_args),
+    CommandRegistration('user', 'sap.cli.user', 'CommandGroup', rfc_connection_from_args),
+    CommandRegistration('bsp', 'sap.cli.bsp', 'CommandGroup',
+                        partial(odata_connection_from_args, 'UI5/ABAP_REPOSITORY_SRV')),
+    CommandRegistration('flp', 'sap.cli.flp', 'CommandGroup',
+                        partial(odata_connection_from_args, 'UI2/PAGE_BUILDER_CUST')),
+    CommandRegistration('config', 'sap.cli.config', 'CommandGroup', no_connection),
+)
+
+
+def command_names():
+    """Returns names of all top-level commands without importing them"""
+
+    return [registration.name for registration in COMMANDS]
+
+
+def get_commands(name=None):
     """Builds and returns a list of CLI commands where each item
        is a tuple converting the common CLI parameters to a connection object
        for the implemented command (ADT or RFC).
+
+       If the name of a registered command is given, only the module
+       of that command is imported and the list has a single item.
     """
 
+    if name is not None and name in command_names():
+        return CommandsCache.commands(names=(name,))
+
     return CommandsCache.commands()
 
 
@@ -12,9 +12,12 @@ from importlib.metadata import version, PackageNotFoundError
 
 import sap
 import sap.cli
+import sap.cli.core
+import sap.cli.helpers
 import sap.adt
 import sap.rfc
-from sap.config import ConfigFile
+import sap.profiling
+from sap.config import ConfigFile, config_get
 from sap.http import TimedOutRequestError as HttpTimedOutRequestError
 from sap.http.truststore_support import enable_system_cert_store, TruststoreNotAvailableError
 import sap.http.oauth
@@ -94,20 +97,16 @@ def _report_auth_cert_resolved_conflicts(arg_parser, args):
             ': a client certificate requires TLS')
 
 
-# pylint: disable=too-many-statements
-def parse_command_line(argv):
-    """Parses command line arguments"""
+def _add_global_arguments(arg_parser):
+    """Declares the options common to all commands"""
 
-    arg_parser = ArgumentParser(os.path.basename(argv[0]))
-    try:
-        sapcli_version = version('sapcli')
-    except PackageNotFoundError:
-        sapcli_version = 'unknown version'
-
-    arg_parser.add_argument('--version', action='version', version=f'%(prog)s {sapcli_version}')
     arg_parser.add_argument(
         '-v', '--verbose', dest='verbose_count', action='count', default=0,
         help='make verbose output')
+    arg_parser.add_argument(
+        '--profile', dest='profile', type=str, default=None,
+        help='Record timing and traffic of HTTP requests and XML parsing, print a summary '
+             'at exit and write a Chrome trace JSON to the given path. Env: SAPCLI_PROFILE')
     arg_parser.add_argument(
         '--config', dest='config', type=str, default=None,
         help='Path to configuration file (default: ~/.sapcli/config.yml)')
@@ -180,9 +179,73 @@ def parse_command_line(argv):
                             help="SAP Secure Login Client library (e.g. "
                                  "/Applications/Secure Login Client.app/Contents/MacOS/lib/libsapcrypto.dylib")
 
+
+class _CommandNameParser(ArgumentParser):
+    """Parser of the global options which does not exit on errors"""
+
+    def error(self, message):
+        raise ValueError(message)
+
+
+def find_command_name(argv):
+    """Returns the name of the selected top-level command or None if
+       the command line does not select any registered command.
+    """
+
+    name_parser = _CommandNameParser(os.path.basename(argv[0]), add_help=False)
+    _add_global_arguments(name_parser)
+
+    try:
+        _, rest = name_parser.parse_known_args(argv[1:])
+    except ValueError:
+        return None
+
+    name = next((arg for arg in rest if not arg.startswith('-')), None)
+    if name not in sap.cli.command_names():
+        return None
+
+    return name
+
+
+def _set_log_level(args):
+    """Sets the log level according to the verbosity options"""
+
+    # SAPCLI_LOG_LEVEL takes precedence over the command line
+    if os.environ.get('SAPCLI_LOG_LEVEL'):
+        return
+
+    loglevel = max(3 - args.verbose_count, 0) * 10
+    log.setLevel(loglevel)
+    logging.debug('Logging level: %i', loglevel)
+
+
+def _start_profiling(args):
+    """Enables profiling if requested on the command line or via environment"""
+
+    args.profile = args.profile or config_get('profile')
+    if args.profile:
+        sap.profiling.enable_profiling()
+
+
+# pylint: disable=too-many-statements
+def parse_command_line(argv):
+    """Parses command line arguments"""
+
+    arg_parser = ArgumentParser(os.path.basename(argv[0]))
+    try:
+        sapcli_version = version('sapcli')
+    except PackageNotFoundError:
+        sapcli_version = 'unknown version'
+
+    arg_parser.add_argument('--version', action='version', version=f'%(prog)s {sapcli_version}')
+
+    _add_global_arguments(arg_parser)
+
     subparsers = arg_parser.add_subparsers()
+    # Import only the module of the selected command, all commands are
+    # needed for the overall help and errors only.
     # pylint: disable=not-an-iterable
-    for connection, cmd in sap.cli.get_commands():
+    for connection, cmd in sap.cli.get_commands(find_command_name(argv)):
         cmd_args = subparsers.add_parser(cmd.name, help=cmd.description)
         cmd_args.set_defaults(command=cmd)
         cmd_args.set_defaults(connection_factory=connection)
@@ -191,9 +254,9 @@ def parse_command_line(argv):
 
     args = arg_parser.parse_args(argv[1:])
 
-    loglevel = max(3 - args.verbose_count, 0) * 10
-    log.setLevel(loglevel)
-    logging.debug('Logging level: %i', loglevel)
+    _set_log_level(args)
+
+    _start_profiling(args)
 
     if not hasattr(args, 'execute'):
         report_args_error_and_exit(
@@ -256,6 +319,39 @@ def parse_command_line(argv):
     return args
 
 
+def report_profile(profiler, path):
+    """Prints the summary of the profile to the error output and writes
+       the Chrome trace to the given path.
+    """
+
+    def _millis(seconds):
+        return f'{seconds * 1000:.1f}'
+
+    columns = (
+        sap.cli.helpers.TableWriter.Columns()
+        ('kind', 'Kind')
+        ('name', 'Name')
+        ('calls', 'Calls')
+        ('total', 'Total [ms]', _millis)
+        ('average', 'Avg [ms]', _millis)
+        ('longest', 'Max [ms]', _millis)
+        ('request_bytes', 'Sent [B]')
+        ('response_bytes', 'Received [B]')
+        ('document_bytes', 'Parsed [B]')
+        .done()
+    )
+
+    console = sap.cli.core.ConsoleErrorDecorator(sap.cli.core.get_console())
+    sap.cli.helpers.TableWriter(profiler.summary(), columns).printout(console)
+
+    try:
+        profiler.write_chrome_trace(path)
+    except OSError as ex:
+        log.error('Cannot write the profile %s: %s', path, ex)
+    else:
+        console.printout(f'Profile written to: {path}')
+
+
 def init_deprecation_warnings():
     """Register default filter for deprecation warning."""
 
@@ -269,6 +365,7 @@ def main(argv=None):
         argv = sys.argv
 
     retval = 1
+    args = None
     init_deprecation_warnings()
     try:
         args = parse_command_line(argv)
@@ -286,6 +383,11 @@ def main(argv=None):
         print(' ', str(ex), file=sys.stderr)
         log.debug('Execution of program has been terminated due to an error', exc_info=True)
     finally:
+        profiler = sap.profiling.disable_profiling()
+        # args are None if parsing of the command line exited
+        if profiler is not None and args is not None:
+            report_profile(profiler, args.profile)
+
         logging.shutdown()
 
     return retval
@@ -2,19 +2,27 @@
 import json
 import os
 import re
+import subprocess
 import sys
+from typing import NamedTuple
 
 from xml.sax.saxutils import escape, quoteattr
 
 import sap.adt
 import sap.adt.object_factory
 import sap.adt.atc
+import sap.adt.atc_baseline
+import sap.adt.cts
+import sap.adt.package
 import sap.cli.core
+import sap.cli.helpers
 from sap.cli.core import printout
+from sap import get_logger
 from sap.cli.helpers import raise_if_object_name_is_not_supported
 from sap.errors import SAPCliError
 
 CHECKSTYLE_VERSION = '8.36'
+DEFAULT_BATCH_CHUNK_SIZE = 50
 ERROR = 'error'
 WARNING = 'warning'
 INFO = 'info'
@@ -27,6 +35,12 @@ SEVERITY_MAPPING = {
 }
 
 
+def mod_log():
+    """ATC Module logger"""
+
+    return get_logger()
+
+
 class ProfileCommandGroup(sap.cli.core.CommandGroup):
     """ATC profile commands
     """
@@ -198,8 +212,278 @@ def customizing(connection, _):
     printout('System Check Variant:', settings.system_check_variant)
 
 
+def _run_worklist(connection, variant, objects, max_verdicts):
+    """Runs checks for all the objects in a single worklist and returns the worklist"""
+
+    checks = sap.adt.atc.ChecksRunner(connection, variant)
+    object_sets = sap.adt.objects.ADTObjectSets()
+    for obj in objects:
+        object_sets.include_object(obj)
+
+    return checks.run_for(object_sets, max_verdicts=max_verdicts).worklist
+
+
+def _run_batched(connection, variant, objects, args):
+    """Runs checks for chunks of the objects in worklists which run concurrently
+       and returns the worklists merged into one worklist.
+    """
+
+    if args.chunk_size < 1:
+        raise sap.cli.core.InvalidCommandLineError(f'The chunk size must be a positive integer: {args.chunk_size}')
+
+    chunks = [objects[start:start + args.chunk_size] for start in range(0, len(objects), args.chunk_size)]
+
+    def _run_chunk(chunk_connection, chunk):
+        return _run_worklist(chunk_connection, variant, chunk, args.max_verdicts)
+
+    with sap.cli.helpers.ConnectionWorkers(connection, args.jobs) as workers:
+        return sap.adt.atc.merge_worklists(workers.map(_run_chunk, chunks))
+
+
+class PackageObject(NamedTuple):
+    """An object of a package tree with the attributes of ADT objects
+       ATC object sets and the findings baseline need.
+    """
+
+    typ: str
+    name: str
+    uri: str
+    full_adt_uri: str
+
+
+def _object_key(obj):
+    if isinstance(obj, PackageObject):
+        return sap.adt.atc_baseline.object_key(obj.typ, obj.name)
+
+    return sap.adt.atc_baseline.object_key(obj.objtype.code, obj.name)
+
+
+def abapgit_file_object_keys(file_path):
+    """Returns the (TYPE, NAME) keys of the objects the abapGit file belongs
+       to - the object of the file and function modules or includes
+       of function groups.
+    """
+
+    parts = os.path.basename(file_path).split('.')
+    if len(parts) < 3 or not parts[0] or parts[1] == 'devc':
+        return set()
+
+    typ = parts[1].upper()
+    keys = {(typ, parts[0].replace('#', '/').upper())}
+    if typ == 'FUGR' and len(parts) == 4:
+        keys.add((typ, parts[2].replace('#', '/').upper()))
+
+    return keys
+
+
+def git_changed_object_keys(revision, directory):
+    """Returns the (TYPE, NAME) keys of the objects whose abapGit files
+       in the directory differ from the git revision.
+    """
+
+    try:
+        proc = subprocess.run(['git', 'diff', '--name-only', revision, '--', '.'], cwd=directory,
+                              capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as ex:
+        raise SAPCliError(f'Cannot list files changed since {revision}: {ex.stderr.strip()}') from ex
+    except OSError as ex:
+        raise SAPCliError(f'Cannot list files changed since {revision}: {ex}') from ex
+
+    keys = set()
+    for file_path in proc.stdout.splitlines():
+        keys.update(abapgit_file_object_keys(file_path))
+
+    return keys
+
+
+def transport_object_keys(connection, corrnr):
+    """Returns the (TYPE, NAME) keys of the objects of all tasks of
+       the transport where sub-objects are replaced by their owners
+       (e.g. methods by classes).
+    """
+
+    workbench = sap.adt.cts.Workbench(connection)
+    transport = workbench.fetch_transport_request(corrnr)
+
+    if transport is None:
+        raise SAPCliError(f'The transport was not found: {corrnr}')
+
+    keys = set()
+    for task in transport.tasks:
+        for abap_object in task.objects:
+            owner = sap.adt.cts.resolve_owner_object(connection, abap_object)
+            if owner is None:
+                mod_log().info('Skipping %s %s %s: unknown owner object',
+                               abap_object.pgmid, abap_object.type, abap_object.name)
+                continue
+
+            keys.add(sap.adt.atc_baseline.object_key(owner.type, owner.name))
+
+    return keys
+
+
+def _incremental(args):
+    return bool(args.baseline or args.changed_in_transport or args.changed_since_commit)
+
+
+def _expand_packages(connection, objects, args):
+    """Returns the list of lists of objects checked together where packages
+       are replaced by all objects of their package trees to check and compare
+       the objects one by one.
+    """
+
+    groups = []
+    for obj in objects:
+        if not isinstance(obj, sap.adt.Package):
+            groups.append([obj])
+            continue
+
+        members = []
+        for _, _, package_objects in sap.adt.package.walk(obj, jobs=args.jobs):
+            members.extend(PackageObject(member.typ, member.name,
+                                         member.uri[len(f'/{connection.uri}/'):], member.uri)
+                           for member in package_objects)
+
+        mod_log().info('Package %s has %d objects', obj.name, len(members))
+        groups.append(members)
+
+    return groups
+
+
+def _select_changed_objects(connection, groups, args):
+    """Returns the groups with the objects changed in the transport or since
+       the git revision or all the groups if no change source is given.
+    """
+
+    changed_keys = None
+
+    if args.changed_in_transport:
+        changed_keys = transport_object_keys(connection, args.changed_in_transport)
+
+    if args.changed_since_commit:
+        git_keys = git_changed_object_keys(args.changed_since_commit, args.repo_dir)
+        changed_keys = git_keys if changed_keys is None else changed_keys | git_keys
+
+    if changed_keys is None:
+        return groups
+
+    selected = []
+    for group in groups:
+        changed = []
+        for obj in group:
+            if _object_key(obj) in changed_keys:
+                changed.append(obj)
+            else:
+                mod_log().info('Object not changed: %s', obj.name)
+
+        if changed:
+            selected.append(changed)
+
+    if not selected:
+        raise SAPCliError('None of the checked objects has changed'
+                          ' - check the transport, the git revision and the object names')
+
+    return selected
+
+
+def _skip_unchanged_objects(connection, baseline, groups, args):
+    """Returns the list of CheckedObject of the objects which are going to be
+       checked and the groups of the objects. With --only-changed, objects whose
+       last-changed timestamp is the same as in the baseline are skipped.
+    """
+
+    objects = [obj for group in groups for obj in group]
+
+    if args.only_changed:
+        with sap.cli.helpers.ConnectionWorkers(connection, args.jobs) as workers:
+            timestamps = list(workers.map(sap.adt.atc_baseline.fetch_changed_at, objects))
+    else:
+        timestamps = [None] * len(objects)
+
+    changed_at = {id(obj): timestamp for obj, timestamp in zip(objects, timestamps)}
+
+    checked = []
+    selected = []
+    for group in groups:
+        changed = []
+        for obj in group:
+            checked_obj = sap.adt.atc_baseline.CheckedObject(*_object_key(obj), changed_at[id(obj)])
+            if args.only_changed and baseline.is_unchanged(checked_obj):
+                mod_log().info('Object unchanged since the baseline: %s', obj.name)
+                continue
+
+            checked.append(checked_obj)
+            changed.append(obj)
+
+        if changed:
+            selected.append(changed)
+
+    return checked, selected
+
+
+def _run_checks(connection, groups, args):
+    """Runs checks for the groups of objects and returns the list of worklists"""
+
+    if args.batch:
+        objects = [obj for group in groups for obj in group]
+        return [_run_batched(connection, args.variant, objects, args)] if objects else []
+
+    results = []
+    for group in groups:
+        checks = sap.adt.atc.ChecksRunner(connection, args.variant)
+        object_sets = sap.adt.objects.ADTObjectSets()
+        for obj in group:
+            object_sets.include_object(obj)
+        atcResult = checks.run_for(object_sets, max_verdicts=args.max_verdicts)
+        results.append(atcResult.worklist)
+
+    return results
+
+
+def _run_against_baseline(connection, groups, args):
+    """Runs checks for the objects which need to be checked and returns
+       the list with a single worklist holding only findings not in the baseline.
+    """
+
+    baseline = sap.adt.atc_baseline.open_findings_baseline(connection, args.baseline, args.variant)
+    try:
+        checked, groups = _skip_unchanged_objects(connection, baseline, groups, args)
+        results = _run_checks(connection, groups, args)
+
+        new_findings = baseline.new_findings(results)
+        if not args.keep_baseline:
+            baseline.update(checked, results)
+    finally:
+        baseline.close()
+
+    return [new_findings]
+
+
+@CommandGroup.argument('--repo-dir', default='.',
+                       help='With --changed-since-commit, directory of the abapGit repository; default == .')
+@CommandGroup.argument('--changed-since-commit', default=None, metavar='REVISION',
+                       help='Check only the objects whose abapGit files differ from the git revision')
+@CommandGroup.argument('--changed-in-transport', default=None, metavar='CORRNR',
+                       help='Check only the objects included in the transport')
+@CommandGroup.argument('--keep-baseline', default=False, action='store_true',
+                       help='With --baseline, do not store the findings of the checked objects in the baseline')
+@CommandGroup.argument('--only-changed', default=False, action='store_true',
+                       help='With --baseline, do not check objects whose last-changed timestamp'
+                            ' is the same as in the baseline')
+@CommandGroup.argument('--baseline', default=None, metavar='PATH',
+                       help='SQLite file of the findings baseline; only findings not in the baseline are reported')
+@CommandGroup.argument('-j', '--jobs', default=1, type=int,
+                       help='With --batch, number of worklists running concurrently; with --baseline or'
+                            ' --changed-*, also number of sub-packages explored and timestamps read concurrently'
+                            ' - every job uses its own HTTP session; default == 1')
+@CommandGroup.argument('--chunk-size', default=DEFAULT_BATCH_CHUNK_SIZE, type=int,
+                       help=f'With --batch, maximum number of objects in a single worklist;'
+                            f' default == {DEFAULT_BATCH_CHUNK_SIZE}')
+@CommandGroup.argument('--batch', default=False, action='store_true',
+                       help='Check all objects in a single worklist (or in a worklist per chunk)'
+                            ' instead of a worklist per object')
 @CommandGroup.argument('-m', '--max-verdicts', default=100, type=int,
-                       help='Maximum number of findings; default == 100')
+                       help='Maximum number of findings per worklist; default == 100')
 @CommandGroup.argument('-r', '--variant', default=None, type=str,
                        help='Executed Check Variant; default: the system variant')
 @CommandGroup.argument('-e', '--error-level', default=2, type=int,
@@ -220,6 +504,7 @@ def run(connection, args):
          - SAPCliError:
            - when the given type does not belong to the type white list
            - when severity_maping argument has invalid format
+           - when the findings baseline cannot be read or updated
     """
 
     printer_format_mapping = {
@@ -244,18 +529,23 @@ def run(connection, args):
             except (json.decoder.JSONDecodeError, TypeError) as ex:
                 raise SAPCliError('Severity mapping has incorrect format') from ex
 
+    if args.only_changed and not args.baseline:
+        raise sap.cli.core.InvalidCommandLineError('The option --only-changed requires --baseline')
+
     if args.variant is None:
         settings = sap.adt.atc.fetch_customizing(connection)
         args.variant = settings.system_check_variant
 
-    results = []
-    for objname in args.name:
-        checks = sap.adt.atc.ChecksRunner(connection, args.variant)
-        objects = sap.adt.objects.ADTObjectSets()
-        obj = obj_factory.make(args.type, objname)
-        objects.include_object(obj)
-        atcResult = checks.run_for(objects, max_verdicts=args.max_verdicts)
-        results.append(atcResult.worklist)
+    objects = [obj_factory.make(args.type, objname) for objname in args.name]
+    if _incremental(args):
+        groups = _select_changed_objects(connection, _expand_packages(connection, objects, args), args)
+    else:
+        groups = [[obj] for obj in objects]
+
+    if args.baseline:
+        results = _run_against_baseline(connection, groups, args)
+    else:
+        results = _run_checks(connection, groups, args)
 
     if args.output == 'checkstyle':
         result = printer(results, sys.stdout, error_level=args.error_level, severity_mapping=severity_mapping,
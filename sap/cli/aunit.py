@@ -1,13 +1,18 @@
+# pylint: disable=too-many-lines
 """ADT proxy for ABAP Unit"""
 
 import os
+import re
 from collections import defaultdict
+from contextlib import contextmanager
 from enum import Enum
 from functools import partial
+from fnmatch import fnmatchcase
+from urllib.parse import unquote, urlparse
 from xml.sax.saxutils import escape, quoteattr
 from itertools import islice
 from dataclasses import dataclass
-from typing import List
+from typing import List, NamedTuple
 
 import sap
 import sap.adt
@@ -17,7 +22,10 @@ import sap.adt.aunit
 import sap.adt.api.aunit
 import sap.adt.objects
 import sap.adt.cts
+import sap.adt.whereused
+import sap.http
 import sap.cli.core
+import sap.cli.helpers
 from sap.cli.core import (
     ConsoleErrorDecorator
 )
@@ -336,6 +344,45 @@ def print_junit4_testcase(xml_writer, test_class, method_name, alerts):
     return 0
 
 
+def print_junit4_program(xml_writer, program):
+    """Prints JUnit test suites of the program and returns number of errors"""
+
+    critical = 0
+
+    if program.alerts:
+        critical += print_junit4_testcase(xml_writer,
+                                          program.name,
+                                          program.name,
+                                          program.alerts)
+
+    for test_class in program.test_classes:
+        with xml_writer.element('testsuite',
+                                name=test_class.name,
+                                package=program.name,
+                                tests=str(len(test_class.test_methods))):
+
+            if test_class.alerts:
+                critical += print_junit4_testcase(xml_writer,
+                                                  test_class.name,
+                                                  test_class.name,
+                                                  test_class.alerts)
+
+            if not test_class.test_methods:
+                continue
+
+            tc_class_name = test_class.name
+            if program.name != test_class.name:
+                tc_class_name = f'{program.name}=>{test_class.name}'
+
+            for test_method in test_class.test_methods:
+                critical += print_junit4_testcase(xml_writer,
+                                                  tc_class_name,
+                                                  test_method.name,
+                                                  test_method.alerts)
+
+    return critical
+
+
 def print_aunit_junit4(run_results, args, console):
     """Print results to console in the form of JUnit"""
 
@@ -348,40 +395,33 @@ def print_aunit_junit4(run_results, args, console):
 
     with XMLWriter(console, 'testsuites', name=testsuite_name) as xml_writer:
         for program in run_results.programs:
-            if program.alerts:
-                critical += print_junit4_testcase(xml_writer,
-                                                  program.name,
-                                                  program.name,
-                                                  program.alerts)
-
-            for test_class in program.test_classes:
-                with xml_writer.element('testsuite',
-                                        name=test_class.name,
-                                        package=program.name,
-                                        tests=str(len(test_class.test_methods))):
-
-                    if test_class.alerts:
-                        critical += print_junit4_testcase(xml_writer,
-                                                          test_class.name,
-                                                          test_class.name,
-                                                          test_class.alerts)
-
-                    if not test_class.test_methods:
-                        continue
-
-                    tc_class_name = test_class.name
-                    if program.name != test_class.name:
-                        tc_class_name = f'{program.name}=>{test_class.name}'
-
-                    for test_method in test_class.test_methods:
-                        critical += print_junit4_testcase(xml_writer,
-                                                          tc_class_name,
-                                                          test_method.name,
-                                                          test_method.alerts)
+            critical += print_junit4_program(xml_writer, program)
 
     return critical
 
 
+def stream_aunit_junit4(aunit_xml, args, console):
+    """Print results to console in the form of JUnit while parsing them
+       and return the number of errors and the parsed response without
+       programs.
+    """
+
+    critical = 0
+
+    def _print_program(program):
+        nonlocal critical
+        critical += print_junit4_program(xml_writer, program)
+
+    with XMLWriter(console, 'testsuites', name="|".join(args.name)) as xml_writer:
+        aunit_parsed_response = sap.adt.aunit.stream_aunit_response(aunit_xml, _print_program)
+
+    # Alerts of the run are known only at the end of the document.
+    critical += print_aunit_human_alerts(ConsoleErrorDecorator(console),
+                                         aunit_parsed_response.run_results.alerts)
+
+    return critical, aunit_parsed_response
+
+
 def find_testclass(package, program, testclass, file_required=False):
     """Find the relative path of the test-class file"""
 
@@ -420,6 +460,63 @@ def print_sonar_alert(alert, console):
 
 
 # pylint: disable=too-many-branches
+def print_sonar_program(program, args, console):
+    """Prints Sonar test cases of the program and returns number of errors"""
+
+    critical = 0
+
+    if program.alerts:
+        console.printout(f'    <testCase name={quoteattr(program.name)} duration="0">')
+
+        for alert in program.alerts:
+            if alert.is_error:
+                critical += 1
+
+            print_sonar_alert(alert, console)
+
+        console.printout('    </testCase>')
+
+    for test_class in program.test_classes:
+        for requested_name in args.name:
+            filename = find_testclass(requested_name, program.name, test_class.name, file_required=True)
+            if filename is not None:
+                break
+        else:
+            package = args.name[0] if len(args.name) == 1 else 'UNKNOWN_PACKAGE'
+            filename = find_testclass(package, program.name, test_class.name, file_required=False)
+
+        console.printout(f'  <file path={quoteattr(filename)}>')
+
+        for test_method in test_class.test_methods:
+            console.printout(f'    <testCase name={quoteattr(test_method.name)} duration="{test_method.duration}"',
+                             end='')
+            if not test_method.alerts:
+                console.printout('/>')
+                continue
+
+            console.printout('>')
+
+            if any((alert.is_error for alert in test_method.alerts)):
+                critical += 1
+
+            for alert in test_method.alerts:
+                print_sonar_alert(alert, console)
+
+            console.printout('    </testCase>')
+
+        if test_class.alerts:
+            console.printout(f'    <testCase name={quoteattr(test_class.name)} duration="0">')
+
+            for alert in test_class.alerts:
+                print_sonar_alert(alert, console)
+
+            console.printout('    </testCase>')
+
+        console.printout('  </file>')
+
+    return critical
+
+
 def print_aunit_sonar(run_results, args, console):
     """Print results to console in the form of Sonar Generic Execution"""
 
@@ -432,58 +529,37 @@ def print_aunit_sonar(run_results, args, console):
     console.printout('<testExecutions version="1">')
 
     for program in run_results.programs:
-        if program.alerts:
-            console.printout(f'    <testCase name={quoteattr(program.name)} duration="0">')
-
-            for alert in program.alerts:
-                if alert.is_error:
-                    critical += 1
+        critical += print_sonar_program(program, args, console)
 
-                print_sonar_alert(alert, console)
-
-            console.printout('    </testCase>')
-
-        for test_class in program.test_classes:
-            for requested_name in args.name:
-                filename = find_testclass(requested_name, program.name, test_class.name, file_required=True)
-                if filename is not None:
-                    break
-            else:
-                package = args.name[0] if len(args.name) == 1 else 'UNKNOWN_PACKAGE'
-                filename = find_testclass(package, program.name, test_class.name, file_required=False)
-
-            console.printout(f'  <file path={quoteattr(filename)}>')
-
-            for test_method in test_class.test_methods:
-                console.printout(f'    <testCase name={quoteattr(test_method.name)} duration="{test_method.duration}"',
-                                 end='')
-                if not test_method.alerts:
-                    console.printout('/>')
-                    continue
-
-                console.printout('>')
+    console.printout('</testExecutions>')
 
-                if any((alert.is_error for alert in test_method.alerts)):
-                    critical += 1
+    return critical
 
-                for alert in test_method.alerts:
-                    print_sonar_alert(alert, console)
 
-                console.printout('    </testCase>')
+def stream_aunit_sonar(aunit_xml, args, console):
+    """Print results to console in the form of Sonar Generic Execution while
+       parsing them and return the number of errors and the parsed response
+       without programs.
+    """
 
-            if test_class.alerts:
-                console.printout(f'    <testCase name={quoteattr(test_class.name)} duration="0">')
+    critical = 0
 
-                for alert in test_class.alerts:
-                    print_sonar_alert(alert, console)
+    def _print_program(program):
+        nonlocal critical
+        critical += print_sonar_program(program, args, console)
 
-                console.printout('    </testCase>')
+    console.printout('<?xml version="1.0" encoding="UTF-8" ?>')
+    console.printout('<testExecutions version="1">')
 
-            console.printout('  </file>')
+    aunit_parsed_response = sap.adt.aunit.stream_aunit_response(aunit_xml, _print_program)
 
     console.printout('</testExecutions>')
 
-    return critical
+    # Alerts of the run are known only at the end of the document.
+    critical += print_aunit_human_alerts(ConsoleErrorDecorator(console),
+                                         aunit_parsed_response.run_results.alerts)
+
+    return critical, aunit_parsed_response
 
 
 def print_aunit_raw(aunit_xml, run_results, console):
@@ -570,6 +646,9 @@ def get_method_lines_mapping(statement_responses):
     return result
 
 
+JACOCO_INDENT = '   '
+
+
 def _print_counters_jacoco(node, console, indent, indent_level):
     # pylint: disable=invalid-name
     COVERAGE_COUNTER_TYPE_MAPPING = {
@@ -629,43 +708,151 @@ def _print_class_jacoco(node, method_lines_mapping, console, indent, indent_leve
     _print_source_file_jacoco(node.name, lines_data, console, indent, indent_level)
 
 
+def _print_single_package_jacoco(package, method_lines_mapping, console, indent, indent_level):
+    console.printout(f'{indent}<package name="{package.name}">')
+    for class_node in package.nodes:
+        _print_class_jacoco(class_node, method_lines_mapping, console, indent, indent_level + 1)
+    _print_counters_jacoco(package, console, indent, indent_level + 1)
+    console.printout(f'{indent}</package>')
+
+
 def _print_package_jacoco(node, method_lines_mapping, console, indent, indent_level):
     for package in node.nodes:
-        console.printout(f'{indent}<package name="{package.name}">')
-        for class_node in package.nodes:
-            _print_class_jacoco(class_node, method_lines_mapping, console, indent, indent_level + 1)
-        _print_counters_jacoco(package, console, indent, indent_level + 1)
-        console.printout(f'{indent}</package>')
+        _print_single_package_jacoco(package, method_lines_mapping, console, indent, indent_level)
 
     _print_counters_jacoco(node, console, indent, indent_level)
 
 
+def _print_report_header_jacoco(args, console):
+    console.printout('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>')
+    console.printout('<!DOCTYPE report PUBLIC "-//JACOCO//DTD Report 1.1//EN" "report.dtd">')
+
+    report_name = "|".join(args.name)
+    console.printout(f'<report name={quoteattr(report_name)}>')
+
+
 def print_acoverage_jacoco(root_node, statement_responses, args, console):
     """Print results of ACoverage to console in the form of JaCoCo"""
 
     method_lines_mapping = get_method_lines_mapping(statement_responses)
 
-    # pylint: disable=invalid-name
-    INDENT = '   '
-    console.printout('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>')
-    console.printout('<!DOCTYPE report PUBLIC "-//JACOCO//DTD Report 1.1//EN" "report.dtd">')
+    _print_report_header_jacoco(args, console)
+    _print_package_jacoco(root_node, method_lines_mapping, console, JACOCO_INDENT, 1)
+    console.printout('</report>')
 
-    report_name = "|".join(args.name)
-    console.printout(f'<report name={quoteattr(report_name)}>')
-    _print_package_jacoco(root_node, method_lines_mapping, console, INDENT, 1)
+
+def stream_acoverage_jacoco(connection, coverage_identifier, acoverage_response, args, console):
+    """Print results of ACoverage to console in the form of JaCoCo package
+       by package while parsing them - statements are fetched per package
+       by the same workers.
+    """
+
+    def _print_package(package, statement_uris):
+        statement_responses = fetch_coverage_statements(connection, coverage_identifier, statement_uris, args,
+                                                        workers=workers)
+        _print_single_package_jacoco(package, get_method_lines_mapping(statement_responses), console,
+                                     JACOCO_INDENT, 1)
+
+    _print_report_header_jacoco(args, console)
+    with sap.cli.helpers.ConnectionWorkers(connection, args.coverage_jobs) as workers:
+        root_node = sap.adt.ACoverage(connection).stream_response(acoverage_response, _print_package)
+    _print_counters_jacoco(root_node, console, JACOCO_INDENT, 1)
     console.printout('</report>')
 
 
-def get_acoverage_statements(connection, coverage_identifier, statement_uris):
-    """Retrieve and parse acoverage statements for specific coverage identifier"""
+DEFAULT_STATEMENTS_CHUNK_SIZE = 100
+
+CLASS_POOL_NAME_RE = re.compile(r'^(.+?)=+CP$')
 
-    acoverage_statements = ACoverageStatements(connection)
-    statement_requests = [StatementRequest(uri) for uri in statement_uris]
-    bulk_statements = StatementsBulkRequest(coverage_identifier, statement_requests)
-    acoverage_statements_response = acoverage_statements.execute(bulk_statements)
-    parsed_response = parse_statements_response(acoverage_statements_response.text)
 
-    return parsed_response.statement_responses
+# pylint: disable=too-many-arguments
+def get_acoverage_statements(connection, coverage_identifier, statement_uris,
+                             chunk_size=DEFAULT_STATEMENTS_CHUNK_SIZE, jobs=1, workers=None):
+    """Retrieve and parse acoverage statements for specific coverage identifier
+
+       The statements are requested in bulk requests of at most chunk_size
+       statement URIs running concurrently on at most jobs connections or
+       on the given sap.cli.helpers.ConnectionWorkers.
+    """
+
+    if chunk_size < 1:
+        raise sap.cli.core.InvalidCommandLineError(f'The chunk size must be a positive integer: {chunk_size}')
+
+    chunks = [statement_uris[start:start + chunk_size] for start in range(0, len(statement_uris), chunk_size)]
+    if not chunks:
+        return []
+
+    def _fetch_chunk(chunk_connection, chunk):
+        acoverage_statements = ACoverageStatements(chunk_connection)
+        statement_requests = [StatementRequest(uri) for uri in chunk]
+        bulk_statements = StatementsBulkRequest(coverage_identifier, statement_requests)
+        acoverage_statements_response = acoverage_statements.execute(bulk_statements)
+        parsed_response = parse_statements_response(acoverage_statements_response.text)
+
+        return parsed_response.statement_responses
+
+    if workers is not None:
+        return [response for responses in workers.map(_fetch_chunk, chunks) for response in responses]
+
+    with sap.cli.helpers.ConnectionWorkers(connection, min(jobs, len(chunks))) as chunk_workers:
+        return [response for responses in chunk_workers.map(_fetch_chunk, chunks) for response in responses]
+
+
+def statement_uri_names(statement_uri):
+    """Returns upper case names of the nodes (package, class pool, class,
+       method ...) on the path of the statements URI.
+    """
+
+    path = urlparse(statement_uri).path
+    _, _, nodes = path.partition('/statements/')
+
+    names = set()
+    for node in nodes.split('/'):
+        name = unquote(node).upper()
+        if not name:
+            continue
+
+        names.add(name)
+        class_pool = CLASS_POOL_NAME_RE.match(name)
+        if class_pool is not None:
+            names.add(class_pool.group(1))
+
+    return names
+
+
+def filter_statement_uris(statement_uris, scope):
+    """Returns statement URIs of nodes whose path contains a name matching
+       one of the scope patterns (e.g. ZPACKAGE, ZCL_*). All URIs are returned
+       if the scope is empty.
+    """
+
+    if not scope:
+        return statement_uris
+
+    patterns = [pattern.upper() for pattern in scope]
+    return [uri for uri in statement_uris
+            if any(fnmatchcase(name, pattern) for name in statement_uri_names(uri) for pattern in patterns)]
+
+
+def fetch_coverage_statements(connection, coverage_identifier, statement_uris, args, workers=None):
+    """Retrieve statements of the URIs in --coverage-scope with the options
+       of the command line.
+    """
+
+    statement_uris = filter_statement_uris(statement_uris, args.coverage_scope)
+    return get_acoverage_statements(connection, coverage_identifier, statement_uris,
+                                    chunk_size=args.coverage_chunk_size, jobs=args.coverage_jobs, workers=workers)
+
+
+# Types of transported objects which can have Unit tests
+TESTABLE_OBJECT_TYPES = {'PROG': sap.adt.Program, 'CLAS': sap.adt.Class, 'FUGR': sap.adt.FunctionGroup}
+
+# Workbench types of transported objects whose R3TR type is ambiguous
+WBTYPE_OBJECT_TYPES = {'PROG/I': 'include', 'TABL/DS': 'structure'}
+
+
+def _is_testable(owner):
+    return owner.type in TESTABLE_OBJECT_TYPES and owner.wbtype not in WBTYPE_OBJECT_TYPES
 
 
 class TransportObjectSelector:
@@ -674,14 +861,9 @@ class TransportObjectSelector:
     def __init__(self, connection, number):
         self._connection = connection
         self._number = number
+        self._where_used_cache = {}
 
-    def get_testable_objects(self, user=None):
-        """Returns the list of all objects which can potentially have Unit tests
-           and are included in the give transport.
-        """
-
-        types = {'PROG': sap.adt.Program, 'CLAS': sap.adt.Class, 'FUGR': sap.adt.FunctionGroup}
-
+    def _transported_objects(self, user):
         mod_log().info('Fetching the transport or task %s', self._number)
         workbench = sap.adt.cts.Workbench(self._connection)
         transport = workbench.fetch_transport_request(self._number, user=user)
@@ -689,30 +871,110 @@ class TransportObjectSelector:
         if transport is None:
             raise SAPCliError(f'The transport was not found: {self._number}')
 
-        result = []
         for task in transport.tasks:
-            for abap_object in task.objects:
-                mod_log().debug('? %s %s', abap_object.type, abap_object.name)
+            yield from task.objects
 
-                try:
-                    # TODO: get rid of the need to create the instances!
-                    result.append(types[abap_object.type](self._connection, abap_object.name))
-                    mod_log().info('+ %s %s', abap_object.type, abap_object.name)
-                except KeyError:
-                    pass
+    def _transported_owner_objects(self, user):
+        """Yields R3TR objects of the transport or owners of transported
+           sub-objects (e.g. classes of methods), every object only once.
+        """
+
+        known = set()
+        for abap_object in self._transported_objects(user):
+            owner = sap.adt.cts.resolve_owner_object(self._connection, abap_object)
+            if owner is None:
+                mod_log().info('Skipping %s %s %s: unknown owner object',
+                               abap_object.pgmid, abap_object.type, abap_object.name)
+                continue
+
+            key = (owner.type, owner.name.upper())
+            if key in known:
+                continue
+
+            known.add(key)
+            yield owner
+
+    def get_testable_objects(self, user=None):
+        """Returns the list of all objects which can potentially have Unit tests
+           and are included in the give transport.
+        """
+
+        result = []
+        for abap_object in self._transported_objects(user):
+            mod_log().debug('? %s %s', abap_object.type, abap_object.name)
+
+            try:
+                # TODO: get rid of the need to create the instances!
+                result.append(TESTABLE_OBJECT_TYPES[abap_object.type](self._connection, abap_object.name))
+                mod_log().info('+ %s %s', abap_object.type, abap_object.name)
+            except KeyError:
+                pass
 
         return result
 
+    def get_impacted_objects(self, max_depth, user=None):
+        """Returns the list of objects which can potentially have Unit tests
+           and are either included in the given transport or use objects of
+           the transport directly or through other objects up to max_depth
+           where-used levels.
+        """
+
+        objfactory = sap.adt.object_factory.human_names_factory(self._connection)
+
+        testable = {}
+        used_uris = []
+        for abap_object in self._transported_owner_objects(user):
+            typ = WBTYPE_OBJECT_TYPES.get(abap_object.wbtype, abap_object.type.lower())
+
+            try:
+                adt_object = objfactory.make(typ, abap_object.name)
+            except SAPCliError:
+                mod_log().info('Where-used not supported: %s %s', abap_object.type, abap_object.name)
+                continue
+
+            used_uris.append(adt_object.full_adt_uri)
+            if _is_testable(abap_object):
+                testable.setdefault((abap_object.type, abap_object.name.upper()), adt_object)
+
+        users = sap.adt.whereused.where_used_transitive(self._connection, used_uris, max_depth,
+                                                        cache=self._where_used_cache)
+
+        for ref_obj in users:
+            typ = ref_obj.adt_object.typ.split('/')[0]
+            name = ref_obj.adt_object.name
+
+            if typ == 'FUGR':
+                # function modules and includes are tested with their group
+                match = sap.adt.cts.FUNCTION_GROUP_URI_RE.search(ref_obj.uri)
+                if match is None:
+                    continue
+
+                name = unquote(match.group(1))
+
+            if typ not in TESTABLE_OBJECT_TYPES or ref_obj.adt_object.typ in WBTYPE_OBJECT_TYPES or not name:
+                continue
+
+            key = (typ, name.upper())
+            if key not in testable:
+                mod_log().info('+ %s %s (uses the transport)', typ, key[1])
+                testable[key] = TESTABLE_OBJECT_TYPES[typ](self._connection, key[1])
+
+        return list(testable.values())
+
 
 def objects_of_transport(as4user: str, connection: sap.adt.core.Connection,
-                         corrnr: str) -> List[sap.adt.objects.ADTObject]:
+                         corrnr: str, impact_depth: int = 0) -> List[sap.adt.objects.ADTObject]:
     """Fetches transports by corrnr and the user and returns a list of testable
-       objects.
+       objects. With a positive impact_depth, the list includes also objects
+       using objects of the transport.
     """
 
     transport = TransportObjectSelector(connection, corrnr)
 
-    testable = transport.get_testable_objects(as4user)
+    if impact_depth > 0:
+        testable = transport.get_impacted_objects(impact_depth, as4user)
+    else:
+        testable = transport.get_testable_objects(as4user)
 
     if not testable:
         raise SAPCliError('No testable objects found')
@@ -723,12 +985,16 @@ def objects_of_transport(as4user: str, connection: sap.adt.core.Connection,
 def print_aunit_output(args, aunit_response, aunit_parsed_response):
     """Prints AUnit output in selected format and console"""
 
+    return print_run_results_output(args, aunit_parsed_response.run_results, aunit_response)
+
+
+def print_run_results_output(args, run_results, aunit_response=None):
+    """Prints parsed AUnit results in selected format and console"""
+
     console = args.console_factory()
 
     result = None
 
-    run_results = aunit_parsed_response.run_results
-
     if args.output == 'human':
         result = print_aunit_human(run_results, console)
 
@@ -746,35 +1012,39 @@ def print_aunit_output(args, aunit_response, aunit_parsed_response):
     return result
 
 
-def print_acoverage_output(args, acoverage_response, root_node, statement_responses):
-    """Prints ACoverage output in selected format and console"""
+@contextmanager
+def coverage_output_console(args):
+    """Yields the console for coverage results - the file --coverage-filepath
+       if given.
+    """
 
     if args.coverage_output not in ('raw', 'human', 'jacoco'):
         raise SAPCliError(f'Unsupported output type: {args.coverage_output}')
 
-    coverage_file = None
-    if args.coverage_filepath:
-        # pylint: disable=consider-using-with
-        coverage_file = open(args.coverage_filepath, 'w+', encoding='utf8')
-        console = sap.cli.core.PrintConsole(
+    if not args.coverage_filepath:
+        yield args.console_factory()
+        return
+
+    with open(args.coverage_filepath, 'w+', encoding='utf8') as coverage_file:
+        yield sap.cli.core.PrintConsole(
             out_file=coverage_file,
             err_file=coverage_file
         )
-    else:
-        console = args.console_factory()
 
-    if args.coverage_output == 'raw':
-        print_acoverage_raw(acoverage_response.text, console)
-    elif args.coverage_output == 'human':
-        print_acoverage_human(root_node, console, skip_covered=args.skip_covered)
-    elif args.coverage_output == 'jacoco':
-        print_acoverage_jacoco(root_node, statement_responses, args, console)
 
-    if args.coverage_output == 'human' and args.report_missed_lines:
-        print_missed_statements(statement_responses, console)
+def print_acoverage_output(args, acoverage_response, root_node, statement_responses):
+    """Prints ACoverage output in selected format and console"""
 
-    if coverage_file is not None:
-        coverage_file.close()
+    with coverage_output_console(args) as console:
+        if args.coverage_output == 'raw':
+            print_acoverage_raw(acoverage_response.text, console)
+        elif args.coverage_output == 'human':
+            print_acoverage_human(root_node, console, skip_covered=args.skip_covered)
+        elif args.coverage_output == 'jacoco':
+            print_acoverage_jacoco(root_node, statement_responses, args, console)
+
+        if args.coverage_output == 'human' and args.report_missed_lines:
+            print_missed_statements(statement_responses, console)
 
 
 class ResultOptions(Enum):
@@ -797,7 +1067,7 @@ def _build_adt_object_sets(connection, args):
     """Build ADTObjectSets from CLI args. May raise SAPCliError."""
 
     objfactory = sap.adt.object_factory.human_names_factory(connection)
-    objfactory.register('transport', partial(objects_of_transport, args.as4user))
+    objfactory.register('transport', partial(objects_of_transport, args.as4user, impact_depth=args.impact_depth))
 
     sets = sap.adt.objects.ADTObjectSets()
     for objname in args.name:
@@ -809,7 +1079,7 @@ def _build_adt_object_sets(connection, args):
 def _build_objects_info_for_transport(connection, args):
     """Resolve transport objects and convert to API protocol objects_info."""
 
-    objects = objects_of_transport(args.as4user, connection, args.name[0])
+    objects = objects_of_transport(args.as4user, connection, args.name[0], impact_depth=args.impact_depth)
     objects_info = []
     for obj in objects:
         osl_type = _ADT_OBJ_TO_OSL_TYPE.get(type(obj))
@@ -838,7 +1108,117 @@ def _build_objects_info(args):
     return objects_info
 
 
+class AUnitShard(NamedTuple):
+    """Objects of a single AUnit run of a sharded run"""
+
+    objects_info: List
+    coverage_objects: List
+
+
+class AUnitShardResult(NamedTuple):
+    """Parsed results of a single AUnit run of a sharded run"""
+
+    run_results: sap.adt.aunit.RunResults
+    coverage_root: sap.adt.acoverage.Node
+    statement_responses: List
+
+
+def split_into_shards(items, shards):
+    """Distributes the items round-robin into at most N non-empty lists
+       to mix large and small objects (e.g. packages) in every shard.
+    """
+
+    return [items[index::shards] for index in range(min(shards, len(items)))]
+
+
+def _build_shards(connection, args):
+    """Split the objects of CLI args into shards. May raise SAPCliError."""
+
+    if args.type == 'transport':
+        objects_info = _build_objects_info_for_transport(connection, args)
+        coverage_objects = [(osl_type.lower(), name) for name, osl_type in objects_info]
+    else:
+        objects_info = _build_objects_info(args)
+        coverage_objects = [(args.type, name) for name in args.name]
+
+    units = list(zip(objects_info, coverage_objects))
+    return [AUnitShard([info for info, _ in shard], [obj for _, obj in shard])
+            for shard in split_into_shards(units, args.shards)]
+
+
+def _run_aunit_shard(connection, shard, args, activate_coverage):
+    """Runs AUnit for the shard and reads its coverage on the given connection"""
+
+    mod_log().info('Starting AUnit run for %s', shard.objects_info)
+
+    test_run = sap.adt.api.aunit.build_test_run(shard.objects_info, activate_coverage=activate_coverage)
+    aunit_response = sap.adt.api.aunit.AUnit(connection).execute(test_run)
+    aunit_parsed_response = sap.adt.aunit.parse_aunit_response(aunit_response.text)
+
+    if not activate_coverage:
+        return AUnitShardResult(aunit_parsed_response.run_results, None, [])
+
+    objfactory = sap.adt.object_factory.human_names_factory(connection)
+    sets = sap.adt.objects.ADTObjectSets()
+    for typ, name in shard.coverage_objects:
+        sets.include(objfactory.make(typ, name))
+
+    acoverage = sap.adt.ACoverage(connection)
+    acoverage_response = acoverage.execute(aunit_parsed_response.coverage_identifier, sets)
+    parsed_acoverage_response = acoverage.parse_response(acoverage_response)
+
+    statement_responses = fetch_coverage_statements(
+        connection,
+        aunit_parsed_response.coverage_identifier,
+        parsed_acoverage_response.statement_uris,
+        args
+    )
+
+    return AUnitShardResult(aunit_parsed_response.run_results, parsed_acoverage_response.root_node,
+                            statement_responses)
+
+
+def run_sharded(connection, args, activate_coverage, console):
+    """Runs AUnit for shards of the objects concurrently - every shard
+       in its own HTTP session - and prints the merged results.
+    """
+
+    if args.shards < 1:
+        raise sap.cli.core.InvalidCommandLineError(f'The number of shards must be a positive integer: {args.shards}')
+
+    if args.compat:
+        raise sap.cli.core.InvalidCommandLineError('The option --shards cannot be used with --compat')
+
+    if args.output == 'raw' or (activate_coverage and args.coverage_output == 'raw'):
+        raise sap.cli.core.InvalidCommandLineError('Raw results of shards cannot be merged')
+
+    try:
+        shards = _build_shards(connection, args)
+    except SAPCliError as ex:
+        console.printerr(str(ex))
+        return 1
+
+    with sap.cli.helpers.ConnectionWorkers(connection, len(shards), console=console) as workers:
+        shard_results = list(workers.map(partial(_run_aunit_shard, args=args, activate_coverage=activate_coverage),
+                                         shards))
+
+    result = None
+    if args.result in (ResultOptions.ONLY_UNIT.value, ResultOptions.ALL.value):
+        run_results = sap.adt.aunit.merge_run_results(shard.run_results for shard in shard_results)
+        result = print_run_results_output(args, run_results)
+
+    if activate_coverage:
+        root_node = sap.adt.acoverage.merge_coverage_roots(shard.coverage_root for shard in shard_results)
+        statement_responses = [response for shard in shard_results for response in shard.statement_responses]
+        print_acoverage_output(args, None, root_node, statement_responses)
+
+    return result
+
+
 @CommandGroup.argument('--as4user', nargs='?', help='Auxiliary parameter for Transports')
+@CommandGroup.argument('--impact-depth', type=int, default=0,
+                       help='With transport, test also objects using the transported objects'
+                            ' up to N where-used levels; default == 0')
 @CommandGroup.argument('--output', choices=['raw', 'human', 'junit4', 'sonar'], default='human')
 @CommandGroup.argument('name', nargs='+', type=str)
 @CommandGroup.argument('type', choices=['program', 'program-include', 'class', 'package',
@@ -854,8 +1234,20 @@ def _build_objects_info(args):
 @CommandGroup.argument('--coverage-filepath', default=None, type=str)
 @CommandGroup.argument('--report-missed-lines', action='store_true', default=False)
 @CommandGroup.argument('--skip-covered', action='store_true', default=False)
+@CommandGroup.argument('--coverage-scope', action='append', default=[], metavar='NAME',
+                       help='Fetch coverage statements only of packages, classes, programs ...'
+                            ' matching the name (wildcards allowed); repeatable')
+@CommandGroup.argument('--coverage-chunk-size', type=int, default=DEFAULT_STATEMENTS_CHUNK_SIZE,
+                       help=f'Maximum number of objects in a single coverage statements request;'
+                            f' default == {DEFAULT_STATEMENTS_CHUNK_SIZE}')
+@CommandGroup.argument('--coverage-jobs', type=int, default=1,
+                       help='Number of concurrent coverage statements requests'
+                            ' - every job uses its own HTTP session; default == 1')
 @CommandGroup.argument('--compat', action='store_true', default=False,
                        help='Use the deprecated non-public ADT AUnit protocol')
+@CommandGroup.argument('--shards', type=int, default=1,
+                       help='Split the objects into N runs executed concurrently'
+                            ' - every run uses its own HTTP session; default == 1')
 @CommandGroup.command()
 def run(connection, args):
     """Prints it out based on command line configuration.
@@ -866,12 +1258,19 @@ def run(connection, args):
            - when the givent output and coverage-output do not belong to
            the output format whitelist
     """
-    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
 
     result = None
     activate_coverage = args.result in (ResultOptions.ONLY_COVERAGE.value, ResultOptions.ALL.value)
+    print_unit = args.result in (ResultOptions.ONLY_UNIT.value, ResultOptions.ALL.value)
+    print_raw_junit4 = args.output == 'junit4' and not args.compat and not activate_coverage
+    # the streamed results are parsed from the HTTP response without reading the body in advance
+    stream_results = not print_raw_junit4 and (not print_unit or args.output in ('junit4', 'sonar'))
     console = args.console_factory()
 
+    if args.shards != 1:
+        return run_sharded(connection, args, activate_coverage, console)
+
     if args.compat:
         # Legacy synchronous protocol
         try:
@@ -881,7 +1280,7 @@ def run(connection, args):
             return 1
 
         aunit = sap.adt.AUnit(connection)
-        aunit_response = aunit.execute(sets, activate_coverage=activate_coverage)
+        aunit_response = aunit.execute(sets, activate_coverage=activate_coverage, stream=stream_results)
     else:
         # API asynchronous protocol (default)
         try:
@@ -901,18 +1300,23 @@ def run(connection, args):
         else:
             accept = sap.adt.api.aunit.ACCEPT_AUNIT_RESULTS
 
-        aunit_response = aunit_api.execute(test_run, accept=accept)
+        aunit_response = aunit_api.execute(test_run, accept=accept, stream=stream_results)
 
-    if args.output == 'junit4' and not args.compat and not activate_coverage:
-        if args.result in (ResultOptions.ONLY_UNIT.value, ResultOptions.ALL.value):
+    if print_raw_junit4:
+        if print_unit:
             console.printout(aunit_response.text)
         aunit_parsed_response = None
-    else:
+    elif print_unit and args.output in ('junit4', 'sonar'):
+        stream_output = stream_aunit_junit4 if args.output == 'junit4' else stream_aunit_sonar
+        result, aunit_parsed_response = stream_output(sap.http.response_stream(aunit_response), args,
+                                                      args.console_factory())
+    elif print_unit:
         aunit_parsed_response = sap.adt.aunit.parse_aunit_response(aunit_response.text)
-
-    if aunit_parsed_response is not None \
-            and args.result in (ResultOptions.ONLY_UNIT.value, ResultOptions.ALL.value):
         result = print_aunit_output(args, aunit_response, aunit_parsed_response)
+    else:
+        # only the coverage identifier is needed
+        aunit_parsed_response = sap.adt.aunit.stream_aunit_response(sap.http.response_stream(aunit_response),
+                                                                    lambda program: None)
 
     if activate_coverage:
         if not args.compat:
@@ -923,13 +1327,23 @@ def run(connection, args):
                 return 1
 
         acoverage = sap.adt.ACoverage(connection)
-        acoverage_response = acoverage.execute(aunit_parsed_response.coverage_identifier, sets)
+        acoverage_response = acoverage.execute(aunit_parsed_response.coverage_identifier, sets,
+                                               stream=args.coverage_output == 'jacoco')
+
+        if args.coverage_output == 'jacoco':
+            with coverage_output_console(args) as coverage_console:
+                stream_acoverage_jacoco(connection, aunit_parsed_response.coverage_identifier, acoverage_response,
+                                        args, coverage_console)
+
+            return result
+
         parsed_acoverage_response = acoverage.parse_response(acoverage_response)
 
-        statement_responses = get_acoverage_statements(
+        statement_responses = fetch_coverage_statements(
             connection,
             aunit_parsed_response.coverage_identifier,
-            parsed_acoverage_response.statement_uris
+            parsed_acoverage_response.statement_uris,
+            args
         )
 
         root_node = parsed_acoverage_response.root_node
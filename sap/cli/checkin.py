@@ -1,13 +1,18 @@
+# pylint: disable=too-many-lines
 """ADT Object import"""
 import os
-import glob
+import time
 import errno
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 from sap import get_logger
 
 import sap.errors
 import sap.cli.core
+import sap.cli.helpers
+import sap.cli.checkin_manifest
+import sap.cli.checkin_dependencies
 import sap.platform.abap.abapgit
 from sap.platform.abap.ddic import (
     VSEOCLASS,
@@ -27,6 +32,7 @@ import sap.adt
 import sap.adt.checks
 import sap.adt.objects
 import sap.adt.errors
+import sap.adt.package_index
 import sap.adt.wb
 import sap.cli.wb
 from sap.config import config_get
@@ -44,6 +50,14 @@ class CommandGroup(sap.cli.core.CommandGroup):
     def __init__(self):
         super().__init__('checkin')
 
+    def install_parser(self, arg_parser):
+        command_args = super().install_parser(arg_parser)
+
+        # scanning works with the local repository only
+        command_args.choices['scan'].set_defaults(connection_factory=sap.cli.no_connection)
+
+        return command_args
+
 
 class RepoPackage(typing.NamedTuple):
     """Package on file system"""
@@ -64,11 +78,21 @@ class RepoObject(typing.NamedTuple):
     files: list
 
 
+class StagedWrite(typing.NamedTuple):
+    """Source code to be written after the pre-save check of the whole group"""
+
+    source_code: str
+    adt_object: typing.Any
+    corrnr: typing.Optional[str]
+    source_label: typing.Optional[str]
+
+
 class ObjectCheckinResult(typing.NamedTuple):
     """Result of a single ADT object checkin handler"""
 
     abap_objects: list
     used_files: list
+    unchanged: bool = False
 
 
 # pylint: disable=too-many-instance-attributes
@@ -91,7 +115,9 @@ class Repository:
         self._packages = {}
         self._objects = []
         self._files = set()
+        self._dir_files = {}
         self._used_files = set()
+        self._checked_in = {}
 
         self._pkg_name_bldr = {
             sap.platform.abap.abapgit.FOLDER_LOGIC_FULL: lambda parts: self._full_fmt % (parts[-1]),
@@ -123,21 +149,65 @@ class Repository:
 
         return sorted(self._files - self._used_files)
 
+    @property
+    def unowned_files(self):
+        """Sorted list of recorded files which do not belong to any package
+           or object - the files are unused by checkin regardless of which
+           object files are written.
+        """
+
+        owned = {(os.path.normpath(os.path.dirname(obj.path)), obj.name, obj.code) for obj in self._objects}
+
+        def is_owned(file_path):
+            if file_path in self._used_files:
+                return True
+
+            dir_path, file_name = os.path.split(file_path)
+            parts = file_name.split('.', 2)
+            return len(parts) == 3 and (os.path.normpath(dir_path), parts[0], parts[1]) in owned
+
+        return sorted(file_path for file_path in self._files if not is_owned(file_path))
+
     def find_package_by_path(self, dir_path):
         """Get package based on its path"""
 
         return self._packages[dir_path]
 
+    @property
+    def files(self):
+        """Sorted list of recorded files"""
+
+        return sorted(self._files)
+
     def add_file(self, file_path):
         """Record a file found in the repository directory structure"""
 
         self._files.add(file_path)
 
+        dir_path, file_name = os.path.split(file_path)
+        parts = file_name.split('.', 2)
+        if len(parts) < 3 or file_name.endswith('.xml'):
+            return
+
+        # index of source files name.type.* of objects in the directory
+        dir_index = self._dir_files.setdefault(os.path.normpath(dir_path), {})
+        dir_index.setdefault((parts[0], parts[1]), []).append(file_path)
+
     def mark_file_used(self, file_path):
         """Mark the given repository file as consumed by checkin"""
 
         self._used_files.add(file_path)
 
+    def mark_object_checked_in(self, repo_obj, uri, used_files):
+        """Mark the given repository object as written to the ADT object URI"""
+
+        self._checked_in[repo_obj.path] = (uri, list(used_files))
+
+    def checked_in(self, repo_obj):
+        """Returns the tuple (uri, used files) of the checked in object or None"""
+
+        return self._checked_in.get(repo_obj.path)
+
     def add_object(self, obj_file_name, package):
         """Add new ADT object"""
 
@@ -151,18 +221,9 @@ class Repository:
 
         obj_name = obj_file_name[:obj_id_start - 1]
 
-        other_files = []
-
-        obj_file_pattern = os.path.join(package.dir_path, obj_name)
-        obj_file_pattern = f'{obj_file_pattern}.{obj_code}.*'
-
-        mod_log().debug('Searching for object files: %s', obj_file_pattern)
-        for source_file in glob.glob(obj_file_pattern):
-            if source_file.endswith('.xml'):
-                continue
-
-            mod_log().debug('Adding file: %s', source_file)
-            other_files.append(source_file)
+        dir_index = self._dir_files.get(os.path.normpath(package.dir_path), {})
+        other_files = list(dir_index.get((obj_name, obj_code), []))
+        mod_log().debug('Object files of %s.%s: %s', obj_name, obj_code, other_files)
 
         obj = RepoObject(obj_code, obj_name, os.path.join(package.dir_path, obj_file_name), package, other_files)
         self._objects.append(obj)
@@ -228,9 +289,11 @@ def _load_objects(repo):
 
         package = repo.find_package_by_path(root)
 
+        # all files of the directory must be indexed before adding objects
         for obj_file_name in files:
             repo.add_file(os.path.join(root, obj_file_name))
 
+        for obj_file_name in files:
             obj_name_parts = obj_file_name.split('.')
             if len(obj_name_parts) < 2:
                 continue
@@ -299,23 +362,18 @@ def checkin_package(connection, repo_package, args):
 
 
 def _resolve_dependencies(objects):
+    """Returns the list of activation waves - lists of objects which do not
+       depend on each other nor on objects of later waves.
+    """
 
-    libs = []
-    bins = []
-    others = []
-
-    for obj in objects:
-        if obj.code in ['intf', 'clas']:
-            libs.append(obj)
-        elif obj.code in ['prog']:
-            bins.append(obj)
-        else:
-            others.append(obj)
+    waves = sap.cli.checkin_dependencies.activation_waves(objects)
+    mod_log().info('Objects split into %d activation waves', len(waves))
 
-    return [libs, bins, others]
+    return waves
 
 
-def checkin_intf(connection, repo_obj, corrnr=None, check_before_save=False):
+def checkin_intf(connection, repo_obj, corrnr=None, check_before_save=False, compare_before_write=False,
+                 staged_writes=None):
     """Checkin ADT Interface"""
 
     sap.cli.core.printout('Creating Interface:', repo_obj.name)
@@ -350,14 +408,46 @@ def checkin_intf(connection, repo_obj, corrnr=None, check_before_save=False):
 
     sap.cli.core.printout('Writing Interface:', repo_obj.name)
     with open(source_file, 'r', encoding='utf-8') as source:
-        _write_source_file(source.read(), interface, corrnr=corrnr,
-                           source_label=source_file,
-                           check_before_save=check_before_save)
+        written = _write_source_file(source.read(), interface, corrnr=corrnr,
+                                     source_label=source_file,
+                                     check_before_save=check_before_save,
+                                     compare_before_write=compare_before_write,
+                                     staged_writes=staged_writes)
 
-    return ObjectCheckinResult([interface], [source_file])
+    return ObjectCheckinResult([interface], [source_file], unchanged=not written)
 
 
-def checkin_clas(connection, repo_obj, corrnr=None, check_before_save=False):
+CLASS_CHECKIN_PARTS = {
+    'clas': lambda clas: clas,
+    'locals_def': lambda clas: clas.definitions,
+    'locals_imp': lambda clas: clas.implementations,
+    'testclasses': lambda clas: clas.test_classes,
+}
+
+
+def _class_sources_unchanged(clas, repo_obj):
+    """Returns True if all class parts have the same source code as the files.
+       Unknown parts are ignored because checkin ignores them too.
+    """
+
+    for source_file in repo_obj.files:
+        if not source_file.endswith('.abap'):
+            return False
+
+        get_part = CLASS_CHECKIN_PARTS.get(source_file.split('.')[-2], None)
+        if get_part is None:
+            continue
+
+        with open(source_file, 'r', encoding='utf-8') as source:
+            if not sap.adt.objects.is_source_unchanged(get_part(clas), source.read()):
+                return False
+
+    return True
+
+
+# pylint: disable=too-many-locals
+def checkin_clas(connection, repo_obj, corrnr=None, check_before_save=False, compare_before_write=False,
+                 staged_writes=None):
     """Checkin ADT Clas"""
 
     sap.cli.core.printout('Creating Class:', repo_obj.name)
@@ -375,11 +465,11 @@ def checkin_clas(connection, repo_obj, corrnr=None, check_before_save=False):
     metadata = sap.adt.ADTCoreData(language='EN', master_language='EN', responsible=connection.user.upper(),
                                    description=abap_data.DESCRIPT)
     clas = sap.adt.Class(connection, repo_obj.name.upper(), package=repo_obj.package.name, metadata=metadata)
+    unchanged = False
 
     try:
         clas.create(corrnr)
     except sap.adt.errors.ExceptionResourceAlreadyExists as exc:
-        mod_log().info('Class already exists. Recreating.')
         clas.fetch()
 
         # pylint: disable=no-member
@@ -388,10 +478,15 @@ def checkin_clas(connection, repo_obj, corrnr=None, check_before_save=False):
                                                          f' {repo_obj.package.name}. It already exists in package'
                                                          f' {clas.reference.name}.') from exc
 
-        clas.delete(corrnr)
-        # Recreate class object to avoid stale data, which causes create to fail
-        clas = sap.adt.Class(connection, repo_obj.name.upper(), package=repo_obj.package.name, metadata=metadata)
-        clas.create(corrnr)
+        # Recreating is the most expensive way of writing the same sources
+        unchanged = compare_before_write and _class_sources_unchanged(clas, repo_obj)
+
+        if not unchanged:
+            mod_log().info('Class already exists. Recreating.')
+            clas.delete(corrnr)
+            # Recreate class object to avoid stale data, which causes create to fail
+            clas = sap.adt.Class(connection, repo_obj.name.upper(), package=repo_obj.package.name, metadata=metadata)
+            clas.create(corrnr)
 
     used_files = []
 
@@ -400,32 +495,30 @@ def checkin_clas(connection, repo_obj, corrnr=None, check_before_save=False):
             raise sap.adt.errors.ExceptionCheckinFailure(f'No .abap suffix of source file for class {repo_obj.name}:'
                                                          f' {source_file}')
 
-        class_parts = {
-            'clas': clas,
-            'locals_def': clas.definitions,
-            'locals_imp': clas.implementations,
-            'testclasses': clas.test_classes,
-        }
-
         sub_obj_id = source_file.split('.')[-2]
-        sub_obj = class_parts.get(sub_obj_id, None)
-        if sub_obj is None:
+        get_part = CLASS_CHECKIN_PARTS.get(sub_obj_id, None)
+        if get_part is None:
             sap.cli.core.printerr(f'Unknown class part {source_file}')
             continue
 
-        sap.cli.core.printout('Writing Clas:', repo_obj.name, sub_obj_id)
+        if unchanged:
+            sap.cli.core.printout('Source unchanged:', source_file)
+        else:
+            sap.cli.core.printout('Writing Clas:', repo_obj.name, sub_obj_id)
 
-        with open(source_file, 'r', encoding='utf-8') as source:
-            _write_source_file(source.read(), sub_obj, corrnr=corrnr,
-                               source_label=source_file,
-                               check_before_save=check_before_save)
+            with open(source_file, 'r', encoding='utf-8') as source:
+                _write_source_file(source.read(), get_part(clas), corrnr=corrnr,
+                                   source_label=source_file,
+                                   check_before_save=check_before_save,
+                                   staged_writes=staged_writes)
 
         used_files.append(source_file)
 
-    return ObjectCheckinResult([clas], used_files)
+    return ObjectCheckinResult([clas], used_files, unchanged=unchanged)
 
 
-def checkin_prog(connection, repo_obj, corrnr=None, check_before_save=False):
+def checkin_prog(connection, repo_obj, corrnr=None, check_before_save=False, compare_before_write=False,
+                 staged_writes=None):
     """Checkin ADT Program"""
 
     sap.cli.core.printout('Creating Program:', repo_obj.name)
@@ -472,11 +565,13 @@ def checkin_prog(connection, repo_obj, corrnr=None, check_before_save=False):
 
     sap.cli.core.printout('Writing Program:', repo_obj.name)
     with open(source_file, 'r', encoding='utf-8') as source:
-        _write_source_file(source.read(), program, corrnr=corrnr,
-                           source_label=source_file,
-                           check_before_save=check_before_save)
+        written = _write_source_file(source.read(), program, corrnr=corrnr,
+                                     source_label=source_file,
+                                     check_before_save=check_before_save,
+                                     compare_before_write=compare_before_write,
+                                     staged_writes=staged_writes)
 
-    return ObjectCheckinResult([program], [source_file])
+    return ObjectCheckinResult([program], [source_file], unchanged=not written)
 
 
 def _check_fugr_source_files(repo_obj, functions, includes):
@@ -495,9 +590,33 @@ def _check_fugr_source_files(repo_obj, functions, includes):
             raise sap.adt.errors.ExceptionCheckinFailure(f'No source file for include {include_name}')
 
 
+def _save_source(source_code, adt_object, corrnr=None, source_label=None):
+    """Writes the source code and reports abapCheckRun findings if the write
+    fails.
+    """
+
+    try:
+        with adt_object.open_editor(corrnr=corrnr) as editor:
+            editor.write(source_code)
+    except sap.adt.errors.ExceptionResourceSaveFailure as save_exc:
+        result = sap.adt.checks.run_object_check(adt_object, source_code)
+        if result.has_errors:
+            raise sap.adt.checks.ObjectCheckFindings(
+                adt_object, result, source_label=source_label
+            ) from save_exc
+        raise
+
+
+# pylint: disable=too-many-arguments
 def _write_source_file(source_code, adt_object, corrnr=None, source_label=None,
-                       check_before_save=False):
-    """Write ``source_code`` to ``adt_object``.
+                       check_before_save=False, compare_before_write=False, staged_writes=None):
+    """Write ``source_code`` to ``adt_object`` and return ``True`` if it
+    was written.
+
+    When ``compare_before_write`` is ``True`` (``--compare`` or
+    ``SAPCLI_COMPARE_BEFORE_WRITE=true``), the current source is
+    downloaded first and nothing is checked, locked or written if it
+    equals ``source_code`` - ``False`` is returned in that case.
 
     When ``check_before_save`` is ``True`` (because the user passed
     ``--check`` or set ``SAPCLI_CHECK_BEFORE_SAVE=true``), abapCheckRun
@@ -509,8 +628,20 @@ def _write_source_file(source_code, adt_object, corrnr=None, source_label=None,
     readable diagnostic instead of the cryptic save error. If the
     check has nothing to say, the original failure carries the real
     reason (lock, missing inactive version, ...) and is re-raised.
+
+    When ``staged_writes`` is a list, the source is appended to it as
+    :class:`StagedWrite` instead of being checked and written - the caller
+    checks the sources of many objects by a single request first.
     """
 
+    if compare_before_write and sap.adt.objects.is_source_unchanged(adt_object, source_code):
+        sap.cli.core.printout('Source unchanged:', source_label or str(adt_object))
+        return False
+
+    if staged_writes is not None:
+        staged_writes.append(StagedWrite(source_code, adt_object, corrnr, source_label))
+        return True
+
     if check_before_save:
         result = sap.adt.checks.run_object_check(adt_object, source_code)
         if result.has_errors:
@@ -518,29 +649,24 @@ def _write_source_file(source_code, adt_object, corrnr=None, source_label=None,
                 adt_object, result, source_label=source_label
             )
 
-    try:
-        with adt_object.open_editor(corrnr=corrnr) as editor:
-            editor.write(source_code)
-    except sap.adt.errors.ExceptionResourceSaveFailure as save_exc:
-        result = sap.adt.checks.run_object_check(adt_object, source_code)
-        if result.has_errors:
-            raise sap.adt.checks.ObjectCheckFindings(
-                adt_object, result, source_label=source_label
-            ) from save_exc
-        raise
+    _save_source(source_code, adt_object, corrnr=corrnr, source_label=source_label)
+
+    return True
 
 
 def _write_adt_object_source_file(path_prefix, adt_object, corrnr=None,
-                                  check_before_save=False):
-    """Write source file for ADT object"""
+                                  check_before_save=False, compare_before_write=False, staged_writes=None):
+    """Write source file for ADT object and return the tuple (file path, written)"""
 
     adt_object_file_path = path_prefix + f'.{adt_object.name.lower()}' + '.abap'
     with open(adt_object_file_path, 'r', encoding='utf-8') as source:
-        _write_source_file(source.read(), adt_object, corrnr,
-                           source_label=adt_object_file_path,
-                           check_before_save=check_before_save)
+        written = _write_source_file(source.read(), adt_object, corrnr,
+                                     source_label=adt_object_file_path,
+                                     check_before_save=check_before_save,
+                                     compare_before_write=compare_before_write,
+                                     staged_writes=staged_writes)
 
-    return adt_object_file_path
+    return adt_object_file_path, written
 
 
 def _format_function(source_code):
@@ -594,19 +720,23 @@ def _format_function(source_code):
 
 
 def _write_function_source_code(path_prefix, adt_object, corrnr=None,
-                                check_before_save=False):
-    """Write source code for function. If function is in ababGit format, change it to ADT format"""
+                                check_before_save=False, compare_before_write=False, staged_writes=None):
+    """Write source code for function. If function is in ababGit format, change it to ADT format.
+       Returns the tuple (file path, written).
+    """
 
     source_file_path = path_prefix + f'.{adt_object.name.lower()}' + '.abap'
     with open(source_file_path, 'r', encoding='utf-8') as source:
         source_code = source.read()
 
     source_code = _format_function(source_code)
-    _write_source_file(source_code, adt_object, corrnr,
-                       source_label=source_file_path,
-                       check_before_save=check_before_save)
+    written = _write_source_file(source_code, adt_object, corrnr,
+                                 source_label=source_file_path,
+                                 check_before_save=check_before_save,
+                                 compare_before_write=compare_before_write,
+                                 staged_writes=staged_writes)
 
-    return source_file_path
+    return source_file_path, written
 
 
 def create_function_module(connection, func, function_group, metadata, corrnr):
@@ -631,7 +761,8 @@ def create_function_module(connection, func, function_group, metadata, corrnr):
 
 
 # pylint: disable=too-many-locals
-def checkin_fugr(connection, repo_obj, corrnr=None, check_before_save=False):
+def checkin_fugr(connection, repo_obj, corrnr=None, check_before_save=False, compare_before_write=False,
+                 staged_writes=None):
     """Checkin ADT Function Group"""
 
     sap.cli.core.printout('Creating Function Group:', repo_obj.name)
@@ -655,6 +786,7 @@ def checkin_fugr(connection, repo_obj, corrnr=None, check_before_save=False):
 
     abap_objs_inactive = [function_group]
     used_files = []
+    written = []
 
     for include in includes:
         include_obj = sap.adt.FunctionInclude(connection, include, function_group.name, metadata=metadata)
@@ -670,19 +802,31 @@ def checkin_fugr(connection, repo_obj, corrnr=None, check_before_save=False):
             mod_log().info(err.message)
 
         sap.cli.core.printout('Writing Function Group Include:', include_obj.name)
-        used_files.append(_write_adt_object_source_file(repo_obj.path[:-4], include_obj, corrnr=corrnr,
-                                                        check_before_save=check_before_save))
+        source_file, include_written = _write_adt_object_source_file(repo_obj.path[:-4], include_obj, corrnr=corrnr,
+                                                                     check_before_save=check_before_save,
+                                                                     compare_before_write=compare_before_write,
+                                                                     staged_writes=staged_writes)
+        used_files.append(source_file)
+        written.append(include_written)
 
     for func in functions:
         function_module = create_function_module(connection, func, function_group, metadata, corrnr)
         abap_objs_inactive.append(function_module)
 
         sap.cli.core.printout('Writing Function Module:', function_module.name)
-        used_files.append(_write_function_source_code(repo_obj.path[:-4], function_module, corrnr=corrnr,
-                                                      check_before_save=check_before_save))
+        source_file, function_written = _write_function_source_code(repo_obj.path[:-4], function_module,
+                                                                    corrnr=corrnr,
+                                                                    check_before_save=check_before_save,
+                                                                    compare_before_write=compare_before_write,
+                                                                    staged_writes=staged_writes)
+        used_files.append(source_file)
+        written.append(function_written)
+
+    return ObjectCheckinResult(abap_objs_inactive, used_files,
+                               unchanged=compare_before_write and not any(written))
 
-    return ObjectCheckinResult(abap_objs_inactive, used_files)
 
+PRE_SAVE_CHECK_CHUNK_SIZE = 50
 
 OBJECT_CHECKIN_HANDLERS = {
     'intf': checkin_intf,
@@ -692,41 +836,254 @@ OBJECT_CHECKIN_HANDLERS = {
 }
 
 
-def _checkin_dependency_group(connection, repo, group, console, corrnr, check_before_save=False):
+def _check_staged_writes(connection, staged_writes):
+    """Runs abapCheckRun for chunks of staged sources and raises
+    ObjectListCheckFindings for the first chunk with errors including
+    errors which cannot be attributed to any of the checked objects.
+    """
+
+    for start in range(0, len(staged_writes), PRE_SAVE_CHECK_CHUNK_SIZE):
+        chunk = staged_writes[start:start + PRE_SAVE_CHECK_CHUNK_SIZE]
+        mod_log().info('Checking %d sources before writing', len(chunk))
+
+        results, unattributed = sap.adt.checks.run_objects_check(
+            connection, [(staged.adt_object, staged.source_code) for staged in chunk])
+
+        findings = [sap.adt.checks.ObjectCheckFindings(staged.adt_object, result, source_label=staged.source_label)
+                    for staged, result in zip(chunk, results) if result.has_errors]
+
+        if findings or unattributed.has_errors:
+            raise sap.adt.checks.ObjectListCheckFindings(
+                findings, unattributed=unattributed if unattributed.has_errors else None)
+
+
+def _write_session_sources(session_writes):
+    for staged in session_writes:
+        _save_source(staged.source_code, staged.adt_object, corrnr=staged.corrnr,
+                     source_label=staged.source_label)
+
+
+def _write_staged(jobs, staged_writes):
+    """Writes staged sources; sources of objects created by the same HTTP
+    session are written sequentially by that session and the sessions
+    write concurrently in up to jobs threads.
+    """
+
+    sessions = {}
+    for staged in staged_writes:
+        sessions.setdefault(id(staged.adt_object.connection), []).append(staged)
+
+    session_writes = list(sessions.values())
+    if jobs == 1 or len(session_writes) < 2:
+        for writes in session_writes:
+            _write_session_sources(writes)
+
+        return
+
+    # the objects carry their own connections - no worker connections needed
+    with ThreadPoolExecutor(max_workers=min(jobs, len(session_writes))) as executor:
+        for _ in executor.map(_write_session_sources, session_writes):
+            pass
+
+
+# pylint: disable=too-many-arguments
+def _checkin_dependency_group(connection, repo, group, console, corrnr, check_before_save=False, workers=None,
+                              compare_before_write=False):
     inactive_objects = sap.adt.objects.ADTObjectReferences()
+    unchanged_objects = []
+    staged_writes = []
 
-    for repo_obj in group:
+    def _checkin_object(worker_connection, repo_obj):
         obj_handler = OBJECT_CHECKIN_HANDLERS.get(repo_obj.code)
 
-        if obj_handler is None:
+        # sources are checked for the whole group before writing any of them
+        object_writes = [] if check_before_save else None
+
+        try:
+            result = obj_handler(worker_connection, repo_obj, corrnr,
+                                 check_before_save=check_before_save,
+                                 compare_before_write=compare_before_write,
+                                 staged_writes=object_writes)
+        except sap.adt.errors.ExceptionCheckinFailure:
+            return None
+
+        return result, object_writes
+
+    supported = []
+    for repo_obj in group:
+        if OBJECT_CHECKIN_HANDLERS.get(repo_obj.code) is None:
             console.printerr(f'Object not supported: {repo_obj.path}')
             continue
 
-        try:
-            result = obj_handler(connection, repo_obj, corrnr,
-                                 check_before_save=check_before_save)
+        supported.append(repo_obj)
+
+    if workers is None:
+        workers = sap.cli.helpers.ConnectionWorkers(connection, 1, console=console)
+
+    for repo_obj, checked_in in zip(supported, workers.map(_checkin_object, supported)):
+        if checked_in is None:
+            console.printout(f'Object handled without activation: {repo_obj.path}')
+            continue
+
+        result, object_writes = checked_in
+        staged_writes.extend(object_writes or [])
+
+        if result.unchanged:
+            # nothing was written but an older write may not have been activated
+            unchanged_objects.extend(result.abap_objects)
+        else:
             for abap_obj in result.abap_objects:
                 inactive_objects.add_object(abap_obj)
 
-            for used_file in result.used_files:
-                repo.mark_file_used(used_file)
+        for used_file in result.used_files:
+            repo.mark_file_used(used_file)
 
-        except sap.adt.errors.ExceptionCheckinFailure:
-            console.printout(f'Object handled without activation: {repo_obj.path}')
+        uri = result.abap_objects[0].full_adt_uri if result.abap_objects else None
+        repo.mark_object_checked_in(repo_obj, uri, result.used_files)
+
+    if staged_writes:
+        _check_staged_writes(connection, staged_writes)
+        _write_staged(workers.jobs, staged_writes)
+
+    if unchanged_objects:
+        for abap_obj in sap.adt.wb.filter_inactive_objects(connection, unchanged_objects):
+            inactive_objects.add_object(abap_obj)
 
     return inactive_objects
 
 
+def _skip_unchanged_objects(manifest, system, repo, group, console):
+    changed = []
+
+    for repo_obj in group:
+        if not manifest.is_unchanged(system, [repo_obj.path] + repo_obj.files):
+            changed.append(repo_obj)
+            continue
+
+        console.printout(f'Object unchanged: {repo_obj.path}')
+        for obj_file in repo_obj.files:
+            if manifest.get(system, obj_file)['uri'] is not None:
+                repo.mark_file_used(obj_file)
+
+    return changed
+
+
+def _record_checked_in_objects(manifest, system, repo, group):
+    for repo_obj in group:
+        checked_in = repo.checked_in(repo_obj)
+        if checked_in is None:
+            # the failed checkin might have written some of the files
+            for obj_file in [repo_obj.path] + repo_obj.files:
+                manifest.forget(system, obj_file)
+
+            continue
+
+        uri, used_files = checked_in
+        manifest.record(system, repo_obj.path, uri)
+        for obj_file in repo_obj.files:
+            # files which were not written are recorded to detect their changes
+            # but without URI to keep them reported as unused
+            manifest.record(system, obj_file, uri if obj_file in used_files else None)
+
+
+def _load_manifest(connection, args):
+    if not args.incremental:
+        return None, None
+
+    return (sap.cli.checkin_manifest.CheckinManifest.load(),
+            sap.cli.checkin_manifest.system_key(connection))
+
+
 def _activate(connection, inactive_objects, console):
     sap.cli.wb.activate(connection, inactive_objects, console)
 
 
+def _open_repository(args, console):
+    top_dir = '.'
+    if args.starting_folder:
+        top_dir = os.path.join(top_dir, args.starting_folder)
+
+    if not os.path.isdir(top_dir):
+        console.printerr(f'Cannot check-in ABAP objects from "{top_dir}": not a directory')
+        return None
+
+    config = _get_config(args.starting_folder, console)
+    return Repository(args.name, config)
+
+
+@CommandGroup.argument('--starting-folder', default=None)
+@CommandGroup.argument('name', help='Root ABAP package name')
+@CommandGroup.command('scan')
+def scan_directory(_, args):
+    """Scan the repository without connecting to an ABAP system and report
+       its objects, unused files and activation waves with timing.
+    """
+
+    console = args.console_factory()
+
+    repo = _open_repository(args, console)
+    if repo is None:
+        return 1
+
+    try:
+        started = time.perf_counter()
+        _load_objects(repo)
+        scanned = time.perf_counter()
+        waves = _resolve_dependencies(repo.objects)
+        resolved = time.perf_counter()
+    except sap.errors.SAPCliError as ex:
+        console.printerr(f'Scan failed: {ex}')
+        return 1
+
+    console.printout(f'Scanned {len(repo.packages)} packages, {len(repo.objects)} objects'
+                     f' and {len(repo.files)} files in {scanned - started:.3f} s')
+
+    object_types = {}
+    for repo_obj in repo.objects:
+        object_types[repo_obj.code] = object_types.get(repo_obj.code, 0) + 1
+
+    for code, count in sorted(object_types.items()):
+        console.printout(f'  {code}: {count}')
+
+    console.printout(f'Resolved {len(waves)} activation waves in {resolved - scanned:.3f} s')
+    for number, wave in enumerate(waves, start=1):
+        console.printout(f'  wave {number}: {len(wave)} objects')
+
+    for unused_file in repo.unowned_files:
+        console.printerr(f'Unused file: {unused_file}')
+
+    return 0
+
+
+def _forget_indexed_package(connection, name):
+    # the created packages and objects are not in the indexed tree but
+    # a broken index must not hide the result of the checkin
+    try:
+        sap.adt.package_index.forget_indexed_trees(connection, [name])
+    except sap.errors.SAPCliError as ex:
+        mod_log().warning('Cannot remove the package %s from the package index: %s', name, ex)
+
+
 @CommandGroup.argument('--no-check', dest='check', action='store_false',
                        help='Skip abapCheckRun before writing source code'
                             ' (overrides SAPCLI_CHECK_BEFORE_SAVE)')
 @CommandGroup.argument('--check', dest='check', action='store_true', default=None,
                        help='Run abapCheckRun before writing source code'
                             ' (overrides SAPCLI_CHECK_BEFORE_SAVE)')
+@CommandGroup.argument('--no-compare', dest='compare', action='store_false',
+                       help='Always write source code'
+                            ' (overrides SAPCLI_COMPARE_BEFORE_WRITE)')
+@CommandGroup.argument('--compare', dest='compare', action='store_true', default=None,
+                       help='Do not write and activate source code identical to the source on the server'
+                            ' (overrides SAPCLI_COMPARE_BEFORE_WRITE)')
+@CommandGroup.argument('-j', '--jobs', type=int, default=1,
+                       help='Number of objects created and written concurrently'
+                            ' - every job uses its own HTTP session')
+@CommandGroup.argument('--incremental', action='store_true', default=False,
+                       help='Skip objects whose files have not changed since the last checkin'
+                            f' to the same system (recorded in {sap.cli.checkin_manifest.MANIFEST_FILE_NAME})')
+@CommandGroup.argument('--force', action='store_true', default=False,
+                       help='With --incremental, check in all objects and rebuild the manifest')
 @CommandGroup.argument('--starting-folder', default=None)
 @CommandGroup.argument('--software-component', type=str, default='LOCAL')
 @CommandGroup.argument('--app-component', type=str, default=None)
@@ -739,20 +1096,21 @@ def do_checkin_directory(connection, args):
 
     console = args.console_factory()
 
-    top_dir = '.'
-    if args.starting_folder:
-        top_dir = os.path.join(top_dir, args.starting_folder)
-
-    if not os.path.isdir(top_dir):
-        console.printerr(f'Cannot check-in ABAP objects from "{top_dir}": not a directory')
+    repo = _open_repository(args, console)
+    if repo is None:
         return 1
 
-    config = _get_config(args.starting_folder, console)
-    repo = Repository(args.name, config)
-
     flag = getattr(args, 'check', None)
     check_before_save = flag if flag is not None else config_get('check_before_save', False)
 
+    flag = getattr(args, 'compare', None)
+    compare_before_write = flag if flag is not None else config_get('compare_before_write', False)
+
+    manifest, system = _load_manifest(connection, args)
+
+    # the threads and their connections are shared by all activation waves
+    workers = sap.cli.helpers.ConnectionWorkers(connection, args.jobs, console=console)
+
     try:
         _load_objects(repo)
 
@@ -763,24 +1121,38 @@ def do_checkin_directory(connection, args):
         groups = _resolve_dependencies(repo.objects)
 
         for activation_group in groups:
+            if manifest is not None and not args.force:
+                activation_group = _skip_unchanged_objects(manifest, system, repo, activation_group, console)
+                if not activation_group:
+                    continue
+
             console.printout('Creating objects ...')
             inactive_objects = _checkin_dependency_group(
                 connection, repo, activation_group, console, args.corrnr,
-                check_before_save=check_before_save,
+                check_before_save=check_before_save, workers=workers,
+                compare_before_write=compare_before_write,
             )
 
             if inactive_objects.references:
                 console.printout('Activating objects ...')
                 _activate(connection, inactive_objects, console)
 
+            if manifest is not None:
+                # record only after successful activation to re-try broken objects next time
+                _record_checked_in_objects(manifest, system, repo, activation_group)
+                manifest.save()
+
         for unused_file in repo.unused_files:
             console.printerr(f'Unused file: {unused_file}')
-    except sap.adt.checks.ObjectCheckFindings as findings:
+    except (sap.adt.checks.ObjectCheckFindings, sap.adt.checks.ObjectListCheckFindings) as findings:
         for line in str(findings).splitlines():
             console.printerr(line)
         return 1
     except sap.errors.SAPCliError as ex:
         console.printerr(f'Checkin failed: {ex}')
         return 1
+    finally:
+        workers.close()
+        _forget_indexed_package(connection, args.name)
 
     return 0
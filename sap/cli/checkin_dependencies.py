@@ -0,0 +1,206 @@
+"""Checkin dependency graph - order of creating and activating objects
+
+Objects of an abapGit repository reference each other: classes implement
+interfaces and inherit from super-classes, sources use types of other
+classes and interfaces, programs include includes and call function modules
+of function groups. An object can be activated only together with or after
+the objects it depends on.
+
+The graph is built from the source files of the objects - every identifier
+of a source code which is the name of another object of the repository
+(or the name of a function module or an include of a function group of the
+repository) is considered a dependency. Comments and string literals are
+ignored except the function module name in CALL FUNCTION 'NAME'.
+
+Objects are put into activation waves - every object is in the wave
+following the waves of all its dependencies and objects depending on each
+other (cycles) are in the same wave because they must be activated by
+a single request. Objects of a wave do not depend on each other and can
+be written concurrently.
+"""
+
+import os
+import re
+
+from sap import get_logger
+
+
+# Positions of literals are preserved to find comments after them
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|`(?:[^`]|``)*`|\|(?:[^|\\]|\\.)*\|")
+
+CALL_FUNCTION_RE = re.compile(r"CALL\s+FUNCTION\s+'([^']+)'", re.IGNORECASE)
+
+IDENTIFIER_RE = re.compile(r'[A-Za-z_/][A-Za-z0-9_/]*')
+
+
+def mod_log():
+    """Module logger"""
+
+    return get_logger()
+
+
+def source_references(source_code):
+    """Returns the set of upper case identifiers and names of called function
+       modules of the ABAP source code without comments and literals.
+    """
+
+    names = set()
+
+    for line in source_code.splitlines():
+        if line.startswith('*'):
+            continue
+
+        code = LITERAL_RE.sub(lambda match: ' ' * len(match.group(0)), line)
+
+        comment = code.find('"')
+        if comment >= 0:
+            code = code[:comment]
+            line = line[:comment]
+
+        names.update(function.upper() for function in CALL_FUNCTION_RE.findall(line))
+        names.update(identifier.upper() for identifier in IDENTIFIER_RE.findall(code))
+
+    return names
+
+
+def provided_names(repo_obj):
+    """Returns the upper case names other objects use to refer to the object"""
+
+    names = {repo_obj.name.upper()}
+
+    if repo_obj.code == 'fugr':
+        # function modules and includes are stored in the files
+        # <group>.fugr.<name>.abap
+        for source_file in repo_obj.files:
+            parts = os.path.basename(source_file).split('.')
+            if len(parts) == 4 and parts[-1] == 'abap':
+                names.add(parts[2].upper())
+
+    return names
+
+
+def _read_references(repo_obj):
+    names = set()
+
+    for source_file in repo_obj.files:
+        if not source_file.endswith('.abap'):
+            continue
+
+        try:
+            with open(source_file, 'r', encoding='utf-8') as source:
+                names.update(source_references(source.read()))
+        except (OSError, UnicodeDecodeError) as ex:
+            # the checkin handler reports the file problem
+            mod_log().info('Cannot read dependencies of %s: %s', repo_obj.path, ex)
+
+    return names
+
+
+def build_dependency_graph(objects):
+    """Returns the list of sets where the set at the position N holds
+       positions of the objects the object N depends on.
+    """
+
+    owners = {}
+    for index, repo_obj in enumerate(objects):
+        for name in provided_names(repo_obj):
+            owners.setdefault(name, index)
+
+    graph = []
+    for index, repo_obj in enumerate(objects):
+        dependencies = {owners[name] for name in _read_references(repo_obj) if name in owners}
+        dependencies.discard(index)
+        graph.append(dependencies)
+
+        mod_log().debug('Dependencies of %s: %s', repo_obj.name, [objects[dep].name for dep in sorted(dependencies)])
+
+    return graph
+
+
+def _strongly_connected_components(graph):
+    """Tarjan's algorithm without recursion to handle long dependency chains.
+       Returns the list of component numbers of the nodes; dependencies are
+       numbered before the nodes depending on them.
+    """
+
+    # pylint: disable=too-many-locals
+    index_of = [None] * len(graph)
+    lowlink = [0] * len(graph)
+    on_stack = [False] * len(graph)
+    component_of = [None] * len(graph)
+    stack = []
+    work = []
+    visited = []
+
+    def _visit(node):
+        index_of[node] = lowlink[node] = len(visited)
+        visited.append(node)
+        stack.append(node)
+        on_stack[node] = True
+        work.append((node, iter(sorted(graph[node]))))
+
+    def _pop_component(node, component):
+        while True:
+            member = stack.pop()
+            on_stack[member] = False
+            component_of[member] = component
+            if member == node:
+                break
+
+    components = 0
+    for root, _ in enumerate(graph):
+        if index_of[root] is not None:
+            continue
+
+        _visit(root)
+
+        while work:
+            node, successors = work[-1]
+
+            for succ in successors:
+                if index_of[succ] is None:
+                    _visit(succ)
+                    break
+
+                if on_stack[succ]:
+                    lowlink[node] = min(lowlink[node], index_of[succ])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index_of[node]:
+                    _pop_component(node, components)
+                    components += 1
+
+    return component_of
+
+
+def activation_waves(objects, graph=None):
+    """Returns the list of lists of objects where every object is in a later
+       list than the objects it depends on. Objects keep their order within
+       a wave.
+    """
+
+    if graph is None:
+        graph = build_dependency_graph(objects)
+
+    component_of = _strongly_connected_components(graph)
+
+    members_of = {}
+    for node, component in enumerate(component_of):
+        members_of.setdefault(component, []).append(node)
+
+    # Tarjan's algorithm finishes components of dependencies first
+    component_wave = {}
+    for component, members in sorted(members_of.items()):
+        component_wave[component] = max((component_wave[component_of[dep]] + 1
+                                         for node in members for dep in graph[node]
+                                         if component_of[dep] != component), default=0)
+
+    waves = [[] for _ in range(max(component_wave.values(), default=-1) + 1)]
+    for node, repo_obj in enumerate(objects):
+        waves[component_wave[component_of[node]]].append(repo_obj)
+
+    return waves
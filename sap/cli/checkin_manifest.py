@@ -0,0 +1,134 @@
+"""Checkin manifest - hashes of files pushed to ABAP systems
+
+The manifest is a JSON file stored next to .abapgit.xml and it records
+the SHA-256 hash of every file of successfully checked in (and activated)
+objects per target system. The next checkin can skip objects whose files
+have not changed since the last push to the same system.
+"""
+
+import os
+import json
+import uuid
+import hashlib
+
+from sap import get_logger
+
+
+MANIFEST_FILE_NAME = '.sapcli-checkin.json'
+MANIFEST_VERSION = 1
+
+
+def mod_log():
+    """Module logger"""
+
+    return get_logger()
+
+
+def file_digest(path):
+    """Returns SHA-256 hex digest of the file contents"""
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(65536), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def system_key(connection):
+    """Returns the manifest key of the system the connection points to"""
+
+    return f'{connection.client}@{connection.host}:{connection.port}'
+
+
+class CheckinManifest:
+    """Hashes of files pushed to ABAP systems"""
+
+    def __init__(self, path, systems=None):
+        self._path = path
+        self._systems = systems if systems is not None else {}
+
+    @property
+    def path(self):
+        """Path to the manifest file"""
+
+        return self._path
+
+    @staticmethod
+    def load(path=MANIFEST_FILE_NAME):
+        """Loads the manifest from the file. Returns an empty manifest if the
+           file does not exist or cannot be parsed - the worst consequence of
+           losing the manifest is a full checkin.
+        """
+
+        try:
+            with open(path, 'r', encoding='utf-8') as manifest_file:
+                data = json.load(manifest_file)
+
+            if data.get('version') != MANIFEST_VERSION:
+                mod_log().info('Ignoring checkin manifest of unsupported version: %s', path)
+                return CheckinManifest(path)
+
+            systems = data['systems']
+            if not isinstance(systems, dict):
+                raise TypeError('systems is not a mapping')
+        except FileNotFoundError:
+            return CheckinManifest(path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as ex:
+            mod_log().info('Ignoring corrupted checkin manifest %s: %s', path, ex)
+            return CheckinManifest(path)
+
+        return CheckinManifest(path, systems)
+
+    def save(self):
+        """Stores the manifest atomically"""
+
+        data = {'version': MANIFEST_VERSION, 'systems': self._systems}
+
+        tmp = f'{self._path}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as manifest_file:
+                json.dump(data, manifest_file, indent=2, sort_keys=True)
+
+            os.replace(tmp, self._path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+            raise
+
+    def get(self, system, file_path):
+        """Returns the recorded entry {'sha256': ..., 'uri': ...} or None"""
+
+        return self._systems.get(system, {}).get(file_path)
+
+    def record(self, system, file_path, uri):
+        """Records the current contents of the file pushed to the object URI"""
+
+        self._systems.setdefault(system, {})[file_path] = {
+            'sha256': file_digest(file_path),
+            'uri': uri,
+        }
+
+    def forget(self, system, file_path):
+        """Removes the file from the manifest"""
+
+        self._systems.get(system, {}).pop(file_path, None)
+
+    def is_unchanged(self, system, file_paths):
+        """Returns True if all the files were recorded for the system
+           and their contents have not changed since then.
+        """
+
+        for file_path in file_paths:
+            entry = self.get(system, file_path)
+            if entry is None:
+                return False
+
+            try:
+                if entry.get('sha256') != file_digest(file_path):
+                    return False
+            except OSError:
+                return False
+
+        return True
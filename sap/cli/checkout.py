@@ -4,7 +4,9 @@ import os
 import sys
 
 import sap.adt
+import sap.adt.package_index
 import sap.cli.core
+import sap.cli.helpers
 
 from sap.platform.abap.ddic import VSEOCLASS, PROGDIR, TPOOL, VSEOINTERF, DEVC, AREAT, INCLUDES, FUNCTIONS, \
     FUNCTION_LINE, IMPORT_TYPE, CHANGING_TYPE, EXPORT_TYPE, TABLE_TYPE, EXCEPTION_TYPE, DOCUMENTATION_TYPE, RSFDO, \
@@ -103,28 +105,45 @@ def build_class_abap_attributes(clas):
     return vseoclass
 
 
-def checkout_class(connection, name, destdir=None):
+CLASS_SOURCE_PARTS = (
+    ('.clas', lambda clas: clas),
+    ('.clas.locals_def', lambda clas: clas.definitions),
+    ('.clas.locals_imp', lambda clas: clas.implementations),
+    ('.clas.testclasses', lambda clas: clas.test_classes),
+)
+
+
+def checkout_class(connection, name, destdir=None, jobs=1):
     """Download entire class"""
 
     sap.cli.core.printout(name)
     clas = sap.adt.Class(connection, name)
     clas.fetch()
 
-    download_abap_source(name, clas, '.clas', destdir=destdir)
-    download_abap_source(name, clas.definitions, '.clas.locals_def', destdir=destdir)
-    download_abap_source(name, clas.implementations, '.clas.locals_imp', destdir=destdir)
-    download_abap_source(name, clas.test_classes, '.clas.testclasses', destdir=destdir)
+    def _download_part(part_connection, part):
+        typsfx, get_source_object = part
+
+        # Source codes do not need fetched class attributes,
+        # so workers with own connections can use a new instance.
+        part_clas = clas if part_connection is connection else sap.adt.Class(part_connection, name)
+        download_abap_source(name, get_source_object(part_clas), typsfx, destdir=destdir)
+
+    with sap.cli.helpers.ConnectionWorkers(connection, jobs) as workers:
+        for _ in workers.map(_download_part, CLASS_SOURCE_PARTS):
+            pass
 
     vseoclass = build_class_abap_attributes(clas)
     dump_attributes_to_file(name, (vseoclass,), '.clas', 'LCL_OBJECT_CLAS', destdir=destdir)
 
 
+@CommandGroup.argument('-j', '--jobs', type=int, default=1,
+                       help='Number of source codes downloaded concurrently')
 @CommandGroup.argument('name')
 @CommandGroup.command('class')
 def abapclass(connection, args):
     """Download all class sources command wrapper"""
 
-    checkout_class(connection, args.name.upper())
+    checkout_class(connection, args.name.upper(), jobs=args.jobs)
 
 
 def build_program_abap_attributes(adt_program):
@@ -355,7 +374,7 @@ def function_group(connection, args):
     return 0
 
 
-def checkout_objects(connection, objects, destdir=None):
+def checkout_objects(connection, objects, destdir=None, jobs=1):
     """Checkout all objects from the give list"""
 
     # This could be a global variable but it breaks mock patching in tests
@@ -369,11 +388,20 @@ def checkout_objects(connection, objects, destdir=None):
     if not os.path.isdir(destdir):
         os.makedirs(destdir)
 
+    supported = []
     for obj in objects:
-        try:
-            checkouters[obj.typ](connection, obj.name, destdir)
-        except KeyError:
+        if obj.typ not in checkouters:
             print(f'Unsupported object: {obj.typ} {obj.name}', file=sys.stderr)
+            continue
+
+        supported.append(obj)
+
+    def _checkout_object(obj_connection, obj):
+        checkouters[obj.typ](obj_connection, obj.name, destdir)
+
+    with sap.cli.helpers.ConnectionWorkers(connection, jobs) as workers:
+        for _ in workers.map(_checkout_object, supported):
+            pass
 
 
 def make_repo_dir_for_package(args):
@@ -414,6 +442,9 @@ def checkout_package(connection, name, destdir=None):
 
 
 # @CommandGroup.argument('--folder-logic', choices=['full', 'prefix'], default='prefix')
+@CommandGroup.argument('-j', '--jobs', type=int, default=1,
+                       help='Number of objects downloaded and sub-packages explored concurrently'
+                            ' - every job uses its own HTTP session')
 @CommandGroup.argument('--recursive', action='store_true', default=False)
 @CommandGroup.argument('--starting-folder', default='src')
 @CommandGroup.argument('directory', nargs='?', default=None,
@@ -428,22 +459,28 @@ def package(connection, args):
 
     explored = sap.adt.Package(connection, args.name)
 
-    for package_name_hier, _, objects in sap.adt.package.walk(explored):
-        destdir = os.path.abspath(source_code_dir)
+    jobs = args.jobs if args.recursive else 1
+    index = sap.adt.package_index.get_package_index(connection)
+    try:
+        for package_name_hier, _, objects in sap.adt.package.walk(explored, jobs=jobs, index=index):
+            destdir = os.path.abspath(source_code_dir)
 
-        if len(package_name_hier) == 1:
-            destdir = os.path.join(destdir, package_name_hier[0].lower())
-        elif len(package_name_hier) > 1:
-            hier_path = os.path.join(*package_name_hier)
-            destdir = os.path.join(destdir, hier_path.lower())
+            if len(package_name_hier) == 1:
+                destdir = os.path.join(destdir, package_name_hier[0].lower())
+            elif len(package_name_hier) > 1:
+                hier_path = os.path.join(*package_name_hier)
+                destdir = os.path.join(destdir, hier_path.lower())
 
-        if not package_name_hier:
-            package_name = args.name
-        else:
-            package_name = package_name_hier[-1]
+            if not package_name_hier:
+                package_name = args.name
+            else:
+                package_name = package_name_hier[-1]
 
-        checkout_objects(connection, objects, destdir=destdir)
-        checkout_package(connection, package_name.upper(), destdir=destdir)
+            checkout_objects(connection, objects, destdir=destdir, jobs=args.jobs)
+            checkout_package(connection, package_name.upper(), destdir=destdir)
 
-        if not args.recursive:
-            break
+            if not args.recursive:
+                break
+    finally:
+        if index is not None:
+            index.close()
@@ -3,6 +3,7 @@
 import sys
 import json
 import typing
+import threading
 
 from contextlib import contextmanager
 
@@ -262,6 +263,38 @@ class ConsoleFileDecorator:
         self.file_object.flush()
 
 
+class RecordingConsole:
+    """Records the printed out messages to replay them later.
+
+       Useful for worker threads whose output must not interleave with
+       the output of other threads.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def printout(self, *objects, sep=' ', end='\n'):
+        """Records a message for the standard output"""
+
+        self.records.append(('printout', objects, sep, end))
+
+    def printerr(self, *objects, sep=' ', end='\n'):
+        """Records a message for the error output"""
+
+        self.records.append(('printerr', objects, sep, end))
+
+    def flush(self):
+        """Nothing to flush"""
+
+    def replay(self, console):
+        """Prints out the recorded messages to the given console"""
+
+        for method, objects, sep, end in self.records:
+            getattr(console, method)(*objects, sep=sep, end=end)
+
+        self.records = []
+
+
 @contextmanager
 def console_printout_file(console, path):
     """Helper method for printing to file if available."""
@@ -274,6 +307,7 @@ def console_printout_file(console, path):
 
 
 _CONSOLE: typing.Union[PrintConsole, None] = None
+_THREAD_CONSOLE = threading.local()
 
 
 def get_console():
@@ -282,6 +316,10 @@ def get_console():
     # pylint: disable=global-statement
     global _CONSOLE
 
+    redirected = getattr(_THREAD_CONSOLE, 'console', None)
+    if redirected is not None:
+        return redirected
+
     if _CONSOLE is None:
         _CONSOLE = PrintConsole()
 
@@ -300,6 +338,20 @@ def set_console(new_console: PrintConsole) -> typing.Union[PrintConsole, None]:
     return old
 
 
+@contextmanager
+def thread_console(console):
+    """Redirects the output of get_console() in the current thread
+       to the given console.
+    """
+
+    old = getattr(_THREAD_CONSOLE, 'console', None)
+    _THREAD_CONSOLE.console = console
+    try:
+        yield console
+    finally:
+        _THREAD_CONSOLE.console = old
+
+
 def printout(*objects, sep=' ', end='\n'):
     """A shortcut for get_console().printout()"""
 
@@ -1,10 +1,12 @@
 """Auxiliary functionality"""
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from enum import Enum, auto
 import time
 import threading
 
 from sap.errors import SAPCliError
+import sap.cli.core
 
 
 class TaskStates(Enum):
@@ -96,6 +98,119 @@ class ConsoleHeartBeat:
         return False
 
 
+class ConnectionWorkers:
+    """Runs a function for a list of items on a bounded pool of threads where
+       every thread owns its own clone of the connection (i.e. its own HTTP
+       session).
+
+       The output the function prints out via sap.cli.core is recorded and
+       replayed in the order of the items to keep the output deterministic.
+
+       With a single job, the function is called directly in the current
+       thread with the original connection.
+
+       The threads and their connections are kept for the lifetime of the
+       workers to be reused by subsequent calls of map(); use the workers as
+       a context manager or call close() to stop the threads and close HTTP
+       sessions of the connections.
+    """
+
+    def __init__(self, connection, jobs, console=None):
+        if jobs is None or jobs < 1:
+            raise sap.cli.core.InvalidCommandLineError(f'The number of jobs must be a positive integer: {jobs}')
+
+        self._connection = connection
+        self._jobs = jobs
+        self._console = console
+        self._local = threading.local()
+        self._executor = None
+        self._clones = []
+        self._clones_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def jobs(self):
+        """Maximum number of concurrently running functions"""
+
+        return self._jobs
+
+    def close(self):
+        """Stops the threads and closes HTTP sessions of their connections"""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+        # the threads are gone and so are their thread local connections
+        self._local = threading.local()
+
+        with self._clones_lock:
+            clones, self._clones = self._clones, []
+
+        for clone in clones:
+            clone.close()
+
+    def _worker_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._connection.clone()
+            self._local.connection = connection
+
+            with self._clones_lock:
+                self._clones.append(connection)
+
+        return connection
+
+    def _run_task(self, func, item):
+        recorder = sap.cli.core.RecordingConsole()
+
+        with sap.cli.core.thread_console(recorder):
+            try:
+                return recorder, func(self._worker_connection(), item), None
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                return recorder, None, ex
+
+    def map(self, func, items):
+        """Yields results of func(connection, item) in the order of items.
+
+           An exception raised by the function is re-raised when its result
+           is about to be yielded and the items which have not been started
+           yet are cancelled.
+        """
+
+        if self._jobs == 1:
+            for item in items:
+                yield func(self._connection, item)
+
+            return
+
+        console = self._console if self._console is not None else sap.cli.core.get_console()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._jobs)
+
+        futures = [self._executor.submit(self._run_task, func, item) for item in items]
+        try:
+            for future in futures:
+                recorder, result, error = future.result()
+                recorder.replay(console)
+
+                if error is not None:
+                    raise error
+
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+
+            # do not let the cancelled map run concurrently with the next one
+            wait(futures)
+
+
 class TableWriter:
     """A helper class for formatting a list of objects into a table"""
 
@@ -14,6 +14,7 @@ import sap.errors
 import sap.adt
 import sap.adt.checks
 import sap.adt.errors
+import sap.adt.objects
 import sap.adt.wb
 import sap.adt.whereused
 import sap.cli.wb
@@ -125,11 +126,18 @@ def printout_adt_object(console, prefix, obj):
     console.printout(f'{prefix}{obj.objtype.code} {obj.name}')
 
 
-def activate_object_list(activator, object_enumerable, count, console):
-    """Starts object activation and handles results"""
+def activate_object_list(activator, object_enumerable, count, console, chunk_size=None):
+    """Starts object activation and handles results.
+
+       If chunk_size is given, the objects are activated in chunks by
+       a single request instead of one by one.
+    """
 
     try:
-        stats = activator.activate_sequentially(object_enumerable, count)
+        if chunk_size is None:
+            stats = activator.activate_sequentially(object_enumerable, count)
+        else:
+            stats = activator.activate_in_chunks(object_enumerable, count, chunk_size=chunk_size)
     except sap.cli.wb.StopObjectActivation as ex:
         console.printout('Activation has stopped')
 
@@ -226,6 +234,12 @@ class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
         write_cmd.append_argument('--no-check', dest='check', action='store_false',
                                   help='Skip abapCheckRun before writing source code'
                                        ' (overrides SAPCLI_CHECK_BEFORE_SAVE)')
+        write_cmd.append_argument('--compare', dest='compare', action='store_true', default=None,
+                                  help='Do not write and activate source code identical to the source'
+                                       ' on the server (overrides SAPCLI_COMPARE_BEFORE_WRITE)')
+        write_cmd.append_argument('--no-compare', dest='compare', action='store_false',
+                                  help='Always write source code'
+                                       ' (overrides SAPCLI_COMPARE_BEFORE_WRITE)')
         write_cmd.declare_corrnr()
 
         return write_cmd
@@ -243,6 +257,12 @@ class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
                                      default=False, help='Do not stop activation in case of errors')
         activate_cmd.append_argument('--warning-errors', action='store_true',
                                      default=False, help='Treat Activation warnings as errors')
+        activate_cmd.append_argument('--chunk-size', type=int, default=sap.adt.wb.DEFAULT_MASS_ACTIVATION_CHUNK_SIZE,
+                                     help='Maximum number of objects activated by a single request when'
+                                          ' activating more objects; chunks with errors are split to isolate'
+                                          ' the broken objects and the other objects are activated even without'
+                                          ' --ignore-errors;'
+                                          f' default: {sap.adt.wb.DEFAULT_MASS_ACTIVATION_CHUNK_SIZE}')
 
         return activate_cmd
 
@@ -416,10 +436,20 @@ class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
         flag = getattr(args, 'check', None)
         check_before_save = flag if flag is not None else config_get('check_before_save', False)
 
+        flag = getattr(args, 'compare', None)
+        compare_before_write = flag if flag is not None else config_get('compare_before_write', False)
+
+        unchanged = collections.OrderedDict()
+
         for obj, text in write_args_to_objects(self, connection, args):
-            console.printout('*', str(obj))
             code = ''.join(text)
 
+            if compare_before_write and sap.adt.objects.is_source_unchanged(obj, code):
+                console.printout('*', str(obj), '(unchanged)')
+                unchanged[obj.name] = obj
+                continue
+
+            console.printout('*', str(obj))
             self._save_object_text(obj, code, check_before_save, args.corrnr)
 
             toactivate[obj.name] = obj
@@ -427,6 +457,16 @@ class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
         if not args.activate:
             return 0
 
+        unchanged = [obj for name, obj in unchanged.items() if name not in toactivate]
+        if unchanged:
+            # nothing was written but an older write may not have been activated
+            for obj in sap.adt.wb.filter_inactive_objects(connection, unchanged):
+                toactivate[obj.name] = obj
+
+        if not toactivate:
+            console.printout('Nothing to activate')
+            return 0
+
         activated_items = toactivate.items()
         return activate_object_list(self.build_activator(args), activated_items, len(activated_items), console)
 
@@ -474,7 +514,11 @@ class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
 
         console = args.console_factory()
         activated_items = ((name, self.instance(connection, name, args)) for name in args.name)
-        return activate_object_list(self.build_activator(args), activated_items, len(args.name), console)
+
+        # A single object is activated with a refresh of its activation status
+        chunk_size = args.chunk_size if len(args.name) > 1 else None
+        return activate_object_list(self.build_activator(args), activated_items, len(args.name), console,
+                                    chunk_size=chunk_size)
 
 
 # pylint: disable=abstract-method
@@ -7,8 +7,10 @@ from sap import get_logger
 import sap.adt
 import sap.adt.checks
 import sap.adt.objects
+import sap.adt.package_index
 import sap.adt.wb
 import sap.cli.wb
+import sap.cli.helpers
 import sap.http
 from sap.adt.errors import ExceptionResourceAlreadyExists, ExceptionResourceNotFound
 from sap.adt.objects import ADTObjectReference, ADTObjectReferences
@@ -22,6 +24,14 @@ def mod_log():
     return get_logger()
 
 
+class IndexCommandGroup(sap.cli.core.CommandGroup):
+    """Local package index commands
+    """
+
+    def __init__(self):
+        super().__init__('index')
+
+
 class CommandGroup(sap.cli.core.CommandGroup):
     """Adapter converting command line parameters to sap.adt.Package methods
        calls.
@@ -30,6 +40,14 @@ class CommandGroup(sap.cli.core.CommandGroup):
     def __init__(self):
         super().__init__('package')
 
+        self.index_grp = IndexCommandGroup()
+
+    def install_parser(self, arg_parser):
+        package_group = super().install_parser(arg_parser)
+
+        index_parser = package_group.add_parser(self.index_grp.name)
+        self.index_grp.install_parser(index_parser)
+
 
 @CommandGroup.argument_corrnr()
 @CommandGroup.argument('--no-error-existing', action='store_true', default=False,
@@ -79,7 +97,17 @@ def create(connection, args):
 
         mod_log().info(err.message)
 
+    changed = [package.name]
+    if args.super_package is not None:
+        # the super package has got a new sub-package
+        changed.append(args.super_package)
+
+    sap.adt.package_index.forget_indexed_trees(connection, changed)
 
+
+@CommandGroup.argument('-j', '--jobs', type=int, default=1,
+                       help='Number of sub-packages explored concurrently with --recursive'
+                            ' - every job uses its own HTTP session')
 @CommandGroup.argument('-l', '--long', default=False, action='store_true', help='Print object details')
 @CommandGroup.argument('-r', '--recursive', default=False, action='store_true', help='List sub-packages')
 @CommandGroup.argument('name')
@@ -97,31 +125,37 @@ def list_package(connection, args):
     items = []
     type_width = 0
     name_width = 0
-    for pkg, subpackages, objects in sap.adt.package.walk(package, withdescr=args.long):
-        basedir = '/'.join(pkg)
-        if basedir:
-            basedir += '/'
-
-        if not args.recursive:
-            for subpkg in subpackages:
-                if args.long:
-                    items.append((None, basedir, subpkg.typ, subpkg.name, subpkg.description))
-                    type_width = max(type_width, len(subpkg.typ))
-                    name_width = max(name_width, len(basedir) + len(subpkg.name))
-                else:
-                    items.append((f'{basedir}{subpkg}', None, None, None, None))
+    jobs = args.jobs if args.recursive else 1
+    index = sap.adt.package_index.get_package_index(connection)
+    try:
+        for pkg, subpackages, objects in sap.adt.package.walk(package, withdescr=args.long, jobs=jobs, index=index):
+            basedir = '/'.join(pkg)
+            if basedir:
+                basedir += '/'
+
+            if not args.recursive:
+                for subpkg in subpackages:
+                    if args.long:
+                        items.append((None, basedir, subpkg.typ, subpkg.name, subpkg.description))
+                        type_width = max(type_width, len(subpkg.typ))
+                        name_width = max(name_width, len(basedir) + len(subpkg.name))
+                    else:
+                        items.append((f'{basedir}{subpkg}', None, None, None, None))
 
-        for obj in objects:
-            items.append((None, basedir, obj.typ, obj.name, obj.description))
-            type_width = max(type_width, len(obj.typ))
-            name_width = max(name_width, len(basedir) + len(obj.name))
+            for obj in objects:
+                items.append((None, basedir, obj.typ, obj.name, obj.description))
+                type_width = max(type_width, len(obj.typ))
+                name_width = max(name_width, len(basedir) + len(obj.name))
 
-        if not args.recursive:
-            break
+            if not args.recursive:
+                break
 
-        # Print empty packages in non-long format and recursive
-        if not subpackages and not objects:
-            items.append((f'{basedir}', None, None, None, None))
+            # Print empty packages in non-long format and recursive
+            if not subpackages and not objects:
+                items.append((f'{basedir}', None, None, None, None))
+    finally:
+        if index is not None:
+            index.close()
 
     # Print items
     for item in items:
@@ -248,33 +282,64 @@ def activate(connection, args):
     console.printout('Activation completed successfully')
 
 
-def _run_reporters_for_objects(connection, reporters, package_objects):
+DEFAULT_CHECK_CHUNK_SIZE = 100
 
-    results = []
-    checks = 0
-    for reporter in reporters:
-        check_objects = sap.adt.checks.CheckObjectList()
 
-        has_object = False
-        for objref in package_objects:
-            if reporter.supports_type(objref.typ):
-                has_object = True
-                mod_log().debug('Reporter %s supports %s %s', reporter.name, objref.typ, objref.name)
-                check_objects.add_uri(objref.uri)
+def _build_check_tasks(reporters, package_objects, chunk_size):
+    """Returns the list of (reporter, objects) where objects is a chunk
+       of the objects supported by the reporter.
+    """
+
+    tasks = []
+    for reporter in reporters:
+        supported = [objref for objref in package_objects if reporter.supports_type(objref.typ)]
 
-        if not has_object:
+        if not supported:
             mod_log().debug('No object for Report %s', reporter.name)
             continue
 
-        try:
-            reports = sap.adt.checks.run(connection, reporter, check_objects)
-            checks += 1
-        except sap.http.HTTPRequestError as ex:
-            mod_log().info('Reporter %s\n%s', reporter.name, str(ex))
-        else:
-            results.extend(reports)
+        for start in range(0, len(supported), chunk_size):
+            tasks.append((reporter, supported[start:start + chunk_size]))
+
+    return tasks
+
+
+def _run_reporter_for_objects(connection, reporter, package_objects):
+    """Runs the reporter for all the objects in a single request and
+       returns the tuple (number of checked objects, reports).
+
+       If the request fails for more than one object, the objects are checked
+       one by one to get results of the objects the server can check.
+    """
+
+    check_objects = sap.adt.checks.CheckObjectList()
+    for objref in package_objects:
+        mod_log().debug('Reporter %s supports %s %s', reporter.name, objref.typ, objref.name)
+        check_objects.add_uri(objref.uri)
+
+    try:
+        reports = sap.adt.checks.run(connection, reporter, check_objects)
+    except sap.http.HTTPRequestError as ex:
+        mod_log().info('Reporter %s\n%s', reporter.name, str(ex))
+
+        if len(package_objects) == 1:
+            return 0, []
+
+        checks = 0
+        reports = []
+        for objref in package_objects:
+            obj_checks, obj_reports = _run_reporter_for_objects(connection, reporter, [objref])
+            checks += obj_checks
+            reports.extend(obj_reports)
+
+        return checks, reports
 
-    return checks, results
+    return len(package_objects), reports
+
+
+def _run_check_task(connection, task):
+    reporter, package_objects = task
+    return _run_reporter_for_objects(connection, reporter, package_objects)
 
 
 # pylint: disable=too-few-public-methods
@@ -342,6 +407,11 @@ def _print_out_messages(reports, checks_cntr, index, group_by, console):
     return (messages_cntr, warnings_cntr, errors_cntr)
 
 
+@CommandGroup.argument('-j', '--jobs', type=int, default=1,
+                       help='Number of sub-packages explored and check requests sent concurrently'
+                            ' - every job uses its own HTTP session')
+@CommandGroup.argument('--chunk-size', type=int, default=DEFAULT_CHECK_CHUNK_SIZE,
+                       help=f'Maximum number of objects checked in a single request; default: {DEFAULT_CHECK_CHUNK_SIZE}')
 @CommandGroup.argument('--group-by', nargs='?', choices=[GroupByChoice.OBJECT, GroupByChoice.MESSAGE],
                        help='to group output by')
 @CommandGroup.argument('-c', '--checks', nargs='*', help='name of the check reporter; default: all available')
@@ -350,6 +420,9 @@ def _print_out_messages(reports, checks_cntr, index, group_by, console):
 def check(connection, args):
     """Run ADT checks for all objects in all sub-packages"""
 
+    if args.chunk_size < 1:
+        raise sap.cli.core.InvalidCommandLineError(f'The chunk size must be a positive integer: {args.chunk_size}')
+
     reporters = sap.adt.checks.fetch_reporters(connection)
     if not reporters:
         sap.cli.core.printerr('No ADT Checks Reporters provided by the system')
@@ -358,24 +431,67 @@ def check(connection, args):
     package = sap.adt.Package(connection, args.name)
 
     all_objects = []
-    for _, __, objects in sap.adt.package.walk(package):
-        all_objects.extend(objects)
+    index = sap.adt.package_index.get_package_index(connection)
+    try:
+        for _, __, objects in sap.adt.package.walk(package, jobs=args.jobs, index=index):
+            all_objects.extend(objects)
+    finally:
+        if index is not None:
+            index.close()
 
     if not all_objects:
         sap.cli.core.printerr('No objects found')
         return 1
 
-    checks = 0
-    reports = []
     index = {}
+    position = {}
     for obj in all_objects:
         index[obj.uri] = obj
+        position.setdefault(obj.uri, len(position))
 
-        mod_log().info('Checking object: %s %s %s', obj.typ, obj.uri, obj.name)
-        runs, results = _run_reporters_for_objects(connection, reporters, [obj])
-        checks += runs
-        reports.extend(results)
+    tasks = _build_check_tasks(reporters, all_objects, args.chunk_size)
+    mod_log().info('Checking %d objects in %d requests', len(all_objects), len(tasks))
+
+    checks = 0
+    reports = []
+    with sap.cli.helpers.ConnectionWorkers(connection, args.jobs) as workers:
+        for runs, results in workers.map(_run_check_task, tasks):
+            checks += runs
+            reports.extend(results)
+
+    # De-multiplex the reports of the chunks by the triggering object and keep
+    # the order of reporters for every object.
+    reports.sort(key=lambda report: position.get(report.triggering_uri, len(position)))
 
     _, __, errors = _print_out_messages(reports, checks, index, args.group_by, args.console_factory())
 
     return 0 if errors == 0 else 1
+
+
+@IndexCommandGroup.argument('-j', '--jobs', type=int, default=1,
+                            help='Number of sub-packages explored concurrently'
+                                 ' - every job uses its own HTTP session')
+@IndexCommandGroup.argument('name', nargs='+')
+@IndexCommandGroup.command()
+def refresh(connection, args):
+    """Explore the package trees on the server and store them in the local
+       package index regardless of the age of the indexed entries.
+    """
+
+    console = args.console_factory()
+    index = sap.adt.package_index.open_package_index(connection)
+
+    try:
+        for name in args.name:
+            index.forget_tree(name)
+
+            packages = 0
+            objects = 0
+            for _, _, package_objects in sap.adt.package.walk(sap.adt.Package(connection, name.upper()),
+                                                              jobs=args.jobs, index=index):
+                packages += 1
+                objects += len(package_objects)
+
+            console.printout(f'Indexed {packages} package(s) and {objects} object(s) of {name.upper()}')
+    finally:
+        index.close()
@@ -92,16 +92,13 @@ class ObjectActivationWorker:
         printout(f'-- {msg.obj_descr}')
         printout(f'   {msg.typ}: {msg.short_text}')
 
-    def handle_results(self, name, obj, results, stats):
-        """Processes activation results for a single object"""
+    def _handle_messages(self, results, stats):
+        """Reports the activation messages and returns True if there
+           is an error.
+        """
 
         error = False
 
-        if obj.active == ADT_OBJECT_VERSION_ACTIVE:
-            stats.active_objects.append(obj)
-        else:
-            stats.inactive_objects.append(obj)
-
         for msg in results.messages:
             if msg.is_error:
                 error = True
@@ -115,9 +112,34 @@ class ObjectActivationWorker:
 
             self.handle_message(msg)
 
+        return error
+
+    def handle_results(self, name, obj, results, stats):
+        """Processes activation results for a single object"""
+
+        if obj.active == ADT_OBJECT_VERSION_ACTIVE:
+            stats.active_objects.append(obj)
+        else:
+            stats.inactive_objects.append(obj)
+
+        error = self._handle_messages(results, stats)
+
         if (error and not self.continue_on_errors):
             raise StopObjectActivation('Stopped activation because of errors', stats, name, obj)
 
+    def handle_chunk_results(self, objects, results, stats):
+        """Processes results of activation of several objects by a single
+           request - the objects were activated unless the results contain
+           an error.
+        """
+
+        if results.has_errors:
+            stats.inactive_objects.extend(objects)
+        else:
+            stats.active_objects.extend(objects)
+
+        self._handle_messages(results, stats)
+
     def activate_sequentially(self, name_and_obj_tuples, count=None):
         """Sequentially goes from the enumerable name_and_obj_tuples and tries
         to activate each object.
@@ -134,25 +156,55 @@ class ObjectActivationWorker:
 
         return stats
 
+    def activate_in_chunks(self, name_and_obj_tuples, count=None,
+                           chunk_size=sap.adt.wb.DEFAULT_MASS_ACTIVATION_CHUNK_SIZE):
+        """Activates chunks of objects from the enumerable name_and_obj_tuples
+        by a single request and bisects the chunks with errors to isolate
+        the objects which cannot be activated.
+
+        The activation does not stop on errors because the other objects
+        of the bisected chunks are activated anyway; the objects which
+        cannot be activated are reported in stats.inactive_objects.
+        """
+
+        items = list(name_and_obj_tuples)
+        if count is None:
+            count = len(items)
+
+        stats = ObjectActivationStats()
+        self.begin(count)
+        if not items:
+            return stats
+
+        connection = items[0][1].connection
+        activated = 0
+        for objects, results in sap.adt.wb.bisect_mass_activate(connection, [obj for _, obj in items], chunk_size):
+            chunk = items[activated:activated + len(objects)]
+
+            for index, item in enumerate(chunk, start=activated + 1):
+                self.start_object(item[0], index, count)
+
+            activated += len(objects)
+            self.handle_chunk_results(objects, results, stats)
+
+        return stats
+
 
 def activate(connection, inactive_objects, console):
     """Mass-activate the given inactive objects and report results.
 
-       Raises SAPCliError when activation produces errors.
+       Chunks with errors are bisected to activate all objects but the broken
+       ones. Raises SAPCliError when activation produces errors.
     """
 
-    messages = sap.adt.wb.try_mass_activate(connection, inactive_objects)
-
-    if not messages:
-        return
-
     error = False
-    for msg in messages:
-        if msg.is_error:
-            error = True
+    for _, results in sap.adt.wb.bisect_mass_activate_references(connection, inactive_objects):
+        for msg in results.messages:
+            if msg.is_error:
+                error = True
 
-        console.printout(f'* {msg.obj_descr} ::')
-        console.printout(f'| {msg.typ}: {msg.short_text}')
+            console.printout(f'* {msg.obj_descr} ::')
+            console.printout(f'| {msg.typ}: {msg.short_text}')
 
     if error:
         raise sap.errors.SAPCliError('Aborting because of activation errors')
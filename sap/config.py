@@ -647,6 +647,7 @@ def _env_bool(name: str, default: bool) -> bool:
     return default
 
 
+# pylint: disable=too-many-return-statements
 def config_get(option: str, default: Any = None) -> Any:
     """Returns configuration values.
 
@@ -663,8 +664,23 @@ def config_get(option: str, default: Any = None) -> Any:
     if option == 'http_timeout':
         return float(os.environ.get('SAPCLI_HTTP_TIMEOUT', 900))
 
+    if option == 'session_cache_ttl':
+        return float(os.environ.get('SAPCLI_SESSION_CACHE_TTL', 0))
+
+    if option == 'discovery_cache_ttl':
+        return float(os.environ.get('SAPCLI_DISCOVERY_CACHE_TTL', 0))
+
+    if option == 'package_index_ttl':
+        return float(os.environ.get('SAPCLI_PACKAGE_INDEX_TTL', 0))
+
+    if option == 'profile':
+        return os.environ.get('SAPCLI_PROFILE') or default
+
     if option == 'check_before_save':
         fallback = True if default is None else bool(default)
         return _env_bool('SAPCLI_CHECK_BEFORE_SAVE', fallback)
 
+    if option == 'compare_before_write':
+        return _env_bool('SAPCLI_COMPARE_BEFORE_WRITE', bool(default))
+
     return default
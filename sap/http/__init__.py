@@ -56,4 +56,5 @@ from sap.http.client import (  # noqa: E402, F401  # pylint: disable=unused-impo
     default_http_error_handler,
     HTTPClient,
     requests,
+    response_stream,
 )
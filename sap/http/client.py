@@ -1,5 +1,7 @@
 """HTTP client for SAP ABAP systems built on top of Python requests."""
 
+import time
+import logging
 from typing import Protocol, runtime_checkable
 
 import requests
@@ -7,6 +9,7 @@ import requests.exceptions
 from requests.auth import HTTPBasicAuth
 
 from sap import get_logger, config_get
+from sap.profiling import get_profiler, body_size
 from sap.http.errors import (
     HTTPRequestError,
     UnauthorizedError,
@@ -14,6 +17,30 @@ from sap.http.errors import (
 )
 
 
+def response_stream(response):
+    """Returns a file-like object reading the decoded body of the response
+       executed with stream=True. The body is not loaded into memory.
+    """
+
+    response.raw.decode_content = True
+    return response.raw
+
+
+def _response_size(res, stream):
+    """Returns the size of the response body without reading streamed bodies"""
+
+    if res is None:
+        return 0
+
+    if stream:
+        try:
+            return int(res.headers.get('Content-Length', 0))
+        except ValueError:
+            return 0
+
+    return body_size(res.content)
+
+
 def build_query_args(client=None, saml2=None):
     """Build the query arguments for the ABAP HTTP request."""
     args = {}
@@ -105,6 +132,7 @@ class HTTPClient():
                  login_path='',
                  login_method='HEAD',
                  session_initializer=None,
+                 session_cache=None,
                  ):
 
         self.ssl = ssl
@@ -135,6 +163,7 @@ class HTTPClient():
         if session_initializer is None:
             session_initializer = BasicAuthHTTPSessionInitializer(user, password)
         self._session_initializer = session_initializer
+        self._session_cache = session_cache
 
         self.error_handlers = [default_http_error_handler]
         self._connection_error_handler = None
@@ -182,8 +211,13 @@ class HTTPClient():
 
         self._connection_error_handler = handler
 
-    def retrieve(self, session, method, path, params=None, headers=None, body=None):
-        """Execute an HTTP request and return the raw (request, response) tuple."""
+    def retrieve(self, session, method, path, params=None, headers=None, body=None, stream=False):
+        """Execute an HTTP request and return the raw (request, response) tuple.
+
+           If stream is True, the response body is not read and must be
+           consumed via response_stream() or the response content.
+        """
+        # pylint: disable=too-many-locals
 
         url = f'{self._base_url}/{path.lstrip("/")}'
         default_params = build_query_args(self.client, self.saml2)
@@ -191,13 +225,18 @@ class HTTPClient():
         req = requests.Request(method.upper(), url, params=default_params, data=body, headers=headers)
         req = session.prepare_request(req)
 
-        get_logger().info('Executing %s %s', method, url)
+        logger = get_logger()
+        logger.info('Executing %s %s', method, url)
 
         if body is not None:
-            get_logger().info('Body %s ', body)
+            logger.info('Body %s ', body)
+
+        profiler = get_profiler()
+        started = time.perf_counter()
+        res = None
 
         try:
-            res = session.send(req, timeout=self.timeout)
+            res = session.send(req, timeout=self.timeout, stream=stream)
         except requests.exceptions.ConnectTimeout as ex:
             raise TimedOutRequestError(req, self.timeout) from ex
         except requests.exceptions.ReadTimeout as ex:
@@ -207,41 +246,90 @@ class HTTPClient():
                 self._connection_error_handler(self, ex)
                 # Handler must raise; if not we reraise the original exception
             raise
-
-        get_logger().debug('Response %s %s:\n++++\n%s\n++++', method, url, res.text)
+        finally:
+            if profiler is not None:
+                profiler.record_http(method, path, res.status_code if res is not None else None,
+                                     started, time.perf_counter() - started,
+                                     request_bytes=body_size(req.body),
+                                     response_bytes=_response_size(res, stream))
+
+        # Decoding the response text is expensive - do it for debugging only
+        if stream:
+            logger.debug('Response %s %s: streamed', method, url)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Response %s %s:\n++++\n%s\n++++', method, url, res.text)
 
         return (req, res)
 
-    def execute_with_session(self, session, method, path, params=None, headers=None, body=None):
+    def execute_with_session(self, session, method, path, params=None, headers=None, body=None, stream=False):
         """Executes the given URL using the given method in
            the common HTTP session.
         """
 
-        req, res = self.retrieve(session, method, path, params=params, headers=headers, body=body)
-
-        if res.status_code == 403 and (not headers or headers.get('x-csrf-token', '') != 'Fetch'):
-            get_logger().debug('Re-Fetching CSRF token')
+        req, res = self.retrieve(session, method, path, params=params, headers=headers, body=body, stream=stream)
 
-            session.headers.pop('x-csrf-token', None)
+        csrf_fetch = headers is not None and headers.get('x-csrf-token', '') == 'Fetch'
 
-            response = self.execute_with_session(
-                session,
-                self.login_method,
-                self.login_path,
-                headers={'x-csrf-token': 'Fetch'}
-            )
+        if res.status_code == 403 and not csrf_fetch:
+            try:
+                self._refetch_csrf_token(session)
+            except UnauthorizedError:
+                if self._session_cache is None:
+                    raise
 
-            session.headers['x-csrf-token'] = response.headers['x-csrf-token']
+                self._relogin(session)
 
-            req, res = self.retrieve(session, method, path, params=params, headers=headers, body=body)
+            req, res = self.retrieve(session, method, path, params=params, headers=headers, body=body, stream=stream)
+        elif res.status_code == 401 and not csrf_fetch and self._session_cache is not None:
+            self._relogin(session)
+            req, res = self.retrieve(session, method, path, params=params, headers=headers, body=body, stream=stream)
 
         if res.status_code >= 400:
             self.handle_http_error(req, res)
 
         return res
 
+    def _refetch_csrf_token(self, session):
+        get_logger().debug('Re-Fetching CSRF token')
+
+        session.headers.pop('x-csrf-token', None)
+
+        response = self.execute_with_session(
+            session,
+            self.login_method,
+            self.login_path,
+            headers={'x-csrf-token': 'Fetch'}
+        )
+
+        session.headers['x-csrf-token'] = response.headers['x-csrf-token']
+        self._save_session(session)
+
+    def _relogin(self, session):
+        """Replaces the rejected (probably cached) session cookies by a new login"""
+
+        get_logger().info('HTTP session rejected, logging in again')
+
+        self._session_cache.forget(self._session_cache_key())
+
+        session.cookies.clear()
+        self._session_initializer.initialize_session(session)
+        self._refetch_csrf_token(session)
+
+    def _session_cache_key(self):
+        return self._session_cache.key_for(self.protocol, self.host, self.port, self.client, self.user,
+                                           type(self._session_initializer).__name__)
+
+    def _save_session(self, session):
+        if self._session_cache is not None:
+            self._session_cache.save(self._session_cache_key(), session)
+
     def build_session(self):
-        """Build the HTTP session for the ABAP HTTP request."""
+        """Build the HTTP session for the ABAP HTTP request.
+
+           If a session cache is configured and holds a session for
+           the system and the user, the cached cookies and CSRF token are
+           installed instead of logging in and the returned response is None.
+        """
 
         session = requests.Session()
         session = self._session_initializer.initialize_session(session)
@@ -256,6 +344,10 @@ class HTTPClient():
             get_logger().info('SSL Server cert will not be verified: SAP_SSL_VERIFY = no')
             session.verify = False
 
+        if self._session_cache is not None and self._session_cache.load(self._session_cache_key(), session):
+            get_logger().info('Reusing cached HTTP session')
+            return session, None
+
         login_headers = {'x-csrf-token': 'Fetch'}
         csrf_token = None
 
@@ -265,4 +357,6 @@ class HTTPClient():
             csrf_token = response.headers['x-csrf-token']
             session.headers.update({'x-csrf-token': csrf_token})
 
+        self._save_session(session)
+
         return session, response
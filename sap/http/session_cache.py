@@ -0,0 +1,199 @@
+"""File-backed cache of authenticated HTTP sessions.
+
+Every sapcli process logs in and fetches an X-CSRF-Token before it sends
+the first real request. Scripts calling sapcli hundreds of times pay that
+round trip hundreds of times. When enabled (SAPCLI_SESSION_CACHE_TTL > 0),
+the session cookies (e.g. SAP_SESSIONID_<SID>_<client>, MYSAPSSO2) and the
+CSRF token are stored in the per-user cache directory via the JSONFileStore
+primitive - atomic writes, 0o700/0o600 perms on POSIX - and the next
+invocation against the same system, client, user and authentication method
+reuses them. Cloned connections of concurrent workers do not use the cache
+because they would overwrite each other's entry.
+
+The entries are credentials, hence the cache is opt-in. HTTPClient drops
+an entry and logs in again as soon as the server rejects the session.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from sap import get_logger
+from sap.config import config_get
+from sap.http.json_store import JSONFileStore, _default_cache_dir
+
+
+# The stateful context (ADT locks) belongs to the process which opened it
+# and must never be shared.
+PRIVATE_COOKIES = frozenset(['sap-contextid'])
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """Cookies and CSRF token of an authenticated session"""
+
+    cookies: List[Dict[str, Any]] = field(default_factory=list)
+    csrf_token: Optional[str] = None
+    stored_at: float = 0.0
+
+    def is_expired(self, ttl: float, now: Optional[float] = None) -> bool:
+        """True if the entry is older than ttl seconds"""
+
+        if now is None:
+            now = time.time()
+
+        return now - self.stored_at > ttl
+
+    def to_json(self) -> str:
+        """Serialize to a JSON string"""
+
+        return json.dumps({'cookies': self.cookies, 'csrf_token': self.csrf_token, 'stored_at': self.stored_at})
+
+    @classmethod
+    def from_json(cls, raw: str) -> CachedSession:
+        """Deserialize from a JSON string"""
+
+        data = json.loads(raw)
+        cookies = data['cookies']
+        if not isinstance(cookies, list):
+            raise TypeError('cookies is not a list')
+
+        return cls(cookies=cookies, csrf_token=data.get('csrf_token'), stored_at=float(data['stored_at']))
+
+    @classmethod
+    def from_session(cls, session: requests.Session) -> CachedSession:
+        """Captures the cookies and CSRF token of the session"""
+
+        cookies = [{'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain,
+                    'path': cookie.path,
+                    'secure': cookie.secure,
+                    'expires': cookie.expires}
+                   for cookie in session.cookies if cookie.name not in PRIVATE_COOKIES]
+
+        return cls(cookies=cookies, csrf_token=session.headers.get('x-csrf-token'), stored_at=time.time())
+
+    def apply(self, session: requests.Session) -> None:
+        """Installs the cookies and CSRF token into the session"""
+
+        for cookie in self.cookies:
+            session.cookies.set(cookie['name'], cookie['value'],
+                                domain=cookie.get('domain', ''),
+                                path=cookie.get('path', '/'),
+                                secure=cookie.get('secure', False),
+                                expires=cookie.get('expires'))
+
+        if self.csrf_token:
+            session.headers['x-csrf-token'] = self.csrf_token
+
+
+class SessionFileStore(JSONFileStore[CachedSession]):
+    """File-backed cache of HTTP sessions under ``<cache_dir>/http_sessions/``."""
+
+    def __init__(self, base_dir: Optional[Path] = None) -> None:
+        super().__init__(base_dir or _default_cache_dir(), 'http_sessions')
+
+    def _serialize(self, value: CachedSession) -> str:
+        return value.to_json()
+
+    def _deserialize(self, raw: str) -> CachedSession:
+        return CachedSession.from_json(raw)
+
+
+class SessionCache:
+    """Cached HTTP sessions with expiration.
+
+    The scope separates connection types (adt, rest, odata) because
+    the CSRF token is issued per ICF service. The store is created on the
+    first access and its failures are logged and ignored - the worst
+    consequence is a login.
+    """
+
+    def __init__(self, ttl: float, scope: str, store: Optional[JSONFileStore[CachedSession]] = None) -> None:
+        self._ttl = ttl
+        self._scope = scope
+        self._store = store
+
+    @property
+    def ttl(self) -> float:
+        """Maximum age of cached sessions in seconds"""
+
+        return self._ttl
+
+    @property
+    def scope(self) -> str:
+        """Connection type the sessions belong to"""
+
+        return self._scope
+
+    def _get_store(self) -> JSONFileStore[CachedSession]:
+        if self._store is None:
+            self._store = SessionFileStore()
+
+        return self._store
+
+    # pylint: disable=too-many-arguments
+    def key_for(self, protocol: str, host: str, port: str, client: str, user: Optional[str], auth: str) -> str:
+        """Build the cache key of the session of the user on the system
+           authenticated by the method auth (e.g. name of the session
+           initializer) because some methods do not have the user name.
+        """
+
+        raw = json.dumps([self._scope, protocol, host, str(port), client, user or '', auth],
+                         separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def load(self, key: str, session: requests.Session) -> bool:
+        """Installs the cached cookies and CSRF token into the session.
+           Returns False if there is no usable entry.
+        """
+
+        try:
+            cached = self._get_store().get(key)
+        except OSError as ex:
+            get_logger().info('Cannot read HTTP session cache: %s', ex)
+            return False
+
+        if cached is None:
+            return False
+
+        if cached.is_expired(self._ttl):
+            get_logger().debug('Cached HTTP session expired')
+            return False
+
+        cached.apply(session)
+        return True
+
+    def save(self, key: str, session: requests.Session) -> None:
+        """Stores the cookies and CSRF token of the session"""
+
+        try:
+            self._get_store().set(key, CachedSession.from_session(session))
+        except OSError as ex:
+            get_logger().info('Cannot write HTTP session cache: %s', ex)
+
+    def forget(self, key: str) -> None:
+        """Removes the cached session"""
+
+        try:
+            self._get_store().delete(key)
+        except OSError as ex:
+            get_logger().info('Cannot delete HTTP session cache entry: %s', ex)
+
+
+def get_session_cache(scope: str) -> Optional[SessionCache]:
+    """Return the session cache for the connection type or None if disabled"""
+
+    ttl = config_get('session_cache_ttl')
+    if ttl <= 0:
+        return None
+
+    return SessionCache(ttl, scope)
@@ -21,7 +21,7 @@ class Connection:
 
     # pylint: disable=too-many-arguments
     def __init__(self, service, host, port, client, user, password, ssl, verify, ssl_server_cert=None,
-                 session_initializer=None):
+                 session_initializer=None, session_cache=None):
         """Parameters:
             - service: id of the odata service (e.g. UI5/ABAP_REPOSITORY_SRV)
             - host: string host name or IP of
@@ -34,6 +34,8 @@ class Connection:
             - ssl_server_cert: optional path to a custom CA certificate file
             - session_initializer: optional HTTPSessionInitializer; when None,
                     BasicAuth with the given user/password is used
+            - session_cache: optional sap.http.session_cache.SessionCache;
+                    when None, every new session logs in
         """
 
         sap.http.setup_keepalive()
@@ -53,6 +55,7 @@ class Connection:
             login_path=service_path,
             login_method='HEAD',
             session_initializer=session_initializer,
+            session_cache=session_cache,
         )
 
         session, _ = self._http_client.build_session()
@@ -0,0 +1,227 @@
+"""Per-request timing and traffic profile of a sapcli run
+
+When enabled (SAPCLI_PROFILE=<path> or the global option --profile <path>),
+HTTPClient.retrieve records method, path template, status, latency and sizes
+of request and response bodies of every HTTP request and the XML parsers
+record their parse time. At exit, sapcli prints a summary table to the error
+output and writes all records to <path> in the Chrome Trace Event format
+which can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+Disabled profiling costs a single global lookup per instrumented call.
+
+This module provides cli neutral functionality.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import functools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+HTTP = 'http'
+PARSE = 'parse'
+
+_ID_SEGMENT = re.compile(r'^(?:[0-9A-Fa-f]{16,}|[0-9]+)$')
+
+_PROFILER = None
+
+
+def path_template(path: str) -> str:
+    """Returns the path without query and with GUIDs, numbers and URL encoded
+       (i.e. namespaced) names replaced by placeholders to group requests of
+       the same kind.
+    """
+
+    segments = []
+    for segment in path.split('?', 1)[0].split('/'):
+        if _ID_SEGMENT.match(segment):
+            segment = '{id}'
+        elif '%' in segment:
+            segment = '{name}'
+
+        segments.append(segment)
+
+    return '/'.join(segments)
+
+
+def body_size(body: Any) -> int:
+    """Returns the number of bytes of HTTP request or response body"""
+
+    if body is None:
+        return 0
+
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+
+    try:
+        return len(body)
+    except TypeError:
+        # generators and file-like objects
+        return 0
+
+
+@dataclass(frozen=True)
+class ProfileRecord:
+    """A single measured call"""
+
+    kind: str
+    name: str
+    started: float
+    duration: float
+    thread: int
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class ProfileSummary:
+    """Aggregated records of the same kind and name"""
+
+    kind: str
+    name: str
+    calls: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    document_bytes: int = 0
+
+    @property
+    def average(self) -> float:
+        """Average duration of a call in seconds"""
+
+        return self.total / self.calls if self.calls else 0.0
+
+
+class Profiler:
+    """Thread safe recorder of HTTP requests and XML parsing"""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._records: List[ProfileRecord] = []
+        self._lock = threading.Lock()
+
+    @property
+    def records(self) -> List[ProfileRecord]:
+        """Recorded calls in the order of their completion"""
+
+        with self._lock:
+            return list(self._records)
+
+    def record(self, kind: str, name: str, started: float, duration: float, **details: Any) -> None:
+        """Records a call started at the given time.perf_counter() value"""
+
+        record = ProfileRecord(kind, name, started - self._origin, duration, threading.get_ident(), details)
+
+        with self._lock:
+            self._records.append(record)
+
+    # pylint: disable=too-many-arguments
+    def record_http(self, method: str, path: str, status: Optional[int], started: float, duration: float,
+                    request_bytes: int = 0, response_bytes: int = 0) -> None:
+        """Records an HTTP request; the status is None if no response came"""
+
+        self.record(HTTP, f'{method.upper()} {path_template(path)}', started, duration,
+                    method=method.upper(), path=path, status=status,
+                    request_bytes=request_bytes, response_bytes=response_bytes)
+
+    def summary(self) -> List[ProfileSummary]:
+        """Returns the records aggregated by kind and name ordered
+           by the total time.
+        """
+
+        groups: Dict[tuple, ProfileSummary] = {}
+
+        for record in self.records:
+            group = groups.get((record.kind, record.name))
+            if group is None:
+                group = ProfileSummary(record.kind, record.name)
+                groups[(record.kind, record.name)] = group
+
+            group.calls += 1
+            group.total += record.duration
+            group.longest = max(group.longest, record.duration)
+            group.request_bytes += record.details.get('request_bytes', 0)
+            group.response_bytes += record.details.get('response_bytes', 0)
+            group.document_bytes += record.details.get('document_bytes', 0)
+
+        return sorted(groups.values(), key=lambda group: group.total, reverse=True)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Returns the records as Chrome Trace Event Format object"""
+
+        pid = os.getpid()
+        events = [{'name': record.name,
+                   'cat': record.kind,
+                   'ph': 'X',
+                   'ts': round(record.started * 1000000, 3),
+                   'dur': round(record.duration * 1000000, 3),
+                   'pid': pid,
+                   'tid': record.thread,
+                   'args': record.details}
+                  for record in self.records]
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Writes the records to the file in Chrome Trace Event Format"""
+
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump(self.chrome_trace(), trace_file, indent=1)
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Returns the active profiler or None if profiling is disabled"""
+
+    return _PROFILER
+
+
+def enable_profiling() -> Profiler:
+    """Starts recording and returns the active profiler"""
+
+    # pylint: disable=global-statement
+    global _PROFILER
+
+    if _PROFILER is None:
+        _PROFILER = Profiler()
+
+    return _PROFILER
+
+
+def disable_profiling() -> Optional[Profiler]:
+    """Stops recording and returns the profiler which was active"""
+
+    # pylint: disable=global-statement
+    global _PROFILER
+
+    profiler, _PROFILER = _PROFILER, None
+    return profiler
+
+
+def profiled_parser(name: str):
+    """Decorator recording parse time of functions whose first parameter
+       is the parsed document.
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _PROFILER
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(PARSE, name, started, time.perf_counter() - started,
+                                document_bytes=body_size(args[0]) if args else 0)
+
+        return wrapper
+
+    return decorator
@@ -26,7 +26,7 @@ class Connection:
 
     # pylint: disable=too-many-arguments
     def __init__(self, icf_path, login_path, host, client, user, password, port=None, ssl=True, verify=True,
-                 ssl_server_cert=None, session_initializer=None):
+                 ssl_server_cert=None, session_initializer=None, session_cache=None):
         """Parameters:
             - host: string host name
             - client: string SAP client
@@ -39,6 +39,8 @@ class Connection:
             - ssl_server_cert: optional path to a custom CA certificate file
             - session_initializer: optional HTTPSessionInitializer; when None,
                     BasicAuth with the given user/password is used
+            - session_cache: optional sap.http.session_cache.SessionCache;
+                    when None, every new session logs in
         """
 
         sap.http.setup_keepalive()
@@ -58,6 +60,7 @@ class Connection:
             login_path=f'{icf_path}/{login_path.lstrip("/")}',
             login_method='GET',
             session_initializer=session_initializer,
+            session_cache=session_cache,
         )
 
         self._http_client.set_connection_error_handler(_gcts_http_connection_error_handler)
@@ -1,3 +1,5 @@
+import sap.adt.atc
+
 # Content-Type: application/xml; charset=utf-8
 ADT_XML_ATC_CUSTOMIZING='''<?xml version="1.0" encoding="utf-8"?>
 <atc:customizing xmlns:atc="http://www.sap.com/adt/atc">
@@ -561,3 +563,38 @@ ADT_XML_CRM_CHECK_RULE_VIEW='''<?xml version="1.0" encoding="UTF-8"?><dataPrevie
 </dataPreview:tableData>
 '''
 
+
+def make_worklist(*objects):
+    worklist = sap.adt.atc.WorkList()
+    worklist.worklist_id = 'WL'
+    worklist.objects = sap.adt.atc.ATCObjectList()
+
+    for typ, name, findings in objects:
+        atcobject = sap.adt.atc.ATCObject()
+        atcobject.typ = typ
+        atcobject.name = name
+        atcobject.findings = sap.adt.atc.ATCFindingList()
+
+        for check_id, message_title, location in findings:
+            finding = sap.adt.atc.ATCFinding()
+            finding.priority = '1'
+            finding.check_id = check_id
+            finding.message_id = '0001'
+            finding.message_title = message_title
+            finding.location = location
+            atcobject.findings.append(finding)
+
+        worklist.objects.append(atcobject)
+
+    return worklist
+
+
+def large_worklist_xml(objects):
+    """Replicates the only ATC object of the fixture worklist"""
+
+    start = ADT_XML_ATC_WORKLIST_CLASS.index('<atcobject:object ')
+    end = ADT_XML_ATC_WORKLIST_CLASS.index('</atcobject:object>') + len('</atcobject:object>')
+
+    return ADT_XML_ATC_WORKLIST_CLASS[:start] + \
+        '\n'.join([ADT_XML_ATC_WORKLIST_CLASS[start:end]] * objects) + \
+        ADT_XML_ATC_WORKLIST_CLASS[end:]
@@ -72,3 +72,19 @@ ADT_XML_RUN_CHECK_2_REPORTERS = '''<?xml version="1.0" encoding="UTF-8"?>
     </chkrun:checkMessageList>
   </chkrun:checkReport>
 </chkrun:checkRunReports>'''
+
+ADT_XML_RUN_OBJECTS_CHECK_RESPONSE_ERRORS = '''<?xml version="1.0" encoding="UTF-8"?>
+<chkrun:checkRunReports xmlns:chkrun="http://www.sap.com/adt/checkrun">
+  <chkrun:checkReport chkrun:reporter="abapCheckRun" chkrun:triggeringUri="/sap/bc/adt/oo/classes/cl_foo" chkrun:status="processed" chkrun:statusText="Object cl_foo has been checked">
+    <chkrun:checkMessageList>
+      <chkrun:checkMessage chkrun:uri="/sap/bc/adt/oo/classes/cl_foo/source/main#start=27,2;end=27,15" chkrun:type="E" chkrun:shortText="Variable &quot;FOO&quot; is not type-compatible" chkrun:code="SYNTAX(001)"/>
+      <chkrun:checkMessage chkrun:uri="/sap/bc/adt/oo/classes/cl_foo/includes/testclasses#start=3,1" chkrun:type="W" chkrun:shortText="Test class without tests" chkrun:code="AUNIT(003)"/>
+      <chkrun:checkMessage chkrun:uri="/sap/bc/adt/oo/classes/cl_foobar/source/main#start=1,1" chkrun:type="W" chkrun:shortText="Unknown object" chkrun:code="OTHER(004)"/>
+    </chkrun:checkMessageList>
+  </chkrun:checkReport>
+  <chkrun:checkReport chkrun:reporter="abapCheckRun" chkrun:triggeringUri="/sap/bc/adt/programs/programs/zfoo" chkrun:status="processed" chkrun:statusText="Object zfoo has been checked">
+    <chkrun:checkMessageList>
+      <chkrun:checkMessage chkrun:uri="/sap/bc/adt/programs/programs/zfoo/source/main#start=10,1;end=10,5" chkrun:type="W" chkrun:shortText="Obsolete syntax" chkrun:code="OBSOLETE(001)"/>
+    </chkrun:checkMessageList>
+  </chkrun:checkReport>
+</chkrun:checkRunReports>'''
@@ -2,7 +2,7 @@ import copy
 import json
 import types
 from typing import Dict, NamedTuple, Optional
-from io import StringIO
+from io import BytesIO, StringIO
 from argparse import ArgumentParser
 from contextlib import AbstractContextManager, contextmanager
 
@@ -37,6 +37,10 @@ class Response:
 
         return self._json
 
+    @property
+    def raw(self):
+        return BytesIO((self.text or '').encode('utf-8'))
+
     @staticmethod
     def with_json(json=None, status_code=None, headers=None):
         return Response(json=json, content_type='application/json', headers=headers, status_code=status_code)
@@ -289,7 +293,7 @@ class Connection(sap.adt.Connection):
     def _build_adt_url(self, adt_uri):
         return f'/{self.uri}/{adt_uri}'
 
-    def _retrieve(self, session, method, url, params=None, headers=None, body=None):
+    def _retrieve(self, session, method, url, params=None, headers=None, body=None, stream=False):
         req = Request(method, url, headers, body, params)
         self.execs.append(req)
 
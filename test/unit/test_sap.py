@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import logging
+import unittest
+from unittest.mock import MagicMock, patch
+
+import sap
+import sap.adt.atc
+from sap.adt.marshalling import ElementHandler, Marshal
+
+from fixtures_adt_atc import large_worklist_xml
+
+
+class TestGetLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.level = self.root.level
+
+    def tearDown(self):
+        self.root.setLevel(self.level)
+
+    def test_returns_root_logger(self):
+        self.assertIs(sap.get_logger(), self.root)
+
+    @patch('sap._LOGGER_CONFIGURED', False)
+    @patch.dict('os.environ', {'SAPCLI_LOG_LEVEL': '40'})
+    def test_env_level_applied_once(self):
+        with patch('logging.basicConfig') as fake_basic_config:
+            sap.get_logger()
+            self.assertEqual(self.root.level, 40)
+
+            self.root.setLevel(10)
+            sap.get_logger()
+
+        self.assertEqual(self.root.level, 10)
+        fake_basic_config.assert_called_once_with()
+
+
+class TestLoggerHotPaths(unittest.TestCase):
+    """The logger is used in SAX handlers called for every XML element"""
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.level = self.root.level
+
+    def tearDown(self):
+        self.root.setLevel(self.level)
+
+    @patch('sap._LOGGER_CONFIGURED', False)
+    def test_get_logger_configures_once(self):
+        with patch('sap._configure_logger') as fake_configure:
+            for _ in range(3):
+                self.assertIs(sap.get_logger(), self.root)
+
+        fake_configure.assert_called_once_with()
+
+    def test_no_debug_formatting_without_debug(self):
+        self.root.setLevel(logging.INFO)
+
+        handler = ElementHandler('root', {}, sap.adt.atc.WorkList)
+        handler.new()
+
+        attr_name = MagicMock()
+
+        # format eagerly to catch debug messages built regardless of the level
+        with patch.object(logging.Logger, 'debug', side_effect=lambda msg, *args: msg % args) as fake_debug:
+            handler.set(attr_name, 'value')
+
+        fake_debug.assert_not_called()
+        attr_name.__str__.assert_not_called()
+
+    def count_debug_calls(self, objects):
+        xml = large_worklist_xml(objects)
+
+        with patch.object(logging.Logger, 'debug') as fake_debug:
+            Marshal.deserialize(xml, sap.adt.atc.WorkList())
+
+        return fake_debug.call_count
+
+    def test_no_debug_calls_per_element(self):
+        self.root.setLevel(logging.INFO)
+
+        # warm up the per-class plans
+        self.count_debug_calls(1)
+
+        self.assertEqual(self.count_debug_calls(1), self.count_debug_calls(500))
+
+
+if __name__ == '__main__':
+    unittest.main()
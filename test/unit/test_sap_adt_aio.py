@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+import sap.adt
+import sap.adt.aio
+import sap.adt.atc
+import sap.adt.objects
+from sap.errors import SAPCliError
+
+from mock import Connection, Response
+from fixtures_adt_program import CREATE_EXECUTABLE_PROGRAM_ADT_XML, GET_EXECUTABLE_PROGRAM_ADT_XML
+from fixtures_adt_repository import PACKAGE_ROOT_NODESTRUCTURE_OK_RESPONSE
+from fixtures_adt_atc import ADT_XML_ATC_RUN_RESPONSE_NO_OBJECTS, ADT_XML_ATC_RUN_RESPONSE_WITH_FINDINGS
+
+
+class ConcurrencyRecorder:
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def execute(self, method, adt_uri, **kwargs):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.threads.add(threading.get_ident())
+
+        time.sleep(self.delay)
+
+        with self._lock:
+            self.running -= 1
+
+        return Response(text=adt_uri, status_code=200, headers={})
+
+
+class TestConnection(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.recorder = ConcurrencyRecorder()
+        self.connection = Mock()
+        self.connection.clone.side_effect = lambda: Mock(execute=self.recorder.execute)
+
+    def test_invalid_max_concurrency(self):
+        for value in (None, 0, -1):
+            with self.assertRaises(SAPCliError):
+                sap.adt.aio.Connection(self.connection, max_concurrency=value)
+
+    async def test_execute_bounded_concurrency(self):
+        async with sap.adt.aio.Connection(self.connection, max_concurrency=3) as aconn:
+            responses = await asyncio.gather(*(aconn.execute('GET', f'objects/{i}') for i in range(12)))
+
+        self.assertEqual([resp.text for resp in responses], [f'objects/{i}' for i in range(12)])
+        self.assertEqual(self.recorder.peak, 3)
+        self.assertLessEqual(self.connection.clone.call_count, 3)
+        self.assertEqual(self.connection.clone.call_count, len(self.recorder.threads))
+        self.connection.execute.assert_not_called()
+
+    async def test_execute_arguments(self):
+        clone = Mock()
+        self.connection.clone.side_effect = None
+        self.connection.clone.return_value = clone
+
+        async with sap.adt.aio.Connection(self.connection) as aconn:
+            resp = await aconn.execute('POST', 'atc/runs', params={'worklistId': 'WL'}, body='<xml/>',
+                                       accept='application/xml', content_type='application/xml')
+
+        self.assertEqual(resp, clone.execute.return_value)
+        clone.execute.assert_called_once_with('POST', 'atc/runs', params={'worklistId': 'WL'}, headers=None,
+                                              body='<xml/>', accept='application/xml',
+                                              content_type='application/xml', complete_url=False)
+
+    async def test_execute_error(self):
+        self.connection.clone.side_effect = None
+        self.connection.clone.return_value.execute.side_effect = SAPCliError('Failed')
+
+        async with sap.adt.aio.Connection(self.connection) as aconn:
+            with self.assertRaises(SAPCliError) as caught:
+                await aconn.execute('GET', 'objects')
+
+        self.assertEqual(str(caught.exception), 'Failed')
+
+    async def test_close_restarts_executor(self):
+        aconn = sap.adt.aio.Connection(self.connection, max_concurrency=2)
+
+        await aconn.execute('GET', 'first')
+        aconn.close()
+        aconn.close()
+
+        resp = await aconn.execute('GET', 'second')
+        aconn.close()
+
+        self.assertEqual(resp.text, 'second')
+
+    async def test_close_closes_clones(self):
+        clones = []
+
+        def clone():
+            clones.append(Mock(execute=self.recorder.execute))
+            return clones[-1]
+
+        self.connection.clone.side_effect = clone
+
+        async with sap.adt.aio.Connection(self.connection, max_concurrency=3) as aconn:
+            await asyncio.gather(*(aconn.execute('GET', f'objects/{i}') for i in range(6)))
+
+        self.assertEqual(len(clones), len(self.recorder.threads))
+        for clone in clones:
+            clone.close.assert_called_once_with()
+
+
+class TestADTObject(unittest.IsolatedAsyncioTestCase):
+
+    async def test_fetch(self):
+        conn = Connection([Response(text=GET_EXECUTABLE_PROGRAM_ADT_XML, status_code=200, headers={})])
+        program = sap.adt.Program(conn, 'ZHELLO_WORLD')
+
+        async with sap.adt.aio.Connection(conn, max_concurrency=1) as aconn:
+            await sap.adt.aio.fetch(aconn, program)
+
+        self.assertEqual(conn.mock_methods(), [('GET', '/sap/bc/adt/programs/programs/zhello_world')])
+        self.assertEqual(program.active, 'active')
+        self.assertEqual(program.description, 'Say hello!')
+
+    async def test_text(self):
+        conn = Connection([Response(text='report zhello_world.\r\n', status_code=200,
+                                    headers={'Content-Type': 'text/plain; charset=utf-8'})])
+        program = sap.adt.Program(conn, 'ZHELLO_WORLD')
+
+        async with sap.adt.aio.Connection(conn, max_concurrency=1) as aconn:
+            source = await sap.adt.aio.text(aconn, program)
+
+        self.assertEqual(source, 'report zhello_world.\n')
+        self.assertEqual(conn.execs[0].adt_uri, '/sap/bc/adt/programs/programs/zhello_world/source/main')
+        self.assertEqual(conn.execs[0].headers, {'Accept': 'text/plain'})
+
+    async def test_create(self):
+        conn = Connection()
+        metadata = sap.adt.ADTCoreData(language='EN', master_language='EN', master_system='NPL', responsible='FILAK')
+        program = sap.adt.Program(conn, 'ZHELLO_WORLD', package='$TEST', metadata=metadata)
+        program.description = 'Say hello!'
+
+        serialized_in = []
+        serialize = program.serialize
+
+        def serialize_in_thread():
+            serialized_in.append(threading.get_ident())
+            return serialize()
+
+        program.serialize = serialize_in_thread
+
+        async with sap.adt.aio.Connection(conn, max_concurrency=1) as aconn:
+            await sap.adt.aio.create(aconn, program, corrnr='420')
+
+        self.assertNotEqual(serialized_in, [threading.get_ident()])
+        self.assertEqual(len(conn.execs), 1)
+        self.assertEqual(conn.execs[0].method, 'POST')
+        self.assertEqual(conn.execs[0].adt_uri, '/sap/bc/adt/programs/programs')
+        self.assertEqual(conn.execs[0].params, {'corrNr': '420'})
+        self.assertEqual(conn.execs[0].body.decode('utf-8'), CREATE_EXECUTABLE_PROGRAM_ADT_XML)
+
+
+class TestRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def test_read_node(self):
+        conn = Connection([PACKAGE_ROOT_NODESTRUCTURE_OK_RESPONSE])
+        package = sap.adt.Package(conn, '$VICTORY')
+
+        async with sap.adt.aio.Connection(conn, max_concurrency=1) as aconn:
+            node = await sap.adt.aio.Repository(aconn).read_node(package)
+
+        self.assertEqual(conn.execs[0].params['parent_name'], '$VICTORY')
+        self.assertEqual([obj.OBJECT_NAME for obj in node.objects], ['$VICTORY_TESTS'])
+
+
+class TestChecksRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def test_run_for(self):
+        conn = Connection([
+            Response(status_code=200, text='WORKLIST', headers={'Content-Type': 'text/plain'}),
+            Response(status_code=200, text=ADT_XML_ATC_RUN_RESPONSE_NO_OBJECTS,
+                     headers={'Content-Type': 'application/xml'}),
+            Response(status_code=200, text=ADT_XML_ATC_RUN_RESPONSE_WITH_FINDINGS,
+                     headers={'Content-Type': 'application/atc.worklist.v1+xml'})])
+
+        objects = sap.adt.objects.ADTObjectSets()
+        objects.include_object(sap.adt.Package(conn, '$IAMTHEKING'))
+
+        async with sap.adt.aio.Connection(conn, max_concurrency=1) as aconn:
+            result = await sap.adt.aio.ChecksRunner(aconn, 'STANDARD').run_for(objects, max_verdicts=69)
+
+        self.assertEqual(conn.mock_methods(), [('POST', '/sap/bc/adt/atc/worklists'),
+                                               ('POST', '/sap/bc/adt/atc/runs'),
+                                               ('GET', '/sap/bc/adt/atc/worklists/WORKLIST')])
+        self.assertEqual(conn.execs[0].params, {'checkVariant': 'STANDARD'})
+        self.assertEqual(len(result.worklist.objects), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
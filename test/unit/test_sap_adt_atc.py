@@ -165,6 +165,35 @@ class TestWorkList(unittest.TestCase):
         self.assertEqual(finding.exemption_kind, '')
 
 
+class TestMergeWorklists(unittest.TestCase):
+
+    def make_worklist(self, worklist_id, *uris):
+        worklist = sap.adt.atc.WorkList()
+        worklist.worklist_id = worklist_id
+        worklist.timestamp = f'{worklist_id}-TIMESTAMP'
+        worklist.objects = sap.adt.atc.ATCObjectList()
+        for uri in uris:
+            obj = sap.adt.atc.ATCObject()
+            obj.uri = uri
+            worklist.objects.append(obj)
+
+        return worklist
+
+    def test_merge(self):
+        merged = sap.adt.atc.merge_worklists([self.make_worklist('FIRST', '/a', '/b'),
+                                              self.make_worklist('SECOND', '/b', '/c')])
+
+        self.assertEqual(merged.worklist_id, 'FIRST')
+        self.assertEqual(merged.timestamp, 'FIRST-TIMESTAMP')
+        self.assertEqual([obj.uri for obj in merged.objects], ['/a', '/b', '/c'])
+
+    def test_merge_empty(self):
+        merged = sap.adt.atc.merge_worklists([])
+
+        self.assertIsNone(merged.worklist_id)
+        self.assertEqual(list(merged.objects), [])
+
+
 class TestATCRunner(unittest.TestCase):
 
     def setUp(self):
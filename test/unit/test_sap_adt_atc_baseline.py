@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import unittest
+from types import SimpleNamespace
+
+import sap.adt
+from sap.errors import SAPCliError
+from sap.adt.atc_baseline import (
+    CheckedObject,
+    FindingsBaseline,
+    fetch_changed_at,
+    object_key,
+    open_findings_baseline,
+)
+
+from mock import Connection, Response
+from fixtures_adt_atc import make_worklist
+
+
+def reported(worklist):
+    return [(obj.typ, obj.name, [(finding.check_id, finding.message_title, finding.location)
+                                 for finding in obj.findings])
+            for obj in worklist.objects]
+
+
+class TestFindingsBaseline(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline = FindingsBaseline(':memory:', 'mockhost:443/100', 'THE_VARIANT')
+
+    def tearDown(self):
+        self.baseline.close()
+
+    def test_object_key(self):
+        self.assertEqual(object_key('CLAS/OC', 'zcl_foo'), ('CLAS', 'ZCL_FOO'))
+        self.assertEqual(object_key('PROG', 'ZREPORT'), ('PROG', 'ZREPORT'))
+
+    def test_empty_baseline_all_new(self):
+        worklist = make_worklist(('CLAS', 'ZCL_FOO', [('CHK1', 'Obsolete', 'start=1')]))
+
+        self.assertIsNone(self.baseline.changed_at('CLAS/OC', 'ZCL_FOO'))
+        self.assertEqual(reported(self.baseline.new_findings([worklist])),
+                         [('CLAS', 'ZCL_FOO', [('CHK1', 'Obsolete', 'start=1')])])
+
+    def test_known_findings_moved(self):
+        self.baseline.update([CheckedObject('CLAS/OC', 'ZCL_FOO', '2024-01-01T10:00:00Z')],
+                             [make_worklist(('CLAS', 'ZCL_FOO', [('CHK1', 'Obsolete', 'start=1')]))])
+
+        worklist = make_worklist(('CLAS', 'ZCL_FOO', [('CHK1', 'Obsolete', 'start=10'),
+                                                      ('CHK1', 'Obsolete', 'start=20'),
+                                                      ('CHK2', 'Unused', 'start=30')]),
+                                 ('PROG', 'ZREPORT', [('CHK1', 'Obsolete', 'start=1')]))
+
+        self.assertEqual(reported(self.baseline.new_findings([worklist])),
+                         [('CLAS', 'ZCL_FOO', [('CHK1', 'Obsolete', 'start=20'), ('CHK2', 'Unused', 'start=30')]),
+                          ('PROG', 'ZREPORT', [('CHK1', 'Obsolete', 'start=1')])])
+
+    def test_objects_without_new_findings_skipped(self):
+        worklist = make_worklist(('CLAS', 'ZCL_FOO', [('CHK1', 'Obsolete', 'start=1')]))
+        self.baseline.update([], [worklist])
+
+        result = self.baseline.new_findings([worklist])
+
+        self.assertEqual(result.worklist_id, 'WL')
+        self.assertEqual(reported(result), [])
+
+    def test_update_replaces_findings(self):
+        self.baseline.update([CheckedObject('CLAS/OC', 'ZCL_FOO', 'T1')],
+                             [make_worklist(('CLAS', 'ZCL_FOO', [('CHK1', 'Obsolete', 'start=1')]))])
+
+        # the fixed object is not reported by ATC anymore
+        self.baseline.update([CheckedObject('CLAS/OC', 'ZCL_FOO', 'T2')], [make_worklist()])
+
+        self.assertEqual(self.baseline.changed_at('CLAS', 'zcl_foo'), 'T2')
+        self.assertEqual(sum(self.baseline.known_findings('CLAS', 'ZCL_FOO').values()), 0)
+
+    def test_update_keeps_timestamp_if_unknown(self):
+        self.baseline.update([CheckedObject('CLAS/OC', 'ZCL_FOO', 'T1')], [])
+        self.baseline.update([CheckedObject('CLAS/OC', 'ZCL_FOO', None)], [])
+
+        self.assertEqual(self.baseline.changed_at('CLAS', 'ZCL_FOO'), 'T1')
+
+    def test_is_unchanged(self):
+        self.baseline.update([CheckedObject('CLAS/OC', 'ZCL_FOO', 'T1')], [])
+
+        self.assertTrue(self.baseline.is_unchanged(CheckedObject('CLAS/OC', 'ZCL_FOO', 'T1')))
+        self.assertFalse(self.baseline.is_unchanged(CheckedObject('CLAS/OC', 'ZCL_FOO', 'T2')))
+        self.assertFalse(self.baseline.is_unchanged(CheckedObject('CLAS/OC', 'ZCL_FOO', None)))
+        self.assertFalse(self.baseline.is_unchanged(CheckedObject('PROG/P', 'ZREPORT', 'T1')))
+
+    def test_variants_are_separated(self):
+        self.baseline.update([CheckedObject('CLAS/OC', 'ZCL_FOO', 'T1')], [])
+
+        other = FindingsBaseline(':memory:', 'mockhost:443/100', 'OTHER_VARIANT')
+        other._db = self.baseline._get_db()
+
+        self.assertIsNone(other.changed_at('CLAS', 'ZCL_FOO'))
+
+    def test_cannot_open(self):
+        baseline = FindingsBaseline('/nonexistent/directory/baseline.sqlite', 'mockhost:443/100', 'THE_VARIANT')
+
+        with self.assertRaises(SAPCliError) as caught:
+            baseline.changed_at('CLAS', 'ZCL_FOO')
+
+        self.assertTrue(str(caught.exception).startswith('Cannot open ATC baseline'))
+
+
+class TestFetchChangedAt(unittest.TestCase):
+
+    def test_fetch(self):
+        connection = Connection([Response(
+            text='<?xml version="1.0" encoding="utf-8"?>'
+                 '<class:abapClass xmlns:class="http://www.sap.com/adt/oo/classes"'
+                 ' xmlns:adtcore="http://www.sap.com/adt/core" adtcore:name="ZCL_FOO"'
+                 ' adtcore:changedAt="2024-01-01T10:00:00Z">'
+                 '<adtcore:packageRef adtcore:changedAt="1999-01-01T00:00:00Z"/>'
+                 '</class:abapClass>',
+            status_code=200, headers={'Content-Type': 'application/vnd.sap.adt.oo.classes.v4+xml'})])
+
+        changed_at = fetch_changed_at(connection, sap.adt.Class(connection, 'ZCL_FOO'))
+
+        self.assertEqual(changed_at, '2024-01-01T10:00:00Z')
+        self.assertEqual(connection.mock_methods(), [('GET', '/sap/bc/adt/oo/classes/zcl_foo')])
+
+
+class TestOpenFindingsBaseline(unittest.TestCase):
+
+    def test_system_key(self):
+        connection = SimpleNamespace(host='mockhost', port='443', client='100')
+
+        baseline = open_findings_baseline(connection, 'baseline.sqlite', 'THE_VARIANT')
+
+        self.assertEqual(baseline._system, 'mockhost:443/100')
+        self.assertEqual(baseline._variant, 'THE_VARIANT')
+
+
+if __name__ == '__main__':
+    unittest.main()
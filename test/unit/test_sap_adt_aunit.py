@@ -1,6 +1,7 @@
 #!/bin/python
 
 import unittest
+from io import BytesIO
 
 import sap
 import sap.adt
@@ -150,6 +151,36 @@ class TestAUnitParseResults(unittest.TestCase):
         # just be happy there is no exception
         run_results = sap.adt.aunit.parse_aunit_response(AUNIT_NO_EXECUTION_TIME_RESULTS_XML).run_results
 
+    def test_stream_aunit_response(self):
+        programs = []
+        handler = sap.adt.aunit.stream_aunit_response(AUNIT_RESULTS_XML, programs.append)
+
+        self.assertEqual(handler.run_results.programs, [])
+        self.assertEqual([program.name for program in programs], ['ZCL_THEKING_MANUAL_HARDCORE', 'ZEXAMPLE_TESTS'])
+        self.assertEqual([test_class.name for test_class in programs[0].test_classes], ['LTCL_TEST', 'LTCL_TEST_HARDER'])
+
+    def test_stream_aunit_response_from_file(self):
+        programs = []
+        sap.adt.aunit.stream_aunit_response(BytesIO(AUNIT_RESULTS_XML.encode('utf-8')), programs.append)
+
+        self.assertEqual([program.name for program in programs], ['ZCL_THEKING_MANUAL_HARDCORE', 'ZEXAMPLE_TESTS'])
+
+    def test_stream_aunit_response_run_alerts(self):
+        programs = []
+        handler = sap.adt.aunit.stream_aunit_response(AUNIT_NO_TEST_RESULTS_XML, programs.append)
+
+        self.assertEqual(programs, [])
+        self.assertEqual([alert.kind for alert in handler.run_results.alerts], ['noTestClasses'])
+
+    def test_merge_run_results(self):
+        first = sap.adt.aunit.parse_aunit_response(AUNIT_RESULTS_XML).run_results
+        second = sap.adt.aunit.parse_aunit_response(AUNIT_NO_TEST_RESULTS_XML).run_results
+
+        merged = sap.adt.aunit.merge_run_results([first, second])
+
+        self.assertEqual([program.name for program in merged.programs], ['ZCL_THEKING_MANUAL_HARDCORE', 'ZEXAMPLE_TESTS'])
+        self.assertEqual([alert.kind for alert in merged.alerts], ['noTestClasses'])
+
 
 if __name__ == '__main__':
     unittest.main()
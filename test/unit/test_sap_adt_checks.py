@@ -17,6 +17,7 @@ from fixtures_adt_checks import (
     ADT_XML_RUN_OBJECT_CHECK_RESPONSE_ERRORS,
     ADT_XML_RUN_OBJECT_CHECK_RESPONSE_WARNINGS_ONLY,
     ADT_XML_RUN_OBJECT_CHECK_RESPONSE_CLEAN,
+    ADT_XML_RUN_OBJECTS_CHECK_RESPONSE_ERRORS,
 )
 
 
@@ -267,6 +268,66 @@ class TestRunObjectCheck(unittest.TestCase):
         self.assertEqual(list(result.messages), [])
 
 
+class TestRunObjectsCheck(unittest.TestCase):
+
+    def test_single_request_messages_mapped(self):
+        connection = Connection([Response(status_code=200,
+                                          content_type='application/vnd.sap.adt.checkmessages+xml; charset=utf-8',
+                                          text=ADT_XML_RUN_OBJECTS_CHECK_RESPONSE_ERRORS)])
+        clas = sap.adt.Class(connection, 'CL_FOO')
+        program = sap.adt.Program(connection, 'ZFOO')
+
+        results, unattributed = sap.adt.checks.run_objects_check(connection, [(clas, 'CLASS cl_foo DEFINITION.\n'),
+                                                                (clas.test_classes, 'CLASS ltcl_foo.\n'),
+                                                                (program, 'REPORT zfoo.\n')])
+
+        self.assertEqual(connection.mock_methods(), [('POST', '/sap/bc/adt/checkruns')])
+        self.assertEqual(connection.execs[0].params, {'reporters': 'abapCheckRun'})
+        self.assertEqual(connection.execs[0].body.count('<chkrun:checkObject '), 3)
+
+        self.assertEqual([[msg.code for msg in result.messages] for result in results],
+                         [['SYNTAX(001)'], ['AUNIT(003)'], ['OBSOLETE(001)']])
+        self.assertEqual([result.has_errors for result in results], [True, False, False])
+        self.assertEqual([msg.code for msg in unattributed.messages], ['OTHER(004)'])
+
+    def test_no_sources(self):
+        connection = Connection()
+
+        results, unattributed = sap.adt.checks.run_objects_check(connection, [])
+
+        self.assertEqual(results, [])
+        self.assertEqual(list(unattributed.messages), [])
+        self.assertEqual(connection.execs, [])
+
+
+class TestObjectListCheckFindings(unittest.TestCase):
+
+    def test_str_joins_findings(self):
+        first = Mock()
+        first.__str__ = Mock(return_value='first.abap:1:1: E: One')
+        second = Mock()
+        second.__str__ = Mock(return_value='second.abap:2:1: E: Two')
+
+        exc = sap.adt.checks.ObjectListCheckFindings([first, second])
+
+        self.assertEqual(str(exc), 'first.abap:1:1: E: One\nsecond.abap:2:1: E: Two')
+
+    def test_str_reports_unattributed(self):
+        first = Mock()
+        first.__str__ = Mock(return_value='first.abap:1:1: E: One')
+        message = sap.adt.checks.CheckMessage()
+        message.uri = '/sap/bc/adt/oo/classes/cl_other/source/main#start=3,1;end=3,5'
+        message.typ = 'E'
+        message.short_text = 'Two'
+        report = sap.adt.checks.CheckReport()
+        report.messages.append(message)
+        unattributed = sap.adt.checks.CheckResult([report])
+
+        exc = sap.adt.checks.ObjectListCheckFindings([first], unattributed=unattributed)
+
+        self.assertEqual(str(exc), 'first.abap:1:1: E: One\nunattributed: cl_other:3:1: E: Two')
+
+
 class TestObjectCheckFindings(unittest.TestCase):
 
     def _make_connection(self, response_text):
@@ -171,7 +171,8 @@ class TestADTConnection(unittest.TestCase):
         mock_exec.assert_called_once_with('session', 'GET', 'url',
                                           params=None,
                                           headers={'Content-Type': 'application/xml'},
-                                          body=None)
+                                          body=None,
+                                          stream=False)
 
     @patch('sap.adt.core.Connection._build_adt_url', return_value='url')
     @patch('sap.adt.core.Connection._get_session', return_value='session')
@@ -184,7 +185,8 @@ class TestADTConnection(unittest.TestCase):
         mock_exec.assert_called_once_with('session', 'GET', 'url',
                                           params=None,
                                           headers={'Content-Type': 'application/xml'},
-                                          body=None)
+                                          body=None,
+                                          stream=False)
 
     @patch('sap.adt.core.Connection._build_adt_url', return_value='url')
     @patch('sap.adt.core.Connection._get_session', return_value='session')
@@ -199,7 +201,8 @@ class TestADTConnection(unittest.TestCase):
         mock_exec.assert_called_once_with('session', 'GET', 'url',
                                           params=None,
                                           headers={'Accept': 'application/xml'},
-                                          body=None)
+                                          body=None,
+                                          stream=False)
 
     @patch('sap.adt.core.Connection._build_adt_url', return_value='url')
     @patch('sap.adt.core.Connection._get_session', return_value='session')
@@ -215,7 +218,8 @@ class TestADTConnection(unittest.TestCase):
         mock_exec.assert_called_once_with('session', 'GET', 'url',
                                           params=None,
                                           headers={'Accept': 'application/xml'},
-                                          body=None)
+                                          body=None,
+                                          stream=False)
 
     @patch('sap.adt.core.Connection._build_adt_url', return_value='url')
     @patch('sap.adt.core.Connection._get_session', return_value='session')
@@ -232,7 +236,8 @@ class TestADTConnection(unittest.TestCase):
                                           params=None,
                                           headers={'Accept': 'application/xml',
                                                    'Content-Type': 'application/json'},
-                                          body=None)
+                                          body=None,
+                                          stream=False)
 
     @patch('sap.adt.core.Connection._build_adt_url', return_value='url')
     @patch('sap.adt.core.Connection._get_session', return_value='session')
@@ -251,7 +256,8 @@ class TestADTConnection(unittest.TestCase):
                                           params=None,
                                           headers={'Accept': 'application/xml',
                                                    'Content-Type': 'application/json'},
-                                          body=None)
+                                          body=None,
+                                          stream=False)
 
     @patch('sap.adt.core.Connection._build_adt_url', return_value='url')
     @patch('sap.adt.core.Connection._get_session', return_value='session')
@@ -266,7 +272,8 @@ class TestADTConnection(unittest.TestCase):
         mock_exec.assert_called_once_with('session', 'GET', 'url',
                                           params=None,
                                           headers={'Accept': 'application/xml, application/json'},
-                                          body=None)
+                                          body=None,
+                                          stream=False)
 
     @patch('sap.adt.core.Connection._build_adt_url', return_value='url')
     @patch('sap.adt.core.Connection._get_session', return_value='session')
@@ -346,6 +353,37 @@ class TestADTConnection(unittest.TestCase):
 
         self.assertIsNone(self.connection._session)
 
+    def test_clone_does_not_share_session(self):
+        self.connection._session = Mock()
+        self.connection._collection_types = {'/sap/bc/adt/foo': ['application/foo']}
+
+        cloned = self.connection.clone()
+
+        self.assertIsNone(cloned._session)
+        self.assertIsNotNone(self.connection._session)
+        self.assertIsNot(cloned._http_client, self.connection._http_client)
+        self.assertEqual(cloned._http_client.host, self.connection._http_client.host)
+        self.assertEqual(cloned.user, self.connection.user)
+        self.assertEqual(cloned.collection_types, self.connection.collection_types)
+
+    def test_clone_does_not_use_session_cache(self):
+        self.connection._http_client._session_cache = Mock()
+
+        cloned = self.connection.clone()
+
+        self.assertIsNone(cloned._http_client._session_cache)
+        self.assertIsNotNone(self.connection._http_client._session_cache)
+
+    def test_close_closes_session(self):
+        session = Mock()
+        self.connection._session = session
+
+        self.connection.close()
+        self.connection.close()
+
+        session.close.assert_called_once_with()
+        self.assertIsNone(self.connection._session)
+
     def test_new_session_when_no_session_is_noop(self):
         """new_session() is safe to call even when no session was built yet."""
         self.assertIsNone(self.connection._session)
@@ -383,6 +421,52 @@ class TestADTConnection(unittest.TestCase):
         self.assertIsNotNone(self.connection._session)
         self.assertIsNot(self.connection._session, session_after_first)
 
+    @patch('sap.adt.core._get_collection_accepts')
+    @patch('sap.http.HTTPClient.retrieve')
+    def test_discovery_cache_miss_stores_collection_types(self, fake_retrieve, fake_accepts):
+        discovery_cache = Mock()
+        discovery_cache.get.return_value = None
+        fake_accepts.return_value = {'/sap/bc/adt/packages': ['application/vnd.sap.adt.packages.v1+xml']}
+
+        connection = sap.adt.Connection('example.host.org', '123', 'SAP*', 'PASS', discovery_cache=discovery_cache)
+
+        dummy_conn = Connection(responses=[
+            Response(status_code=200, headers={'x-csrf-token': 'first'}),
+            Response(status_code=200, text='discovery'),
+            Response(status_code=200, text='success'),
+        ])
+        fake_retrieve.side_effect = dummy_conn._retrieve
+
+        resp = connection.execute('GET', 'test')
+
+        self.assertEqual(resp.text, 'success')
+        self.assertEqual(len(dummy_conn.execs), 3)
+        fake_accepts.assert_called_once_with('discovery')
+        discovery_cache.get.assert_called_once_with('example.host.org', '443', '123')
+        discovery_cache.set.assert_called_once_with('example.host.org', '443', '123', fake_accepts.return_value)
+
+    @patch('sap.adt.core._get_collection_accepts')
+    @patch('sap.http.HTTPClient.retrieve')
+    def test_discovery_cache_hit_skips_download(self, fake_retrieve, fake_accepts):
+        collection_types = {'/sap/bc/adt/packages': ['application/vnd.sap.adt.packages.v1+xml']}
+        discovery_cache = Mock()
+        discovery_cache.get.return_value = collection_types
+
+        connection = sap.adt.Connection('example.host.org', '123', 'SAP*', 'PASS', discovery_cache=discovery_cache)
+
+        dummy_conn = Connection(responses=[
+            Response(status_code=200, headers={'x-csrf-token': 'first'}),
+            Response(status_code=200, text='success'),
+        ])
+        fake_retrieve.side_effect = dummy_conn._retrieve
+
+        resp = connection.execute('GET', 'test')
+
+        self.assertEqual(resp.text, 'success')
+        self.assertEqual(len(dummy_conn.execs), 2)
+        fake_accepts.assert_not_called()
+        discovery_cache.set.assert_not_called()
+        self.assertEqual(connection.collection_types, collection_types)
 
     @patch('sap.adt.core.Connection.execute')
     def test_parse_collection_accept(self, mock_exec):
@@ -5,13 +5,15 @@ import unittest
 import sap
 import sap.adt
 from fixtures_adt_coverage import ACOVERAGE_RESULTS_XML
+from fixtures_adt_acoverage import ACOVERAGE_MEASUREMENTS_XML, \
+    ACOVERAGE_NEXT_OBJECT_MEASUREMENTS_XML, ACOVERAGE_NEXT_2_OBJECT_MEASUREMENTS_XML
 from sap.adt.aunit import Alert, AlertSeverity
 from sap.adt.objects import ADTObjectSets
 
 from fixtures_adt import DummyADTObject
 from fixtures_adt_aunit import AUNIT_RESULTS_XML, AUNIT_NO_TEST_RESULTS_XML
 
-from mock import Connection
+from mock import Connection, Response
 
 
 class TestACoverage(unittest.TestCase):
@@ -65,6 +67,41 @@ class TestACoverageParseResults(unittest.TestCase):
         pass
         # TODO implement
 
+    def test_stream_response(self):
+        def node_names(node):
+            return [(child.name, node_names(child)) for child in node.nodes]
+
+        def responses():
+            return [Response(status_code=200, text=xml,
+                             headers={'Content-Type': 'application/vnd.sap.adt.coverage.measurements.v1+xml'})
+                    for xml in (ACOVERAGE_NEXT_OBJECT_MEASUREMENTS_XML, ACOVERAGE_NEXT_2_OBJECT_MEASUREMENTS_XML)]
+
+        acoverage_response = Response(status_code=200, text=ACOVERAGE_MEASUREMENTS_XML, headers={})
+        parsed = sap.adt.acoverage.ACoverage(Connection(responses())).parse_response(acoverage_response)
+
+        streamed = []
+        connection = Connection(responses())
+        root_node = sap.adt.acoverage.ACoverage(connection).stream_response(
+            acoverage_response, lambda node, statement_uris: streamed.append((node, statement_uris)))
+
+        self.assertEqual(len(connection.execs), 2)
+        self.assertEqual(root_node.nodes, [])
+        self.assertEqual([node.name for node, _ in streamed], ['TEST_EXAMPLE_PACKAGE'])
+        self.assertEqual(node_names(streamed[0][0]), node_names(parsed.root_node.nodes[0]))
+        self.assertEqual(streamed[0][1], parsed.statement_uris)
+
+    def test_merge_coverage_roots(self):
+        first = sap.adt.acoverage.parse_acoverage_response(ACOVERAGE_RESULTS_XML).root_node
+        second = sap.adt.acoverage.parse_acoverage_response(ACOVERAGE_RESULTS_XML).root_node
+        first.coverages.append(sap.adt.acoverage.CoverageNode(type='statement', total=10, executed=4))
+        second.coverages.append(sap.adt.acoverage.CoverageNode(type='statement', total=5, executed=5))
+
+        merged = sap.adt.acoverage.merge_coverage_roots([first, second])
+
+        self.assertEqual(merged.name, 'ADT_ROOT_NODE')
+        self.assertEqual([node.name for node in merged.nodes], ['TEST_CHECK_LIST', 'TEST_CHECK_LIST'])
+        self.assertEqual(merged.coverages, [sap.adt.acoverage.CoverageNode(type='statement', total=15, executed=9)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -983,5 +983,60 @@ class TestADTCTSWorkbenchBuilder(unittest.TestCase):
         self.assertEqual(transport.number, 'NPLK123456')
 
 
+
+def abap_object(pgmid, typ, name, wbtype=''):
+    return WorkbenchABAPObject(pgmid, typ, name, wbtype, 'descr', True, '000001')
+
+
+class TestResolveOwnerObject(unittest.TestCase):
+
+    def resolve(self, *args, connection=None):
+        owner = sap.adt.cts.resolve_owner_object(connection, abap_object(*args))
+        return None if owner is None else (owner.pgmid, owner.type, owner.name, owner.wbtype)
+
+    def test_r3tr(self):
+        self.assertEqual(self.resolve('R3TR', 'PROG', 'ZINCLUDE', 'PROG/I'), ('R3TR', 'PROG', 'ZINCLUDE', 'PROG/I'))
+
+    def test_class_parts(self):
+        self.assertEqual(self.resolve('LIMU', 'METH', 'ZCL_FOO                       GET_BAR'),
+                         ('R3TR', 'CLAS', 'ZCL_FOO', 'CLAS/OC'))
+        self.assertEqual(self.resolve('LIMU', 'CINC', 'ZCL_FOO=======================CCAU'),
+                         ('R3TR', 'CLAS', 'ZCL_FOO', 'CLAS/OC'))
+        self.assertEqual(self.resolve('LIMU', 'CPUB', 'ZCL_FOO'), ('R3TR', 'CLAS', 'ZCL_FOO', 'CLAS/OC'))
+
+    def test_report_sources(self):
+        self.assertEqual(self.resolve('LIMU', 'REPS', 'LZFUGRU01', 'FUGR/I'), ('R3TR', 'FUGR', 'ZFUGR', 'FUGR/F'))
+        self.assertEqual(self.resolve('LIMU', 'REPS', '/NS/SAPLFUGR', 'FUGR/I'),
+                         ('R3TR', 'FUGR', '/NS/FUGR', 'FUGR/F'))
+        self.assertEqual(self.resolve('LIMU', 'REPS', 'ZINCLUDE', 'PROG/I'), ('R3TR', 'PROG', 'ZINCLUDE', 'PROG/I'))
+
+    def test_function_module(self):
+        connection = Connection([Response(
+            text='<?xml version="1.0" encoding="utf-8"?>'
+                 '<adtcore:objectReferences xmlns:adtcore="http://www.sap.com/adt/core">'
+                 '<adtcore:objectReference adtcore:uri="/sap/bc/adt/functions/groups/zother/fmodules/z_module_2"'
+                 ' adtcore:type="FUGR/FF" adtcore:name="Z_MODULE_2"/>'
+                 '<adtcore:objectReference adtcore:uri="/sap/bc/adt/functions/groups/%2fns%2ffugr/fmodules/z_module"'
+                 ' adtcore:type="FUGR/FF" adtcore:name="Z_MODULE"/>'
+                 '</adtcore:objectReferences>',
+            status_code=200, headers={'Content-Type': 'application/xml'})])
+
+        self.assertEqual(self.resolve('LIMU', 'FUNC', 'z_module', 'FUGR/FF', connection=connection),
+                         ('R3TR', 'FUGR', '/NS/FUGR', 'FUGR/F'))
+        self.assertEqual(connection.execs[0].params['query'], 'Z_MODULE')
+
+    def test_function_module_not_found(self):
+        connection = Connection([Response(
+            text='<?xml version="1.0" encoding="utf-8"?>'
+                 '<adtcore:objectReferences xmlns:adtcore="http://www.sap.com/adt/core"/>',
+            status_code=200, headers={'Content-Type': 'application/xml'})])
+
+        self.assertIsNone(self.resolve('LIMU', 'FUNC', 'Z_MODULE', 'FUGR/FF', connection=connection))
+
+    def test_unknown(self):
+        self.assertIsNone(self.resolve('LIMU', 'TABD', 'ZTABLE', 'TABL/DT'))
+        self.assertIsNone(self.resolve('CORR', 'RELE', 'NPLK000001'))
+
+
 if __name__ == '__main__':
     unittest.main()
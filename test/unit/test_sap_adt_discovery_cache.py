@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+"""Tests for sap.adt.discovery_cache.
+
+The file store is replaced by an in-memory fake; generic JSONFileStore
+behaviour is exercised in test_sap_http_json_store.py.
+"""
+
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from sap.adt.discovery_cache import (
+    CachedDiscovery,
+    DiscoveryCache,
+    DiscoveryFileStore,
+    cache_key_for,
+    get_discovery_cache,
+)
+
+
+COLLECTION_TYPES = {'/sap/bc/adt/packages': ['application/vnd.sap.adt.packages.v1+xml']}
+
+
+class MemoryStore:
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries[key] = value
+
+
+class TestCachedDiscovery(unittest.TestCase):
+
+    def test_round_trip(self):
+        entry = CachedDiscovery(collection_types=COLLECTION_TYPES, stored_at=1000.0)
+
+        self.assertEqual(CachedDiscovery.from_json(entry.to_json()), entry)
+
+    def test_from_json_rejects_non_mapping(self):
+        with self.assertRaises(TypeError):
+            CachedDiscovery.from_json(json.dumps({'collection_types': [], 'stored_at': 0}))
+
+    def test_is_expired(self):
+        entry = CachedDiscovery(collection_types=COLLECTION_TYPES, stored_at=1000.0)
+
+        self.assertFalse(entry.is_expired(60, now=1060.0))
+        self.assertTrue(entry.is_expired(60, now=1061.0))
+
+
+class TestDiscoveryFileStore(unittest.TestCase):
+
+    @patch('pathlib.Path.chmod', return_value=None)
+    @patch('pathlib.Path.mkdir', return_value=None)
+    def test_subdirectory_and_serialization(self, _mock_mkdir, _mock_chmod):
+        store = DiscoveryFileStore(base_dir=Path('/tmp/sapcli-test'))
+        entry = CachedDiscovery(collection_types=COLLECTION_TYPES, stored_at=1.0)
+
+        self.assertEqual(store._dir, Path('/tmp/sapcli-test/adt_discovery'))
+        self.assertEqual(store._deserialize(store._serialize(entry)), entry)
+
+
+class TestCacheKey(unittest.TestCase):
+
+    def test_key_differs_per_system(self):
+        key = cache_key_for('example.org', '443', '100')
+
+        self.assertEqual(key, cache_key_for('example.org', 443, '100'))
+        self.assertNotEqual(key, cache_key_for('example.org', '443', '200'))
+        self.assertNotEqual(key, cache_key_for('example.com', '443', '100'))
+        self.assertNotEqual(key, cache_key_for('example.org', '8000', '100'))
+
+
+class TestDiscoveryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.store = MemoryStore()
+        self.cache = DiscoveryCache(3600, store=self.store)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('example.org', '443', '100'))
+
+    def test_set_get(self):
+        self.cache.set('example.org', '443', '100', COLLECTION_TYPES)
+
+        self.assertEqual(self.cache.get('example.org', '443', '100'), COLLECTION_TYPES)
+        self.assertIsNone(self.cache.get('example.org', '443', '200'))
+
+    def test_get_expired(self):
+        self.store.set(cache_key_for('example.org', '443', '100'),
+                       CachedDiscovery(collection_types=COLLECTION_TYPES, stored_at=0.0))
+
+        self.assertIsNone(self.cache.get('example.org', '443', '100'))
+
+    def test_store_errors_are_ignored(self):
+        store = Mock()
+        store.get.side_effect = OSError('read-only')
+        store.set.side_effect = OSError('read-only')
+        cache = DiscoveryCache(3600, store=store)
+
+        cache.set('example.org', '443', '100', COLLECTION_TYPES)
+        self.assertIsNone(cache.get('example.org', '443', '100'))
+
+    @patch('sap.adt.discovery_cache.DiscoveryFileStore')
+    def test_store_created_lazily(self, fake_store):
+        cache = DiscoveryCache(3600)
+        fake_store.assert_not_called()
+
+        fake_store.return_value.get.return_value = None
+        cache.get('example.org', '443', '100')
+        cache.get('example.org', '443', '100')
+
+        fake_store.assert_called_once_with()
+
+
+class TestGetDiscoveryCache(unittest.TestCase):
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_discovery_cache())
+
+    @patch.dict('os.environ', {'SAPCLI_DISCOVERY_CACHE_TTL': '86400'}, clear=True)
+    def test_enabled(self):
+        cache = get_discovery_cache()
+
+        self.assertIsInstance(cache, DiscoveryCache)
+        self.assertEqual(cache.ttl, 86400)
+
+    @patch.dict('os.environ', {'SAPCLI_DISCOVERY_CACHE_TTL': '0'}, clear=True)
+    def test_disabled(self):
+        self.assertIsNone(get_discovery_cache())
+
+    @patch.dict('os.environ', {'SAPCLI_DISCOVERY_CACHE_TTL': '60'}, clear=True)
+    def test_custom_ttl(self):
+        self.assertEqual(get_discovery_cache().ttl, 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,19 @@
 #!/bin/python
 
+import io
+import hashlib
 import unittest
 
+import sap.adt.atc
 from sap import get_logger
 from sap.adt import ADTObject, ADTObjectType, ADTCoreData, OrderedClassMembers
-from sap.adt.objects import XMLNamespace, ADTRootObject
+from sap.adt.objects import XMLNamespace, ADTRootObject, ADTObjectReferences, ADTObjectReference
 from sap.adt.annotations import xml_element, xml_attribute, XmlElementProperty, XmlElementKind, XmlNodeProperty, \
                                 XmlNodeAttributeProperty, XmlContainer, XmlListNodeProperty, xml_text
-from sap.adt.marshalling import Marshal, Element, adt_object_to_element_name, ElementHandler, MarshallingError
+from sap.adt.marshalling import Marshal, adt_object_to_element_name, ElementHandler, MarshallingError, \
+                                deserialization_plan, serialization_plan
+
+from fixtures_adt_atc import large_worklist_xml
 
 
 class Dummy(ADTObject):
@@ -483,37 +489,33 @@ class DummyWithEmptyElements(metaclass=OrderedClassMembers):
 class TestADTAnnotation(unittest.TestCase):
 
 
-    def test_tree_generation(self):
+    def test_serialize_structure(self):
         obj = Dummy()
         marshal = Marshal()
-        xmltree = marshal._object_to_tree(obj)
-
-        self.assertEqual(xmltree.name, 'dummyxmlns:dummyelem')
-        self.assertEqual(xmltree.attributes['attr_first'], '11111')
-        self.assertEqual(xmltree.attributes['attr_second'], '22222')
-        self.assertEqual(xmltree.attributes['attr_third'], '3333')
-
-        self.assertEqual(xmltree.children[0].name, 'adtcore:packageRef')
-
-        self.assertEqual(xmltree.children[1].name, 'first_elem')
-        self.assertEqual(xmltree.children[1].attributes['nst_fst'], 'nst_fst_val')
-        self.assertEqual(xmltree.children[1].attributes['nst_scn'], 'nst_scn_val')
+        xml = marshal.serialize(obj)
 
-        self.assertEqual(xmltree.children[1].children[0].name, 'child_nst')
-        self.assertEqual(xmltree.children[1].children[0].attributes['sup_nst_fst'], 'yetanother')
+        self.assertEqual(xml, '''<?xml version="1.0" encoding="UTF-8"?>
+<dummyxmlns:dummyelem xmlns:dummyxmlns="http://www.sap.com/adt/xmlns/dummy" adtcore:type="CODE" adtcore:description="Description" adtcore:language="CZ" adtcore:name="dmtname" adtcore:masterLanguage="EN" adtcore:masterSystem="NPL" adtcore:responsible="FILAK" attr_first="11111" attr_second="22222" attr_third="3333">
+<adtcore:packageRef/>
+<first_elem nst_fst="nst_fst_val" nst_scn="nst_scn_val">
+<child_nst sup_nst_fst="yetanother"/>
+</first_elem>
+<readonly_elem nst_fst="nst_fst_val" nst_scn="nst_scn_val">
+<child_nst sup_nst_fst="yetanother"/>
+</readonly_elem>
+</dummyxmlns:dummyelem>''')
 
     def test_xml_formatting(self):
         marshal = Marshal()
-        elem = Element('root')
-        elem.add_attribute('one', '1')
-        elem.add_attribute('two', '2')
-        elem.add_attribute('three', 'quoted &')
-        child = elem.add_child('child')
-        xml = marshal._tree_to_xml(elem)
+        obj = ObjectWithListOfTextItems()
+        obj.items = ListItemWithTextAndAttribute('quoted &', 'alpha & <omega>')
+        obj.items = ListItemWithTextAndAttribute('2', None)
+        xml = marshal.serialize(obj)
         self.assertEqual(xml, '''<?xml version="1.0" encoding="UTF-8"?>
-<root one="1" two="2" three="quoted &amp;">
-<child/>
-</root>''')
+<mock:listoftextitems xmlns:mock="https://example.org/mock">
+<mock:entry mock:label="quoted &amp;">alpha &amp; &lt;omega&gt;</mock:entry>
+<mock:entry mock:label="2"/>
+</mock:listoftextitems>''')
 
     def test_element_handler(self):
         adt_object = DummyWithSetters()
@@ -1308,5 +1310,182 @@ class TestElementHandlerTextPropertyReset(unittest.TestCase):
         self.assertEqual(restored.items[1].content, 'beta')
 
 
+class TextWithChildren(metaclass=OrderedClassMembers):
+
+    def __init__(self):
+        self.objtype = ADTObjectType(None, None,
+                                     XMLNamespace('mock', 'https://example.org/mock'),
+                                     'application/xml',
+                                     None,
+                                     'textwithchildren')
+
+    @xml_text('text')
+    def text(self):
+        return 'text'
+
+    @xml_element('mock:child', kind=XmlElementKind.TEXT)
+    def child(self):
+        return 'child'
+
+
+class TestStreamingSerialization(unittest.TestCase):
+
+    def test_container(self):
+        container = DummyOjbectWithContainer()
+        container.items.append(DummyContainerItem('first'))
+        container.items.append(DummyContainerItem('second'))
+
+        self.assertEqual(Marshal().serialize(container), '''<?xml version="1.0" encoding="UTF-8"?>
+<adtcore:container xmlns:adtcore="http://www.sap.com/adt/core">
+<adtcore:packageRef/>
+<items>
+<item number="first"/>
+<item number="second"/>
+</items>
+</adtcore:container>''')
+
+    def test_escaping(self):
+        text_items = ObjectWithListOfTextItems()
+        text_items.items = ListItemWithTextAndAttribute('a', 'alpha & <omega>')
+
+        self.assertEqual(Marshal().serialize(text_items), '''<?xml version="1.0" encoding="UTF-8"?>
+<mock:listoftextitems xmlns:mock="https://example.org/mock">
+<mock:entry mock:label="a">alpha &amp; &lt;omega&gt;</mock:entry>
+</mock:listoftextitems>''')
+
+    def test_versioned(self):
+        expected = {
+            'V1': '''<?xml version="1.0" encoding="UTF-8"?>
+<mock:versioned xmlns:mock="https://github.com/jfilak/sapcli/mock" mock:attrverfst="Init-attr-fst" mock:attrverboth="Init-attr-both" mock:attrverall="Init-attr-all">
+<adtcore:packageRef/>
+<mock:elemverfst>Init-elem-fst</mock:elemverfst>
+<mock:elemverboth>Init-elem-both</mock:elemverboth>
+<mock:elemverall>Init-elem-all</mock:elemverall>
+</mock:versioned>''',
+            'V2': '''<?xml version="1.0" encoding="UTF-8"?>
+<mock:versioned xmlns:mock="https://github.com/jfilak/sapcli/mock" mock:attrverboth="Init-attr-both" mock:attrverall="Init-attr-all">
+<adtcore:packageRef/>
+<mock:elemverboth>Init-elem-both</mock:elemverboth>
+<mock:elemverall>Init-elem-all</mock:elemverall>
+</mock:versioned>''',
+            'V3': '''<?xml version="1.0" encoding="UTF-8"?>
+<mock:versioned xmlns:mock="https://github.com/jfilak/sapcli/mock" mock:attrverall="Init-attr-all">
+<adtcore:packageRef/>
+<mock:elemverall>Init-elem-all</mock:elemverall>
+</mock:versioned>''',
+        }
+
+        for version, xml in expected.items():
+            with self.subTest(version=version):
+                self.assertEqual(Marshal(object_schema_version=version).serialize(DummyADTObjectWithVersions()), xml)
+
+    def test_serialize_to_stream(self):
+        stream = io.StringIO()
+        stream.write('prefix:')
+
+        Marshal().serialize_to_stream(ParentADTObject(), stream)
+
+        self.assertEqual(stream.getvalue(), 'prefix:' + Marshal().serialize(ParentADTObject()))
+
+    def test_text_with_children(self):
+        with self.assertRaises(MarshallingError) as caught:
+            Marshal().serialize(TextWithChildren())
+
+        self.assertEqual(str(caught.exception),
+                         'Cannot set text the text element "mock:textwithchildren" with children')
+
+
+class TestLargePayloadSerialization(unittest.TestCase):
+
+    def test_large_payload(self):
+        references = ADTObjectReferences()
+        for i in range(5000):
+            references.add_reference(ADTObjectReference(uri=f'/sap/bc/adt/oo/classes/zcl_{i}',
+                                                        typ='CLAS/OC', name=f'ZCL_{i}'))
+
+        xml = Marshal().serialize(references)
+
+        self.assertEqual(xml, '<?xml version="1.0" encoding="UTF-8"?>\n'
+                              '<adtcore:objectReferences xmlns:adtcore="http://www.sap.com/adt/core">\n'
+                         + ''.join('<adtcore:objectReference'
+                                   f' adtcore:uri="/sap/bc/adt/oo/classes/zcl_{i}"'
+                                   f' adtcore:type="CLAS/OC" adtcore:name="ZCL_{i}"/>\n' for i in range(5000))
+                         + '</adtcore:objectReferences>')
+        # the payload serialized by the former element tree serializer
+        self.assertEqual(hashlib.sha256(xml.encode('utf-8')).hexdigest(),
+                         '6a6657f414d1f7728cbe83769be692bfc18876f129e38a5571e88d007f33e744')
+
+
+class TestMarshallingPlans(unittest.TestCase):
+
+    def test_deserialization_plan(self):
+        plan = deserialization_plan(Dummy)
+
+        self.assertIs(plan, deserialization_plan(Dummy))
+        self.assertEqual(list(plan.attributes.keys())[-2:], ['attr_first', 'attr_second'])
+        self.assertNotIn('attr_third', plan.attributes)
+        self.assertEqual([attr.name for attr in plan.elements], ['adtcore:packageRef', 'first_elem'])
+        self.assertIsNone(plan.textproperty)
+
+        with self.assertRaises(TypeError):
+            plan.attributes['attr_fourth'] = None
+
+    def test_deserialization_plan_text(self):
+        plan = deserialization_plan(ContentWithTextAndAttribute)
+
+        self.assertIsNotNone(plan.textproperty)
+        self.assertEqual(plan.textproperty_name, 'text_prop')
+
+    def test_serialization_plan_versions(self):
+        self.assertIs(serialization_plan(DummyADTObjectWithVersions, 'V1'),
+                      serialization_plan(DummyADTObjectWithVersions, 'V1'))
+
+        names = [attr_name for attr_name, _ in serialization_plan(DummyADTObjectWithVersions, 'V2')]
+        self.assertNotIn('elemverfst', names)
+        self.assertIn('elemverboth', names)
+
+    def test_serialization_plan_without_version(self):
+        with self.assertRaises(RuntimeError):
+            serialization_plan(DummyADTObjectWithVersions, None)
+
+
+class TestMarshallingPlansCache(unittest.TestCase):
+    """Annotations of a class must be examined once and not for every XML
+       element of large documents like ATC worklists.
+    """
+
+    def setUp(self):
+        self.xml = large_worklist_xml(2000)
+
+    def deserialize(self):
+        worklist = sap.adt.atc.WorkList()
+        Marshal.deserialize(self.xml, worklist)
+        return worklist
+
+    def test_deserialize_reuses_plans(self):
+        self.deserialize()
+
+        before = deserialization_plan.cache_info()
+        worklist = self.deserialize()
+        after = deserialization_plan.cache_info()
+
+        self.assertEqual(len(worklist.objects), 2000)
+        self.assertEqual(worklist.objects[1999].findings[0].check_id, '001321AF52A31DDBA7E0EE95D633EA22')
+        self.assertEqual(after.misses, before.misses)
+        self.assertGreater(after.hits, before.hits)
+
+    def test_serialize_reuses_plans(self):
+        worklist = self.deserialize()
+        marshal = Marshal()
+        marshal.serialize(worklist)
+
+        before = serialization_plan.cache_info()
+        marshal.serialize(worklist)
+        after = serialization_plan.cache_info()
+
+        self.assertEqual(after.misses, before.misses)
+        self.assertGreaterEqual(after.hits - before.hits, 2000)
+
+
 if __name__ == '__main__':
     unittest.main()
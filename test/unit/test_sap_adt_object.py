@@ -731,5 +731,37 @@ class TestADTObjectSourceEditorFactoryMethods(unittest.TestCase):
         self.assertEqual(editor._content_type, 'text/plain')
 
 
+class TestSourceComparison(unittest.TestCase):
+
+    def test_normalize_source_text(self):
+        self.assertEqual(sap.adt.objects.normalize_source_text('first  \r\nsecond\t\n\n\n'), 'first\nsecond')
+
+    def test_normalize_source_text_keeps_inner_empty_lines(self):
+        self.assertEqual(sap.adt.objects.normalize_source_text('first\n\nsecond\n'), 'first\n\nsecond')
+
+    def test_is_source_unchanged(self):
+        connection = Connection([Response(status_code=200, text='first\r\nsecond\r\n')])
+        victory = DummyADTObject(connection=connection, name='SOFTWARE_ENGINEER')
+
+        self.assertTrue(sap.adt.objects.is_source_unchanged(victory, 'first\nsecond\n'))
+        self.assertEqual([(request.method, request.adt_uri) for request in connection.execs],
+                         [('GET', '/sap/bc/adt/awesome/success/software_engineer/no/bigdeal')])
+
+    def test_is_source_changed(self):
+        connection = Connection([Response(status_code=200, text='first\nsecond\n')])
+        victory = DummyADTObject(connection=connection, name='SOFTWARE_ENGINEER')
+
+        self.assertFalse(sap.adt.objects.is_source_unchanged(victory, 'first\nthird\n'))
+
+    def test_is_source_unchanged_not_found(self):
+        class MissingObject:
+
+            @property
+            def text(self):
+                raise sap.adt.errors.ExceptionResourceNotFound('Not found')
+
+        self.assertFalse(sap.adt.objects.is_source_unchanged(MissingObject(), 'first'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,15 @@
 #!/bin/python
 
+import threading
+import time
 import unittest
 from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 from sap import get_logger
 import sap.errors
 import sap.adt
+from sap.adt.package_index import PackageIndex
 
 from mock import Connection, Response, PatcherTestCase
 from fixtures_adt_package import GET_PACKAGE_ADT_XML
@@ -224,5 +228,136 @@ class TestADTPackageWalk(unittest.TestCase, PatcherTestCase):
                          SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD', uri='/sap/bc/adt/programs/programs/z_hello_world', description='Test program')])
 
 
+PACKAGE_TREE = {
+    '$ROOT': ['$ROOT_A', '$ROOT_B', '$ROOT_C'],
+    '$ROOT_A': ['$ROOT_A_1', '$ROOT_A_2'],
+    '$ROOT_B': [],
+    '$ROOT_C': ['$ROOT_C_1'],
+    '$ROOT_A_1': [],
+    '$ROOT_A_2': ['$ROOT_A_2_X'],
+    '$ROOT_A_2_X': [],
+    '$ROOT_C_1': [],
+}
+
+
+class FakeTreeRepository:
+
+    explored = []
+    lock = threading.Lock()
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def walk_step(self, adt_object, withdescr=False):
+        with FakeTreeRepository.lock:
+            FakeTreeRepository.explored.append((adt_object.name, self.connection))
+
+        # make the first sibling the slowest one to shuffle completion order
+        time.sleep(0.02 if adt_object.name.endswith('_A') else 0.001)
+
+        if withdescr:
+            subpackages = [SimpleNamespace(typ='DEVC/K', name=name, uri=f'packages/{name}', description=name)
+                           for name in PACKAGE_TREE[adt_object.name]]
+        else:
+            subpackages = list(PACKAGE_TREE[adt_object.name])
+
+        return subpackages, [SimpleNamespace(typ='PROG/P', name=f'Z{adt_object.name[1:]}', uri='', description='')]
+
+
+@patch('sap.adt.package.Repository', new=FakeTreeRepository)
+class TestADTPackageWalkConcurrently(unittest.TestCase):
+
+    def setUp(self):
+        FakeTreeRepository.explored = []
+        self.connection = Mock()
+        self.connection.clone.side_effect = lambda: Mock(name='clone')
+
+    def walk(self, jobs, withdescr=False):
+        return list(sap.adt.package.walk(sap.adt.Package(self.connection, '$ROOT'), withdescr=withdescr, jobs=jobs))
+
+    def test_same_order_as_sequential(self):
+        sequential = self.walk(1)
+        self.assertEqual(self.connection.clone.call_count, 0)
+
+        concurrent = self.walk(4)
+
+        self.assertEqual([path for path, _, _ in sequential],
+                         [[], ['$ROOT_A'], ['$ROOT_B'], ['$ROOT_C'],
+                          ['$ROOT_A', '$ROOT_A_1'], ['$ROOT_A', '$ROOT_A_2'], ['$ROOT_C', '$ROOT_C_1'],
+                          ['$ROOT_A', '$ROOT_A_2', '$ROOT_A_2_X']])
+        self.assertEqual(concurrent, sequential)
+        self.assertLessEqual(self.connection.clone.call_count, 4)
+        self.assertNotIn(self.connection, [connection for _, connection in FakeTreeRepository.explored[8:]])
+
+    def test_clones_closed(self):
+        clones = []
+
+        def clone():
+            clones.append(Mock(name='clone'))
+            return clones[-1]
+
+        self.connection.clone.side_effect = clone
+
+        self.walk(4)
+
+        self.assertTrue(clones)
+        for connection in clones:
+            connection.close.assert_called_once_with()
+
+    def test_same_order_as_sequential_withdescr(self):
+        self.assertEqual(self.walk(3, withdescr=True), self.walk(1, withdescr=True))
+
+    def test_stop_iteration_does_not_explore_subpackages(self):
+        walk_iter = sap.adt.package.walk(sap.adt.Package(self.connection, '$ROOT'), jobs=4)
+
+        path, subpackages, _ = next(walk_iter)
+        walk_iter.close()
+
+        self.assertEqual(path, [])
+        self.assertEqual(subpackages, ['$ROOT_A', '$ROOT_B', '$ROOT_C'])
+        self.assertEqual([name for name, _ in FakeTreeRepository.explored], ['$ROOT'])
+
+    def test_error_is_propagated(self):
+        def failing_walk_step(repository, adt_object, withdescr=False):
+            if adt_object.name == '$ROOT_B':
+                raise sap.errors.SAPCliError('Cannot read $ROOT_B')
+
+            return [] if adt_object.name != '$ROOT' else ['$ROOT_A', '$ROOT_B'], []
+
+        with patch.object(FakeTreeRepository, 'walk_step', failing_walk_step):
+            with self.assertRaises(sap.errors.SAPCliError) as caught:
+                self.walk(2)
+
+        self.assertEqual(str(caught.exception), 'Cannot read $ROOT_B')
+
+    def test_index_is_filled_and_read(self):
+        index = PackageIndex('mockhost:443/100', 3600, path=':memory:')
+
+        for jobs in (1, 4):
+            for withdescr in (False, True):
+                expected = self.walk(jobs, withdescr=withdescr)
+                FakeTreeRepository.explored = []
+
+                first = list(sap.adt.package.walk(sap.adt.Package(self.connection, '$ROOT'),
+                                                  withdescr=withdescr, jobs=jobs, index=index))
+                explored = len(FakeTreeRepository.explored)
+
+                second = list(sap.adt.package.walk(sap.adt.Package(self.connection, '$ROOT'),
+                                                   withdescr=withdescr, jobs=jobs, index=index))
+
+                self.assertEqual(first, expected)
+                self.assertEqual(second, expected)
+                self.assertEqual(len(FakeTreeRepository.explored), explored)
+
+                index.forget_tree('$ROOT')
+
+        index.close()
+
+    def test_invalid_jobs(self):
+        for jobs in (None, 0, -1):
+            with self.assertRaises(sap.errors.SAPCliError):
+                self.walk(jobs)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from sap.errors import SAPCliError
+from sap.adt.package_index import (
+    PackageIndex,
+    forget_indexed_trees,
+    get_package_index,
+    open_package_index,
+    system_key,
+)
+
+from mock import Connection
+
+
+SUBPACKAGES = [SimpleNamespace(typ='DEVC/K', name='$VICTORY_TESTS', uri='/sap/bc/adt/packages/%24victory_tests',
+                               description='Tests')]
+OBJECTS = [SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD', uri='/sap/bc/adt/programs/programs/z_hello_world',
+                           description='Hello')]
+
+
+class TestPackageIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PackageIndex('mockhost:443/100', 3600, path=':memory:')
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_get_missing(self):
+        self.assertIsNone(self.index.get('$VICTORY'))
+
+    def test_set_get(self):
+        self.index.set('$victory', SUBPACKAGES, OBJECTS)
+
+        self.assertEqual(self.index.get('$VICTORY'), (SUBPACKAGES, OBJECTS))
+
+    def test_get_expired(self):
+        self.index.set('$VICTORY', SUBPACKAGES, OBJECTS)
+
+        with patch('time.time', return_value=0):
+            self.index.set('$OLD', [], [])
+
+        self.assertIsNone(self.index.get('$OLD'))
+        self.assertIsNotNone(self.index.get('$VICTORY'))
+
+    def test_systems_are_separated(self):
+        self.index.set('$VICTORY', SUBPACKAGES, OBJECTS)
+        db = self.index._get_db()
+
+        other = PackageIndex('mockhost:443/200', 3600, path=':memory:')
+        other._db = db
+
+        self.assertIsNone(other.get('$VICTORY'))
+
+    def test_forget_tree(self):
+        self.index.set('$VICTORY', SUBPACKAGES, OBJECTS)
+        self.index.set('$VICTORY_TESTS', [], OBJECTS)
+        self.index.set('$OTHER', [], OBJECTS)
+
+        self.assertEqual(self.index.forget_tree('$victory'), 2)
+
+        self.assertIsNone(self.index.get('$VICTORY'))
+        self.assertIsNone(self.index.get('$VICTORY_TESTS'))
+        self.assertIsNotNone(self.index.get('$OTHER'))
+        self.assertEqual(self.index.forget_tree('$VICTORY'), 0)
+
+    def test_database_errors(self):
+        index = PackageIndex('mockhost:443/100', 3600, path='/nonexistent/directory/index.sqlite')
+
+        index.set('$VICTORY', SUBPACKAGES, OBJECTS)
+        self.assertIsNone(index.get('$VICTORY'))
+
+        with self.assertRaises(SAPCliError):
+            index.forget_tree('$VICTORY')
+
+    @patch('sap.adt.package_index._default_cache_dir')
+    def test_database_opened_lazily(self, fake_cache_dir):
+        index = PackageIndex('mockhost:443/100', 3600)
+        fake_cache_dir.assert_not_called()
+
+        fake_cache_dir.side_effect = OSError('read-only')
+        self.assertIsNone(index.get('$VICTORY'))
+        fake_cache_dir.assert_called_once_with()
+
+
+class TestGetPackageIndex(unittest.TestCase):
+
+    def test_system_key(self):
+        self.assertEqual(system_key('example.org', '443', '100'), 'example.org:443/100')
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_package_index(Connection()))
+
+    @patch.dict('os.environ', {'SAPCLI_PACKAGE_INDEX_TTL': '600'}, clear=True)
+    def test_enabled(self):
+        connection = Connection()
+        index = get_package_index(connection)
+
+        self.assertEqual(index.ttl, 600)
+        self.assertEqual(index.system, system_key(connection.host, connection.port, connection.client))
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_open_disabled(self):
+        self.assertEqual(open_package_index(Connection()).ttl, 0)
+
+
+class TestForgetIndexedTrees(unittest.TestCase):
+
+    @patch('sap.adt.package_index.get_package_index', return_value=None)
+    def test_disabled(self, fake_get_index):
+        forget_indexed_trees(Connection(), ['$VICTORY'])
+
+        fake_get_index.assert_called_once()
+
+    @patch('sap.adt.package_index.get_package_index')
+    def test_forget_and_close(self, fake_get_index):
+        index = Mock()
+        index.forget_tree.side_effect = [1, SAPCliError('Cannot update package index')]
+        fake_get_index.return_value = index
+
+        with self.assertRaises(SAPCliError):
+            forget_indexed_trees(Connection(), ['$VICTORY', '$MASTER', '$OTHER'])
+
+        self.assertEqual([call.args for call in index.forget_tree.call_args_list], [('$VICTORY',), ('$MASTER',)])
+        index.close.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -201,6 +201,21 @@ class TestADTWBFetchInactive(unittest.TestCase):
         self.assertEqual(my_inactive_objects.entries[1].object.reference.name, 'CL_HELLO_WORLD')
 
 
+class TestADTWBFilterInactive(unittest.TestCase):
+
+    def test_filter_inactive_objects(self):
+        conn = Connection(responses=[RESPONSE_INACTIVE_OBJECTS_V1])
+
+        hello = Mock(full_adt_uri='/sap/bc/adt/oo/classes/cl_hello_world')
+        prefix = Mock(full_adt_uri='/sap/bc/adt/oo/classes/cl_hello')
+        other = Mock(full_adt_uri='/sap/bc/adt/programs/programs/zprogram')
+
+        inactive = sap.adt.wb.filter_inactive_objects(conn, [prefix, hello, other])
+
+        self.assertEqual(inactive, [hello])
+        self.assertEqual([request.adt_uri for request in conn.execs], ['/sap/bc/adt/activation/inactiveobjects'])
+
+
 class TestADTWBTryMassActivate(unittest.TestCase):
 
     def test_parse_activation_warnings(self):
@@ -230,6 +245,67 @@ class TestADTWBTryMassActivate(unittest.TestCase):
         self.assertEqual(messages[1].force_supported, 'true')
 
 
+class TestADTWBBisectMassActivate(unittest.TestCase):
+
+    def make_objects(self, conn, *names):
+        objects = []
+        for name in names:
+            adt_object = Mock()
+            adt_object.full_adt_uri = f'/sap/bc/adt/programs/programs/{name.lower()}'
+            adt_object.name = name
+            adt_object.connection = conn
+            objects.append(adt_object)
+
+        return objects
+
+    def error_response(self):
+        return Response(status_code=200, text=ACTIVATION_ERROR_XML, content_type='application/xml')
+
+    def activated_names(self, conn):
+        return [[name for name in ('FIRST', 'SECOND', 'THIRD', 'FOURTH') if f'adtcore:name="{name}"' in request.body]
+                for request in conn.execs]
+
+    def test_single_request_per_chunk(self):
+        conn = Connection([EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
+        objects = self.make_objects(conn, 'FIRST', 'SECOND', 'THIRD')
+
+        chunks = list(sap.adt.wb.bisect_mass_activate(conn, objects, chunk_size=2))
+
+        self.assertEqual([chunk for chunk, _ in chunks], [objects[:2], objects[2:]])
+        self.assertFalse(any(results.has_errors for _, results in chunks))
+        self.assertEqual(self.activated_names(conn), [['FIRST', 'SECOND'], ['THIRD']])
+
+    def test_bisect_chunk_with_errors(self):
+        conn = Connection([self.error_response(), EMPTY_RESPONSE_OK, self.error_response(), EMPTY_RESPONSE_OK,
+                           self.error_response()])
+        objects = self.make_objects(conn, 'FIRST', 'SECOND', 'THIRD', 'FOURTH')
+
+        chunks = list(sap.adt.wb.bisect_mass_activate(conn, objects, chunk_size=4))
+
+        self.assertEqual([chunk for chunk, _ in chunks], [objects[:2], objects[2:3], objects[3:]])
+        self.assertEqual([results.has_errors for _, results in chunks], [False, False, True])
+        self.assertEqual(self.activated_names(conn),
+                         [['FIRST', 'SECOND', 'THIRD', 'FOURTH'], ['FIRST', 'SECOND'], ['THIRD', 'FOURTH'],
+                          ['THIRD'], ['FOURTH']])
+
+    def test_bisect_references(self):
+        conn = Connection([self.error_response(), self.error_response(), EMPTY_RESPONSE_OK])
+        references = ADTObjectReferences()
+        for adt_object in self.make_objects(conn, 'FIRST', 'SECOND'):
+            references.add_object(adt_object)
+
+        chunks = list(sap.adt.wb.bisect_mass_activate_references(conn, references, chunk_size=2))
+
+        self.assertEqual([[ref.name for ref in chunk] for chunk, _ in chunks], [['FIRST'], ['SECOND']])
+        self.assertEqual([results.has_errors for _, results in chunks], [True, False])
+        self.assertEqual(self.activated_names(conn), [['FIRST', 'SECOND'], ['FIRST'], ['SECOND']])
+
+    def test_invalid_chunk_size(self):
+        for chunk_size in (None, 0):
+            with self.assertRaises(SAPCliError):
+                list(sap.adt.wb.bisect_mass_activate(Connection(), [], chunk_size=chunk_size))
+
+
 class TestCheckMessage(unittest.TestCase):
 
     def test_check_message_is_errror(self):
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
 import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import sap.adt.whereused
+from sap.adt.errors import ExceptionResourceNotFound
 from sap.adt.marshalling import Marshal
 
 from mock import Connection, Response, Request
@@ -179,5 +182,63 @@ class TestWhereUsed(unittest.TestCase):
         self.assertEqual(len(result.referenced_objects), 2)
 
 
+def referenced_object(uri, typ, name):
+    return SimpleNamespace(uri=uri, adt_object=SimpleNamespace(typ=typ, name=name))
+
+
+class TestWhereUsedTransitive(unittest.TestCase):
+
+    def setUp(self):
+        self.usages = {
+            '/intf/zif_used': [referenced_object('/clas/zcl_user', 'CLAS/OC', 'ZCL_USER'),
+                               referenced_object('/clas/zcl_user/includes/testclasses', None, 'Local Test Classes')],
+            '/clas/zcl_user': [referenced_object('/prog/zreport', 'PROG/P', 'ZREPORT'),
+                               referenced_object('/intf/zif_used', 'INTF/OI', 'ZIF_USED')],
+            '/prog/zreport': [referenced_object('/prog/zindirect', 'PROG/P', 'ZINDIRECT')],
+        }
+
+        patcher = patch('sap.adt.whereused.where_used',
+                        side_effect=lambda connection, uri: SimpleNamespace(referenced_objects=self.usages.get(uri, [])))
+        self.where_used = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bounded_depth(self):
+        found = sap.adt.whereused.where_used_transitive('connection', ['/intf/zif_used'], 2)
+
+        self.assertEqual([ref_obj.uri for ref_obj in found], ['/clas/zcl_user', '/prog/zreport'])
+        self.assertEqual([call.args[1] for call in self.where_used.call_args_list], ['/intf/zif_used', '/clas/zcl_user'])
+
+    def test_cache(self):
+        cache = {}
+        sap.adt.whereused.where_used_transitive('connection', ['/intf/zif_used'], 5, cache=cache)
+        self.assertEqual(self.where_used.call_count, 4)
+
+        found = sap.adt.whereused.where_used_transitive('connection', ['/clas/zcl_user'], 5, cache=cache)
+
+        self.assertEqual(self.where_used.call_count, 4)
+        self.assertEqual([ref_obj.uri for ref_obj in found], ['/prog/zreport', '/intf/zif_used', '/prog/zindirect'])
+
+    def test_failing_object_skipped(self):
+        usages = self.usages
+
+        def where_used(connection, uri):
+            if uri == '/clas/zcl_user':
+                raise ExceptionResourceNotFound('Not found')
+
+            return SimpleNamespace(referenced_objects=usages.get(uri, []))
+
+        self.where_used.side_effect = where_used
+
+        with self.assertLogs(level='WARNING') as logs:
+            found = sap.adt.whereused.where_used_transitive('connection', ['/intf/zif_used', '/prog/zreport'], 2)
+
+        self.assertEqual([ref_obj.uri for ref_obj in found], ['/clas/zcl_user', '/prog/zindirect'])
+        self.assertIn('Skipping where-used of /clas/zcl_user: Not found', logs.output[0])
+
+    def test_zero_depth(self):
+        self.assertEqual(sap.adt.whereused.where_used_transitive('connection', ['/intf/zif_used'], 0), [])
+        self.where_used.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -33,6 +33,27 @@ class TestModule(unittest.TestCase):
             self.assertIsInstance(cmd[1], sap.cli.core.CommandGroup,
                 msg='The second item should be of a command group - Command: ' + str(idx))
 
+    def test_get_commands_by_name(self):
+        commands = sap.cli.get_commands('config')
+
+        self.assertEqual(len(commands), 1)
+        self.assertIs(commands[0][0], sap.cli.no_connection)
+        self.assertEqual(commands[0][1].name, 'config')
+
+    def test_get_commands_unknown_name(self):
+        with patch('sap.cli.CommandsCache.commands') as fake_commands:
+            sap.cli.get_commands('unknown')
+
+        fake_commands.assert_called_once_with()
+
+    def test_command_registry_names(self):
+        self.assertEqual(len(set(sap.cli.command_names())), len(sap.cli.COMMANDS))
+
+        for registration in sap.cli.COMMANDS:
+            with self.subTest(command=registration.name):
+                _, group = sap.cli.CommandsCache.command(registration)
+                self.assertEqual(group.name, registration.name)
+
 
 class TestPrinting(unittest.TestCase):
 
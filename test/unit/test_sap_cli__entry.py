@@ -1,5 +1,8 @@
 import os
 import sys
+import json
+import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch, Mock
@@ -7,6 +10,8 @@ from io import StringIO
 
 import sap
 import sap.cli._entry as entry
+import sap.profiling
+from sap.cli.core import PrintConsole
 from sap.config import ConfigFile
 from sap.http.truststore_support import TruststoreNotAvailableError
 from sap.rest.errors import TimedOutRequestError as RestTimedOutRequestError
@@ -758,6 +763,78 @@ class TestMainEntry(unittest.TestCase):
         self.assertIn('SAPCLI_HTTP_TIMEOUT', fake_output.getvalue())
 
 
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        self._get_commands_patcher = patch('sap.cli.get_commands')
+        fake_commands = self._get_commands_patcher.start()
+        fake_commands.return_value = [(Mock(), make_mock_command())]
+
+        self._config_patcher = patch('sap.cli._entry.ConfigFile.load', return_value=ConfigFile({}, TEST_CONFIG_PATH))
+        self._config_patcher.start()
+
+    def tearDown(self):
+        sap.profiling.disable_profiling()
+        self._config_patcher.stop()
+        self._get_commands_patcher.stop()
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_disabled_by_default(self):
+        args = entry.parse_command_line(get_tested_parameters())
+
+        self.assertIsNone(args.profile)
+        self.assertIsNone(sap.profiling.get_profiler())
+
+    @patch.dict(os.environ, {'SAPCLI_PROFILE': '/tmp/env.json'}, clear=True)
+    def test_option(self):
+        params = get_tested_parameters()
+        params.insert(1, '/tmp/cli.json')
+        params.insert(1, '--profile')
+
+        args = entry.parse_command_line(params)
+
+        self.assertEqual(args.profile, '/tmp/cli.json')
+        self.assertIsNotNone(sap.profiling.get_profiler())
+
+    @patch.dict(os.environ, {'SAPCLI_PROFILE': '/tmp/env.json'}, clear=True)
+    def test_env(self):
+        args = entry.parse_command_line(get_tested_parameters())
+
+        self.assertEqual(args.profile, '/tmp/env.json')
+        self.assertIsNotNone(sap.profiling.get_profiler())
+
+    @patch('sap.cli._entry.parse_command_line')
+    def test_main_reports_profile(self, fake_parse_command_line):
+        def execute(connection, args):
+            sap.profiling.get_profiler().record_http('GET', '/sap/bc/adt/discovery', 200, 0.0, 0.25,
+                                                     response_bytes=1024)
+            return 0
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'profile.json')
+
+            def parse_command_line(argv):
+                sap.profiling.enable_profiling()
+                return Mock(profile=path, execute=execute)
+
+            fake_parse_command_line.side_effect = parse_command_line
+
+            fake_stdout, fake_stderr = StringIO(), StringIO()
+            with patch('sap.cli.core.get_console', return_value=PrintConsole(fake_stdout, fake_stderr)):
+                retval = entry.main(ALL_PARAMETERS.copy())
+
+            with open(path, encoding='utf-8') as trace_file:
+                trace = json.load(trace_file)
+
+        self.assertEqual(retval, 0)
+        self.assertIsNone(sap.profiling.get_profiler())
+        self.assertEqual(fake_stdout.getvalue(), '')
+        self.assertIn('GET /sap/bc/adt/discovery', fake_stderr.getvalue())
+        self.assertIn('250.0', fake_stderr.getvalue())
+        self.assertIn(f'Profile written to: {path}', fake_stderr.getvalue())
+        self.assertEqual(trace['traceEvents'][0]['name'], 'GET /sap/bc/adt/discovery')
+
+
 class TestParseCommandLineConfigFile(unittest.TestCase):
 
     def setUp(self):
@@ -825,5 +902,73 @@ class TestParseCommandLineConfigFile(unittest.TestCase):
             fake_commands.return_value = [(Mock(), make_mock_command())]
 
 
+class TestFindCommandName(unittest.TestCase):
+
+    def test_registered_command(self):
+        self.assertEqual(entry.find_command_name(ALL_PARAMETERS + ['program', 'read', 'ZFOO']), 'program')
+
+    def test_command_options(self):
+        self.assertEqual(entry.find_command_name(['sapcli', '-vv', 'config', '--help']), 'config')
+
+    def test_no_command(self):
+        self.assertIsNone(entry.find_command_name(ALL_PARAMETERS))
+        self.assertIsNone(entry.find_command_name(['sapcli', '--help']))
+
+    def test_unknown_command(self):
+        self.assertIsNone(entry.find_command_name(ALL_PARAMETERS + [MOCK_COMMAND_NAME, MOCK_SUBCOMMAND_NAME]))
+
+    def test_invalid_global_option(self):
+        self.assertIsNone(entry.find_command_name(['sapcli', '--port', 'nan', 'program', 'read', 'ZFOO']))
+
+    @patch('sap.cli._entry.ConfigFile.load', return_value=ConfigFile({}, TEST_CONFIG_PATH))
+    @patch('sap.cli.get_commands')
+    def test_parse_command_line_passes_command_name(self, fake_commands, _fake_config):
+        fake_commands.return_value = [(Mock(), make_mock_command())]
+
+        entry.parse_command_line(get_tested_parameters())
+        fake_commands.assert_called_once_with(None)
+
+        fake_commands.reset_mock()
+        with self.assertRaises(SystemExit), patch('sys.stderr', new_callable=StringIO):
+            entry.parse_command_line(['sapcli', 'config', 'get-contexts'])
+
+        fake_commands.assert_called_once_with('config')
+
+
+COLD_START_SCRIPT = """
+import sys, json
+from argparse import ArgumentParser
+import sap.cli._entry
+import sap.cli
+argv = ['sapcli', *sys.argv[1:]]
+subparsers = ArgumentParser().add_subparsers()
+for connection, cmd in sap.cli.get_commands(sap.cli._entry.find_command_name(argv)):
+    cmd.install_parser(subparsers.add_parser(cmd.name))
+print(json.dumps({'modules': sorted(m for m in sys.modules if m.startswith('sap.cli')),
+                  'commands': {registration.name: registration.module for registration in sap.cli.COMMANDS}}))
+"""
+
+
+class TestStartupImports(unittest.TestCase):
+    """Cold start of a fresh interpreter: parsing the command line of
+       a single command must not import the other command modules.
+    """
+
+    def _cold_start(self, *args):
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+
+        output = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT, *args], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        return json.loads(output)
+
+    def test_single_command_imports_only_its_module(self):
+        started = self._cold_start('config', 'show')
+
+        self.assertEqual(started['commands']['config'], 'sap.cli.config')
+        self.assertEqual(started['modules'], ['sap.cli', 'sap.cli._entry', 'sap.cli.config', 'sap.cli.core',
+                                              'sap.cli.helpers'])
+
+
 if __name__ == '__main__':
     unittest.main()
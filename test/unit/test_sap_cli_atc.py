@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import os
+import subprocess
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch, Mock, call
 from argparse import ArgumentParser
@@ -10,10 +12,12 @@ from io import StringIO
 from sap.errors import SAPCliError
 import sap.cli.atc
 from sap.adt.objects import ADTObjectSets
+from sap.adt.cts import WorkbenchABAPObject
 
 from mock import Connection, Response
 
 from infra import generate_parse_args
+from fixtures_adt_atc import make_worklist
 
 
 parse_args = generate_parse_args(sap.cli.atc.CommandGroup())
@@ -296,6 +300,261 @@ class TestRun(unittest.TestCase):
         
         fake_print.assert_called_once_with(['WORKLIST'], sys.stdout, error_level=2, priority_filter=1)
 
+    @patch('sap.adt.atc.merge_worklists')
+    @patch('sap.cli.atc.print_worklists_to_stream')
+    @patch('sap.adt.objects.ADTObjectSets')
+    @patch('sap.adt.atc.ChecksRunner')
+    @patch('sap.adt.atc.fetch_customizing')
+    @patch('sap.adt.Package')
+    def test_batch_single_worklist(self, fake_object, fake_fetch_customizing, fake_runner, fake_sets, fake_print,
+                                   fake_merge):
+        self.setUpRunMocks(fake_object, '$PACKAGE', fake_fetch_customizing, fake_runner, fake_sets)
+        fake_object.side_effect = ['PKG1', 'PKG2', 'PKG3']
+        fake_merge.side_effect = lambda worklists: list(worklists)
+
+        self.execute_run('package', 'PKG1', 'PKG2', 'PKG3', '--batch')
+
+        fake_runner.assert_called_once_with(self.connection, 'THE_VARIANT')
+        fake_sets.assert_called_once()
+        self.assertEqual(fake_sets.return_value.include_object.call_args_list,
+                         [call('PKG1'), call('PKG2'), call('PKG3')])
+        fake_runner.return_value.run_for.assert_called_once_with(fake_sets.return_value, max_verdicts=100)
+        fake_print.assert_called_once_with([['WORKLIST']], sys.stdout, error_level=2, priority_filter=5)
+
+    @patch('sap.adt.atc.merge_worklists')
+    @patch('sap.cli.atc.print_worklists_to_stream')
+    @patch('sap.adt.objects.ADTObjectSets')
+    @patch('sap.adt.atc.ChecksRunner')
+    @patch('sap.adt.atc.fetch_customizing')
+    @patch('sap.adt.Package')
+    def test_batch_chunks(self, fake_object, fake_fetch_customizing, fake_runner, fake_sets, fake_print,
+                          fake_merge):
+        self.setUpRunMocks(fake_object, '$PACKAGE', fake_fetch_customizing, fake_runner, fake_sets)
+        fake_object.side_effect = ['PKG1', 'PKG2', 'PKG3']
+        fake_runner.return_value.run_for.side_effect = [SimpleNamespace(worklist='WL1'),
+                                                        SimpleNamespace(worklist='WL2')]
+        fake_merge.side_effect = lambda worklists: list(worklists)
+
+        self.execute_run('package', 'PKG1', 'PKG2', 'PKG3', '--batch', '--chunk-size', '2')
+
+        self.assertEqual(fake_runner.call_count, 2)
+        self.assertEqual(fake_sets.return_value.include_object.call_args_list,
+                         [call('PKG1'), call('PKG2'), call('PKG3')])
+        fake_print.assert_called_once_with([['WL1', 'WL2']], sys.stdout, error_level=2, priority_filter=5)
+
+    @patch('sap.adt.atc.ChecksRunner')
+    @patch('sap.adt.atc.fetch_customizing')
+    @patch('sap.adt.Package')
+    def test_batch_invalid_chunk_size(self, fake_object, fake_fetch_customizing, fake_runner):
+        self.setUpObject(fake_object, '$PACKAGE')
+        self.setUpCustomizing(fake_fetch_customizing)
+
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError) as caught:
+            self.execute_run('package', 'PKG1', '--batch', '--chunk-size', '0')
+
+        self.assertEqual(str(caught.exception), 'The chunk size must be a positive integer: 0')
+        fake_runner.assert_not_called()
+
+
+class TestRunBaseline(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = Connection()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.baseline = os.path.join(self.tmpdir.name, 'baseline.sqlite')
+        self.checked = []
+        self.reported = {}
+        self.types = {}
+
+        patcher = patch('sap.adt.atc.ChecksRunner')
+        self.fake_runner = patcher.start()
+        self.fake_runner.return_value.run_for.side_effect = self.run_for
+        self.addCleanup(patcher.stop)
+
+        patcher = patch('sap.cli.atc.print_worklists_to_stream')
+        self.fake_print = patcher.start()
+        self.fake_print.return_value = 0
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_for(self, obj_sets, max_verdicts=100):
+        names = [ref.name for ref in obj_sets.inclusive.references.references]
+        self.checked.append(names)
+
+        worklist = make_worklist(*[(self.types.get(name, 'CLAS'), name, self.reported.get(name, []))
+                                   for name in names])
+        return SimpleNamespace(worklist=worklist)
+
+    def execute_run(self, *args, typ='class'):
+        cmd_args = parse_args('run', typ, *args, '-r', 'THE_VARIANT', '--baseline', self.baseline)
+        return cmd_args.execute(self.connection, cmd_args)
+
+    def patch_package(self, members):
+        self.types = {name: typ.split('/')[0] for typ, name, _ in members}
+
+        def walk(package, jobs=1):
+            self.assertEqual(package.name, 'ZPKG')
+            yield ([], [], [SimpleNamespace(typ=typ, name=name, uri=f'/sap/bc/adt/{uri}', description='')
+                            for typ, name, uri in members])
+
+        patcher = patch('sap.adt.package.walk', side_effect=walk)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def printed(self):
+        worklists = self.fake_print.call_args.args[0]
+        return [(obj.name, [finding.check_id for finding in obj.findings])
+                for worklist in worklists for obj in worklist.objects]
+
+    def test_new_findings_only(self):
+        self.reported = {'ZCL_A': [('CHK1', 'Obsolete', 'start=1')]}
+        self.execute_run('ZCL_A', 'ZCL_B')
+        self.assertEqual(self.printed(), [('ZCL_A', ['CHK1'])])
+
+        self.reported = {'ZCL_A': [('CHK1', 'Obsolete', 'start=5')], 'ZCL_B': [('CHK2', 'Unused', 'start=1')]}
+        self.execute_run('ZCL_A', 'ZCL_B')
+        self.assertEqual(self.printed(), [('ZCL_B', ['CHK2'])])
+
+        self.assertEqual(self.checked, [['ZCL_A'], ['ZCL_B'], ['ZCL_A'], ['ZCL_B']])
+
+    def test_keep_baseline(self):
+        self.reported = {'ZCL_A': [('CHK1', 'Obsolete', 'start=1')]}
+
+        self.execute_run('ZCL_A', '--keep-baseline')
+        self.execute_run('ZCL_A', '--keep-baseline')
+
+        self.assertEqual(self.printed(), [('ZCL_A', ['CHK1'])])
+
+    @patch('sap.adt.atc_baseline.fetch_changed_at')
+    def test_only_changed(self, fake_changed_at):
+        timestamps = {'ZCL_A': 'T1', 'ZCL_B': 'T1'}
+        fake_changed_at.side_effect = lambda connection, obj: timestamps[obj.name]
+
+        self.execute_run('ZCL_A', 'ZCL_B', '--only-changed', '--batch')
+        timestamps['ZCL_B'] = 'T2'
+        self.execute_run('ZCL_A', 'ZCL_B', '--only-changed', '--batch')
+        self.execute_run('ZCL_A', 'ZCL_B', '--only-changed', '--batch')
+
+        self.assertEqual(self.checked, [['ZCL_A', 'ZCL_B'], ['ZCL_B']])
+        self.assertEqual(self.fake_print.call_count, 3)
+        self.assertEqual(self.printed(), [])
+
+    def test_only_changed_without_baseline(self):
+        cmd_args = parse_args('run', 'class', 'ZCL_A', '-r', 'THE_VARIANT', '--only-changed')
+
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            cmd_args.execute(self.connection, cmd_args)
+
+        self.fake_runner.assert_not_called()
+
+    @patch('sap.adt.cts.Workbench')
+    def test_changed_in_transport(self, fake_workbench):
+        fake_workbench.return_value.fetch_transport_request.return_value = SimpleNamespace(
+            tasks=[SimpleNamespace(objects=[
+                WorkbenchABAPObject('LIMU', 'METH', 'ZCL_B                         RUN', 'CLAS/OM', '', True, '1'),
+                WorkbenchABAPObject('R3TR', 'PROG', 'ZCL_A', 'PROG/P', '', True, '2')])])
+
+        self.execute_run('ZCL_A', 'ZCL_B', '--changed-in-transport', 'NPLK000001')
+
+        fake_workbench.return_value.fetch_transport_request.assert_called_once_with('NPLK000001')
+        self.assertEqual(self.checked, [['ZCL_B']])
+
+    @patch('sap.adt.cts.Workbench')
+    def test_changed_in_unknown_transport(self, fake_workbench):
+        fake_workbench.return_value.fetch_transport_request.return_value = None
+
+        with self.assertRaises(SAPCliError) as caught:
+            self.execute_run('ZCL_A', '--changed-in-transport', 'NPLK000001')
+
+        self.assertEqual(str(caught.exception), 'The transport was not found: NPLK000001')
+
+    @patch('subprocess.run')
+    def test_changed_since_commit(self, fake_run):
+        fake_run.return_value = SimpleNamespace(stdout='src/zcl_b.clas.abap\nsrc/zcl_b.clas.xml\n'
+                                                       'src/package.devc.xml\n')
+
+        self.execute_run('ZCL_A', 'ZCL_B', '--changed-since-commit', 'origin/main', '--repo-dir', 'repo')
+
+        fake_run.assert_called_once_with(['git', 'diff', '--name-only', 'origin/main', '--', '.'], cwd='repo',
+                                         capture_output=True, text=True, check=True)
+        self.assertEqual(self.checked, [['ZCL_B']])
+
+    @patch('subprocess.run')
+    def test_changed_since_commit_git_error(self, fake_run):
+        fake_run.side_effect = subprocess.CalledProcessError(128, 'git', stderr='fatal: bad revision\n')
+
+        with self.assertRaises(SAPCliError) as caught:
+            self.execute_run('ZCL_A', '--changed-since-commit', 'nope')
+
+        self.assertEqual(str(caught.exception), 'Cannot list files changed since nope: fatal: bad revision')
+
+    @patch('subprocess.run')
+    def test_package_changed_since_commit(self, fake_run):
+        self.patch_package([('CLAS/OC', 'ZCL_A', 'oo/classes/zcl_a'),
+                            ('CLAS/OC', 'ZCL_B', 'oo/classes/zcl_b'),
+                            ('PROG/P', 'ZREPORT', 'programs/programs/zreport')])
+        fake_run.return_value = SimpleNamespace(stdout='src/zcl_b.clas.abap\nsrc/zreport.prog.abap\n')
+        self.reported = {'ZREPORT': [('CHK1', 'Obsolete', 'start=1')]}
+
+        self.execute_run('ZPKG', '--changed-since-commit', 'origin/main', typ='package')
+
+        self.assertEqual(self.checked, [['ZCL_B', 'ZREPORT']])
+        self.assertEqual(self.printed(), [('ZREPORT', ['CHK1'])])
+
+    @patch('subprocess.run')
+    def test_package_nothing_changed(self, fake_run):
+        self.patch_package([('CLAS/OC', 'ZCL_A', 'oo/classes/zcl_a')])
+        fake_run.return_value = SimpleNamespace(stdout='src/zcl_other.clas.abap\n')
+
+        with self.assertRaises(SAPCliError) as caught:
+            self.execute_run('ZPKG', '--changed-since-commit', 'origin/main', typ='package')
+
+        self.assertTrue(str(caught.exception).startswith('None of the checked objects has changed'))
+        self.fake_runner.assert_not_called()
+
+    @patch('sap.adt.atc_baseline.fetch_changed_at')
+    def test_package_only_changed_members(self, fake_changed_at):
+        self.patch_package([('CLAS/OC', 'ZCL_A', 'oo/classes/zcl_a'),
+                            ('PROG/P', 'ZREPORT', 'programs/programs/zreport')])
+        timestamps = {'oo/classes/zcl_a': 'T1', 'programs/programs/zreport': 'T1'}
+        fake_changed_at.side_effect = lambda connection, obj: timestamps[obj.uri]
+
+        self.execute_run('ZPKG', '--only-changed', typ='package')
+        timestamps['programs/programs/zreport'] = 'T2'
+        self.execute_run('ZPKG', '--only-changed', typ='package')
+
+        self.assertEqual(self.checked, [['ZCL_A', 'ZREPORT'], ['ZREPORT']])
+
+    def test_package_fixed_findings_forgotten(self):
+        self.patch_package([('CLAS/OC', 'ZCL_A', 'oo/classes/zcl_a')])
+
+        self.reported = {'ZCL_A': [('CHK1', 'Obsolete', 'start=1')]}
+        self.execute_run('ZPKG', typ='package')
+
+        # fixed - the object is not reported by ATC
+        self.reported = {}
+        self.execute_run('ZPKG', typ='package')
+
+        # reintroduced
+        self.reported = {'ZCL_A': [('CHK1', 'Obsolete', 'start=1')]}
+        self.execute_run('ZPKG', typ='package')
+
+        self.assertEqual(self.printed(), [('ZCL_A', ['CHK1'])])
+
+
+class TestAbapGitFileObjectKeys(unittest.TestCase):
+
+    def test_keys(self):
+        self.assertEqual(sap.cli.atc.abapgit_file_object_keys('src/zcl_foo.clas.locals_imp.abap'),
+                         {('CLAS', 'ZCL_FOO')})
+        self.assertEqual(sap.cli.atc.abapgit_file_object_keys('src/#ns#cl_foo.clas.abap'), {('CLAS', '/NS/CL_FOO')})
+        self.assertEqual(sap.cli.atc.abapgit_file_object_keys('src/zfugr.fugr.z_module.abap'),
+                         {('FUGR', 'ZFUGR'), ('FUGR', 'Z_MODULE')})
+        self.assertEqual(sap.cli.atc.abapgit_file_object_keys('src/package.devc.xml'), set())
+        self.assertEqual(sap.cli.atc.abapgit_file_object_keys('.abapgit.xml'), set())
+
 class TestPrintWorklistMixin:
 
     def setUp(self):
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 
+import re
 import sys
+import threading
 import contextlib
 import unittest
-from io import StringIO
+from io import BytesIO, StringIO
 from types import SimpleNamespace
-from unittest.mock import patch, call, Mock, mock_open
+from unittest.mock import patch, call, Mock, PropertyMock, mock_open
 
 import sap.adt.cts
 import sap.cli.aunit
@@ -23,6 +25,7 @@ from fixtures_adt_aunit import (
 )
 from fixtures_adt_program import GET_INCLUDE_PROGRAM_WITH_CONTEXT_ADT_XML
 from fixtures_adt_coverage import ACOVERAGE_RESULTS_XML, ACOVERAGE_STATEMENTS_RESULTS_XML
+from sap.adt.acoverage_statements import parse_statements_response
 from fixtures_adt_acoverage import ACOVERAGE_MEASUREMENTS_XML, \
     ACOVERAGE_NEXT_OBJECT_MEASUREMENTS_XML, ACOVERAGE_NEXT_2_OBJECT_MEASUREMENTS_XML
 from infra import generate_parse_args
@@ -384,6 +387,19 @@ call 2</system-out>
 </root>
 ''')
 
+    def test_aunit_sonar_parsed_from_streamed_response(self):
+        response = Mock(status_code=200, headers={}, raw=BytesIO(AUNIT_RESULTS_XML.encode('utf-8')))
+        type(response).text = PropertyMock(side_effect=AssertionError('response body read in advance'))
+        self.connection.set_responses(response)
+
+        with patch.object(self.connection._http_client, 'retrieve', wraps=self.connection._retrieve) as fake_retrieve, \
+             patch_get_print_console_with_buffer() as fake_console:
+            exit_code = self.execute_run('package', 'ypackage', '--output', 'sonar', '--result', ResultOptions.ONLY_UNIT.value, '--compat')
+
+        self.assertEqual(exit_code, 3)
+        self.assertTrue(fake_retrieve.call_args.kwargs['stream'])
+        self.assertIn('<testCase name="DO_THE_FAIL" duration="33">', fake_console.capout)
+
     def test_aunit_package_with_results_sonar(self):
         self.connection.set_responses(Response(status_code=200, text=AUNIT_RESULTS_XML, headers={}))
 
@@ -811,6 +827,52 @@ def make_statement(executed, uri):
     return Statement(executed=executed, uri=uri)
 
 
+class TestStreamingWriters(unittest.TestCase):
+
+    RESULTS = [AUNIT_RESULTS_XML, GLOBAL_TEST_CLASS_AUNIT_RESULTS_XML, AUNIT_NO_TEST_RESULTS_XML,
+               TEST_CLASS_WITH_SYS_ERROR_FOLLOWED_BY_GREEN_TEST_CLASS_AUNIT_RESULTS_XML, AUNIT_RESULTS_SKIPPED_XML]
+
+    def assert_same_output(self, print_output, stream_output):
+        args = SimpleNamespace(name=['$TMP'])
+
+        for results_xml in self.RESULTS:
+            printed = BufferConsole()
+            run_results = sap.adt.aunit.parse_aunit_response(results_xml).run_results
+            expected = print_output(run_results, args, printed)
+
+            streamed = BufferConsole()
+            critical, parsed = stream_output(results_xml, args, streamed)
+
+            self.assertEqual(streamed.capout, printed.capout)
+            self.assertEqual(streamed.caperr, printed.caperr)
+            self.assertEqual(critical, expected)
+            self.assertEqual(parsed.run_results.programs, [])
+
+    def test_junit4(self):
+        self.assert_same_output(sap.cli.aunit.print_aunit_junit4, sap.cli.aunit.stream_aunit_junit4)
+
+    def test_sonar(self):
+        self.assert_same_output(sap.cli.aunit.print_aunit_sonar, sap.cli.aunit.stream_aunit_sonar)
+
+    @patch('sap.cli.aunit.get_acoverage_statements')
+    def test_jacoco(self, get_acoverage_statements):
+        statement_responses = parse_statements_response(ACOVERAGE_STATEMENTS_RESULTS_XML).statement_responses
+        get_acoverage_statements.return_value = statement_responses
+        args = SimpleNamespace(name=['$TMP'], coverage_scope=[], coverage_chunk_size=100, coverage_jobs=1)
+
+        printed = BufferConsole()
+        root_node = sap.adt.acoverage.parse_acoverage_response(ACOVERAGE_RESULTS_XML).root_node
+        sap.cli.aunit.print_acoverage_jacoco(root_node, statement_responses, args, printed)
+
+        streamed = BufferConsole()
+        sap.cli.aunit.stream_acoverage_jacoco(Connection(), 'FOOBAR', Response(text=ACOVERAGE_RESULTS_XML),
+                                              args, streamed)
+
+        self.assertEqual(streamed.capout, printed.capout)
+        get_acoverage_statements.assert_called_once()
+        self.assertEqual(get_acoverage_statements.call_args.args[1], 'FOOBAR')
+        self.assertIsInstance(get_acoverage_statements.call_args.kwargs['workers'], sap.cli.helpers.ConnectionWorkers)
+
 class TestFormatLineRanges(unittest.TestCase):
 
     def test_single_line(self):
@@ -869,6 +931,95 @@ foo (source/main)
         self.assertEqual(output.capout, 'Missed statements:\n')
 
 
+class TestGetACoverageStatements(unittest.TestCase):
+
+    STATEMENT_URIS = [
+        '/sap/bc/adt/runtime/traces/coverage/results/FOOBAR/statements/ADT_ROOT_NODE/TEST_CHECK_LIST/FOO%3d%3d%3dCP/FOO',
+        '/sap/bc/adt/runtime/traces/coverage/results/FOOBAR/statements/ADT_ROOT_NODE/TEST_CHECK_LIST/BAR%3d%3d%3dCP/BAR',
+        '/sap/bc/adt/runtime/traces/coverage/results/FOOBAR/statements/ADT_ROOT_NODE/OTHER_PACKAGE/ZREPORT/ZREPORT',
+    ]
+
+    def statements_response(self):
+        return Response(status_code=200, text=ACOVERAGE_STATEMENTS_RESULTS_XML, headers={})
+
+    def test_chunks(self):
+        connection = Connection([self.statements_response() for _ in range(2)])
+
+        responses = sap.cli.aunit.get_acoverage_statements(connection, 'FOOBAR', self.STATEMENT_URIS, chunk_size=2)
+
+        single = parse_statements_response(ACOVERAGE_STATEMENTS_RESULTS_XML).statement_responses
+        self.assertEqual(responses, single + single)
+        self.assertEqual(connection.mock_methods(),
+                         [('POST', '/sap/bc/adt/runtime/traces/coverage/results/FOOBAR/statements')] * 2)
+        self.assertEqual([request.body.count('<statementsRequest ') for request in connection.execs], [2, 1])
+
+    def test_concurrent_chunks(self):
+        connection = Mock()
+        connection.clone.side_effect = lambda: Connection([self.statements_response() for _ in range(3)])
+
+        responses = sap.cli.aunit.get_acoverage_statements(connection, 'FOOBAR', self.STATEMENT_URIS,
+                                                           chunk_size=1, jobs=4)
+
+        single = parse_statements_response(ACOVERAGE_STATEMENTS_RESULTS_XML).statement_responses
+        self.assertEqual(responses, single * 3)
+        self.assertLessEqual(connection.clone.call_count, 3)
+        connection.execute.assert_not_called()
+
+    def test_shared_workers(self):
+        connection = Mock()
+        clones = []
+
+        def clone():
+            clones.append(Connection([self.statements_response() for _ in range(6)]))
+            return clones[-1]
+
+        connection.clone.side_effect = clone
+
+        with sap.cli.helpers.ConnectionWorkers(connection, 2) as workers:
+            for _ in range(3):
+                responses = sap.cli.aunit.get_acoverage_statements(connection, 'FOOBAR', self.STATEMENT_URIS[:2],
+                                                                   chunk_size=1, workers=workers)
+                self.assertEqual(len(responses), 2 * len(parse_statements_response(
+                    ACOVERAGE_STATEMENTS_RESULTS_XML).statement_responses))
+
+        self.assertLessEqual(len(clones), 2)
+        self.assertEqual(sum(len(clone.execs) for clone in clones), 6)
+
+    def test_no_statements(self):
+        connection = Connection([])
+
+        self.assertEqual(sap.cli.aunit.get_acoverage_statements(connection, 'FOOBAR', []), [])
+        self.assertEqual(connection.execs, [])
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            sap.cli.aunit.get_acoverage_statements(Connection([]), 'FOOBAR', self.STATEMENT_URIS, chunk_size=0)
+
+    def test_statement_uri_names(self):
+        self.assertEqual(sap.cli.aunit.statement_uri_names(self.STATEMENT_URIS[0]),
+                         {'ADT_ROOT_NODE', 'TEST_CHECK_LIST', 'FOO===CP', 'FOO'})
+
+    def test_filter_statement_uris(self):
+        self.assertEqual(sap.cli.aunit.filter_statement_uris(self.STATEMENT_URIS, []), self.STATEMENT_URIS)
+        self.assertEqual(sap.cli.aunit.filter_statement_uris(self.STATEMENT_URIS, ['other_package']),
+                         self.STATEMENT_URIS[2:])
+        self.assertEqual(sap.cli.aunit.filter_statement_uris(self.STATEMENT_URIS, ['ba*', 'zreport']),
+                         self.STATEMENT_URIS[1:])
+
+    @patch('sap.cli.aunit.get_acoverage_statements')
+    def test_coverage_scope_option(self, get_acoverage_statements):
+        get_acoverage_statements.return_value = []
+        connection = Connection([Response(status_code=200, text=AUNIT_RESULTS_XML, headers={}),
+                                 Response(status_code=200, text=ACOVERAGE_RESULTS_XML, headers={})])
+
+        args = parse_args('run', 'package', 'ypackage', '--result', ResultOptions.ONLY_COVERAGE.value, '--compat',
+                          '--coverage-scope', 'nothing', '--coverage-chunk-size', '10', '--coverage-jobs', '3')
+        with patch_get_print_console_with_buffer():
+            args.execute(connection, args)
+
+        get_acoverage_statements.assert_called_once_with(connection, 'FOOBAR', [], chunk_size=10, jobs=3,
+                                                         workers=None)
+
 class TestGetMethodLinesMapping(unittest.TestCase):
 
     def test_uses_parsed_uri_start_line(self):
@@ -992,7 +1143,7 @@ class TestAUnitCommandRunTransport(unittest.TestCase):
         class SentinelError(Exception):
             pass
 
-        def assert_objects(obj_sets, activate_coverage):
+        def assert_objects(obj_sets, activate_coverage, stream=False):
             inclusive = [(ref.uri, ref.name) for ref in obj_sets.inclusive.references.references]
             self.assertEqual(inclusive, [('/sap/bc/adt/programs/programs/program', 'PROGRAM'),
                                          ('/sap/bc/adt/oo/classes/class', 'CLASS'),
@@ -1005,6 +1156,130 @@ class TestAUnitCommandRunTransport(unittest.TestCase):
         with self.assertRaises(SentinelError):
             args.execute(connection, args)
 
+    @patch('sap.adt.search.ADTSearch.quick_search')
+    @patch('sap.adt.cts.Workbench.fetch_transport_request')
+    def test_sub_objects_without_impact_depth(self, fake_fetch_transports, fake_quick_search):
+        connection = Connection()
+
+        fake_fetch_transports.return_value = sap.adt.cts.WorkbenchTransport(
+            [sap.adt.cts.WorkbenchTask('NPLK123456',
+                [sap.adt.cts.WorkbenchABAPObject('LIMU', 'METH', 'ZCL_CHANGED                   RUN', 'CLAS/OM',
+                                                 'descr', 'X', '000000'),
+                 sap.adt.cts.WorkbenchABAPObject('LIMU', 'FUNC', 'Z_MODULE', 'FUGR/FF', 'descr', 'X', '000001'),
+                 sap.adt.cts.WorkbenchABAPObject('R3TR', 'PROG', 'ZREPORT', 'PROG/P', 'descr', 'X', '000002'),
+                ],
+                connection, 'NPLK123457', 'FILAK', 'Description', 'D')],
+            connection, 'NPLK123456', 'FILAK', 'Description', 'D')
+
+        connection.set_responses(
+            Response(status_code=200, text='', headers={'Location': '/sap/bc/adt/abapunit/runs/RUN_ID_123'}),
+            Response(status_code=200, text=AUNIT_API_RUN_STATUS_FINISHED_XML, headers={}),
+            Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML,
+                     headers={'Content-Type': sap.adt.api.aunit.ACCEPT_AUNIT_RESULTS}))
+
+        args = parse_args('run', 'transport', 'NPLK123456')
+        with patch_get_print_console_with_buffer():
+            args.execute(connection, args)
+
+        fake_quick_search.assert_not_called()
+
+        body = connection.execs[0].body
+        self.assertEqual(re.findall(r'name="(\w+)" type="(\w+)"', body), [('ZREPORT', 'PROG')])
+
+    @patch('sap.adt.whereused.where_used')
+    @patch('sap.adt.cts.Workbench.fetch_transport_request')
+    def test_impact_depth(self, fake_fetch_transports, fake_where_used):
+        connection = Connection()
+
+        fake_fetch_transports.return_value = sap.adt.cts.WorkbenchTransport(
+            [sap.adt.cts.WorkbenchTask('NPLK123456',
+                [sap.adt.cts.WorkbenchABAPObject('R3TR', 'INTF', 'zif_used', 'T', 'descr', 'X', '000000'),
+                 sap.adt.cts.WorkbenchABAPObject('R3TR', 'CLAS', 'zcl_changed', 'T', 'descr', 'X', '000001'),
+                 sap.adt.cts.WorkbenchABAPObject('R3TR', 'TABU', 'table', 'T', 'descr', 'X', '000002'),
+                ],
+                connection, 'NPLK123457', 'FILAK', 'Description', 'D')],
+            connection, 'NPLK123456', 'FILAK', 'Description', 'D')
+
+        def referenced_object(uri, typ, name):
+            return SimpleNamespace(uri=uri, adt_object=SimpleNamespace(typ=typ, name=name))
+
+        usages = {
+            '/sap/bc/adt/oo/interfaces/zif_used': [
+                referenced_object('/sap/bc/adt/oo/classes/zcl_user', 'CLAS/OC', 'ZCL_USER'),
+                referenced_object('/sap/bc/adt/oo/classes/zcl_changed', 'CLAS/OC', 'ZCL_CHANGED'),
+                referenced_object('/sap/bc/adt/functions/groups/zgroup/fmodules/z_module', 'FUGR/FF', 'Z_MODULE')],
+            '/sap/bc/adt/oo/classes/zcl_user': [
+                referenced_object('/sap/bc/adt/programs/programs/zreport', 'PROG/P', 'ZREPORT')],
+        }
+        fake_where_used.side_effect = lambda conn, uri: SimpleNamespace(referenced_objects=usages.get(uri, []))
+
+        connection.set_responses(
+            Response(status_code=200, text='', headers={'Location': '/sap/bc/adt/abapunit/runs/RUN_ID_123'}),
+            Response(status_code=200, text=AUNIT_API_RUN_STATUS_FINISHED_XML, headers={}),
+            Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML,
+                     headers={'Content-Type': sap.adt.api.aunit.ACCEPT_AUNIT_RESULTS}))
+
+        args = parse_args('run', 'transport', 'NPLK123456', '--impact-depth', '1')
+        with patch_get_print_console_with_buffer():
+            args.execute(connection, args)
+
+        self.assertEqual(sorted(call.args[1] for call in fake_where_used.call_args_list),
+                         ['/sap/bc/adt/oo/classes/zcl_changed', '/sap/bc/adt/oo/interfaces/zif_used'])
+
+        body = connection.execs[0].body
+        self.assertEqual(re.findall(r'name="(\w+)" type="(\w+)"', body),
+                         [('ZCL_CHANGED', 'CLAS'), ('ZCL_USER', 'CLAS'), ('ZGROUP', 'FUGR')])
+
+
+    @patch('sap.adt.whereused.where_used')
+    @patch('sap.adt.cts.Workbench.fetch_transport_request')
+    def test_impact_depth_sub_objects(self, fake_fetch_transports, fake_where_used):
+        connection = Connection()
+
+        fake_fetch_transports.return_value = sap.adt.cts.WorkbenchTransport(
+            [sap.adt.cts.WorkbenchTask('NPLK123456',
+                [sap.adt.cts.WorkbenchABAPObject('LIMU', 'METH', 'ZCL_CHANGED                   RUN', 'CLAS/OM',
+                                                 'descr', 'X', '000000'),
+                 sap.adt.cts.WorkbenchABAPObject('LIMU', 'CINC', 'ZCL_CHANGED===================CCAU', 'CLAS/OCN',
+                                                 'descr', 'X', '000001'),
+                 sap.adt.cts.WorkbenchABAPObject('R3TR', 'PROG', 'ZINCLUDE', 'PROG/I', 'descr', 'X', '000002'),
+                 sap.adt.cts.WorkbenchABAPObject('R3TR', 'TABL', 'ZSTRUCT', 'TABL/DS', 'descr', 'X', '000003'),
+                 sap.adt.cts.WorkbenchABAPObject('LIMU', 'TABD', 'ZSTRUCT', 'TABL/DS', 'descr', 'X', '000004'),
+                ],
+                connection, 'NPLK123457', 'FILAK', 'Description', 'D')],
+            connection, 'NPLK123456', 'FILAK', 'Description', 'D')
+
+        def where_used(conn, uri):
+            if uri == '/sap/bc/adt/ddic/structures/zstruct':
+                raise sap.adt.errors.ExceptionResourceNotFound('Not found')
+
+            if uri == '/sap/bc/adt/programs/includes/zinclude':
+                return SimpleNamespace(referenced_objects=[SimpleNamespace(
+                    uri='/sap/bc/adt/programs/programs/zreport',
+                    adt_object=SimpleNamespace(typ='PROG/P', name='ZREPORT'))])
+
+            return SimpleNamespace(referenced_objects=[])
+
+        fake_where_used.side_effect = where_used
+
+        connection.set_responses(
+            Response(status_code=200, text='', headers={'Location': '/sap/bc/adt/abapunit/runs/RUN_ID_123'}),
+            Response(status_code=200, text=AUNIT_API_RUN_STATUS_FINISHED_XML, headers={}),
+            Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML,
+                     headers={'Content-Type': sap.adt.api.aunit.ACCEPT_AUNIT_RESULTS}))
+
+        args = parse_args('run', 'transport', 'NPLK123456', '--impact-depth', '1')
+        with patch_get_print_console_with_buffer(), self.assertLogs(level='WARNING'):
+            args.execute(connection, args)
+
+        self.assertEqual([call.args[1] for call in fake_where_used.call_args_list],
+                         ['/sap/bc/adt/oo/classes/zcl_changed', '/sap/bc/adt/programs/includes/zinclude',
+                          '/sap/bc/adt/ddic/structures/zstruct'])
+
+        body = connection.execs[0].body
+        self.assertEqual(re.findall(r'name="(\w+)" type="(\w+)"', body),
+                         [('ZCL_CHANGED', 'CLAS'), ('ZREPORT', 'PROG')])
+
 
 class TestAUnitAPIProtocol(unittest.TestCase):
     """Tests for the default API (async) protocol in the CLI"""
@@ -1286,6 +1561,114 @@ Errors:     3
         self.assertEqual(exit_code, 3)
 
 
+class FakeAUnitServer:
+    """Answers requests of sharded runs where run IDs are the tested names"""
+
+    def __init__(self, results):
+        self.results = results
+        self.started = []
+        self.coverage_queries = []
+        self._lock = threading.Lock()
+
+    def clone(self):
+        return Mock(execute=self.execute, uri='sap/bc/adt')
+
+    def execute(self, method, adt_uri, params=None, headers=None, body=None, accept=None, content_type=None, stream=False):
+        if method == 'POST' and adt_uri == 'abapunit/runs':
+            run_id = '_'.join(re.findall(r'(?:value|name)="([A-Z_]+)"', body))
+            with self._lock:
+                self.started.append(run_id)
+
+            return Response(status_code=200, text='', headers={'Location': f'/sap/bc/adt/abapunit/runs/{run_id}'})
+
+        if method == 'GET' and adt_uri.startswith('abapunit/runs/'):
+            return Response(status_code=200, text=AUNIT_API_RUN_STATUS_FINISHED_XML, headers={})
+
+        if method == 'GET' and adt_uri.startswith('abapunit/results/'):
+            return Response(status_code=200, text=self.results[adt_uri.rsplit('/', 1)[1]], headers={})
+
+        if method == 'POST' and adt_uri.startswith('runtime/traces/coverage/measurements/'):
+            with self._lock:
+                self.coverage_queries.append((adt_uri, body))
+
+            return Response(status_code=200, text=ACOVERAGE_RESULTS_XML, headers={})
+
+        raise AssertionError(f'Unexpected request: {method} {adt_uri}')
+
+
+class TestAUnitShards(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeAUnitServer({
+            'PKG_A_PKG_C': AUNIT_RESULTS_XML,
+            'PKG_B': GLOBAL_TEST_CLASS_AUNIT_RESULTS_XML,
+        })
+        self.connection = Mock()
+        self.connection.clone.side_effect = self.server.clone
+
+    def execute_run(self, *args, **kwargs):
+        cmd_args = parse_args('run', *args, **kwargs)
+        return cmd_args.execute(self.connection, cmd_args)
+
+    def test_split_into_shards(self):
+        self.assertEqual(sap.cli.aunit.split_into_shards([1, 2, 3, 4, 5], 2), [[1, 3, 5], [2, 4]])
+        self.assertEqual(sap.cli.aunit.split_into_shards([1, 2], 4), [[1], [2]])
+
+    def test_shards_merged_human(self):
+        with patch_get_print_console_with_buffer() as fake_console:
+            exit_code = self.execute_run('package', 'pkg_a', 'pkg_b', 'pkg_c', '--shards', '2')
+
+        self.assertEqual(sorted(self.server.started), ['PKG_A_PKG_C', 'PKG_B'])
+        self.assertLessEqual(self.connection.clone.call_count, 2)
+        self.connection.execute.assert_not_called()
+
+        self.assertEqual(exit_code, 3)
+        self.assertIn('ZCL_THEKING_MANUAL_HARDCORE\n', fake_console.capout)
+        self.assertIn('ZCL_TEST_CLASS\n', fake_console.capout)
+        self.assertTrue(fake_console.capout.endswith('Successful: 4\nWarnings:   1\nErrors:     3\n'))
+
+    def test_shards_merged_junit4(self):
+        with patch_get_print_console_with_buffer() as fake_console:
+            self.execute_run('package', 'pkg_a', 'pkg_b', 'pkg_c', '--shards', '2', '--output', 'junit4')
+
+        self.assertEqual(fake_console.capout.count('<testsuites '), 1)
+        self.assertIn('<testsuite name="LTCL_TEST_HARDER"', fake_console.capout)
+        self.assertIn('<testsuite name="ZCL_TEST_CLASS"', fake_console.capout)
+
+    @patch('sap.cli.aunit.get_acoverage_statements')
+    def test_shards_merged_coverage(self, get_acoverage_statements):
+        get_acoverage_statements.return_value = []
+
+        with patch_get_print_console_with_buffer() as fake_console:
+            exit_code = self.execute_run('package', 'pkg_a', 'pkg_b', 'pkg_c', '--shards', '2',
+                                         '--result', ResultOptions.ONLY_COVERAGE.value)
+
+        self.assertIsNone(exit_code)
+        self.assertEqual(len(self.server.coverage_queries), 2)
+        self.assertTrue(any('PKG_A' in body and 'PKG_C' in body and 'PKG_B' not in body
+                            for _, body in self.server.coverage_queries))
+        self.assertEqual(fake_console.capout.count('TEST_CHECK_LIST : 29.00% : 21.64% : 19.23%\n'), 2)
+
+    def test_shards_invalid_count(self):
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            self.execute_run('package', 'pkg_a', '--shards', '0')
+
+    def test_shards_compat(self):
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            self.execute_run('package', 'pkg_a', '--shards', '2', '--compat')
+
+    def test_shards_raw_output(self):
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            self.execute_run('package', 'pkg_a', '--shards', '2', '--output', 'raw')
+
+    def test_shards_error_output(self):
+        with patch_get_print_console_with_buffer() as fake_console:
+            exit_code = self.execute_run('program-include', 'a\\b\\c', '--shards', '2')
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(fake_console.caperr, 'Program include name can be: INCLUDE or MAIN\\INCLUDE\n')
+
+
 class TestPrintACoverageHumanSkipCovered(unittest.TestCase):
 
     def _make_node(self, name, nodes=None, coverages=None):
@@ -2,16 +2,17 @@
 
 import os
 import unittest
-import fnmatch
 import errno
+import sqlite3
 from types import SimpleNamespace
 from unittest.mock import mock_open, patch, Mock, MagicMock, call
 
 import sap.adt.checks
 import sap.cli.checkin
+import sap.cli.checkin_manifest
 import sap.platform.abap.abapgit
 from sap import get_logger
-from sap.adt.wb import CheckMessage, CheckMessageList
+from sap.adt.wb import CheckMessage, CheckMessageList, CheckResults
 from sap.errors import SAPCliError
 from sap.adt.errors import ExceptionResourceAlreadyExists, ExceptionCheckinFailure, ExceptionResourceCreationFailure
 
@@ -53,6 +54,14 @@ class ActivationMessageGenerator:
     def add_warning(self, obj_descr, short_text):
         return self.add_message(CheckMessage.Type.WARNING, obj_descr, short_text)
 
+    @property
+    def check_results(self):
+        results = CheckResults()
+        for message in self.check_message_list:
+            results.messages = message
+
+        return results
+
 
 class DirContentBuilder:
 
@@ -126,15 +135,20 @@ class TestRepository(unittest.TestCase):
 
         self.assertEqual(str(caught.exception), 'Invalid ABAP file name: log.txt')
 
-    @patch('sap.cli.checkin.glob.glob', return_value=['zreport.prog.abap', 'zreport.prog.bogus', 'zreport.prog.xml'])
-    def test_repo_add_object_ok(self, fake_glob):
+    def test_repo_add_object_ok(self):
+        for file_name in ['zreport.prog.abap', 'zreport.prog.bogus', 'zreport.prog.xml', 'zreport.clas.abap',
+                          'zreport2.prog.abap', 'zreport.txt']:
+            self.repo.add_file(f'./src/{file_name}')
+
+        self.repo.add_file('./src/sub/zreport.prog.abap')
+
         obj = self.repo.add_object('zreport.prog.xml', self.root_package)
 
         self.assertEqual(obj, sap.cli.checkin.RepoObject('prog',
                                                          'zreport',
                                                          './src/zreport.prog.xml',
                                                          self.root_package,
-                                                         ['zreport.prog.abap', 'zreport.prog.bogus']))
+                                                         ['./src/zreport.prog.abap', './src/zreport.prog.bogus']))
 
     @patch('sap.cli.checkin.os.path.isfile', return_value=False)
     def test_repo_not_a_packagedir(self, fake_isfile):
@@ -189,8 +203,7 @@ class TestRepository(unittest.TestCase):
 
         self.assertEqual(self.repo.unused_files, [])
 
-    @patch('sap.cli.checkin.glob.glob', return_value=['./src/zreport.prog.abap', './src/zreport.prog.xml'])
-    def test_repo_add_object_marks_xml_used(self, fake_glob):
+    def test_repo_add_object_marks_xml_used(self):
         self.repo.add_file('./src/zreport.prog.xml')
         self.repo.add_file('./src/zreport.prog.abap')
 
@@ -301,6 +314,174 @@ class TestCheckinGroup(ConsoleOutputTestCase):
         self.assertEqual(len(inactive.references), 1)
         self.repo.mark_file_used.assert_called_once_with('./src/used.abap')
 
+    def test_checkin_group_jobs(self):
+        connection = Mock()
+        connection.clone.side_effect = lambda: Mock(name='worker_connection')
+
+        group = [sap.cli.checkin.RepoObject(code='prog', name=f'zprog{i}', path=f'./src/zprog{i}.prog.xml',
+                                            package=None, files=[f'./src/zprog{i}.prog.abap'])
+                 for i in range(6)]
+        group.insert(3, self.mock_object)
+
+        used_connections = []
+
+        def fake_handler(conn, repo_obj, corrnr, **_):
+            used_connections.append(conn)
+            sap.cli.core.printout('Creating Program:', repo_obj.name)
+
+            if repo_obj.name == 'zprog4':
+                raise ExceptionCheckinFailure('Checkin of adt object failed')
+
+            return sap.cli.checkin.ObjectCheckinResult([SimpleNamespace(full_adt_uri=repo_obj.path,
+                                                                        name=repo_obj.name)],
+                                                       repo_obj.files)
+
+        with patch.dict('sap.cli.checkin.OBJECT_CHECKIN_HANDLERS', {'prog': fake_handler}, clear=True), \
+             sap.cli.helpers.ConnectionWorkers(connection, 3, console=self.console) as workers:
+            inactive = sap.cli.checkin._checkin_dependency_group(connection, self.repo, group, self.console,
+                                                                 '420', workers=workers)
+
+        self.assertEqual([ref.uri for ref in inactive.references],
+                         ['./src/zprog0.prog.xml', './src/zprog1.prog.xml', './src/zprog2.prog.xml',
+                          './src/zprog3.prog.xml', './src/zprog5.prog.xml'])
+        self.assertNotIn(connection, used_connections)
+        self.assertLessEqual(connection.clone.call_count, 3)
+        self.assertEqual(self.repo.mark_file_used.call_args_list,
+                         [call(f'./src/zprog{i}.prog.abap') for i in (0, 1, 2, 3, 5)])
+        self.assertConsoleContents(self.console,
+                                   stdout=''.join(f'Creating Program: zprog{i}\n' for i in range(5))
+                                   + 'Object handled without activation: ./src/zprog4.prog.xml\n'
+                                   + 'Creating Program: zprog5\n',
+                                   stderr='Object not supported: ./bogus.txt\n')
+
+    def test_checkin_group_unchanged(self):
+        connection = Mock()
+        group = [sap.cli.checkin.RepoObject(code='prog', name=name, path=f'./src/{name}.prog.xml',
+                                            package=None, files=[f'./src/{name}.prog.abap'])
+                 for name in ('zchanged', 'zactive', 'zinactive')]
+
+        passed_options = []
+
+        def fake_handler(conn, repo_obj, corrnr, **kwargs):
+            passed_options.append(kwargs['compare_before_write'])
+            return sap.cli.checkin.ObjectCheckinResult([SimpleNamespace(full_adt_uri=repo_obj.path,
+                                                                        name=repo_obj.name)],
+                                                       repo_obj.files,
+                                                       unchanged=repo_obj.name != 'zchanged')
+
+        with patch.dict('sap.cli.checkin.OBJECT_CHECKIN_HANDLERS', {'prog': fake_handler}, clear=True), \
+             patch('sap.adt.wb.filter_inactive_objects') as fake_filter:
+            fake_filter.side_effect = lambda _, objects: [obj for obj in objects if obj.name == 'zinactive']
+
+            inactive = sap.cli.checkin._checkin_dependency_group(connection, self.repo, group, self.console,
+                                                                 None, compare_before_write=True)
+
+        self.assertEqual(passed_options, [True, True, True])
+        self.assertEqual([ref.uri for ref in inactive.references],
+                         ['./src/zchanged.prog.xml', './src/zinactive.prog.xml'])
+        self.assertEqual([obj.name for obj in fake_filter.call_args.args[1]], ['zactive', 'zinactive'])
+        self.assertEqual(self.repo.mark_file_used.call_count, 3)
+
+    def _checkin_group_with_check(self, check_results):
+        events = []
+        group = [sap.cli.checkin.RepoObject(code='prog', name=name, path=f'./src/{name}.prog.xml',
+                                            package=None, files=[f'./src/{name}.prog.abap'])
+                 for name in ('zfirst', 'zsecond')]
+
+        def fake_handler(conn, repo_obj, corrnr, **kwargs):
+            adt_object = MagicMock()
+            adt_object.name = repo_obj.name
+            adt_object.connection = conn
+            adt_object.open_editor.return_value.__enter__.return_value.write.side_effect = \
+                lambda source: events.append(('write', source))
+
+            events.append(('create', repo_obj.name))
+            sap.cli.checkin._write_source_file(f'REPORT {repo_obj.name}.', adt_object, corrnr=corrnr,
+                                               source_label=repo_obj.files[0],
+                                               check_before_save=kwargs['check_before_save'],
+                                               staged_writes=kwargs['staged_writes'])
+
+            return sap.cli.checkin.ObjectCheckinResult([SimpleNamespace(full_adt_uri=repo_obj.path,
+                                                                        name=repo_obj.name)],
+                                                       repo_obj.files)
+
+        def fake_check(connection, sources):
+            events.append(('check', [source for _, source in sources]))
+            return check_results
+
+        with patch.dict('sap.cli.checkin.OBJECT_CHECKIN_HANDLERS', {'prog': fake_handler}, clear=True), \
+             patch('sap.adt.checks.run_objects_check', side_effect=fake_check), \
+             patch('sap.adt.checks.run_object_check') as fake_single_check:
+            try:
+                sap.cli.checkin._checkin_dependency_group(Mock(), self.repo, group, self.console, '420',
+                                                          check_before_save=True)
+            finally:
+                fake_single_check.assert_not_called()
+
+        return events
+
+    def test_checkin_group_check_before_save_batched(self):
+        clean = SimpleNamespace(has_errors=False)
+
+        events = self._checkin_group_with_check(([clean, clean], clean))
+
+        self.assertEqual(events, [('create', 'zfirst'),
+                                  ('create', 'zsecond'),
+                                  ('check', ['REPORT zfirst.', 'REPORT zsecond.']),
+                                  ('write', 'REPORT zfirst.'),
+                                  ('write', 'REPORT zsecond.')])
+
+    def test_checkin_group_check_before_save_findings(self):
+        clean = SimpleNamespace(has_errors=False)
+        broken = SimpleNamespace(has_errors=True, messages=[])
+
+        with self.assertRaises(sap.adt.checks.ObjectListCheckFindings) as caught:
+            self._checkin_group_with_check(([clean, broken], clean))
+
+        self.assertEqual([findings.source_label for findings in caught.exception.findings],
+                         ['./src/zsecond.prog.abap'])
+        self.assertIsNone(caught.exception.unattributed)
+
+    def test_checkin_group_check_before_save_unattributed_findings(self):
+        clean = SimpleNamespace(has_errors=False)
+        broken = SimpleNamespace(has_errors=True, messages=[])
+
+        with self.assertRaises(sap.adt.checks.ObjectListCheckFindings) as caught:
+            self._checkin_group_with_check(([clean, clean], broken))
+
+        self.assertEqual(caught.exception.findings, [])
+        self.assertIs(caught.exception.unattributed, broken)
+
+    def test_write_staged_by_sessions(self):
+        first, second = Mock(name='first'), Mock(name='second')
+        written = []
+
+        def staged(connection, name):
+            adt_object = MagicMock(connection=connection)
+            adt_object.open_editor.return_value.__enter__.return_value.write.side_effect = \
+                lambda source: written.append((connection, source))
+
+            return SimpleNamespace(adt_object=adt_object, source_code=name, corrnr='420', source_label=name)
+
+        with patch('sap.cli.checkin.ThreadPoolExecutor', wraps=sap.cli.checkin.ThreadPoolExecutor) as fake_pool:
+            sap.cli.checkin._write_staged(4, [staged(first, 'a'), staged(second, 'b'), staged(first, 'c')])
+
+        fake_pool.assert_called_once_with(max_workers=2)
+        self.assertEqual([source for conn, source in written if conn is first], ['a', 'c'])
+        self.assertEqual([source for conn, source in written if conn is second], ['b'])
+
+    def test_write_staged_sequentially(self):
+        connection = Mock()
+        adt_object = MagicMock(connection=connection)
+
+        with patch('sap.cli.checkin.ThreadPoolExecutor') as fake_pool:
+            sap.cli.checkin._write_staged(1, [SimpleNamespace(adt_object=adt_object, source_code='a', corrnr=None,
+                                                              source_label='a')])
+
+        fake_pool.assert_not_called()
+        adt_object.open_editor.return_value.__enter__.return_value.write.assert_called_once_with('a')
+
+
 
 class TestCheckIn(ConsoleOutputTestCase, PatcherTestCase):
 
@@ -315,9 +496,6 @@ class TestCheckIn(ConsoleOutputTestCase, PatcherTestCase):
     def is_file(self, path):
         return path in self.files
 
-    def glob(self, pattern):
-        return [name for name in self.files if fnmatch.fnmatch(name, pattern)]
-
     def tearDown(self):
         try:
             PatcherTestCase.unpatch_all(self)
@@ -344,8 +522,18 @@ class TestCheckIn(ConsoleOutputTestCase, PatcherTestCase):
         self.fake_is_file = self.patch('sap.cli.checkin.os.path.isfile')
         self.fake_is_file.side_effect = self.is_file
 
-        self.fake_glob = self.patch('sap.cli.checkin.glob.glob')
-        self.fake_glob.side_effect = self.glob
+        self.sources = {
+            './src/sub/grand/cl_implementor.clas.abap': 'CLASS cl_implementor DEFINITION.\n'
+                                                        '  PUBLIC SECTION.\n'
+                                                        '    INTERFACES if_strategy.\n'
+                                                        'ENDCLASS.\n',
+            './src/run_report.prog.abap': 'REPORT run_report.\n'
+                                          "CALL FUNCTION 'MODULE'.\n"
+                                          'NEW cl_implementor( )->run( ).\n',
+        }
+
+        self.fake_open_source = self.patch('sap.cli.checkin_dependencies.open', create=True)
+        self.fake_open_source.side_effect = lambda path, *args, **kwargs: StringIOFile(self.sources.get(path, ''))
 
         get_logger().debug('Test files: %s', ','.join(self.files))
 
@@ -365,7 +553,7 @@ class TestCheckIn(ConsoleOutputTestCase, PatcherTestCase):
 
         args = parse_args('package', '$foo')
         with patch('sap.cli.checkin.OBJECT_CHECKIN_HANDLERS') as fake_handler, \
-             patch('sap.adt.wb.try_mass_activate') as fake_activate:
+             patch('sap.adt.wb.bisect_mass_activate_references') as fake_activate:
             fake_handler.get = Mock()
             fake_handler.get.return_value = mock_object_handler
 
@@ -394,10 +582,132 @@ class TestCheckIn(ConsoleOutputTestCase, PatcherTestCase):
         )
 
         args = parse_args('package', '$foo')
-        exit_code = args.execute(None, args)
+        with patch('sap.adt.package_index.forget_indexed_trees') as fake_forget:
+            exit_code = args.execute(None, args)
+
+        self.assertEqual(exit_code, 1)
+        self.assertConsoleContents(self.console, stderr='Checkin failed: Load failed.\n')
+        # the checkin might have changed the package before it failed
+        fake_forget.assert_called_once_with(None, ['$foo'])
+
+    @patch('sap.cli.checkin._get_config')
+    @patch('sap.cli.checkin._load_objects')
+    def test_do_checkin_error_package_index_failure(self, fake_load_objects, fake_config):
+        fake_load_objects.side_effect = sap.errors.SAPCliError('Load failed.')
+        fake_config.return_value = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(
+            FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX
+        )
+
+        connection = SimpleNamespace(host='mockhost', port='443', client='100')
+        args = parse_args('package', '$foo')
+        with patch('os.environ', {'SAPCLI_PACKAGE_INDEX_TTL': '3600'}), \
+             patch('sap.adt.package_index.sqlite3.connect',
+                   side_effect=sqlite3.OperationalError('unable to open database file')), \
+             self.assertLogs(get_logger(), level='WARNING') as logs:
+            exit_code = args.execute(connection, args)
 
         self.assertEqual(exit_code, 1)
         self.assertConsoleContents(self.console, stderr='Checkin failed: Load failed.\n')
+        self.assertEqual(logs.output, ['WARNING:root:Cannot remove the package $foo from the package index:'
+                                       ' Cannot update package index: unable to open database file'])
+
+    @patch('sap.cli.checkin._get_config')
+    def test_do_checkin_invalid_jobs(self, fake_config):
+        fake_config.return_value = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(
+            FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX
+        )
+
+        args = parse_args('package', '$foo', '--jobs', '0')
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            args.execute(None, args)
+
+    @patch('sap.cli.checkin._get_config')
+    def test_do_checkin_workers_shared_by_waves(self, fake_config):
+        fake_config.return_value = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(
+            FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX
+        )
+
+        connection = Mock()
+        clones = []
+
+        def clone():
+            clones.append(Mock(name='clone'))
+            return clones[-1]
+
+        connection.clone.side_effect = clone
+
+        def mock_object_handler(conn, repo_obj, corrnr, **_):
+            return sap.cli.checkin.ObjectCheckinResult(
+                [SimpleNamespace(full_adt_uri=repo_obj.path, name=repo_obj.name)],
+                list(repo_obj.files))
+
+        handlers = {code: mock_object_handler for code in ('intf', 'clas', 'prog', 'fugr')}
+
+        args = parse_args('package', '$foo', '--jobs', '2')
+        with patch.dict('sap.cli.checkin.OBJECT_CHECKIN_HANDLERS', handlers, clear=True), \
+             patch('sap.cli.checkin.checkin_package'), \
+             patch('sap.adt.wb.bisect_mass_activate_references', return_value=[]):
+            exit_code = args.execute(connection, args)
+
+        self.assertEqual(exit_code, 0)
+        # 3 activation waves share at most 2 worker connections
+        self.assertIn(len(clones), (1, 2))
+        for conn in clones:
+            conn.close.assert_called_once_with()
+
+    @patch('sap.cli.checkin._get_config')
+    @patch('sap.cli.checkin.time.perf_counter', side_effect=[1.0, 1.5, 1.75])
+    def test_scan(self, _, fake_config):
+        fake_config.return_value = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(
+            FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX
+        )
+
+        args = parse_args('scan', '$foo')
+        self.assertIs(args.connection_factory, sap.cli.no_connection)
+
+        exit_code = args.execute(None, args)
+
+        self.assertEqual(exit_code, 0)
+        self.assertConsoleContents(self.console,
+                                   stdout='''Scanned 3 packages, 4 objects and 13 files in 0.500 s
+  clas: 1
+  fugr: 1
+  intf: 1
+  prog: 1
+Resolved 3 activation waves in 0.250 s
+  wave 1: 2 objects
+  wave 2: 1 objects
+  wave 3: 1 objects
+''')
+
+    @patch('sap.cli.checkin._get_config')
+    def test_scan_reports_files_of_no_object(self, fake_config):
+        fake_config.return_value = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(
+            FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX
+        )
+
+        # source file without its object XML and a file without object type
+        self.walk_stands[1][2].extend(['if_orphan.intf.abap', 'README.md'])
+
+        args = parse_args('scan', '$foo')
+        exit_code = args.execute(None, args)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(self.console.caperr, 'Unused file: ./src/sub/README.md\n'
+                                              'Unused file: ./src/sub/if_orphan.intf.abap\n')
+
+    @patch('sap.cli.checkin._get_config')
+    @patch('sap.cli.checkin._load_objects', side_effect=sap.errors.SAPCliError('Load failed.'))
+    def test_scan_error(self, _, fake_config):
+        fake_config.return_value = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(
+            FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX
+        )
+
+        args = parse_args('scan', '$foo')
+        exit_code = args.execute(None, args)
+
+        self.assertEqual(exit_code, 1)
+        self.assertConsoleContents(self.console, stderr='Scan failed: Load failed.\n')
 
     def test_load_objects(self):
         config = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX)
@@ -412,6 +722,12 @@ class TestCheckIn(ConsoleOutputTestCase, PatcherTestCase):
                          [('unittest', 'run_report'), ('unittest', 'test_fugr'), ('unittest_sub', 'if_strategy'),
                           ('unittest_sub_grand', 'cl_implementor')])
 
+        self.assertEqual([obj.files for obj in repo.objects],
+                         [['./src/run_report.prog.abap'],
+                          ['./src/test_fugr.fugr.module.abap', './src/test_fugr.fugr.include.abap'],
+                          ['./src/sub/if_strategy.intf.abap'],
+                          ['./src/sub/grand/cl_implementor.clas.abap']])
+
     def test_load_objects_tracks_files(self):
         config = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX)
         repo = sap.cli.checkin.Repository('unittest', config)
@@ -461,7 +777,7 @@ class TestCheckIn(ConsoleOutputTestCase, PatcherTestCase):
 
         args = parse_args('package', '$foo')
         with patch.dict('sap.cli.checkin.OBJECT_CHECKIN_HANDLERS', handlers, clear=True), \
-             patch('sap.adt.wb.try_mass_activate') as fake_activate:
+             patch('sap.adt.wb.bisect_mass_activate_references') as fake_activate:
             fake_activate.return_value = []
 
             exit_code = args.execute(None, args)
@@ -478,17 +794,136 @@ Activating objects ...
 ''',
                                    stderr='Unused file: ./src/test_fugr.fugr.include.xml\n')
 
+    def _do_checkin_incremental(self, manifest, *cli_args, failing=()):
+        checked_in = []
+
+        def mock_object_handler(connection, repo_obj, corrnr, **_):
+            if repo_obj.name in failing:
+                raise sap.adt.errors.ExceptionCheckinFailure(f'Cannot write {repo_obj.name}')
+
+            checked_in.append(repo_obj.name)
+            return sap.cli.checkin.ObjectCheckinResult(
+                [SimpleNamespace(full_adt_uri=f'/adt/{repo_obj.name}', name=repo_obj.name)],
+                [obj_file for obj_file in repo_obj.files if '.include.' not in obj_file])
+
+        handlers = {'intf': mock_object_handler,
+                    'clas': mock_object_handler,
+                    'prog': mock_object_handler,
+                    'fugr': mock_object_handler}
+
+        connection = SimpleNamespace(host='example.org', port='443', client='100')
+
+        self.console.reset()
+        args = parse_args('package', '$foo', '--incremental', *cli_args)
+        with patch.dict('sap.cli.checkin.OBJECT_CHECKIN_HANDLERS', handlers, clear=True), \
+             patch('sap.cli.checkin._get_config') as fake_config, \
+             patch('sap.cli.checkin.checkin_package'), \
+             patch('sap.cli.checkin.sap.cli.checkin_manifest.CheckinManifest.load', return_value=manifest), \
+             patch.object(manifest, 'save') as fake_save, \
+             patch('sap.adt.wb.bisect_mass_activate_references') as fake_activate:
+            fake_activate.return_value = []
+            fake_config.return_value = sap.platform.abap.abapgit.DOT_ABAP_GIT.for_new_repo(
+                FOLDER_LOGIC=sap.platform.abap.abapgit.FOLDER_LOGIC_PREFIX
+            )
+
+            exit_code = args.execute(connection, args)
+
+        return exit_code, checked_in, fake_save.call_count
+
+    def test_do_checkin_incremental(self):
+        manifest = sap.cli.checkin_manifest.CheckinManifest('.sapcli-checkin.json')
+        digests = {}
+
+        with patch('sap.cli.checkin_manifest.file_digest', side_effect=lambda path: digests.get(path, 'initial')):
+            exit_code, checked_in, saves = self._do_checkin_incremental(manifest)
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(checked_in, ['test_fugr', 'if_strategy', 'cl_implementor', 'run_report'])
+            self.assertEqual(saves, 3)
+            self.assertEqual(manifest.get('100@example.org:443', './src/test_fugr.fugr.module.abap'),
+                             {'sha256': 'initial', 'uri': '/adt/test_fugr'})
+            self.assertEqual(manifest.get('100@example.org:443', './src/test_fugr.fugr.include.abap'),
+                             {'sha256': 'initial', 'uri': None})
+
+            exit_code, checked_in, saves = self._do_checkin_incremental(manifest)
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(checked_in, [])
+            self.assertEqual(saves, 0)
+            self.assertConsoleContents(self.console,
+                                       stdout='''Creating packages ...
+Object unchanged: ./src/test_fugr.fugr.xml
+Object unchanged: ./src/sub/if_strategy.intf.xml
+Object unchanged: ./src/sub/grand/cl_implementor.clas.xml
+Object unchanged: ./src/run_report.prog.xml
+''',
+                                       stderr='Unused file: ./src/test_fugr.fugr.include.abap\n'
+                                              'Unused file: ./src/test_fugr.fugr.include.xml\n')
+
+            digests['./src/run_report.prog.abap'] = 'modified'
+            exit_code, checked_in, saves = self._do_checkin_incremental(manifest)
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(checked_in, ['run_report'])
+            self.assertEqual(saves, 1)
+            self.assertEqual(manifest.get('100@example.org:443', './src/run_report.prog.abap'),
+                             {'sha256': 'modified', 'uri': '/adt/run_report'})
+
+            exit_code, checked_in, saves = self._do_checkin_incremental(manifest, '--force')
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(checked_in, ['test_fugr', 'if_strategy', 'cl_implementor', 'run_report'])
+            self.assertEqual(saves, 3)
+
+    def test_do_checkin_incremental_checkin_failure(self):
+        manifest = sap.cli.checkin_manifest.CheckinManifest('.sapcli-checkin.json')
+        digests = {}
+
+        with patch('sap.cli.checkin_manifest.file_digest', side_effect=lambda path: digests.get(path, 'initial')):
+            self._do_checkin_incremental(manifest)
+
+            digests['./src/run_report.prog.abap'] = 'modified'
+            exit_code, checked_in, _ = self._do_checkin_incremental(manifest, failing=('run_report',))
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(checked_in, [])
+            self.assertIsNone(manifest.get('100@example.org:443', './src/run_report.prog.xml'))
+            self.assertIsNone(manifest.get('100@example.org:443', './src/run_report.prog.abap'))
+
+            # the reverted source must be written again
+            del digests['./src/run_report.prog.abap']
+            exit_code, checked_in, _ = self._do_checkin_incremental(manifest)
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(checked_in, ['run_report'])
+
+    def test_do_checkin_incremental_activation_failure(self):
+        manifest = sap.cli.checkin_manifest.CheckinManifest('.sapcli-checkin.json')
+
+        with patch('sap.cli.checkin_manifest.file_digest', return_value='initial'), \
+             patch('sap.cli.checkin._activate', side_effect=SAPCliError('Activation failed')):
+            exit_code, checked_in, saves = self._do_checkin_incremental(manifest)
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(checked_in, ['test_fugr', 'if_strategy'])
+        self.assertEqual(saves, 0)
+        self.assertIsNone(manifest.get('100@example.org:443', './src/sub/if_strategy.intf.xml'))
+
     def test_resolve_dependencies(self):
-        clas = sap.cli.checkin.RepoObject(code='clas', name='cl_ass', path='./cl_ass', package=None, files=[])
-        intf = sap.cli.checkin.RepoObject(code='intf', name='if_ace', path='./if_ace', package=None, files=[])
-        prog = sap.cli.checkin.RepoObject(code='prog', name='program', path='./program', package=None, files=[])
-        fugr = sap.cli.checkin.RepoObject(code='fugr', name='function_group', path='./function_group', package=None, files=[])
+        objects = [sap.cli.checkin.RepoObject(code='clas', name='cl_ass', path='./cl_ass', package=None,
+                                              files=['./src/cl_ass.clas.abap']),
+                   sap.cli.checkin.RepoObject(code='prog', name='program', path='./program', package=None,
+                                              files=['./src/program.prog.abap']),
+                   sap.cli.checkin.RepoObject(code='intf', name='if_ace', path='./if_ace', package=None, files=[]),
+                   sap.cli.checkin.RepoObject(code='fugr', name='function_group', path='./function_group',
+                                              package=None, files=[])]
 
-        objects = [clas, prog, intf, fugr]
+        self.sources = {'./src/cl_ass.clas.abap': 'CLASS cl_ass DEFINITION. INTERFACES if_ace. ENDCLASS.',
+                        './src/program.prog.abap': 'DATA(ace) = NEW cl_ass( ).'}
 
         deps = sap.cli.checkin._resolve_dependencies(objects)
 
-        self.assertEqual(deps, [[clas, intf], [prog], [fugr]])
+        self.assertEqual(deps, [[objects[2], objects[3]], [objects[0]], [objects[1]]])
 
     @patch('sap.cli.checkin._checkin_dependency_group')
     @patch('sap.cli.checkin._resolve_dependencies')
@@ -528,7 +963,8 @@ Activating objects ...
 
         captured = {}
 
-        def fake_group(connection, repo, group, console, corrnr, check_before_save=False):
+        def fake_group(connection, repo, group, console, corrnr, check_before_save=False, workers=None,
+                       compare_before_write=False):
             captured['value'] = check_before_save
             return Mock(references=[])
 
@@ -576,7 +1012,7 @@ class TestActivate(ConsoleOutputTestCase, PatcherTestCase):
     def setUp(self):
         super(TestActivate, self).setUp()
 
-        self.fake_activate = self.patch('sap.adt.wb.try_mass_activate')
+        self.fake_activate = self.patch('sap.adt.wb.bisect_mass_activate_references')
 
         self.connection = Mock()
         self.inactive_list = Mock()
@@ -594,7 +1030,8 @@ class TestActivate(ConsoleOutputTestCase, PatcherTestCase):
         self.assertEmptyConsole(self.console)
 
     def test_activate_no_error(self):
-        self.fake_activate.return_value = ActivationMessageGenerator().add_warning('CLAS/A', 'One').add_warning('PROG/B', 'Two').check_message_list
+        results = ActivationMessageGenerator().add_warning('CLAS/A', 'One').add_warning('PROG/B', 'Two').check_results
+        self.fake_activate.return_value = [(['CLAS/A', 'PROG/B'], results)]
 
         self.call_activate()
 
@@ -605,7 +1042,8 @@ class TestActivate(ConsoleOutputTestCase, PatcherTestCase):
 ''')
 
     def test_activate_error(self):
-        self.fake_activate.return_value = ActivationMessageGenerator().add_error('CLAS/A', 'One').add_warning('PROG/B', 'Two').check_message_list
+        results = ActivationMessageGenerator().add_error('CLAS/A', 'One').add_warning('PROG/B', 'Two').check_results
+        self.fake_activate.return_value = [(['CLAS/A', 'PROG/B'], results)]
 
         with self.assertRaises(sap.errors.SAPCliError) as caught:
             self.call_activate()
@@ -618,6 +1056,23 @@ class TestActivate(ConsoleOutputTestCase, PatcherTestCase):
 | W: Two
 ''')
 
+    def test_activate_reports_all_bisected_errors(self):
+        self.fake_activate.return_value = [
+            (['CLAS/A'], ActivationMessageGenerator().add_error('CLAS/A', 'One').check_results),
+            (['PROG/B'], CheckResults()),
+            (['PROG/C'], ActivationMessageGenerator().add_error('PROG/C', 'Three').check_results)]
+
+        with self.assertRaises(sap.errors.SAPCliError) as caught:
+            self.call_activate()
+
+        self.assertEqual(str(caught.exception), 'Aborting because of activation errors')
+
+        self.assertConsoleContents(self.console, stdout='''* CLAS/A ::
+| E: One
+* PROG/C ::
+| E: Three
+''')
+
 
 class TestCheckInPackage(ConsoleOutputTestCase, PatcherTestCase):
 
@@ -847,6 +1302,46 @@ Writing Clas: {self.clas_object.name} testclasses
         self.clas.delete.assert_called_once()
         self.clas.create.assert_has_calls([call(None), call(None)])
 
+    def test_checkin_clas_already_exists_unchanged(self):
+        source_files_content = ['class_body', 'locals_def_body', 'locals_imp_body', 'test_body']
+        self.fake_open.side_effect = [StringIOFile(content) for content in
+                                      [CLAS_XML] + source_files_content]
+        self.clas.create.side_effect = ExceptionResourceAlreadyExists('Class already exists.')
+        self.clas.text = 'class_body\n'
+        self.clas.definitions.text = 'locals_def_body'
+        self.clas.implementations.text = 'locals_imp_body'
+        self.clas.test_classes.text = 'test_body'
+
+        result = sap.cli.checkin.checkin_clas(self.connection, self.clas_object, compare_before_write=True)
+
+        self.assertTrue(result.unchanged)
+        self.assertEqual(result.abap_objects, [self.clas])
+        self.assertEqual(result.used_files, self.clas_object.files)
+        self.clas.delete.assert_not_called()
+        self.clas.create.assert_called_once_with(None)
+        self.clas_editor.write.assert_not_called()
+        self.assertConsoleContents(self.console, stdout=f'''Creating Class: {self.clas_object.name}
+Source unchanged: foo.clas.abap
+Source unchanged: foo.locals_def.abap
+Source unchanged: foo.locals_imp.abap
+Source unchanged: foo.testclasses.abap
+''')
+
+    def test_checkin_clas_already_exists_changed(self):
+        source_files_content = ['class_body', 'locals_def_body', 'locals_imp_body', 'test_body']
+        self.fake_open.side_effect = [StringIOFile(content) for content in
+                                      [CLAS_XML] + source_files_content[:2] + source_files_content]
+        self.clas.create.side_effect = [ExceptionResourceAlreadyExists('Class already exists.'), None]
+        self.clas.text = 'class_body'
+        self.clas.definitions.text = 'old_locals_def_body'
+
+        result = sap.cli.checkin.checkin_clas(self.connection, self.clas_object, compare_before_write=True)
+
+        self.assertFalse(result.unchanged)
+        self.clas.delete.assert_called_once_with(None)
+        self.clas.create.assert_has_calls([call(None), call(None)])
+        self.assert_open_editor_calls(source_files_content)
+
     def test_checkin_clas_with_corrnr(self):
         self.fake_open.return_value = StringIOFile(CLAS_XML)
 
@@ -1504,6 +1999,49 @@ class TestWriteSourceFileChecks(unittest.TestCase):
 
         fake_check.assert_called_once()
 
+    def test_compare_before_write_skips_unchanged(self):
+        adt_object = MagicMock()
+        adt_object.text = 'CODE  \n\n'
+
+        with patch('sap.adt.checks.run_object_check') as fake_check, \
+             patch('sap.cli.core.printout') as fake_printout:
+            written = sap.cli.checkin._write_source_file('CODE\n', adt_object,
+                                                         source_label='src/foo.prog.abap',
+                                                         check_before_save=True,
+                                                         compare_before_write=True)
+
+        self.assertFalse(written)
+        fake_check.assert_not_called()
+        adt_object.open_editor.assert_not_called()
+        fake_printout.assert_called_once_with('Source unchanged:', 'src/foo.prog.abap')
+
+    def test_staged_write_is_not_checked_nor_written(self):
+        adt_object = MagicMock()
+        staged_writes = []
+
+        with patch('sap.adt.checks.run_object_check') as fake_check:
+            written = sap.cli.checkin._write_source_file('CODE', adt_object, corrnr='420',
+                                                         source_label='src/foo.prog.abap',
+                                                         check_before_save=True,
+                                                         staged_writes=staged_writes)
+
+        self.assertTrue(written)
+        fake_check.assert_not_called()
+        adt_object.open_editor.assert_not_called()
+        self.assertEqual(staged_writes, [sap.cli.checkin.StagedWrite('CODE', adt_object, '420', 'src/foo.prog.abap')])
+
+    def test_compare_before_write_writes_changed(self):
+        adt_object = MagicMock()
+        adt_object.text = 'OLD CODE'
+        editor = MagicMock()
+        editor.__enter__.return_value = editor
+        adt_object.open_editor.return_value = editor
+
+        written = sap.cli.checkin._write_source_file('CODE', adt_object, compare_before_write=True)
+
+        self.assertTrue(written)
+        editor.write.assert_called_once_with('CODE')
+
 
 if __name__ == '__main__':
     unittest.main()
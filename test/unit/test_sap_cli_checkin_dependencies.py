@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import patch
+
+from sap.cli.checkin import RepoObject
+from sap.cli.checkin_dependencies import (
+    source_references,
+    provided_names,
+    build_dependency_graph,
+    activation_waves,
+)
+
+from mock import StringIOFile
+
+
+def repo_object(code, name, *files):
+    return RepoObject(code=code, name=name, path=f'./src/{name}.{code}.xml', package=None, files=list(files))
+
+
+class TestSourceReferences(unittest.TestCase):
+
+    def test_identifiers(self):
+        names = source_references('CLASS zcl_impl DEFINITION INHERITING FROM zcl_base.\n'
+                                  '  PUBLIC SECTION.\n'
+                                  '    INTERFACES /ns/if_strategy.\n'
+                                  '    DATA ref TYPE REF TO zif_other.\n')
+
+        self.assertTrue({'ZCL_IMPL', 'ZCL_BASE', '/NS/IF_STRATEGY', 'ZIF_OTHER'} <= names)
+
+    def test_comments_and_literals(self):
+        names = source_references('* zcl_full_line_comment\n'
+                                  "WRITE 'zcl_in_literal'. \" zcl_in_comment\n"
+                                  'WRITE |zcl_in_template|.\n'
+                                  "WRITE `zcl_in_string` && 'it''s \"'. zcl_after\n")
+
+        self.assertIn('ZCL_AFTER', names)
+        self.assertFalse({'ZCL_FULL_LINE_COMMENT', 'ZCL_IN_LITERAL', 'ZCL_IN_COMMENT', 'ZCL_IN_TEMPLATE',
+                          'ZCL_IN_STRING'} & names)
+
+    def test_call_function(self):
+        names = source_references("CALL FUNCTION 'z_module' EXPORTING iv = 1.\n"
+                                  "\" CALL FUNCTION 'Z_COMMENTED'\n")
+
+        self.assertIn('Z_MODULE', names)
+        self.assertNotIn('Z_COMMENTED', names)
+
+
+class TestProvidedNames(unittest.TestCase):
+
+    def test_function_group(self):
+        fugr = repo_object('fugr', 'zfugr', './src/zfugr.fugr.z_module.abap', './src/zfugr.fugr.lzfugrtop.abap',
+                           './src/zfugr.fugr.z_module.xml')
+
+        self.assertEqual(provided_names(fugr), {'ZFUGR', 'Z_MODULE', 'LZFUGRTOP'})
+
+    def test_class(self):
+        clas = repo_object('clas', 'zcl_impl', './src/zcl_impl.clas.abap', './src/zcl_impl.clas.testclasses.abap')
+
+        self.assertEqual(provided_names(clas), {'ZCL_IMPL'})
+
+
+class TestBuildDependencyGraph(unittest.TestCase):
+
+    def build(self, objects, sources):
+        def fake_open(path, *args, **kwargs):
+            if path not in sources:
+                raise FileNotFoundError(path)
+
+            return StringIOFile(sources[path])
+
+        with patch('sap.cli.checkin_dependencies.open', side_effect=fake_open, create=True):
+            return build_dependency_graph(objects)
+
+    def test_graph(self):
+        objects = [repo_object('intf', 'zif_strategy', './src/zif_strategy.intf.abap'),
+                   repo_object('clas', 'zcl_impl', './src/zcl_impl.clas.abap', './src/zcl_impl.clas.testclasses.abap'),
+                   repo_object('fugr', 'zfugr', './src/zfugr.fugr.z_module.abap'),
+                   repo_object('prog', 'zreport', './src/zreport.prog.abap', './src/zreport.prog.missing.abap')]
+
+        graph = self.build(objects, {
+            './src/zif_strategy.intf.abap': 'INTERFACE zif_strategy PUBLIC. ENDINTERFACE.',
+            './src/zcl_impl.clas.abap': 'CLASS zcl_impl DEFINITION. INTERFACES zif_strategy. ENDCLASS.',
+            './src/zcl_impl.clas.testclasses.abap': 'CLASS ltcl DEFINITION FOR TESTING. ENDCLASS.',
+            './src/zfugr.fugr.z_module.abap': 'FUNCTION z_module. ENDFUNCTION.',
+            './src/zreport.prog.abap': "CALL FUNCTION 'Z_MODULE'. NEW zcl_impl( ).",
+        })
+
+        self.assertEqual(graph, [set(), {0}, set(), {1, 2}])
+
+
+class TestActivationWaves(unittest.TestCase):
+
+    def test_independent_objects(self):
+        self.assertEqual(activation_waves(['a', 'b', 'c'], [set(), set(), set()]), [['a', 'b', 'c']])
+
+    def test_chain(self):
+        self.assertEqual(activation_waves(['a', 'b', 'c', 'd'], [{1}, {2}, set(), {2}]), [['c'], ['b', 'd'], ['a']])
+
+    def test_cycle_in_single_wave(self):
+        self.assertEqual(activation_waves(['a', 'b', 'c', 'd'], [{1}, {0, 2}, set(), {0}]), [['c'], ['a', 'b'], ['d']])
+
+    def test_no_objects(self):
+        self.assertEqual(activation_waves([], []), [])
+
+    def test_long_chain(self):
+        count = 5000
+        graph = [{node + 1} for node in range(count - 1)] + [set()]
+
+        waves = activation_waves(list(range(count)), graph)
+
+        self.assertEqual(len(waves), count)
+        self.assertEqual(waves[0], [count - 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import hashlib
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from sap.cli.checkin_manifest import CheckinManifest, file_digest, system_key
+
+
+class TestCheckinManifest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self._tmp.name, '.sapcli-checkin.json')
+        self.source_path = os.path.join(self._tmp.name, 'zprog.prog.abap')
+
+        with open(self.source_path, 'w', encoding='utf-8') as source:
+            source.write('REPORT zprog.\n')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_file_digest(self):
+        self.assertEqual(file_digest(self.source_path), hashlib.sha256(b'REPORT zprog.\n').hexdigest())
+
+    def test_system_key(self):
+        connection = SimpleNamespace(host='example.org', port='443', client='100')
+        self.assertEqual(system_key(connection), '100@example.org:443')
+
+    def test_load_missing(self):
+        manifest = CheckinManifest.load(self.manifest_path)
+
+        self.assertEqual(manifest.path, self.manifest_path)
+        self.assertIsNone(manifest.get('100@host:443', self.source_path))
+
+    def test_load_corrupted(self):
+        with open(self.manifest_path, 'w', encoding='utf-8') as manifest_file:
+            manifest_file.write('{not json')
+
+        manifest = CheckinManifest.load(self.manifest_path)
+        self.assertFalse(manifest.is_unchanged('100@host:443', [self.source_path]))
+
+    def test_load_other_version(self):
+        with open(self.manifest_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump({'version': 0, 'systems': {'sys': {self.source_path: {'sha256': 'x', 'uri': None}}}},
+                      manifest_file)
+
+        manifest = CheckinManifest.load(self.manifest_path)
+        self.assertIsNone(manifest.get('sys', self.source_path))
+
+    def test_record_save_load(self):
+        manifest = CheckinManifest.load(self.manifest_path)
+        manifest.record('sys', self.source_path, '/sap/bc/adt/programs/programs/zprog')
+        manifest.save()
+
+        self.assertEqual(sorted(os.listdir(self._tmp.name)), ['.sapcli-checkin.json', 'zprog.prog.abap'])
+
+        loaded = CheckinManifest.load(self.manifest_path)
+        self.assertEqual(loaded.get('sys', self.source_path),
+                         {'sha256': file_digest(self.source_path), 'uri': '/sap/bc/adt/programs/programs/zprog'})
+        self.assertTrue(loaded.is_unchanged('sys', [self.source_path]))
+        self.assertFalse(loaded.is_unchanged('other', [self.source_path]))
+
+    def test_is_unchanged_modified(self):
+        manifest = CheckinManifest(self.manifest_path)
+        manifest.record('sys', self.source_path, None)
+
+        with open(self.source_path, 'a', encoding='utf-8') as source:
+            source.write('WRITE 1.\n')
+
+        self.assertFalse(manifest.is_unchanged('sys', [self.source_path]))
+
+    def test_is_unchanged_removed(self):
+        manifest = CheckinManifest(self.manifest_path)
+        manifest.record('sys', self.source_path, None)
+
+        os.unlink(self.source_path)
+
+        self.assertFalse(manifest.is_unchanged('sys', [self.source_path]))
+
+    def test_is_unchanged_unknown_file(self):
+        manifest = CheckinManifest(self.manifest_path)
+        manifest.record('sys', self.source_path, None)
+
+        self.assertFalse(manifest.is_unchanged('sys', [self.source_path, self.manifest_path]))
+
+    def test_forget(self):
+        manifest = CheckinManifest(self.manifest_path)
+        manifest.record('sys', self.source_path, None)
+        manifest.forget('sys', self.source_path)
+        manifest.forget('unknown', self.source_path)
+
+        self.assertIsNone(manifest.get('sys', self.source_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
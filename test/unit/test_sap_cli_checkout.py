@@ -2,18 +2,22 @@
 
 import os
 import sys
+import threading
+import time
 from argparse import ArgumentParser
 import unittest
 from unittest.mock import Mock, PropertyMock, patch, mock_open, call, MagicMock
 from types import SimpleNamespace
 from io import StringIO
 
+from sap.errors import SAPCliError
 import sap.cli.checkout
+import sap.cli.core
 import sap.platform.abap
 import sap.platform.abap.abapgit
 import sap.adt
 
-from mock import Connection, patch, PatcherTestCase, ConsoleOutputTestCase
+from mock import Connection, patch, PatcherTestCase, ConsoleOutputTestCase, patch_get_print_console_with_buffer
 from test.unit.fixtures_cli_checkout import FUNCTION_GROUP_XML, FUNCTION_INCLUDE_1_XML, FUNCTION_INCLUDE_2_XML, FUNCTION_MODULE_1_CODE, FUNCTION_MODULE_2_CODE,\
     FUNCTION_MODULE_1_CODE_ABAPGIT, FUNCTION_MODULE_2_CODE_ABAPGIT
 
@@ -56,7 +60,7 @@ class TestCheckout(unittest.TestCase):
         args = parse_args(['class', 'ZCL_UPPERCASE'])
         args.execute(conn, args)
 
-        self.assertEqual(fake_clas.mock_calls, [call(conn, 'ZCL_LOWERCASE'), call(conn, 'ZCL_UPPERCASE')])
+        self.assertEqual(fake_clas.mock_calls, [call(conn, 'ZCL_LOWERCASE', jobs=1), call(conn, 'ZCL_UPPERCASE', jobs=1)])
 
     @patch('sap.cli.checkout.checkout_interface')
     def test_checkout_uppercase_name_intf(self, fake_intf):
@@ -239,6 +243,57 @@ class TestCheckout(unittest.TestCase):
 
 class TestCheckoutClass(unittest.TestCase):
 
+    @patch('sap.cli.checkout.dump_attributes_to_file')
+    @patch('sap.cli.checkout.build_class_abap_attributes')
+    @patch('sap.cli.checkout.write_source')
+    @patch('sap.adt.Class')
+    def test_checkout_class_jobs(self, fake_class, fake_write_source, _, fake_dump):
+        conn = Mock()
+        conn.clone.side_effect = lambda: Mock(name='worker_connection')
+
+        def new_class(connection, name):
+            clas = Mock()
+            clas.connection = connection
+            clas.text = f'{name} main'
+            clas.definitions.text = f'{name} definitions'
+            clas.implementations.text = f'{name} implementations'
+            clas.test_classes.text = f'{name} tests'
+            return clas
+
+        fake_class.side_effect = new_class
+
+        sap.cli.checkout.checkout_class(conn, 'ZCL_PARALLEL', destdir='src', jobs=4)
+
+        self.assertEqual(fake_class.call_args_list[0], call(conn, 'ZCL_PARALLEL'))
+        self.assertEqual(fake_write_source.mock_calls,
+                         [call('ZCL_PARALLEL main', 'ZCL_PARALLEL', '.clas', 'src'),
+                          call('ZCL_PARALLEL definitions', 'ZCL_PARALLEL', '.clas.locals_def', 'src'),
+                          call('ZCL_PARALLEL implementations', 'ZCL_PARALLEL', '.clas.locals_imp', 'src'),
+                          call('ZCL_PARALLEL tests', 'ZCL_PARALLEL', '.clas.testclasses', 'src')])
+        self.assertNotIn(conn, [c.args[0] for c in fake_class.call_args_list[1:]])
+        fake_dump.assert_called_once()
+
+    @patch('sap.cli.checkout.dump_attributes_to_file')
+    @patch('sap.cli.checkout.build_class_abap_attributes')
+    @patch('sap.adt.Class')
+    def test_checkout_class_jobs_output_order(self, _, __, ___):
+        conn = Mock()
+        conn.clone.side_effect = lambda: Mock(name='worker_connection')
+        started = threading.Barrier(4)
+
+        def fake_download(name, source_object, typsfx, destdir=None):
+            # all parts run concurrently and the last one finishes first
+            started.wait(timeout=5)
+            time.sleep(0.01 * (4 - len(typsfx.split('.'))))
+            sap.cli.core.printout(typsfx)
+
+        with patch('sap.cli.checkout.download_abap_source', side_effect=fake_download), \
+             patch_get_print_console_with_buffer() as fake_console:
+            sap.cli.checkout.checkout_class(conn, 'ZCL_PARALLEL', destdir='src', jobs=4)
+
+        self.assertEqual(fake_console.capout,
+                         'ZCL_PARALLEL\n.clas\n.clas.locals_def\n.clas.locals_imp\n.clas.testclasses\n')
+
     @patch('sap.adt.Class')
     def test_build_class_attributes(self, fake_class):
         fake_inst = Mock()
@@ -405,7 +460,42 @@ class TestCheckoutPackage(unittest.TestCase):
             args.execute(conn, args)
 
         exp_destdir = os.path.abspath(os.path.join(package_name, starting_folder))
-        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_destdir)
+        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_destdir, jobs=1)
+
+    @patch('sap.cli.checkout.checkout_package')
+    @patch('sap.cli.checkout.checkout_objects')
+    @patch('sap.adt.package.walk')
+    def test_checkout_package_closes_index(self, fake_walk, fake_checkout, fake_package):
+        conn = Connection([])
+
+        fake_walk.return_value = iter((([], [], []), ))
+        fake_checkout.side_effect = SAPCliError('Checkout failed')
+
+        args = parse_args(['package', '$ROOT'])
+        with patch('sap.adt.package_index.get_package_index') as fake_get_index, \
+             patch('sap.cli.checkout.open', mock_open()), \
+             patch('os.path.isdir', return_value=True):
+            with self.assertRaises(SAPCliError):
+                args.execute(conn, args)
+
+        self.assertEqual(fake_walk.call_args[1]['index'], fake_get_index.return_value)
+        fake_get_index.return_value.close.assert_called_once_with()
+
+    @patch('sap.cli.checkout.checkout_package')
+    @patch('sap.cli.checkout.checkout_objects')
+    @patch('sap.adt.package.walk')
+    def test_checkout_package_recursive_jobs(self, fake_walk, fake_checkout, fake_package):
+        conn = Connection([])
+
+        fake_walk.side_effect = lambda *args, **kwargs: iter((([], [], []), ))
+
+        for arguments, exp_jobs in ((['--jobs', '3'], 1), (['--jobs', '3', '--recursive'], 3)):
+            args = parse_args(['package', '$ROOT'] + arguments)
+            with patch('sap.cli.checkout.open', mock_open()), \
+                 patch('os.path.isdir', return_value=True):
+                args.execute(conn, args)
+
+            self.assertEqual(fake_walk.call_args[1]['jobs'], exp_jobs)
 
     @patch('sap.cli.checkout.checkout_package')
     @patch('sap.cli.checkout.checkout_objects')
@@ -430,7 +520,7 @@ class TestCheckoutPackage(unittest.TestCase):
         fake_isdir.assert_called_once_with(exp_repodir)
 
         exp_sourcedir = os.path.abspath(os.path.join(exp_repodir, starting_folder))
-        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir)
+        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir, jobs=1)
 
     @patch('sap.platform.abap.to_xml')
     @patch('sap.cli.checkout.checkout_package')
@@ -487,7 +577,29 @@ class TestCheckoutPackage(unittest.TestCase):
         fake_isdir.assert_called_once_with(exp_repodir)
 
         exp_sourcedir = os.path.join(exp_repodir, starting_folder)
-        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir)
+        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir, jobs=1)
+
+    def test_checkout_objects_jobs(self):
+        conn = Mock()
+        conn.clone.side_effect = lambda: Mock(name='worker_connection')
+
+        objects = [SimpleNamespace(typ='PROG/P', name=f'Z_PROGRAM_{i}') for i in range(5)]
+        objects.insert(2, SimpleNamespace(typ='7777/3', name='Magic Unicorn'))
+
+        def fake_checkout_program(connection, name, destdir):
+            sap.cli.core.printout(name)
+            return connection
+
+        with patch('sap.cli.checkout.checkout_program', side_effect=fake_checkout_program) as fake_prog, \
+             patch('sap.cli.checkout.print') as fake_print, \
+             patch('os.path.isdir', return_value=True), \
+             patch_get_print_console_with_buffer() as fake_console:
+            sap.cli.checkout.checkout_objects(conn, objects, destdir='src', jobs=3)
+
+        self.assertEqual(sorted(c.args[1] for c in fake_prog.call_args_list), [f'Z_PROGRAM_{i}' for i in range(5)])
+        self.assertNotIn(conn, [c.args[0] for c in fake_prog.call_args_list])
+        self.assertEqual(fake_print.mock_calls, [call('Unsupported object: 7777/3 Magic Unicorn', file=sys.stderr)])
+        self.assertEqual(fake_console.capout, ''.join(f'Z_PROGRAM_{i}\n' for i in range(5)))
 
     def test_checkout_objects_makedirs(self):
         conn = Connection([])
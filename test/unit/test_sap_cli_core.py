@@ -2,6 +2,7 @@
 
 from io import StringIO
 import sys
+import threading
 import unittest
 from unittest.mock import call, patch, MagicMock, Mock, mock_open
 
@@ -321,6 +322,48 @@ class TestConsolePrintoutFile(unittest.TestCase):
         self.assertEqual(self.err.getvalue(), 'ERR\n')
 
 
+class TestRecordingConsole(unittest.TestCase):
+
+    def test_replay_keeps_order(self):
+        out = StringIO()
+        err = StringIO()
+
+        recorder = sap.cli.core.RecordingConsole()
+        recorder.printout('OUT', 'one', sep='-')
+        recorder.printerr('ERR')
+        recorder.printout('OUT two', end='')
+        recorder.flush()
+
+        self.assertEqual(out.getvalue(), '')
+
+        recorder.replay(sap.cli.core.PrintConsole(out, err))
+
+        self.assertEqual(out.getvalue(), 'OUT-one\nOUT two')
+        self.assertEqual(err.getvalue(), 'ERR\n')
+        self.assertEqual(recorder.records, [])
+
+
+class TestThreadConsole(unittest.TestCase):
+
+    def test_thread_console_redirects_current_thread(self):
+        recorder = sap.cli.core.RecordingConsole()
+        original = sap.cli.core.get_console()
+
+        with sap.cli.core.thread_console(recorder):
+            self.assertIs(sap.cli.core.get_console(), recorder)
+            sap.cli.core.printout('Recorded')
+
+            other = []
+            thread = threading.Thread(target=lambda: other.append(sap.cli.core.get_console()))
+            thread.start()
+            thread.join()
+
+            self.assertIs(other[0], original)
+
+        self.assertIs(sap.cli.core.get_console(), original)
+        self.assertEqual(recorder.records, [('printout', ('Recorded',), ' ', '\n')])
+
+
 class TestGetStdin(unittest.TestCase):
 
     def test_initial_sys_stdin(self):
@@ -23,7 +23,7 @@ class TestCommandGroup(unittest.TestCase):
 
 class TestDCLActivate(unittest.TestCase):
 
-    @patch('sap.adt.wb.try_activate')
+    @patch('sap.adt.wb.bisect_mass_activate')
     @patch('sap.adt.AccessControl')
     def test_cli_dcl_activate_defaults(self, fake_dcl, fake_activate):
         instances = []
@@ -40,7 +40,7 @@ class TestDCLActivate(unittest.TestCase):
 
         fake_conn = Mock()
 
-        fake_activate.return_value = (sap.adt.wb.CheckResults(), None)
+        fake_activate.side_effect = lambda connection, objects, chunk_size: iter([(objects, sap.adt.wb.CheckResults())])
         args = parse_args('activate', 'zmyacl', 'zmyacl2')
         with patch_get_print_console_with_buffer() as fake_console:
             args.execute(fake_conn, args)
@@ -52,7 +52,7 @@ class TestDCLActivate(unittest.TestCase):
         self.assertEqual(instances[0].name, 'ZMYACL')
         self.assertEqual(instances[1].name, 'ZMYACL2')
 
-        self.assertEqual(fake_activate.mock_calls, [call(instances[0]), call(instances[1])])
+        fake_activate.assert_called_once_with(instances[0].connection, instances, 100)
 
         self.assertEqual(fake_console.caperr, '')
         self.assertEqual(fake_console.capout, '''Activating 2 objects:
@@ -4,12 +4,102 @@ from types import SimpleNamespace
 import unittest
 from unittest.mock import patch, Mock
 
+import sap.cli.core
 import sap.cli.helpers
+from sap.errors import SAPCliError
 
 from mock import (
     ConsoleOutputTestCase
 )
 
+class TestConnectionWorkers(ConsoleOutputTestCase, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.connection = Mock()
+        self.connection.clone.side_effect = lambda: Mock(name='clone')
+
+    def test_invalid_jobs(self):
+        for jobs in (0, -1, None):
+            with self.assertRaises(sap.cli.core.InvalidCommandLineError) as caught:
+                sap.cli.helpers.ConnectionWorkers(self.connection, jobs)
+
+            self.assertEqual(str(caught.exception), f'The number of jobs must be a positive integer: {jobs}')
+
+    def test_single_job_uses_original_connection(self):
+        workers = sap.cli.helpers.ConnectionWorkers(self.connection, 1, console=self.console)
+
+        results = list(workers.map(lambda conn, item: (conn, item), ['a', 'b']))
+
+        self.assertEqual(results, [(self.connection, 'a'), (self.connection, 'b')])
+        self.connection.clone.assert_not_called()
+
+    def test_many_jobs_keeps_order_of_results_and_output(self):
+        workers = sap.cli.helpers.ConnectionWorkers(self.connection, 3, console=self.console)
+
+        def task(conn, item):
+            sap.cli.core.printout('Out', item)
+            sap.cli.core.printerr('Err', item)
+            return (conn, item * 2)
+
+        results = list(workers.map(task, [1, 2, 3, 4, 5]))
+
+        self.assertEqual([result[1] for result in results], [2, 4, 6, 8, 10])
+        for conn, _ in results:
+            self.assertIsNot(conn, self.connection)
+
+        self.assertLessEqual(self.connection.clone.call_count, 3)
+        self.assertConsoleContents(self.console,
+                                   stdout=''.join(f'Out {i}\n' for i in range(1, 6)),
+                                   stderr=''.join(f'Err {i}\n' for i in range(1, 6)))
+
+    def test_many_jobs_reraises_error_in_order(self):
+        workers = sap.cli.helpers.ConnectionWorkers(self.connection, 2, console=self.console)
+
+        def task(_, item):
+            sap.cli.core.printout('Item', item)
+            if item == 2:
+                raise SAPCliError('Failed item 2')
+
+            return item
+
+        results = []
+        with self.assertRaises(SAPCliError) as caught:
+            for result in workers.map(task, [1, 2, 3]):
+                results.append(result)
+
+        self.assertEqual(str(caught.exception), 'Failed item 2')
+        self.assertEqual(results, [1])
+        self.assertTrue(self.console.capout.startswith('Item 1\nItem 2\n'))
+
+    def test_threads_and_clones_reused_until_closed(self):
+        clones = []
+
+        def clone():
+            clones.append(Mock(name='clone'))
+            return clones[-1]
+
+        self.connection.clone.side_effect = clone
+
+        with sap.cli.helpers.ConnectionWorkers(self.connection, 2, console=self.console) as workers:
+            first = set(conn for conn in workers.map(lambda conn, item: conn, range(6)))
+            second = set(conn for conn in workers.map(lambda conn, item: conn, range(6)))
+
+            self.assertLessEqual(len(clones), 2)
+            self.assertTrue(second <= set(clones))
+            self.assertTrue(first <= set(clones))
+
+        for conn in clones:
+            conn.close.assert_called_once_with()
+
+    def test_close_single_job_keeps_original_connection(self):
+        with sap.cli.helpers.ConnectionWorkers(self.connection, 1, console=self.console) as workers:
+            list(workers.map(lambda conn, item: item, [1, 2]))
+
+        self.connection.close.assert_not_called()
+
+
 class TestConsoleHeartBeat(ConsoleOutputTestCase, unittest.TestCase):
 
     def getBeater(self, period):
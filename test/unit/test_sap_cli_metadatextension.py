@@ -21,7 +21,7 @@ class TestCommandGroup(unittest.TestCase):
 
 class TestDDLXActivate(unittest.TestCase):
 
-    @patch('sap.adt.wb.try_activate')
+    @patch('sap.adt.wb.bisect_mass_activate')
     @patch('sap.adt.MetadataExtension')
     def test_cli_ddlx_activate_defaults(self, fake_ddlx, fake_activate):
         instances = []
@@ -38,7 +38,7 @@ class TestDDLXActivate(unittest.TestCase):
 
         fake_conn = Mock()
 
-        fake_activate.return_value = (sap.adt.wb.CheckResults(), None)
+        fake_activate.side_effect = lambda connection, objects, chunk_size: iter([(objects, sap.adt.wb.CheckResults())])
         args = parse_args('activate', 'z_test_md_ext_v0', 'z_test_md_ext_v1')
         with patch_get_print_console_with_buffer() as fake_console:
             args.execute(fake_conn, args)
@@ -50,7 +50,7 @@ class TestDDLXActivate(unittest.TestCase):
         self.assertEqual(instances[0].name, 'Z_TEST_MD_EXT_V0')
         self.assertEqual(instances[1].name, 'Z_TEST_MD_EXT_V1')
 
-        self.assertEqual(fake_activate.mock_calls, [call(instances[0]), call(instances[1])])
+        fake_activate.assert_called_once_with(instances[0].connection, instances, 100)
 
         self.assertEqual(fake_console.caperr, '')
         self.assertEqual(fake_console.capout, '''Activating 2 objects:
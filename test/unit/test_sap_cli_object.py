@@ -82,15 +82,15 @@ class TestCommandGroupObjectTemplateDefine(unittest.TestCase):
 
         self.assertEqual(act_write_cmd, exp_write_cmd)
         # name, source, --activate, --ignore-errors, --warning-errors,
-        # --check, --no-check, --corrnr
-        self.assertEqual(len(exp_write_cmd.arguments), 8)
+        # --check, --no-check, --compare, --no-compare, --corrnr
+        self.assertEqual(len(exp_write_cmd.arguments), 10)
 
     def test_define_activate(self):
         exp_activate_cmd = self.group.define_activate(self.commands)
         act_activate_cmd = self.commands.get_declaration(self.group.activate_objects)
 
         self.assertEqual(act_activate_cmd, exp_activate_cmd)
-        self.assertEqual(len(exp_activate_cmd.arguments), 3)
+        self.assertEqual(len(exp_activate_cmd.arguments), 4)
 
     def test_define_delete(self):
         exp_delete_cmd = self.group.define_delete(self.commands)
@@ -475,7 +475,8 @@ Errors: 0
              patch('sys.stdin.readlines', return_value='source code'):
             args.execute(connection, args)
 
-        fake_cfg.assert_called_once_with('check_before_save', False)
+        self.assertEqual(fake_cfg.call_args_list,
+                         [call('check_before_save', False), call('compare_before_write', False)])
         fake_check.assert_not_called()
         self.group.open_editor_mock.write.assert_called_once_with('source code')
 
@@ -485,14 +486,14 @@ Errors: 0
         args = self.parse_args('write', 'myname', '-', '--check')
         self.assertTrue(args.check)
 
-        with patch('sap.cli.object.config_get') as fake_cfg, \
+        with patch('sap.cli.object.config_get', return_value=False) as fake_cfg, \
              patch('sap.adt.checks.run_object_check') as fake_check, \
              patch('sys.stdin.readlines', return_value='source code'):
             fake_check.return_value = SimpleNamespace(has_errors=False, messages=iter([]))
             args.execute(connection, args)
 
         # The CLI flag wins; config_get is not even consulted.
-        fake_cfg.assert_not_called()
+        self.assertEqual(fake_cfg.call_args_list, [call('compare_before_write', False)])
         fake_check.assert_called_once()
         self.group.open_editor_mock.write.assert_called_once_with('source code')
 
@@ -504,12 +505,13 @@ Errors: 0
 
         # Even with the env-var saying "check", the explicit --no-check
         # must skip both the pre-check and the catch-on-failure path.
-        with patch('sap.cli.object.config_get', return_value=True) as fake_cfg, \
+        with patch('sap.cli.object.config_get', side_effect=lambda option, _: option == 'check_before_save') \
+                as fake_cfg, \
              patch('sap.adt.checks.run_object_check') as fake_check, \
              patch('sys.stdin.readlines', return_value='source code'):
             args.execute(connection, args)
 
-        fake_cfg.assert_not_called()
+        self.assertEqual(fake_cfg.call_args_list, [call('compare_before_write', False)])
         fake_check.assert_not_called()
         self.group.open_editor_mock.write.assert_called_once_with('source code')
 
@@ -519,16 +521,71 @@ Errors: 0
         args = self.parse_args('write', 'myname', '-')
         self.assertIsNone(args.check)
 
-        with patch('sap.cli.object.config_get', return_value=True) as fake_cfg, \
+        with patch('sap.cli.object.config_get', side_effect=lambda option, _: option == 'check_before_save') \
+                as fake_cfg, \
              patch('sap.adt.checks.run_object_check') as fake_check, \
              patch('sys.stdin.readlines', return_value='source code'):
             fake_check.return_value = SimpleNamespace(has_errors=False, messages=iter([]))
             args.execute(connection, args)
 
-        fake_cfg.assert_called_once_with('check_before_save', False)
+        self.assertEqual(fake_cfg.call_args_list,
+                         [call('check_before_save', False), call('compare_before_write', False)])
         fake_check.assert_called_once()
         self.group.open_editor_mock.write.assert_called_once_with('source code')
 
+    def test_write_compare_skips_unchanged(self):
+        connection = MagicMock()
+
+        args = self.parse_args('write', 'myname', '-', '--compare', '--activate')
+        self.assertTrue(args.compare)
+
+        self.group.new_object_mock.text = 'source code\n'
+
+        with patch('sys.stdin.readlines', return_value='source code'), \
+             patch('sap.adt.wb.filter_inactive_objects', return_value=[]) as fake_filter, \
+             patch('sap.adt.wb.try_activate') as fake_activate, \
+             patch_get_print_console_with_buffer() as fake_console:
+            exit_code = args.execute(connection, args)
+
+        self.assertEqual(exit_code, 0)
+        self.group.new_object_mock.open_editor.assert_not_called()
+        fake_filter.assert_called_once_with(connection, [self.group.new_object_mock])
+        fake_activate.assert_not_called()
+        self.assertEqual(fake_console.capout, 'Writing:\n* str(myname) (unchanged)\nNothing to activate\n')
+
+    def test_write_compare_activates_unchanged_inactive(self):
+        connection = MagicMock()
+
+        args = self.parse_args('write', 'myname', '-', '--compare', '--activate')
+
+        self.group.new_object_mock.text = 'source code'
+
+        with patch('sys.stdin.readlines', return_value='source code'), \
+             patch('sap.adt.wb.filter_inactive_objects', side_effect=lambda _, objects: objects), \
+             patch('sap.adt.wb.try_activate') as fake_activate, \
+             patch_get_print_console_with_buffer():
+            fake_activate.return_value = (sap.adt.wb.CheckResults(), None)
+            args.execute(connection, args)
+
+        self.group.new_object_mock.open_editor.assert_not_called()
+        fake_activate.assert_called_once_with(self.group.new_object_mock)
+
+    def test_write_compare_writes_changed(self):
+        connection = MagicMock()
+
+        args = self.parse_args('write', 'myname', '-')
+
+        self.group.new_object_mock.text = 'old source code'
+
+        with patch('sap.cli.object.config_get', side_effect=lambda option, _: option == 'compare_before_write'), \
+             patch('sys.stdin.readlines', return_value='source code'), \
+             patch('sap.adt.wb.filter_inactive_objects') as fake_filter, \
+             patch_get_print_console_with_buffer():
+            args.execute(connection, args)
+
+        self.group.open_editor_mock.write.assert_called_once_with('source code')
+        fake_filter.assert_not_called()
+
     def test_write_check_findings_raise_and_skip(self):
         connection = MagicMock()
 
@@ -706,21 +763,18 @@ Errors: 0
 
         args = self.parse_args('activate', 'myname', 'anothername')
 
-        with patch('sap.adt.wb.try_activate') as fake_activate, \
+        with patch('sap.adt.wb.bisect_mass_activate') as fake_activate, \
              patch_get_print_console_with_buffer() as fake_console:
 
-            def fake_activate_fn(obj):
-                # simulate object activation
-                obj.active = 'active'
-                return (sap.adt.wb.CheckResults(), None)
-
-            fake_activate.side_effect = fake_activate_fn
+            fake_activate.side_effect = lambda conn, objects, chunk_size: iter([(objects, sap.adt.wb.CheckResults())])
 
             exit_code = args.execute(connection, args)
             self.assertEqual(exit_code, 0)
 
-        self.assertEqual(fake_activate.call_args_list, [call(self.group.new_object_mock),
-                                                        call(self.group.new_object_mock)])
+        self.assertEqual(fake_activate.call_args_list, [call(self.group.new_object_mock.connection,
+                                                             [self.group.new_object_mock,
+                                                              self.group.new_object_mock],
+                                                             100)])
 
         self.assertEqual(self.group.instace_mock.call_args_list, [call(connection, 'myname', args, metadata=None),
                                                                   call(connection, 'anothername', args, metadata=None)])
@@ -741,16 +795,14 @@ Errors: 0
 
         message_builder = MessageBuilder()
 
-        response_iter = iter([('active', (message_builder.build_results_without_messages(), None)),
-                              ('inactive', (message_builder.build_results_with_errors(), None))])
+        first = message_builder.build_results_without_messages()
+        second = message_builder.build_results_with_errors()
 
-        def fake_activate_fn(obj):
-            response = next(response_iter) 
-            # simulate object activation
-            obj.active = response[0]
-            return response[1]
+        def fake_activate_fn(conn, objects, chunk_size):
+            # simulate bisection isolating the broken object
+            return iter([([objects[0]], first), ([objects[1]], second)])
 
-        with patch('sap.adt.wb.try_activate') as fake_activate, \
+        with patch('sap.adt.wb.bisect_mass_activate') as fake_activate, \
              patch_get_print_console_with_buffer() as fake_console:
             fake_activate.side_effect = fake_activate_fn
 
@@ -760,13 +812,45 @@ Errors: 0
         self.assertEqual(fake_console.capout, f'''Activating 2 objects:
 * myname (1/2)
 * anothername (2/2)
-{message_builder.error_message[1]}Activation has stopped
+{message_builder.error_message[1]}Activation has finished
 Warnings: 0
 Errors: 1
-Active objects:
+Inactive objects:
   FAKE anothername
 ''')
 
+    def test_activate_objects_continues_after_error(self):
+        connection = MagicMock()
+
+        args = self.parse_args('activate', 'myname', 'anothername', 'thirdname')
+
+        message_builder = MessageBuilder()
+
+        broken = message_builder.build_results_with_errors()
+        rest = message_builder.build_results_without_messages()
+
+        def fake_activate_fn(conn, objects, chunk_size):
+            # simulate bisection isolating the first broken object
+            return iter([([objects[0]], broken), (objects[1:], rest)])
+
+        with patch('sap.adt.wb.bisect_mass_activate') as fake_activate, \
+             patch_get_print_console_with_buffer() as fake_console:
+            fake_activate.side_effect = fake_activate_fn
+
+            exit_code = args.execute(connection, args)
+            self.assertEqual(exit_code, 1)
+
+        self.assertEqual(fake_console.capout, f'''Activating 3 objects:
+* myname (1/3)
+{message_builder.error_message[1]}* anothername (2/3)
+* thirdname (3/3)
+Activation has finished
+Warnings: 0
+Errors: 1
+Inactive objects:
+  FAKE thirdname
+''')
+
     def test_activate_objects_with_ignored_error(self):
         connection = MagicMock()
 
@@ -774,16 +858,14 @@ Active objects:
 
         message_builder = MessageBuilder()
 
-        response_iter = iter([('active', (message_builder.build_results_without_messages(), None)),
-                              ('inactive', (message_builder.build_results_with_errors(), None))])
+        first = message_builder.build_results_without_messages()
+        second = message_builder.build_results_with_errors()
 
-        def fake_activate_fn(obj):
-            response = next(response_iter) 
-            # simulate object activation
-            obj.active = response[0]
-            return response[1]
+        def fake_activate_fn(conn, objects, chunk_size):
+            # simulate bisection isolating the broken object
+            return iter([([objects[0]], first), ([objects[1]], second)])
 
-        with patch('sap.adt.wb.try_activate') as fake_activate, \
+        with patch('sap.adt.wb.bisect_mass_activate') as fake_activate, \
              patch_get_print_console_with_buffer() as fake_console:
             fake_activate.side_effect = fake_activate_fn
 
@@ -807,16 +889,14 @@ Inactive objects:
 
         message_builder = MessageBuilder()
 
-        response_iter = iter([('active', (message_builder.build_results_without_messages(), None)),
-                             ('active',  (message_builder.build_results_with_warnings(), None))])
+        first = message_builder.build_results_without_messages()
+        second = message_builder.build_results_with_warnings()
 
-        def fake_activate_fn(obj):
-            response = next(response_iter) 
-            # simulate object activation
-            obj.active = response[0]
-            return response[1]
+        def fake_activate_fn(conn, objects, chunk_size):
+            # simulate bisection isolating the broken object
+            return iter([([objects[0]], first), ([objects[1]], second)])
 
-        with patch('sap.adt.wb.try_activate') as fake_activate, \
+        with patch('sap.adt.wb.bisect_mass_activate') as fake_activate, \
              patch_get_print_console_with_buffer() as fake_console:
             fake_activate.side_effect = fake_activate_fn
 
@@ -31,21 +31,25 @@ def parse_args(*argv):
 
 class TestPackageCreate(unittest.TestCase):
 
-    def test_create_package_with_super(self):
+    @patch('sap.adt.package_index.forget_indexed_trees')
+    def test_create_package_with_super(self, fake_forget):
         connection = Connection([EMPTY_RESPONSE_OK])
 
         args = parse_args('create', '$TEST', 'description', '--super-package', '$MASTER')
         sap.cli.package.create(connection, args)
 
         self.assertIn('<pak:superPackage adtcore:name="$MASTER"/>', connection.execs[0].body.decode('utf-8'))
+        fake_forget.assert_called_once_with(connection, ['$TEST', '$MASTER'])
 
-    def test_create_package_without_super(self):
+    @patch('sap.adt.package_index.forget_indexed_trees')
+    def test_create_package_without_super(self, fake_forget):
         connection = Connection([EMPTY_RESPONSE_OK])
 
         args = parse_args('create', '$TEST', 'description')
         sap.cli.package.create(connection, args)
 
         self.assertIn('<pak:superPackage/>', connection.execs[0].body.decode('utf-8'))
+        fake_forget.assert_called_once_with(connection, ['$TEST'])
 
     def test_create_package_with_app_component(self):
         connection = Connection([EMPTY_RESPONSE_OK])
@@ -241,6 +245,42 @@ $VICTORY_TESTS/ZCL_TESTS
 $VICTORY_DOC/
 ''')
 
+    @patch('sap.adt.package.walk')
+    def test_with_recursion_jobs(self, fake_walk):
+        conn = Connection()
+
+        self.configure_mock_walk(fake_walk)
+        args = parse_args('list', '$VICTORY', '-r', '--jobs', '4')
+
+        args.execute(conn, args)
+
+        self.assertEqual(fake_walk.call_args[1]['jobs'], 4)
+
+    @patch('sap.adt.package.walk')
+    def test_without_recursion_jobs(self, fake_walk):
+        conn = Connection()
+
+        self.configure_mock_walk(fake_walk)
+        args = parse_args('list', '$VICTORY', '--jobs', '4')
+
+        args.execute(conn, args)
+
+        self.assertEqual(fake_walk.call_args[1]['jobs'], 1)
+
+    @patch('sap.adt.package_index.get_package_index')
+    @patch('sap.adt.package.walk')
+    def test_with_index(self, fake_walk, fake_get_index):
+        conn = Connection()
+
+        self.configure_mock_walk(fake_walk)
+        args = parse_args('list', '$VICTORY', '-r')
+
+        args.execute(conn, args)
+
+        fake_get_index.assert_called_once_with(conn)
+        self.assertEqual(fake_walk.call_args[1]['index'], fake_get_index.return_value)
+        fake_get_index.return_value.close.assert_called_once_with()
+
     @patch('sap.adt.package.walk')
     def test_with_long_option(self, fake_walk):
         conn = Connection()
@@ -586,10 +626,14 @@ class TestPackageActivate(unittest.TestCase):
 
 class TestPackageCheck(unittest.TestCase):
 
-    def run_checks(self, args, reporters, walk_results):
+    def setUp(self):
+        self.failing_uris = []
+
+    def run_checks(self, args, reporters, walk_results, index=None):
         with patch_get_print_console_with_buffer() as fake_console, \
              patch('sap.adt.checks.run') as fake_run, \
              patch('sap.adt.package.walk') as fake_walk, \
+             patch('sap.adt.package_index.get_package_index', return_value=index), \
              patch('sap.adt.checks.fetch_reporters') as fake_fetch_reporters:
 
             fake_fetch_reporters.return_value = reporters
@@ -597,32 +641,37 @@ class TestPackageCheck(unittest.TestCase):
 
             runs = []
             def sap_adt_checks_run(connection, reporter, object_list):
-                if reporter.name == 'Exception':
+                uris = [obj.uri for obj in object_list]
+
+                if reporter.name == 'Exception' or any(uri in self.failing_uris for uri in uris):
                     fake_response = Mock(status_code=400, text='Error response')
                     raise HTTPRequestError(Mock(), fake_response)
 
-                runs.append([reporter.name] + [obj.uri for obj in object_list])
+                runs.append([reporter.name] + uris)
 
-                check_report = sap.adt.checks.CheckReport()
-                check_report.reporter = reporter.name
-                obj = next(iter(object_list))
-                check_report.triggering_uri = obj.uri
+                check_reports = []
+                for uri in uris:
+                    check_report = sap.adt.checks.CheckReport()
+                    check_report.reporter = reporter.name
+                    check_report.triggering_uri = uri
 
-                check_message = sap.adt.checks.CheckMessage()
-                check_message.uri = f'fake/uri/{reporter.name}'
+                    check_message = sap.adt.checks.CheckMessage()
+                    check_message.uri = f'fake/uri/{reporter.name}'
 
-                if reporter.name == 'all':
-                    check_message.typ = 'W'
-                else:
-                    check_message.typ = 'E'
+                    if reporter.name == 'all':
+                        check_message.typ = 'W'
+                    else:
+                        check_message.typ = 'E'
 
-                check_message.short_text = f'Test {reporter.name}'
-                check_message.category = reporter.name[0]
+                    check_message.short_text = f'Test {reporter.name}'
+                    check_message.category = reporter.name[0]
 
-                sap.get_logger().debug('FAKE message: %s %s', check_report.triggering_uri, check_message.short_text)
-                check_report.messages.append(check_message)
+                    sap.get_logger().debug('FAKE message: %s %s', check_report.triggering_uri,
+                                           check_message.short_text)
+                    check_report.messages.append(check_message)
+                    check_reports.append(check_report)
 
-                return [check_report]
+                return check_reports
 
             fake_run.side_effect = sap_adt_checks_run
 
@@ -632,7 +681,7 @@ class TestPackageCheck(unittest.TestCase):
 
             return (runs, fake_console.capout, fake_console.caperr, ret)
 
-    def run_check_with_objects(self, args, exp_std, exp_err):
+    def run_check_with_objects(self, args, exp_std, exp_err, exp_runs=None, sort_runs=False):
 
         reporter_all = sap.adt.checks.Reporter('all')
         reporter_all.supported_types = '*'
@@ -657,11 +706,15 @@ class TestPackageCheck(unittest.TestCase):
             ],
         )
 
-        self.assertEqual(runs, [['all', 'programs/programs/zprogram'],
-                                ['all', 'oo/classes/zcl'],
-                                ['clas', 'oo/classes/zcl'],
-                                ['all', 'ddic/tables/ztable'],
-                                ['tabl', 'ddic/tables/ztable']])
+        if exp_runs is None:
+            exp_runs = [['all', 'programs/programs/zprogram', 'oo/classes/zcl', 'ddic/tables/ztable'],
+                        ['clas', 'oo/classes/zcl'],
+                        ['tabl', 'ddic/tables/ztable']]
+
+        if sort_runs:
+            runs = sorted(runs)
+
+        self.assertEqual(runs, exp_runs)
 
         self.assertEqual(std, exp_std)
         self.assertEqual(err, exp_err)
@@ -681,6 +734,85 @@ Errors:   2
 ''',
                                     '')
 
+    def test_check_closes_index(self):
+        reporter = sap.adt.checks.Reporter('all')
+        reporter.supported_types = '*'
+        index = Mock()
+
+        _, _, _, ret = self.run_checks(parse_args('check', 'foo'), [reporter],
+                                       [('foo', None, [SimpleNamespace(typ='PROG', name='ZPROGRAM',
+                                                                       uri='programs/programs/zprogram')])],
+                                       index=index)
+
+        self.assertEqual(ret, 0)
+        index.close.assert_called_once_with()
+
+    def test_check_with_objects_chunk_size(self):
+        args = parse_args('check', 'foo', '--chunk-size', '2')
+        self.run_check_with_objects(args,
+                                    '''W :: a :: Test all :: PROG ZPROGRAM
+W :: a :: Test all :: CLAS ZCL
+E :: c :: Test clas :: CLAS ZCL
+W :: a :: Test all :: TABL/DB ZTABLE
+E :: t :: Test tabl :: TABL/DB ZTABLE
+Checks:   5
+Messages: 5
+Warnings: 3
+Errors:   2
+''',
+                                    '',
+                                    exp_runs=[['all', 'programs/programs/zprogram', 'oo/classes/zcl'],
+                                              ['all', 'ddic/tables/ztable'],
+                                              ['clas', 'oo/classes/zcl'],
+                                              ['tabl', 'ddic/tables/ztable']])
+
+    def test_check_with_objects_failing_chunk(self):
+        self.failing_uris = ['oo/classes/zcl']
+
+        args = parse_args('check', 'foo')
+        self.run_check_with_objects(args,
+                                    '''W :: a :: Test all :: PROG ZPROGRAM
+W :: a :: Test all :: TABL/DB ZTABLE
+E :: t :: Test tabl :: TABL/DB ZTABLE
+Checks:   3
+Messages: 3
+Warnings: 2
+Errors:   1
+''',
+                                    '',
+                                    exp_runs=[['all', 'programs/programs/zprogram'],
+                                              ['all', 'ddic/tables/ztable'],
+                                              ['tabl', 'ddic/tables/ztable']])
+
+    def test_check_with_objects_jobs(self):
+        args = parse_args('check', 'foo', '--chunk-size', '1', '--jobs', '3')
+
+        with patch.object(Connection, 'clone', lambda self: self, create=True):
+            self.run_check_with_objects(args,
+                                        '''W :: a :: Test all :: PROG ZPROGRAM
+W :: a :: Test all :: CLAS ZCL
+E :: c :: Test clas :: CLAS ZCL
+W :: a :: Test all :: TABL/DB ZTABLE
+E :: t :: Test tabl :: TABL/DB ZTABLE
+Checks:   5
+Messages: 5
+Warnings: 3
+Errors:   2
+''',
+                                        '',
+                                        exp_runs=[['all', 'ddic/tables/ztable'],
+                                                  ['all', 'oo/classes/zcl'],
+                                                  ['all', 'programs/programs/zprogram'],
+                                                  ['clas', 'oo/classes/zcl'],
+                                                  ['tabl', 'ddic/tables/ztable']],
+                                        sort_runs=True)
+
+    def test_check_invalid_chunk_size(self):
+        args = parse_args('check', 'foo', '--chunk-size', '0')
+
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            args.execute(Connection(), args)
+
     def test_check_with_objects_by_object(self):
         args = parse_args('check', 'foo', '--group-by', 'object')
         self.run_check_with_objects(args,
@@ -804,5 +936,56 @@ Errors:   0
         self.assertEqual(ret, 0)
 
 
+class TestPackageIndexRefresh(ConsoleOutputTestCase, PatcherTestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        PatcherTestCase.__init__(self)
+
+    def tearDown(self):
+        try:
+            PatcherTestCase.unpatch_all(self)
+        finally:
+            super().tearDown()
+
+    def setUp(self):
+        ConsoleOutputTestCase.setUp(self)
+        self.patch_console(console=self.console)
+
+        self.index = Mock()
+        self.fake_open_index = self.patch('sap.adt.package_index.open_package_index', return_value=self.index)
+        self.fake_walk = self.patch('sap.adt.package.walk')
+        self.fake_walk.side_effect = lambda package, **kwargs: iter(
+            (([], ['SUB'], [SimpleNamespace(name='A'), SimpleNamespace(name='B')]),
+             (['SUB'], [], [SimpleNamespace(name='C')])))
+
+    def test_refresh(self):
+        conn = Connection()
+        args = parse_args('index', 'refresh', '$victory', '$other', '-j', '3')
+
+        args.execute(conn, args)
+
+        self.fake_open_index.assert_called_once_with(conn)
+        self.assertEqual(self.index.forget_tree.call_args_list, [call('$victory'), call('$other')])
+        self.assertEqual([(walk_call[0][0].name, walk_call[1]) for walk_call in self.fake_walk.call_args_list],
+                         [('$VICTORY', {'jobs': 3, 'index': self.index}),
+                          ('$OTHER', {'jobs': 3, 'index': self.index})])
+        self.index.close.assert_called_once_with()
+
+        self.assertConsoleContents(self.console, stdout='''Indexed 2 package(s) and 3 object(s) of $VICTORY
+Indexed 2 package(s) and 3 object(s) of $OTHER
+''')
+
+    def test_refresh_error_closes_index(self):
+        self.index.forget_tree.side_effect = SAPCliError('Cannot update package index')
+        conn = Connection()
+        args = parse_args('index', 'refresh', '$victory')
+
+        with self.assertRaises(SAPCliError):
+            args.execute(conn, args)
+
+        self.index.close.assert_called_once_with()
+
+
 if __name__ == '__main__':
     unittest.main()
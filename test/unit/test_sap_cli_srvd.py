@@ -113,7 +113,7 @@ class TestSRVDRead(unittest.TestCase):
 
 class TestSRVDActivate(unittest.TestCase):
 
-    @patch('sap.adt.wb.try_activate')
+    @patch('sap.adt.wb.bisect_mass_activate')
     @patch('sap.adt.ServiceDefinition')
     def test_cli_srvd_activate_defaults(self, fake_srvd, fake_activate):
         instances = []
@@ -126,7 +126,7 @@ class TestSRVDActivate(unittest.TestCase):
             return srvd
 
         fake_srvd.side_effect = add_instance
-        fake_activate.return_value = (sap.adt.wb.CheckResults(), None)
+        fake_activate.side_effect = lambda connection, objects, chunk_size: iter([(objects, sap.adt.wb.CheckResults())])
         fake_conn = Mock()
 
         args = parse_args('activate', 'zsapcli_test_srv', 'zsapcli_test_srv2')
@@ -137,7 +137,7 @@ class TestSRVDActivate(unittest.TestCase):
             call(fake_conn, 'ZSAPCLI_TEST_SRV', package=None, metadata=None),
             call(fake_conn, 'ZSAPCLI_TEST_SRV2', package=None, metadata=None),
         ])
-        self.assertEqual(fake_activate.mock_calls, [call(instances[0]), call(instances[1])])
+        fake_activate.assert_called_once_with(instances[0].connection, instances, 100)
         self.assertEqual(fake_console.caperr, '')
 
 
@@ -193,16 +193,16 @@ class TestActivate(unittest.TestCase):
         self.console = BufferConsole()
         self.inactive_objects = Mock()
 
-    @patch('sap.adt.wb.try_mass_activate')
+    @patch('sap.adt.wb.bisect_mass_activate_references')
     def test_no_messages(self, fake_mass_activate):
-        fake_mass_activate.return_value = None
+        fake_mass_activate.return_value = [(['CL_TEST'], Mock(messages=[]))]
 
         sap.cli.wb.activate(self.connection, self.inactive_objects, self.console)
 
         fake_mass_activate.assert_called_once_with(self.connection, self.inactive_objects)
         self.assertEqual(self.console.capout, '')
 
-    @patch('sap.adt.wb.try_mass_activate')
+    @patch('sap.adt.wb.bisect_mass_activate_references')
     def test_info_messages(self, fake_mass_activate):
         msg = Mock()
         msg.is_error = False
@@ -210,13 +210,13 @@ class TestActivate(unittest.TestCase):
         msg.typ = 'I'
         msg.short_text = 'Info message'
 
-        fake_mass_activate.return_value = [msg]
+        fake_mass_activate.return_value = [([msg.obj_descr], Mock(messages=[msg]))]
 
         sap.cli.wb.activate(self.connection, self.inactive_objects, self.console)
 
         self.assertEqual(self.console.capout, '* CL_TEST ::\n| I: Info message\n')
 
-    @patch('sap.adt.wb.try_mass_activate')
+    @patch('sap.adt.wb.bisect_mass_activate_references')
     def test_error_messages(self, fake_mass_activate):
         msg = Mock()
         msg.is_error = True
@@ -224,7 +224,7 @@ class TestActivate(unittest.TestCase):
         msg.typ = 'E'
         msg.short_text = 'Syntax error'
 
-        fake_mass_activate.return_value = [msg]
+        fake_mass_activate.return_value = [([msg.obj_descr], Mock(messages=[msg]))]
 
         with self.assertRaises(sap.errors.SAPCliError) as cm:
             sap.cli.wb.activate(self.connection, self.inactive_objects, self.console)
@@ -232,7 +232,7 @@ class TestActivate(unittest.TestCase):
         self.assertEqual(str(cm.exception), 'Aborting because of activation errors')
         self.assertEqual(self.console.capout, '* CL_BROKEN ::\n| E: Syntax error\n')
 
-    @patch('sap.adt.wb.try_mass_activate')
+    @patch('sap.adt.wb.bisect_mass_activate_references')
     def test_mixed_messages(self, fake_mass_activate):
         info_msg = Mock()
         info_msg.is_error = False
@@ -246,7 +246,7 @@ class TestActivate(unittest.TestCase):
         err_msg.typ = 'E'
         err_msg.short_text = 'Not good'
 
-        fake_mass_activate.return_value = [info_msg, err_msg]
+        fake_mass_activate.return_value = [(['CL_OK', 'CL_BAD'], Mock(messages=[info_msg, err_msg]))]
 
         with self.assertRaises(sap.errors.SAPCliError):
             sap.cli.wb.activate(self.connection, self.inactive_objects, self.console)
@@ -254,6 +254,20 @@ class TestActivate(unittest.TestCase):
         self.assertIn('* CL_OK ::', self.console.capout)
         self.assertIn('* CL_BAD ::', self.console.capout)
 
+    @patch('sap.adt.wb.bisect_mass_activate_references')
+    def test_errors_of_all_chunks(self, fake_mass_activate):
+        first = Mock(is_error=True, obj_descr='CL_FIRST', typ='E', short_text='Broken')
+        second = Mock(is_error=True, obj_descr='CL_SECOND', typ='E', short_text='Broken too')
+
+        fake_mass_activate.return_value = [(['CL_FIRST'], Mock(messages=[first])),
+                                           (['CL_OK'], Mock(messages=[])),
+                                           (['CL_SECOND'], Mock(messages=[second]))]
+
+        with self.assertRaises(sap.errors.SAPCliError):
+            sap.cli.wb.activate(self.connection, self.inactive_objects, self.console)
+
+        self.assertEqual(self.console.capout, '* CL_FIRST ::\n| E: Broken\n* CL_SECOND ::\n| E: Broken too\n')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -94,6 +94,62 @@ class TestConfigGet(unittest.TestCase):
 
         self.assertEqual(timeout, 0.777)
 
+    def test_return_session_cache_ttl(self):
+        with patch('os.environ', {}):
+            ttl = sap.config.config_get('session_cache_ttl')
+
+        self.assertEqual(ttl, 0)
+
+    def test_return_session_cache_ttl_from_env(self):
+        with patch('os.environ', {'SAPCLI_SESSION_CACHE_TTL': '1800'}):
+            ttl = sap.config.config_get('session_cache_ttl')
+
+        self.assertEqual(ttl, 1800)
+
+    def test_return_discovery_cache_ttl(self):
+        with patch('os.environ', {}):
+            ttl = sap.config.config_get('discovery_cache_ttl')
+
+        self.assertEqual(ttl, 0)
+
+    def test_return_discovery_cache_ttl_from_env(self):
+        with patch('os.environ', {'SAPCLI_DISCOVERY_CACHE_TTL': '86400'}):
+            ttl = sap.config.config_get('discovery_cache_ttl')
+
+        self.assertEqual(ttl, 86400)
+
+    def test_return_package_index_ttl(self):
+        with patch('os.environ', {}):
+            ttl = sap.config.config_get('package_index_ttl')
+
+        self.assertEqual(ttl, 0)
+
+    def test_return_package_index_ttl_from_env(self):
+        with patch('os.environ', {'SAPCLI_PACKAGE_INDEX_TTL': '3600'}):
+            ttl = sap.config.config_get('package_index_ttl')
+
+        self.assertEqual(ttl, 3600)
+
+    def test_return_profile(self):
+        with patch('os.environ', {}):
+            self.assertIsNone(sap.config.config_get('profile'))
+
+    def test_return_profile_from_env(self):
+        with patch('os.environ', {'SAPCLI_PROFILE': '/tmp/profile.json'}):
+            self.assertEqual(sap.config.config_get('profile'), '/tmp/profile.json')
+
+    def test_compare_before_write_default(self):
+        with patch('os.environ', {}):
+            self.assertFalse(sap.config.config_get('compare_before_write'))
+            self.assertTrue(sap.config.config_get('compare_before_write', True))
+
+    def test_compare_before_write_from_env(self):
+        with patch('os.environ', {'SAPCLI_COMPARE_BEFORE_WRITE': 'yes'}):
+            self.assertTrue(sap.config.config_get('compare_before_write', False))
+
+        with patch('os.environ', {'SAPCLI_COMPARE_BEFORE_WRITE': 'off'}):
+            self.assertFalse(sap.config.config_get('compare_before_write', True))
+
     def test_check_before_save_default(self):
         with patch('os.environ', {}):
             self.assertTrue(sap.config.config_get('check_before_save'))
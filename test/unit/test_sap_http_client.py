@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, PropertyMock
 
 import requests.exceptions
 from requests.auth import HTTPBasicAuth
 
+import sap.profiling
+
 from sap.http.client import (
     build_query_args,
     build_url,
@@ -319,7 +321,7 @@ class TestHTTPClientRetrieve(unittest.TestCase):
 
         self.assertIs(req, prepared)
         self.assertIs(res, response)
-        session.send.assert_called_once_with(prepared, timeout=client.timeout)
+        session.send.assert_called_once_with(prepared, timeout=client.timeout, stream=False)
 
     @patch('sap.http.client.requests.Request')
     def test_retrieve_builds_url(self, mock_request_cls):
@@ -473,6 +475,94 @@ class TestHTTPClientRetrieve(unittest.TestCase):
         kwargs = mock_request_cls.call_args[1]
         self.assertEqual(kwargs['params'], {'sap-client': '100'})
 
+    @patch('sap.http.client.requests.Request')
+    def test_retrieve_does_not_decode_response_without_debug(self, mock_request_cls):
+        client = self._make_client()
+        session = Mock()
+        session.prepare_request.return_value = Mock()
+        response = Mock()
+        text = PropertyMock(return_value='decoded')
+        type(response).text = text
+        session.send.return_value = response
+
+        with patch('logging.Logger.isEnabledFor', return_value=False):
+            client.retrieve(session, 'GET', 'path')
+
+        text.assert_not_called()
+
+        with patch('logging.Logger.isEnabledFor', return_value=True), \
+             patch('logging.Logger.debug') as fake_debug:
+            client.retrieve(session, 'GET', 'path')
+
+        text.assert_called_once_with()
+        self.assertEqual(fake_debug.call_args[0][-1], 'decoded')
+
+    @patch('sap.http.client.requests.Request')
+    def test_retrieve_profiled(self, mock_request_cls):
+        client = self._make_client()
+        session = Mock()
+        session.prepare_request.return_value = Mock(body='<request/>')
+        session.send.return_value = Mock(text='<response/>', content=b'<response/>', status_code=200)
+
+        profiler = sap.profiling.enable_profiling()
+        try:
+            client.retrieve(session, 'post', '/sap/bc/adt/activation')
+        finally:
+            sap.profiling.disable_profiling()
+
+        record = profiler.records[0]
+        self.assertEqual(record.kind, sap.profiling.HTTP)
+        self.assertEqual(record.name, 'POST /sap/bc/adt/activation')
+        self.assertEqual(record.details, {'method': 'POST', 'path': '/sap/bc/adt/activation', 'status': 200,
+                                          'request_bytes': 10, 'response_bytes': 11})
+
+    @patch('sap.http.client.requests.Request')
+    def test_retrieve_streamed_body_not_read(self, mock_request_cls):
+        client = self._make_client()
+        session = Mock()
+        session.prepare_request.return_value = Mock(body=None)
+
+        response = Mock(status_code=200, headers={'Content-Length': '42'})
+        type(response).content = PropertyMock(side_effect=AssertionError('body read'))
+        type(response).text = PropertyMock(side_effect=AssertionError('body read'))
+        session.send.return_value = response
+
+        profiler = sap.profiling.enable_profiling()
+        try:
+            with patch('sap.http.client.get_logger') as fake_logger:
+                fake_logger.return_value.isEnabledFor.return_value = True
+                _, res = client.retrieve(session, 'GET', 'path', stream=True)
+        finally:
+            sap.profiling.disable_profiling()
+
+        self.assertIs(res, response)
+        session.send.assert_called_once_with(session.prepare_request.return_value, timeout=client.timeout,
+                                             stream=True)
+        self.assertEqual(profiler.records[0].details['response_bytes'], 42)
+
+    def test_response_stream(self):
+        response = Mock()
+
+        self.assertIs(sap.http.response_stream(response), response.raw)
+        self.assertTrue(response.raw.decode_content)
+
+    @patch('sap.http.client.requests.Request')
+    def test_retrieve_profiled_timeout(self, mock_request_cls):
+        client = self._make_client()
+        session = Mock()
+        session.prepare_request.return_value = Mock(method='GET', url='https://example.com:443/path', body=None)
+        session.send.side_effect = requests.exceptions.ReadTimeout('read timed out')
+
+        profiler = sap.profiling.enable_profiling()
+        try:
+            with self.assertRaises(TimedOutRequestError):
+                client.retrieve(session, 'GET', 'path')
+        finally:
+            sap.profiling.disable_profiling()
+
+        self.assertIsNone(profiler.records[0].details['status'])
+        self.assertEqual(profiler.records[0].details['response_bytes'], 0)
+
 
 class TestHTTPClientExecuteWithSession(unittest.TestCase):
 
@@ -506,7 +596,7 @@ class TestHTTPClientExecuteWithSession(unittest.TestCase):
 
         client.retrieve.assert_called_once_with(
             session, 'POST', 'path',
-            params={'p': '1'}, headers={'h': 'v'}, body='data'
+            params={'p': '1'}, headers={'h': 'v'}, body='data', stream=False
         )
 
     def test_error_handler_called_on_error_status(self):
@@ -558,7 +648,7 @@ class TestHTTPClientExecuteWithSession(unittest.TestCase):
             (req_retry, res_ok),
         ]
 
-        def fake_retrieve(sess, method, path, params=None, headers=None, body=None):
+        def fake_retrieve(sess, method, path, params=None, headers=None, body=None, stream=False):
             idx = call_count[0]
             call_count[0] += 1
             return retrieve_returns[idx]
@@ -654,7 +744,7 @@ class TestHTTPClientExecuteWithSession(unittest.TestCase):
             (Mock(), res_ok),
         ]
 
-        def fake_retrieve(sess, method, path, params=None, headers=None, body=None):
+        def fake_retrieve(sess, method, path, params=None, headers=None, body=None, stream=False):
             idx = call_count[0]
             call_count[0] += 1
             return retrieve_returns[idx]
@@ -915,5 +1005,107 @@ class TestHTTPClientSessionInitializer(unittest.TestCase):
         custom.build_unauthorized_error.assert_called_once_with(req, res)
 
 
+class TestHTTPClientSessionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.session_cache = Mock()
+        self.session_cache.key_for.return_value = 'key'
+        self.session_cache.load.return_value = False
+        self.client = HTTPClient(host='example.com', user='SAP*', password='pass', client='100',
+                                 login_path='login', login_method='HEAD', session_cache=self.session_cache)
+
+    def _response(self, status_code, headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        return response
+
+    @patch('sap.http.client.requests.Session')
+    def test_build_session_reuses_cached_session(self, mock_session_cls):
+        self.session_cache.load.return_value = True
+        self.client.execute_with_session = Mock()
+
+        session, response = self.client.build_session()
+
+        self.assertIs(session, mock_session_cls.return_value)
+        self.assertIsNone(response)
+        self.client.execute_with_session.assert_not_called()
+        self.session_cache.key_for.assert_called_once_with('https', 'example.com', '443', '100', 'SAP*',
+                                                           'BasicAuthHTTPSessionInitializer')
+        self.session_cache.load.assert_called_once_with('key', session)
+        self.session_cache.save.assert_not_called()
+
+    @patch('sap.http.client.requests.Session')
+    def test_build_session_stores_new_session(self, mock_session_cls):
+        mock_session_cls.return_value = MagicMock()
+        mock_session_cls.return_value.headers = {}
+        login_response = self._response(200, {'x-csrf-token': 'token'})
+        self.client.execute_with_session = Mock(return_value=login_response)
+
+        session, response = self.client.build_session()
+
+        self.assertIs(response, login_response)
+        self.session_cache.save.assert_called_once_with('key', session)
+
+    def test_relogin_on_401(self):
+        session = MagicMock()
+        session.headers = {'x-csrf-token': 'stale'}
+
+        self.client.retrieve = Mock(side_effect=[
+            (Mock(), self._response(401)),
+            (Mock(), self._response(200, {'x-csrf-token': 'fresh'})),
+            (Mock(), self._response(200)),
+        ])
+
+        result = self.client.execute_with_session(session, 'GET', 'path')
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(session.headers['x-csrf-token'], 'fresh')
+        session.cookies.clear.assert_called_once_with()
+        self.session_cache.forget.assert_called_once_with('key')
+        self.session_cache.save.assert_called_once_with('key', session)
+
+    def test_relogin_on_403_with_expired_session(self):
+        session = MagicMock()
+        session.headers = {'x-csrf-token': 'stale'}
+
+        self.client.retrieve = Mock(side_effect=[
+            (Mock(), self._response(403)),
+            (Mock(), self._response(401)),
+            (Mock(), self._response(200, {'x-csrf-token': 'fresh'})),
+            (Mock(), self._response(200)),
+        ])
+
+        result = self.client.execute_with_session(session, 'GET', 'path')
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(session.headers['x-csrf-token'], 'fresh')
+        self.session_cache.forget.assert_called_once_with('key')
+
+    def test_relogin_failure_raises_unauthorized(self):
+        session = MagicMock()
+        session.headers = {}
+
+        self.client.retrieve = Mock(return_value=(Mock(), self._response(401)))
+
+        with self.assertRaises(UnauthorizedError):
+            self.client.execute_with_session(session, 'GET', 'path')
+
+        self.assertEqual(self.client.retrieve.call_count, 2)
+        self.session_cache.save.assert_not_called()
+
+    def test_no_relogin_without_cache(self):
+        client = HTTPClient(host='example.com', user='SAP*', password='pass', client='100')
+        client.retrieve = Mock(side_effect=[
+            (Mock(), self._response(403)),
+            (Mock(), self._response(401)),
+        ])
+
+        with self.assertRaises(UnauthorizedError):
+            client.execute_with_session(MagicMock(), 'GET', 'path')
+
+        self.assertEqual(client.retrieve.call_count, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
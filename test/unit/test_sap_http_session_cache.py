@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+"""Tests for sap.http.session_cache.
+
+The file store is replaced by an in-memory fake; generic JSONFileStore
+behaviour is exercised in test_sap_http_json_store.py.
+"""
+
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import requests
+
+from sap.http.session_cache import (
+    CachedSession,
+    SessionCache,
+    SessionFileStore,
+    get_session_cache,
+)
+
+
+class MemoryStore:
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries[key] = value
+
+    def delete(self, key):
+        self.entries.pop(key, None)
+
+
+def make_session():
+    session = requests.Session()
+    session.cookies.set('SAP_SESSIONID_C50_100', 'secret', domain='example.org', path='/')
+    session.cookies.set('sap-contextid', 'stateful', domain='example.org', path='/sap/bc/adt')
+    session.headers['x-csrf-token'] = 'token'
+    return session
+
+
+class TestCachedSession(unittest.TestCase):
+
+    def test_from_session_skips_private_cookies(self):
+        cached = CachedSession.from_session(make_session())
+
+        self.assertEqual([cookie['name'] for cookie in cached.cookies], ['SAP_SESSIONID_C50_100'])
+        self.assertEqual(cached.csrf_token, 'token')
+
+    def test_round_trip_and_apply(self):
+        cached = CachedSession.from_json(CachedSession.from_session(make_session()).to_json())
+
+        session = requests.Session()
+        cached.apply(session)
+
+        self.assertEqual(session.cookies.get('SAP_SESSIONID_C50_100', domain='example.org'), 'secret')
+        self.assertIsNone(session.cookies.get('sap-contextid'))
+        self.assertEqual(session.headers['x-csrf-token'], 'token')
+
+    def test_from_json_rejects_non_list(self):
+        with self.assertRaises(TypeError):
+            CachedSession.from_json(json.dumps({'cookies': {}, 'csrf_token': None, 'stored_at': 0}))
+
+    def test_is_expired(self):
+        cached = CachedSession(stored_at=1000.0)
+
+        self.assertFalse(cached.is_expired(60, now=1060.0))
+        self.assertTrue(cached.is_expired(60, now=1061.0))
+
+
+class TestSessionFileStore(unittest.TestCase):
+
+    @patch('pathlib.Path.chmod', return_value=None)
+    @patch('pathlib.Path.mkdir', return_value=None)
+    def test_subdirectory_and_serialization(self, _mock_mkdir, _mock_chmod):
+        store = SessionFileStore(base_dir=Path('/tmp/sapcli-test'))
+        cached = CachedSession(cookies=[{'name': 'a', 'value': 'b'}], csrf_token='token', stored_at=1.0)
+
+        self.assertEqual(store._dir, Path('/tmp/sapcli-test/http_sessions'))
+        self.assertEqual(store._deserialize(store._serialize(cached)), cached)
+
+
+class TestSessionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.store = MemoryStore()
+        self.cache = SessionCache(1800, 'adt', store=self.store)
+        self.key = self.cache.key_for('https', 'example.org', '443', '100', 'DEVELOPER', 'basic')
+
+    def test_key_for_differs(self):
+        self.assertEqual(self.key, self.cache.key_for('https', 'example.org', 443, '100', 'DEVELOPER', 'basic'))
+        self.assertNotEqual(self.key, self.cache.key_for('https', 'example.org', '443', '100', 'OTHER', 'basic'))
+        self.assertNotEqual(self.key, self.cache.key_for('https', 'example.org', '443', '200', 'DEVELOPER', 'basic'))
+        self.assertNotEqual(self.key, SessionCache(1800, 'rest').key_for('https', 'example.org', '443', '100',
+                                                                         'DEVELOPER', 'basic'))
+
+    def test_key_for_auth_method(self):
+        self.assertNotEqual(self.cache.key_for('https', 'example.org', '443', '100', None, 'oauth'),
+                            self.cache.key_for('https', 'example.org', '443', '100', None, 'certificate'))
+        self.assertNotEqual(self.cache.key_for('https', 'example.org', '443', '100', None, 'oauth'),
+                            self.cache.key_for('https', 'example.org', '443', '100', '', 'basic'))
+
+    def test_load_missing(self):
+        self.assertFalse(self.cache.load(self.key, requests.Session()))
+
+    def test_save_load(self):
+        self.cache.save(self.key, make_session())
+
+        session = requests.Session()
+        self.assertTrue(self.cache.load(self.key, session))
+        self.assertEqual(session.headers['x-csrf-token'], 'token')
+
+    def test_load_expired(self):
+        self.store.set(self.key, CachedSession(csrf_token='token', stored_at=0.0))
+
+        session = requests.Session()
+        self.assertFalse(self.cache.load(self.key, session))
+        self.assertNotIn('x-csrf-token', session.headers)
+
+    def test_forget(self):
+        self.cache.save(self.key, make_session())
+        self.cache.forget(self.key)
+
+        self.assertEqual(self.store.entries, {})
+
+    def test_store_errors_are_ignored(self):
+        store = Mock()
+        store.get.side_effect = OSError('read-only')
+        store.set.side_effect = OSError('read-only')
+        store.delete.side_effect = OSError('read-only')
+        cache = SessionCache(1800, 'adt', store=store)
+
+        cache.save(self.key, make_session())
+        cache.forget(self.key)
+        self.assertFalse(cache.load(self.key, requests.Session()))
+
+
+class TestGetSessionCache(unittest.TestCase):
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_session_cache('adt'))
+
+    @patch.dict('os.environ', {'SAPCLI_SESSION_CACHE_TTL': '1800'}, clear=True)
+    def test_enabled(self):
+        cache = get_session_cache('odata')
+
+        self.assertEqual(cache.ttl, 1800)
+        self.assertEqual(cache.scope, 'odata')
+
+
+if __name__ == '__main__':
+    unittest.main()
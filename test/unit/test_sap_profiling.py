@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import unittest
+
+import sap.profiling
+from sap.profiling import Profiler, body_size, path_template, profiled_parser
+
+
+class TestPathTemplate(unittest.TestCase):
+
+    def test_plain_path(self):
+        self.assertEqual(path_template('/sap/bc/adt/oo/classes/zcl_foo/source/main'),
+                         '/sap/bc/adt/oo/classes/zcl_foo/source/main')
+
+    def test_query_is_removed(self):
+        self.assertEqual(path_template('/sap/bc/adt/repository/informationsystem/search?query=Z*'),
+                         '/sap/bc/adt/repository/informationsystem/search')
+
+    def test_identifiers(self):
+        self.assertEqual(path_template('/sap/bc/adt/atc/worklists/0242AC1100021EE9AAE43D24739F1C3A'),
+                         '/sap/bc/adt/atc/worklists/{id}')
+        self.assertEqual(path_template('/sap/bc/adt/activation/results/42'),
+                         '/sap/bc/adt/activation/results/{id}')
+        self.assertEqual(path_template('/sap/bc/adt/oo/classes/%2fns%2fcl_foo'),
+                         '/sap/bc/adt/oo/classes/{name}')
+
+
+class TestBodySize(unittest.TestCase):
+
+    def test_sizes(self):
+        self.assertEqual(body_size(None), 0)
+        self.assertEqual(body_size('ž'), 2)
+        self.assertEqual(body_size(b'abc'), 3)
+        self.assertEqual(body_size(iter([b'abc'])), 0)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = Profiler()
+
+        self.profiler.record_http('get', '/sap/bc/adt/discovery', 200, 10.0, 0.5, response_bytes=100)
+        self.profiler.record_http('GET', '/sap/bc/adt/discovery', 200, 11.0, 0.25, response_bytes=50)
+        self.profiler.record_http('POST', '/sap/bc/adt/activation', 200, 12.0, 2.0, request_bytes=30)
+        self.profiler.record(sap.profiling.PARSE, 'Marshal.deserialize', 13.0, 0.1, document_bytes=50)
+
+    def test_summary(self):
+        summary = self.profiler.summary()
+
+        self.assertEqual([(group.kind, group.name, group.calls) for group in summary],
+                         [('http', 'POST /sap/bc/adt/activation', 1),
+                          ('http', 'GET /sap/bc/adt/discovery', 2),
+                          ('parse', 'Marshal.deserialize', 1)])
+
+        self.assertEqual(summary[1].total, 0.75)
+        self.assertEqual(summary[1].average, 0.375)
+        self.assertEqual(summary[1].longest, 0.5)
+        self.assertEqual(summary[1].response_bytes, 150)
+        self.assertEqual(summary[0].request_bytes, 30)
+        self.assertEqual(summary[2].document_bytes, 50)
+
+    def test_chrome_trace(self):
+        trace = self.profiler.chrome_trace()
+
+        self.assertEqual(trace['displayTimeUnit'], 'ms')
+        self.assertEqual(len(trace['traceEvents']), 4)
+
+        event = trace['traceEvents'][2]
+        self.assertEqual(event['name'], 'POST /sap/bc/adt/activation')
+        self.assertEqual(event['cat'], 'http')
+        self.assertEqual(event['ph'], 'X')
+        self.assertEqual(event['dur'], 2000000)
+        self.assertEqual(event['pid'], os.getpid())
+        self.assertEqual(event['args']['status'], 200)
+        self.assertEqual(trace['traceEvents'][3]['ts'] - event['ts'], 1000000)
+
+    def test_write_chrome_trace(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'profile.json')
+            self.profiler.write_chrome_trace(path)
+
+            with open(path, encoding='utf-8') as trace_file:
+                self.assertEqual(json.load(trace_file), self.profiler.chrome_trace())
+
+
+class TestProfiledParser(unittest.TestCase):
+
+    def tearDown(self):
+        sap.profiling.disable_profiling()
+
+    def test_disabled(self):
+        self.assertIsNone(sap.profiling.get_profiler())
+
+        @profiled_parser('parse_foo')
+        def parse_foo(xml):
+            return xml.upper()
+
+        self.assertEqual(parse_foo('<foo/>'), '<FOO/>')
+
+    def test_enabled(self):
+        profiler = sap.profiling.enable_profiling()
+        self.assertIs(sap.profiling.enable_profiling(), profiler)
+
+        @profiled_parser('parse_foo')
+        def parse_foo(xml):
+            raise ValueError(xml)
+
+        with self.assertRaises(ValueError):
+            parse_foo('<foo/>')
+
+        self.assertIs(sap.profiling.disable_profiling(), profiler)
+        self.assertIsNone(sap.profiling.get_profiler())
+
+        record = profiler.records[0]
+        self.assertEqual(record.kind, sap.profiling.PARSE)
+        self.assertEqual(record.name, 'parse_foo')
+        self.assertEqual(record.details, {'document_bytes': 6})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,7 @@ from sap.http import HTTPRequestError
 from sap.rest.errors import UnauthorizedError, GCTSConnectionError, TimedOutRequestError, UnexpectedResponseContent
 
 
-def stub_retrieve(response, session, method, path, params=None, headers=None, body=None):
+def stub_retrieve(response, session, method, path, params=None, headers=None, body=None, stream=False):
     req = Mock()
     req.method = method
     req.url = path